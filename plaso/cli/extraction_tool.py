@@ -47,6 +47,7 @@ class ExtractionTool(
     super(ExtractionTool, self).__init__(
         input_reader=input_reader, output_writer=output_writer)
     self._artifacts_registry = None
+    self._block_cache_size = None
     self._buffer_size = 0
     self._mount_path = None
     self._operating_system = None
@@ -57,8 +58,12 @@ class ExtractionTool(
     self._queue_size = self._DEFAULT_QUEUE_SIZE
     self._resolver_context = dfvfs_context.Context()
     self._single_process_mode = False
+    self._storage_compression_format = definitions.COMPRESSION_FORMAT_ZLIB
     self._storage_file_path = None
     self._storage_format = definitions.STORAGE_FORMAT_SQLITE
+    self._storage_serializer_format = definitions.SERIALIZER_FORMAT_JSON
+    self._task_storage_compression_format = (
+        definitions.COMPRESSION_FORMAT_NONE)
     self._temporary_directory = None
     self._text_prepend = None
     self._use_zeromq = True
@@ -80,6 +85,7 @@ class ExtractionTool(
     configuration.credentials = self._credential_configurations
     configuration.debug_output = self._debug_mode
     configuration.event_extraction.text_prepend = self._text_prepend
+    configuration.extraction.block_cache_size = self._block_cache_size
     configuration.extraction.hasher_file_size_limit = (
         self._hasher_file_size_limit)
     configuration.extraction.hasher_names_string = self._hasher_names_string
@@ -26,6 +26,13 @@ class ExtractionArgumentsHelper(interface.ArgumentsHelper):
       argument_group (argparse._ArgumentGroup|argparse.ArgumentParser):
           argparse group.
     """
+    argument_group.add_argument(
+        '--block_cache_size', '--block-cache-size', dest='block_cache_size',
+        type=int, action='store', default=None, metavar='SIZE', help=(
+            'Maximum size in bytes of the file content every worker caches '
+            'in memory, so that it is read from the source only once. '
+            'A value of 0 disables the cache.'))
+
     argument_group.add_argument(
         '--preferred_year', '--preferred-year', dest='preferred_year',
         type=int, action='store', default=None, metavar='YEAR', help=(
@@ -58,17 +65,24 @@ class ExtractionArgumentsHelper(interface.ArgumentsHelper):
 
     Raises:
       BadConfigObject: when the configuration object is of the wrong type.
+      BadConfigOption: if the block cache size is negative.
     """
     if not isinstance(configuration_object, tools.CLITool):
       raise errors.BadConfigObject(
           'Configuration object is not an instance of CLITool')
 
+    block_cache_size = cls._ParseNumericOption(options, 'block_cache_size')
+    if block_cache_size is not None and block_cache_size < 0:
+      raise errors.BadConfigOption(
+          'Invalid block cache size value cannot be negative.')
+
     preferred_year = cls._ParseNumericOption(options, 'preferred_year')
 
     process_archives = getattr(options, 'process_archives', False)
     process_compressed_streams = getattr(
         options, 'process_compressed_streams', True)
 
+    setattr(configuration_object, '_block_cache_size', block_cache_size)
     setattr(configuration_object, '_preferred_year', preferred_year)
     setattr(configuration_object, '_process_archives', process_archives)
     setattr(
@@ -27,8 +27,30 @@ class StorageFormatArgumentsHelper(interface.ArgumentsHelper):
       argument_group (argparse._ArgumentGroup|argparse.ArgumentParser):
           argparse group.
     """
+    compression_formats = sorted(definitions.COMPRESSION_FORMATS)
+    serializer_formats = sorted(definitions.SERIALIZER_FORMATS)
     storage_formats = sorted(definitions.STORAGE_FORMATS)
 
+    argument_group.add_argument(
+        '--compression_format', '--compression-format', action='store',
+        choices=compression_formats, dest='compression_format', type=str,
+        metavar='FORMAT', default=definitions.COMPRESSION_FORMAT_ZLIB, help=(
+            'Format in which attribute containers are compressed in a new '
+            'storage file, the default is: {0:s}. Supported options: '
+            '{1:s}'.format(
+                definitions.COMPRESSION_FORMAT_ZLIB,
+                ', '.join(compression_formats))))
+
+    argument_group.add_argument(
+        '--serializer_format', '--serializer-format', action='store',
+        choices=serializer_formats, dest='serializer_format', type=str,
+        metavar='FORMAT', default=definitions.SERIALIZER_FORMAT_JSON, help=(
+            'Format in which attribute containers are serialized in a new '
+            'storage file, the default is: {0:s}. Supported options: '
+            '{1:s}'.format(
+                definitions.SERIALIZER_FORMAT_JSON,
+                ', '.join(serializer_formats))))
+
     argument_group.add_argument(
         '--storage_format', '--storage-format', action='store',
         choices=storage_formats, dest='storage_format', type=str,
@@ -38,6 +60,17 @@ class StorageFormatArgumentsHelper(interface.ArgumentsHelper):
                 definitions.DEFAULT_STORAGE_FORMAT,
                 ', '.join(storage_formats))))
 
+    argument_group.add_argument(
+        '--task_compression_format', '--task-compression-format',
+        action='store', choices=compression_formats,
+        dest='task_compression_format', type=str, metavar='FORMAT',
+        default=definitions.COMPRESSION_FORMAT_NONE, help=(
+            'Format in which attribute containers are compressed in task '
+            'storage files, the default is: {0:s}. Supported options: '
+            '{1:s}'.format(
+                definitions.COMPRESSION_FORMAT_NONE,
+                ', '.join(compression_formats))))
+
   @classmethod
   def ParseOptions(cls, options, configuration_object):
     """Parses and validates options.
@@ -49,7 +82,8 @@ class StorageFormatArgumentsHelper(interface.ArgumentsHelper):
 
     Raises:
       BadConfigObject: when the configuration object is of the wrong type.
-      BadConfigOption: if the storage format is not defined or supported.
+      BadConfigOption: if the storage format is not defined or supported or
+          if the compression or serializer format is not supported.
     """
     if not isinstance(configuration_object, tools.CLITool):
       raise errors.BadConfigObject(
@@ -63,7 +97,39 @@ class StorageFormatArgumentsHelper(interface.ArgumentsHelper):
       raise errors.BadConfigOption(
           'Unsupported storage format: {0:s}'.format(storage_format))
 
+    serializer_format = cls._ParseStringOption(
+        options, 'serializer_format',
+        default_value=definitions.SERIALIZER_FORMAT_JSON)
+    if serializer_format not in definitions.SERIALIZER_FORMATS:
+      raise errors.BadConfigOption(
+          'Unsupported storage serializer format: {0:s}'.format(
+              serializer_format))
+
+    compression_format = cls._ParseStringOption(
+        options, 'compression_format',
+        default_value=definitions.COMPRESSION_FORMAT_ZLIB)
+    if compression_format not in definitions.COMPRESSION_FORMATS:
+      raise errors.BadConfigOption(
+          'Unsupported storage compression format: {0:s}'.format(
+              compression_format))
+
+    task_compression_format = cls._ParseStringOption(
+        options, 'task_compression_format',
+        default_value=definitions.COMPRESSION_FORMAT_NONE)
+    if task_compression_format not in definitions.COMPRESSION_FORMATS:
+      raise errors.BadConfigOption(
+          'Unsupported task storage compression format: {0:s}'.format(
+              task_compression_format))
+
+    setattr(
+        configuration_object, '_storage_compression_format',
+        compression_format)
     setattr(configuration_object, '_storage_format', storage_format)
+    setattr(
+        configuration_object, '_storage_serializer_format', serializer_format)
+    setattr(
+        configuration_object, '_task_storage_compression_format',
+        task_compression_format)
 
 
 manager.ArgumentHelperManager.RegisterHelper(StorageFormatArgumentsHelper)
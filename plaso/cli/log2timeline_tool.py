@@ -4,6 +4,7 @@
 from __future__ import unicode_literals
 
 import argparse
+import os
 import sys
 import time
 import textwrap
@@ -24,7 +25,6 @@ from plaso.cli import views
 from plaso.cli.helpers import manager as helpers_manager
 from plaso.engine import engine
 from plaso.engine import single_process as single_process_engine
-from plaso.lib import definitions
 from plaso.lib import errors
 from plaso.lib import loggers
 from plaso.multi_processing import task_engine as multi_process_engine
@@ -99,7 +99,7 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
     self._command_line_arguments = None
     self._enable_sigsegv_handler = False
     self._number_of_extraction_workers = 0
-    self._storage_serializer_format = definitions.SERIALIZER_FORMAT_JSON
+    self._resume = False
     self._source_type = None
     self._status_view = status_view.StatusView(self._output_writer, self.NAME)
     self._status_view_mode = self._DEFAULT_STATUS_VIEW_MODE
@@ -229,6 +229,13 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
     helpers_manager.ArgumentHelperManager.AddCommandLineArguments(
         storage_group, names=['storage_format'])
 
+    storage_group.add_argument(
+        '--resume', dest='resume', action='store_true', default=False, help=(
+            'Resume an interrupted extraction into an existing storage file. '
+            'Path specifications of which the results were already merged '
+            'into the storage file are not processed again. Only supported '
+            'in multi process mode.'))
+
     argument_parser.add_argument(
         self._SOURCE_OPTION, action='store', metavar='SOURCE', nargs='?',
         default=None, type=str, help=(
@@ -333,14 +340,6 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
     if not self._storage_file_path:
       raise errors.BadConfigOption('Missing storage file option.')
 
-    serializer_format = getattr(
-        options, 'serializer_format', definitions.SERIALIZER_FORMAT_JSON)
-    if serializer_format not in definitions.SERIALIZER_FORMATS:
-      raise errors.BadConfigOption(
-          'Unsupported storage serializer format: {0:s}.'.format(
-              serializer_format))
-    self._storage_serializer_format = serializer_format
-
     # TODO: where is this defined?
     self._operating_system = getattr(options, 'os', None)
 
@@ -352,6 +351,11 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
 
     self._enable_sigsegv_handler = getattr(options, 'sigsegv_handler', False)
 
+    self._resume = getattr(options, 'resume', False)
+    if self._resume and self._single_process_mode:
+      raise errors.BadConfigOption(
+          'Resume is not supported in single process mode.')
+
     self._EnforceProcessMemoryLimit(self._process_memory_limit)
 
   def ExtractEventsFromSources(self):
@@ -364,7 +368,13 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
           file system.
       UserAbort: if the user initiated an abort.
     """
-    self._CheckStorageFile(self._storage_file_path, warn_about_existing=True)
+    if self._resume and not os.path.isfile(self._storage_file_path):
+      raise errors.BadConfigOption(
+          'Unable to resume, no such storage file: {0:s}.'.format(
+              self._storage_file_path))
+
+    self._CheckStorageFile(
+        self._storage_file_path, warn_about_existing=not self._resume)
 
     scan_context = self.ScanSource(self._source_path)
     self._source_type = scan_context.source_type
@@ -392,13 +402,20 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
         preferred_year=self._preferred_year)
 
     storage_writer = storage_factory.StorageFactory.CreateStorageWriter(
-        self._storage_format, session, self._storage_file_path)
+        self._storage_format, session, self._storage_file_path,
+        compression_format=self._storage_compression_format,
+        serialization_format=self._storage_serializer_format,
+        task_compression_format=self._task_storage_compression_format)
     if not storage_writer:
       raise errors.BadConfigOption(
           'Unsupported storage format: {0:s}'.format(self._storage_format))
 
     single_process_mode = self._single_process_mode
     if self._source_type == dfvfs_definitions.SOURCE_TYPE_FILE:
+      if self._resume:
+        raise errors.BadConfigOption(
+            'Resume is not supported for a single file source.')
+
       # No need to multi process a single file source.
       single_process_mode = True
 
@@ -441,7 +458,7 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
           configuration, enable_sigsegv_handler=self._enable_sigsegv_handler,
           filter_find_specs=filter_find_specs,
           number_of_worker_processes=self._number_of_extraction_workers,
-          status_update_callback=status_update_callback,
+          resume=self._resume, status_update_callback=status_update_callback,
           worker_memory_limit=self._worker_memory_limit)
 
     self._status_view.PrintExtractionSummary(processing_status)
@@ -89,6 +89,7 @@ class PsortTool(
     self._event_filter = None
     self._knowledge_base = knowledge_base.KnowledgeBase()
     self._number_of_analysis_reports = 0
+    self._number_of_export_workers = 0
     self._preferred_language = 'en-US'
     self._process_memory_limit = None
     self._status_view_mode = self._DEFAULT_STATUS_VIEW_MODE
@@ -266,6 +267,14 @@ class PsortTool(
 
     self._worker_memory_limit = worker_memory_limit
 
+    number_of_export_workers = getattr(options, 'workers', 0) or 0
+
+    if number_of_export_workers < 0:
+      raise errors.BadConfigOption(
+          'Invalid number of workers value cannot be negative.')
+
+    self._number_of_export_workers = number_of_export_workers
+
   def _PrintAnalysisReportsDetails(self, storage_reader):
     """Prints the details of the analysis reports.
 
@@ -307,6 +316,13 @@ class PsortTool(
             'If a worker process exceeds this limit is is killed by the main '
             '(foreman) process.'))
 
+    argument_group.add_argument(
+        '--workers', dest='workers', action='store', type=int, default=0, help=(
+            'Number of worker processes used to read events and to format '
+            'events, for output modules that support it. The default is 0, '
+            'which represents reading and formatting events in the main '
+            'process.'))
+
   def ParseArguments(self):
     """Parses the command line arguments.
 
@@ -557,6 +573,7 @@ class PsortTool(
           self._knowledge_base, storage_reader, self._output_module,
           configuration, deduplicate_events=self._deduplicate_events,
           event_filter=self._event_filter,
+          number_of_worker_processes=self._number_of_export_workers,
           status_update_callback=status_update_callback,
           time_slice=self._time_slice, use_time_slicer=self._use_time_slicer)
 
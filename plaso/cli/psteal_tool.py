@@ -292,7 +292,10 @@ class PstealTool(
         preferred_year=self._preferred_year)
 
     storage_writer = storage_factory.StorageFactory.CreateStorageWriter(
-        self._storage_format, session, self._storage_file_path)
+        self._storage_format, session, self._storage_file_path,
+        compression_format=self._storage_compression_format,
+        serialization_format=self._storage_serializer_format,
+        task_compression_format=self._task_storage_compression_format)
     if not storage_writer:
       raise errors.BadConfigOption(
           'Unsupported storage format: {0:s}'.format(self._storage_format))
@@ -354,6 +354,23 @@ class StatusView(object):
       self._output_writer.Write('\n')
       table_view.Write(self._output_writer)
 
+    if processing_status and processing_status.merge_status:
+      merge_status = processing_status.merge_status
+
+      table_view = views.CLITabularTableView(
+          column_names=['Merge:', 'Backlog', 'Tasks', 'Events',
+                        'Events/s'],
+          column_sizes=[15, 7, 15, 15, 0])
+
+      table_view.AddRow([
+          '', merge_status.number_of_tasks_pending_merge,
+          merge_status.number_of_merged_tasks,
+          merge_status.number_of_merged_events,
+          merge_status.events_per_second])
+
+      self._output_writer.Write('\n')
+      table_view.Write(self._output_writer)
+
     self._output_writer.Write('\n')
 
   def PrintExtractionSummary(self, processing_status):
@@ -17,6 +17,8 @@ class EventSource(interface.AttributeContainer):
   Attributes:
     data_type (str): attribute container type indicator.
     file_entry_type (str): dfVFS file entry type.
+    file_size (int): size of the data of the file entry, in bytes, or None
+        if not known.
     path_spec (dfvfs.PathSpec): path specification.
   """
   CONTAINER_TYPE = 'event_source'
@@ -31,6 +33,7 @@ class EventSource(interface.AttributeContainer):
     super(EventSource, self).__init__()
     self.data_type = self.DATA_TYPE
     self.file_entry_type = None
+    self.file_size = None
     self.path_spec = path_spec
 
   # This method is necessary for heap sort.
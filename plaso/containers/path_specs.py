@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""Path specification attribute container definitions."""
+
+from __future__ import unicode_literals
+
+from plaso.containers import interface
+from plaso.containers import manager
+
+
+class PathSpecification(interface.AttributeContainer):
+  """Path specification attribute container.
+
+  The path specification attribute container is used by the storage to store
+  a path specification once and reference it from multiple event data.
+
+  Attributes:
+    path_spec (dfvfs.PathSpec): path specification.
+  """
+  CONTAINER_TYPE = 'path_spec'
+
+  def __init__(self, path_spec=None):
+    """Initializes a path specification attribute container.
+
+    Args:
+      path_spec (Optional[dfvfs.PathSpec]): path specification.
+    """
+    super(PathSpecification, self).__init__()
+    self.path_spec = path_spec
+
+
+manager.AttributeContainersManager.RegisterAttributeContainer(
+    PathSpecification)
@@ -31,6 +31,9 @@ class Task(interface.AttributeContainer):
     merge_priority (int): priority used for the task storage file merge, where
         a lower value indicates a higher priority to merge.
     path_spec (dfvfs.PathSpec): path specification.
+    path_specs (list[dfvfs.PathSpec]): path specifications of a batch of file
+        entries to process, or None if the task processes the path
+        specification in path_spec.
     session_identifier (str): the identifier of the session the task is part of.
     start_time (int): time that the task was started. Contains the number
         of micro seconds since January 1, 1970, 00:00:00 UTC.
@@ -54,6 +57,7 @@ class Task(interface.AttributeContainer):
     self.last_processing_time = None
     self.merge_priority = None
     self.path_spec = None
+    self.path_specs = None
     self.session_identifier = session_identifier
     self.start_time = int(time.time() * definitions.MICROSECONDS_PER_SECOND)
     self.storage_file_size = None
@@ -83,12 +87,27 @@ class Task(interface.AttributeContainer):
     retry_task.file_entry_type = self.file_entry_type
     retry_task.merge_priority = self.merge_priority
     retry_task.path_spec = self.path_spec
+    retry_task.path_specs = self.path_specs
     retry_task.storage_file_size = self.storage_file_size
 
     self.has_retry = True
 
     return retry_task
 
+  def CreateTaskCheckpoint(self):
+    """Creates a task checkpoint.
+
+    Returns:
+      TaskCheckpoint: task checkpoint attribute container.
+    """
+    task_checkpoint = TaskCheckpoint()
+    task_checkpoint.identifier = self.identifier
+    task_checkpoint.path_specs = self.GetPathSpecs()
+    task_checkpoint.session_identifier = self.session_identifier
+    task_checkpoint.timestamp = int(
+        time.time() * definitions.MICROSECONDS_PER_SECOND)
+    return task_checkpoint
+
   def CreateTaskCompletion(self):
     """Creates a task completion.
 
@@ -117,12 +136,59 @@ class Task(interface.AttributeContainer):
     task_start.timestamp = self.start_time
     return task_start
 
+  def GetPathSpecs(self):
+    """Retrieves the path specifications to process.
+
+    Returns:
+      list[dfvfs.PathSpec]: path specifications to process.
+    """
+    if self.path_specs:
+      return list(self.path_specs)
+
+    if self.path_spec:
+      return [self.path_spec]
+
+    return []
+
   def UpdateProcessingTime(self):
     """Updates the processing time to now."""
     self.last_processing_time = int(
         time.time() * definitions.MICROSECONDS_PER_SECOND)
 
 
+class TaskCheckpoint(interface.AttributeContainer):
+  """Task checkpoint attribute container.
+
+  A task checkpoint is written to the session storage when the results of
+  a task have been merged, so that an interrupted extraction can be resumed
+  without processing the path specifications of the task again.
+
+  Attributes:
+    identifier (str): unique identifier of the task.
+    path_specs (list[dfvfs.PathSpec]): path specifications processed by
+        the task.
+    session_identifier (str): the identifier of the session the task
+        is part of.
+    timestamp (int): time that the results of the task were merged. Contains
+        the number of micro seconds since January 1, 1970, 00:00:00 UTC.
+  """
+  CONTAINER_TYPE = 'task_checkpoint'
+
+  def __init__(self, identifier=None, session_identifier=None):
+    """Initializes a task checkpoint attribute container.
+
+    Args:
+      identifier (Optional[str]): unique identifier of the task.
+      session_identifier (Optional[str]): identifier of the session the task
+          is part of.
+    """
+    super(TaskCheckpoint, self).__init__()
+    self.identifier = identifier
+    self.path_specs = None
+    self.session_identifier = session_identifier
+    self.timestamp = None
+
+
 class TaskCompletion(interface.AttributeContainer):
   """Task completion attribute container.
 
@@ -182,4 +248,4 @@ class TaskStart(interface.AttributeContainer):
 
 
 manager.AttributeContainersManager.RegisterAttributeContainers([
-    Task, TaskCompletion, TaskStart])
+    Task, TaskCheckpoint, TaskCompletion, TaskStart])
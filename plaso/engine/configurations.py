@@ -56,6 +56,9 @@ class ExtractionConfiguration(interface.AttributeContainer):
   These settings are primarily used by the extraction worker.
 
   Attributes:
+    block_cache_size (int): maximum size of the data of data streams that
+        the extraction worker caches in bytes, where 0 represents the cache
+        is disabled and None the default size.
     hasher_file_size_limit (int): maximum file size that hashers
         should process, where 0 or None represents unlimited.
     hasher_names_string (str): comma separated string of names
@@ -71,6 +74,7 @@ class ExtractionConfiguration(interface.AttributeContainer):
   def __init__(self):
     """Initializes an extraction configuration object."""
     super(ExtractionConfiguration, self).__init__()
+    self.block_cache_size = None
     self.hasher_file_size_limit = None
     self.hasher_names_string = None
     self.process_archives = False
@@ -105,7 +109,8 @@ class ProfilingConfiguration(interface.AttributeContainer):
         * 'memory', which profiles memory usage;
         * 'parsers', which profiles CPU time consumed by individual parsers;
         * 'processing', which profiles CPU time consumed by different parts of
-          processing;
+          processing and the processing costs per file entry, which are used
+          by the task scheduler of subsequent sessions;
         * 'serializers', which profiles CPU time consumed by individual
           serializers.
         * 'storage', which profiles storage reads and writes.
@@ -20,6 +20,7 @@ from plaso.engine import logger
 from plaso.lib import errors
 from plaso.parsers import interface as parsers_interface
 from plaso.parsers import manager as parsers_manager
+from plaso.parsers import text_classifier
 
 
 class EventExtractor(object):
@@ -56,6 +57,7 @@ class EventExtractor(object):
     self._non_sigscan_parser_names = None
     self._parsers = None
     self._parsers_profiler = None
+    self._text_format_classifier = None
     self._usnjrnl_parser = None
 
     self._InitializeParserObjects(
@@ -77,6 +79,28 @@ class EventExtractor(object):
 
     return False
 
+  def _GetNonSigScanParserNames(self, parser_mediator, file_object):
+    """Determines the parsers without a signature that can parse a file.
+
+    The text parsers are only included if the text format classifier
+    determines they can plausibly parse the file.
+
+    Args:
+      parser_mediator (ParserMediator): parser mediator.
+      file_object (file): file-like object to classify.
+
+    Returns:
+      list[str]: names of parsers without a signature that can parse
+          the file-like object.
+    """
+    text_parser_names = self._text_format_classifier.Classify(
+        file_object, parser_mediator.codepage)
+
+    return [
+        parser_name for parser_name in self._non_sigscan_parser_names
+        if parser_name in text_parser_names or
+        parser_name not in self._text_format_classifier.parser_names]
+
   def _GetSignatureMatchParserNames(self, file_object):
     """Determines if a file-like object matches one of the known signatures.
 
@@ -146,6 +170,41 @@ class EventExtractor(object):
     if 'usnjrnl' in self._parsers:
       del self._parsers['usnjrnl']
 
+    non_sigscan_parsers = {
+        parser_name: self._parsers[parser_name]
+        for parser_name in self._non_sigscan_parser_names
+        if parser_name in self._parsers}
+    self._text_format_classifier = text_classifier.TextFormatClassifier(
+        non_sigscan_parsers)
+
+  def _ParseDataStreamFileObject(
+      self, parser_mediator, file_entry, file_object):
+    """Parses a file-like object of a data stream with the enabled parsers.
+
+    Args:
+      parser_mediator (ParserMediator): parser mediator.
+      file_entry (dfvfs.FileEntry): file entry.
+      file_object (file): file-like object of the data stream.
+
+    Raises:
+      RuntimeError: if the parser object is missing.
+    """
+    parser_names = self._GetSignatureMatchParserNames(file_object)
+
+    parse_with_non_sigscan_parsers = True
+    if parser_names:
+      parse_result = self._ParseFileEntryWithParsers(
+          parser_mediator, parser_names, file_entry, file_object=file_object)
+      if parse_result in (
+          self._PARSE_RESULT_FAILURE, self._PARSE_RESULT_SUCCESS):
+        parse_with_non_sigscan_parsers = False
+
+    if parse_with_non_sigscan_parsers:
+      parser_names = self._GetNonSigScanParserNames(
+          parser_mediator, file_object)
+      self._ParseFileEntryWithParsers(
+          parser_mediator, parser_names, file_entry, file_object=file_object)
+
   def _ParseDataStreamWithParser(
       self, parser_mediator, parser, file_entry, data_stream_name):
     """Parses a data stream of a file entry with a specific parser.
@@ -289,37 +348,34 @@ class EventExtractor(object):
 
     return parse_results
 
-  def ParseDataStream(self, parser_mediator, file_entry, data_stream_name):
+  def ParseDataStream(
+      self, parser_mediator, file_entry, data_stream_name, file_object=None):
     """Parses a data stream of a file entry with the enabled parsers.
 
     Args:
       parser_mediator (ParserMediator): parser mediator.
       file_entry (dfvfs.FileEntry): file entry.
       data_stream_name (str): data stream name.
+      file_object (Optional[file]): file-like object of the data stream,
+          which remains open after parsing. If not set the data stream will
+          be opened and closed by the event extractor.
 
     Raises:
       RuntimeError: if the file-like object or the parser object is missing.
     """
+    if file_object:
+      self._ParseDataStreamFileObject(
+          parser_mediator, file_entry, file_object)
+      return
+
     file_object = file_entry.GetFileObject(data_stream_name=data_stream_name)
     if not file_object:
       raise RuntimeError(
           'Unable to retrieve file-like object from file entry.')
 
     try:
-      parser_names = self._GetSignatureMatchParserNames(file_object)
-
-      parse_with_non_sigscan_parsers = True
-      if parser_names:
-        parse_result = self._ParseFileEntryWithParsers(
-            parser_mediator, parser_names, file_entry, file_object=file_object)
-        if parse_result in (
-            self._PARSE_RESULT_FAILURE, self._PARSE_RESULT_SUCCESS):
-          parse_with_non_sigscan_parsers = False
-
-      if parse_with_non_sigscan_parsers:
-        self._ParseFileEntryWithParsers(
-            parser_mediator, self._non_sigscan_parser_names, file_entry,
-            file_object=file_object)
+      self._ParseDataStreamFileObject(
+          parser_mediator, file_entry, file_object)
 
     finally:
       file_object.close()
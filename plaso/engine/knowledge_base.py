@@ -194,6 +194,21 @@ class KnowledgeBase(object):
 
     return system_configuration
 
+  def GetSystemConfigurationArtifacts(self):
+    """Retrieves the knowledge base as system configuration artifacts.
+
+    Returns:
+      dict[str, SystemConfigurationArtifact]: system configuration artifacts
+          per session identifier.
+    """
+    session_identifiers = set(self._hostnames.keys())
+    session_identifiers.update(self._user_accounts.keys())
+
+    return {
+        session_identifier: self.GetSystemConfigurationArtifact(
+            session_identifier=session_identifier)
+        for session_identifier in session_identifiers}
+
   def GetUsernameByIdentifier(
       self, user_identifier, session_identifier=CURRENT_SESSION):
     """Retrieves the username based on an user identifier.
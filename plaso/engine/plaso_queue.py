@@ -37,6 +37,19 @@ class Queue(object):
       QueueFull: if the queue is full, and the item could not be added.
     """
 
+  def PushItems(self, items, block=True):
+    """Pushes items onto the queue.
+
+    Args:
+      items (list[object]): items to add.
+      block (bool): whether to block if the queue is full.
+
+    Raises:
+      QueueFull: if the queue is full, and the items could not be added.
+    """
+    for item in items:
+      self.PushItem(item, block=block)
+
   @abc.abstractmethod
   def PopItem(self):
     """Pops an item off the queue.
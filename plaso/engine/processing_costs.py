@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""The processing cost model."""
+
+from __future__ import unicode_literals
+
+import codecs
+import glob
+import gzip
+import os
+
+from plaso.engine import logger
+
+
+class ProcessingCostModel(object):
+  """Model of the cost of processing file entries.
+
+  The cost of processing a file entry is estimated from the size of its data
+  and its format. Since the format of a file entry is not known before it is
+  processed, it is approximated by the extension of the name of the file
+  entry, or the name itself if it has no extension.
+
+  The costs per format are learned from processing costs samples, such as
+  the sample files written by the processing costs profiler of previous
+  sessions. Formats without samples are estimated using a default throughput.
+  """
+
+  # Default cost of processing a byte of data, in seconds, which corresponds
+  # with a throughput of 10 MiB per second.
+  _DEFAULT_COST_PER_BYTE = 1.0 / (10 * 1024 * 1024)
+
+  # Cost of processing a file entry regardless of the size of its data,
+  # in seconds.
+  _COST_PER_FILE_ENTRY = 0.001
+
+  # Glob pattern of the names of processing costs sample files.
+  _SAMPLE_FILENAME_PATTERN = 'processing_costs-*.csv.gz'
+
+  def __init__(self):
+    """Initializes a processing cost model."""
+    super(ProcessingCostModel, self).__init__()
+    # The samples per format identifier, which are stored as a list of
+    # the total data size, the total processing time and the number of
+    # samples.
+    self._samples = {}
+
+  @property
+  def number_of_formats(self):
+    """int: number of formats for which samples were added."""
+    return len(self._samples)
+
+  def AddSample(self, format_identifier, data_size, processing_time):
+    """Adds a processing costs sample.
+
+    Args:
+      format_identifier (str): identifier of the format of the file entry.
+      data_size (int): size of the data of the file entry, in bytes.
+      processing_time (float): time consumed processing the file entry,
+          in seconds.
+    """
+    samples = self._samples.setdefault(format_identifier, [0, 0.0, 0])
+    samples[0] += data_size
+    samples[1] += processing_time
+    samples[2] += 1
+
+  def EstimateCost(self, format_identifier, data_size):
+    """Estimates the cost of processing a file entry.
+
+    Args:
+      format_identifier (str): identifier of the format of the file entry.
+      data_size (int): size of the data of the file entry, in bytes, or None
+          if not known.
+
+    Returns:
+      float: estimated time needed to process the file entry, in seconds.
+    """
+    data_size = data_size or 0
+
+    samples = self._samples.get(format_identifier, None)
+    if not samples:
+      return self._COST_PER_FILE_ENTRY + (
+          data_size * self._DEFAULT_COST_PER_BYTE)
+
+    total_data_size, total_processing_time, number_of_samples = samples
+    if not total_data_size:
+      return total_processing_time / number_of_samples
+
+    return self._COST_PER_FILE_ENTRY + (
+        data_size * total_processing_time / total_data_size)
+
+  @classmethod
+  def GetFormatIdentifier(cls, path_spec):
+    """Determines the format identifier of a file entry.
+
+    Args:
+      path_spec (dfvfs.PathSpec): path specification of the file entry.
+
+    Returns:
+      str: identifier of the format of the file entry, which is the lower
+          case extension of its name, such as ".evtx", the lower case name
+          if it has no extension or an empty string if the path specification
+          has no location.
+    """
+    location = getattr(path_spec, 'location', None)
+    if not location:
+      return ''
+
+    name = location.replace('\\', '/').rsplit('/', 1)[-1]
+    _, extension = os.path.splitext(name)
+    return (extension or name).lower()
+
+  def ReadSampleFiles(self, path):
+    """Reads processing costs samples from sample files.
+
+    Args:
+      path (str): path of the directory that contains the sample files.
+
+    Returns:
+      int: number of samples read.
+    """
+    number_of_samples = 0
+
+    glob_pattern = os.path.join(path, self._SAMPLE_FILENAME_PATTERN)
+    for sample_file_path in sorted(glob.glob(glob_pattern)):
+      try:
+        with gzip.open(sample_file_path, 'rb') as sample_file:
+          # Skip the header.
+          sample_file.readline()
+
+          for line in sample_file:
+            line = codecs.decode(line, 'utf-8')
+            values = line.rstrip('\n').split('\t')
+            if len(values) != 4:
+              continue
+
+            try:
+              data_size = int(values[2], 10)
+              processing_time = float(values[3])
+            except ValueError:
+              continue
+
+            self.AddSample(values[1], data_size, processing_time)
+            number_of_samples += 1
+
+      except (IOError, EOFError, UnicodeDecodeError) as exception:
+        logger.warning((
+            'Unable to read processing costs sample file: {0:s} with error: '
+            '{1!s}').format(sample_file_path, exception))
+
+    return number_of_samples
@@ -306,6 +306,34 @@ class ProcessStatus(object):
     return consumed_event_tags_delta > 0 or produced_event_tags_delta > 0
 
 
+class MergeStatus(object):
+  """The status of merging task storage into the session storage.
+
+  Attributes:
+    merge_time (float): time spent merging, in seconds.
+    number_of_merged_events (int): number of events merged.
+    number_of_merged_tasks (int): number of tasks merged.
+    number_of_tasks_pending_merge (int): number of tasks pending merge, which
+        is the merge backlog.
+  """
+
+  def __init__(self):
+    """Initializes a merge status."""
+    super(MergeStatus, self).__init__()
+    self.merge_time = 0.0
+    self.number_of_merged_events = 0
+    self.number_of_merged_tasks = 0
+    self.number_of_tasks_pending_merge = 0
+
+  @property
+  def events_per_second(self):
+    """int: number of events merged per second spent merging."""
+    if not self.merge_time:
+      return 0
+
+    return int(self.number_of_merged_events / self.merge_time)
+
+
 class ProcessingStatus(object):
   """The status of the overall extraction process (processing).
 
@@ -314,6 +342,7 @@ class ProcessingStatus(object):
     error_path_specs (list[dfvfs.PathSpec]): path specifications that
         caused critical errors during processing.
     foreman_status (ProcessingStatus): foreman processing status.
+    merge_status (MergeStatus): status information about merging.
     start_time (float): time that the processing was started. Contains the
         number of micro seconds since January 1, 1970, 00:00:00 UTC.
     tasks_status (TasksStatus): status information about tasks.
@@ -327,6 +356,7 @@ class ProcessingStatus(object):
     self.aborted = False
     self.error_path_specs = []
     self.foreman_status = None
+    self.merge_status = None
     self.start_time = time.time()
     self.tasks_status = None
 
@@ -449,6 +479,14 @@ class ProcessingStatus(object):
         number_of_consumed_errors, number_of_produced_errors,
         number_of_consumed_reports, number_of_produced_reports)
 
+  def UpdateMergeStatus(self, merge_status):
+    """Updates the merge status.
+
+    Args:
+      merge_status (MergeStatus): status information about merging.
+    """
+    self.merge_status = merge_status
+
   def UpdateTasksStatus(self, tasks_status):
     """Updates the tasks status.
 
@@ -17,11 +17,18 @@ except ImportError:
 class CPUTimeMeasurement(object):
   """The CPU time measurement.
 
+  A measurement can consist of multiple intervals, where the CPU time of
+  an interval is added to the total CPU time when the measurement is stopped
+  and SampleResume starts measuring the next interval.
+
   Attributes:
     start_sample_time (float): start sample time or None if not set.
     total_cpu_time (float): total CPU time or None if not set.
   """
 
+  # time.clock() was removed in Python 3.8 in favor of time.process_time().
+  _GetCPUTime = staticmethod(getattr(time, 'process_time', None) or time.clock)
+
   def __init__(self):
     """Initializes the CPU time measurement."""
     super(CPUTimeMeasurement, self).__init__()
@@ -29,16 +36,25 @@ class CPUTimeMeasurement(object):
     self.start_sample_time = None
     self.total_cpu_time = None
 
+  def SampleResume(self):
+    """Resumes measuring the CPU time without resetting the total CPU time."""
+    if self.total_cpu_time is None:
+      self.start_sample_time = time.time()
+      self.total_cpu_time = 0
+
+    self._start_cpu_time = self._GetCPUTime()
+
   def SampleStart(self):
     """Starts measuring the CPU time."""
-    self._start_cpu_time = time.clock()
+    self._start_cpu_time = self._GetCPUTime()
     self.start_sample_time = time.time()
     self.total_cpu_time = 0
 
   def SampleStop(self):
     """Stops measuring the CPU time."""
     if self._start_cpu_time is not None:
-      self.total_cpu_time += time.clock() - self._start_cpu_time
+      self.total_cpu_time += self._GetCPUTime() - self._start_cpu_time
+      self._start_cpu_time = None
 
 
 class SampleFileProfiler(object):
@@ -111,6 +127,34 @@ class CPUTimeProfiler(SampleFileProfiler):
 
   _FILE_HEADER = 'Time\tName\tProcessing time\n'
 
+  def PauseTiming(self, profile_name):
+    """Pauses timing CPU time.
+
+    The CPU time consumed until the timing is paused is kept, but no sample is
+    written until the timing is stopped.
+
+    Args:
+      profile_name (str): name of the profile to sample.
+    """
+    measurements = self._profile_measurements.get(profile_name)
+    if measurements:
+      measurements.SampleStop()
+
+  def ResumeTiming(self, profile_name):
+    """Resumes timing CPU time.
+
+    The CPU time consumed until the timing is paused again or stopped is added
+    to that of the sample. If the timing was not started, a new sample is
+    started.
+
+    Args:
+      profile_name (str): name of the profile to sample.
+    """
+    if profile_name not in self._profile_measurements:
+      self._profile_measurements[profile_name] = CPUTimeMeasurement()
+
+    self._profile_measurements[profile_name].SampleResume()
+
   def StartTiming(self, profile_name):
     """Starts timing CPU time.
 
@@ -128,7 +172,7 @@ class CPUTimeProfiler(SampleFileProfiler):
     Args:
       profile_name (str): name of the profile to sample.
     """
-    measurements = self._profile_measurements.get(profile_name)
+    measurements = self._profile_measurements.pop(profile_name, None)
     if measurements:
       measurements.SampleStop()
 
@@ -218,10 +262,86 @@ class MemoryProfiler(SampleFileProfiler):
 
 
 class ProcessingProfiler(CPUTimeProfiler):
-  """The processing profiler."""
+  """The processing profiler.
+
+  Besides the CPU time consumed by different parts of processing, the
+  processing profiler samples the number of cache hits and misses in
+  a separate sample file.
+  """
 
   _FILENAME_PREFIX = 'processing'
 
+  _CACHES_FILENAME_PREFIX = 'processing_caches'
+
+  _CACHES_FILE_HEADER = 'Time\tName\tHits\tMisses\n'
+
+  def __init__(self, identifier, configuration):
+    """Initializes a processing profiler.
+
+    Args:
+      identifier (str): identifier of the profiling session used to create
+          the sample filename.
+      configuration (ProfilingConfiguration): profiling configuration.
+    """
+    super(ProcessingProfiler, self).__init__(identifier, configuration)
+    self._caches_sample_file = None
+
+  def SampleCache(self, cache_name, number_of_hits, number_of_misses):
+    """Takes a sample of the number of hits and misses of a cache.
+
+    Args:
+      cache_name (str): name of the cache.
+      number_of_hits (int): number of lookups that were found in the cache
+          since the previous sample.
+      number_of_misses (int): number of lookups that were not found in
+          the cache since the previous sample.
+    """
+    sample_time = time.time()
+    sample = '{0:f}\t{1:s}\t{2:d}\t{3:d}\n'.format(
+        sample_time, cache_name, number_of_hits, number_of_misses)
+    self._caches_sample_file.write(codecs.encode(sample, 'utf-8'))
+
+  def Start(self):
+    """Starts the profiler."""
+    super(ProcessingProfiler, self).Start()
+
+    filename = '{0:s}-{1:s}.csv.gz'.format(
+        self._CACHES_FILENAME_PREFIX, self._identifier)
+    if self._path:
+      filename = os.path.join(self._path, filename)
+
+    self._caches_sample_file = gzip.open(filename, 'wb')
+    self._caches_sample_file.write(
+        codecs.encode(self._CACHES_FILE_HEADER, 'utf-8'))
+
+  def Stop(self):
+    """Stops the profiler."""
+    super(ProcessingProfiler, self).Stop()
+
+    self._caches_sample_file.close()
+    self._caches_sample_file = None
+
+
+class ProcessingCostsProfiler(SampleFileProfiler):
+  """The processing costs profiler."""
+
+  _FILENAME_PREFIX = 'processing_costs'
+
+  _FILE_HEADER = 'Time\tFormat\tData size\tProcessing time\n'
+
+  def Sample(self, format_identifier, data_size, processing_time):
+    """Takes a sample of the cost of processing a file entry for profiling.
+
+    Args:
+      format_identifier (str): identifier of the format of the file entry.
+      data_size (int): size of the data of the file entry, in bytes.
+      processing_time (float): CPU time consumed processing the file entry.
+    """
+    sample_time = time.time()
+    sample = '{0:f}\t{1:s}\t{2:d}\t{3:f}\n'.format(
+        sample_time, format_identifier, data_size, processing_time)
+    self._WritesString(sample)
+
 
 class SerializersProfiler(CPUTimeProfiler):
   """The serializers profiler."""
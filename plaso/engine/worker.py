@@ -19,6 +19,9 @@ from plaso.analyzers import manager as analyzers_manager
 from plaso.containers import event_sources
 from plaso.engine import extractors
 from plaso.engine import logger
+from plaso.engine import processing_costs
+from plaso.engine import profilers
+from plaso.lib import block_cache_file
 from plaso.lib import definitions
 from plaso.lib import errors
 
@@ -74,6 +77,14 @@ class EventExtractionWorker(object):
   _TYPES_WITH_ROOT_METADATA = frozenset([
       dfvfs_definitions.TYPE_INDICATOR_GZIP])
 
+  # The block size, default maximum cached size and maximum read-ahead size
+  # of the block cache that is used to share the data of data streams between
+  # the analyzers, the signature scanner and the parsers. The block cache is
+  # shared by all data streams processed by the worker.
+  _BLOCK_CACHE_BLOCK_SIZE = 64 * 1024
+  _BLOCK_CACHE_DEFAULT_SIZE = 32 * 1024 * 1024
+  _BLOCK_CACHE_MAXIMUM_READ_AHEAD_SIZE = 1024 * 1024
+
   def __init__(self, parser_filter_expression=None):
     """Initializes an event extraction worker.
 
@@ -93,18 +104,25 @@ class EventExtractionWorker(object):
     super(EventExtractionWorker, self).__init__()
     self._abort = False
     self._analyzers = []
+    self._block_cache = block_cache_file.BlockCache(
+        block_size=self._BLOCK_CACHE_BLOCK_SIZE,
+        maximum_cached_size=self._BLOCK_CACHE_DEFAULT_SIZE)
+    self._block_cache_number_of_hits = 0
+    self._block_cache_number_of_misses = 0
     self._event_extractor = extractors.EventExtractor(
         parser_filter_expression=parser_filter_expression)
     self._hasher_file_size_limit = None
     self._path_spec_extractor = extractors.PathSpecExtractor()
     self._process_archives = None
     self._process_compressed_streams = None
+    self._processing_costs_profiler = None
     self._processing_profiler = None
 
     self.last_activity_timestamp = 0.0
     self.processing_status = definitions.PROCESSING_STATUS_IDLE
 
-  def _AnalyzeDataStream(self, mediator, file_entry, data_stream_name):
+  def _AnalyzeDataStream(
+      self, mediator, file_entry, data_stream_name, file_object=None):
     """Analyzes the contents of a specific data stream of a file entry.
 
     The results of the analyzers are set in the parser mediator as attributes
@@ -117,6 +135,9 @@ class EventExtractionWorker(object):
       file_entry (dfvfs.FileEntry): file entry whose data stream is to be
           analyzed.
       data_stream_name (str): name of the data stream.
+      file_object (Optional[file]): file-like object of the data stream,
+          which remains open after analysis. If not set the data stream will
+          be opened and closed by the worker.
 
     Raises:
       RuntimeError: if the file-like object cannot be retrieved from
@@ -130,16 +151,21 @@ class EventExtractionWorker(object):
       self._processing_profiler.StartTiming('analyzing')
 
     try:
-      file_object = file_entry.GetFileObject(data_stream_name=data_stream_name)
-      if not file_object:
-        raise RuntimeError((
-            'Unable to retrieve file-like object for file entry: '
-            '{0:s}.').format(display_name))
-
-      try:
+      if file_object:
         self._AnalyzeFileObject(mediator, file_object)
-      finally:
-        file_object.close()
+
+      else:
+        file_object = file_entry.GetFileObject(
+            data_stream_name=data_stream_name)
+        if not file_object:
+          raise RuntimeError((
+              'Unable to retrieve file-like object for file entry: '
+              '{0:s}.').format(display_name))
+
+        try:
+          self._AnalyzeFileObject(mediator, file_object)
+        finally:
+          file_object.close()
 
     finally:
       if self._processing_profiler:
@@ -310,7 +336,7 @@ class EventExtractionWorker(object):
     return False
 
   def _ExtractContentFromDataStream(
-      self, mediator, file_entry, data_stream_name):
+      self, mediator, file_entry, data_stream_name, file_object=None):
     """Extracts content from a data stream.
 
     Args:
@@ -319,6 +345,9 @@ class EventExtractionWorker(object):
       file_entry (dfvfs.FileEntry): file entry to extract its content.
       data_stream_name (str): name of the data stream whose content is to be
           extracted.
+      file_object (Optional[file]): file-like object of the data stream,
+          which remains open after extraction. If not set the data stream
+          will be opened and closed by the event extractor.
     """
     self.processing_status = definitions.PROCESSING_STATUS_EXTRACTING
 
@@ -326,7 +355,7 @@ class EventExtractionWorker(object):
       self._processing_profiler.StartTiming('extracting')
 
     self._event_extractor.ParseDataStream(
-        mediator, file_entry, data_stream_name)
+        mediator, file_entry, data_stream_name, file_object=file_object)
 
     if self._processing_profiler:
       self._processing_profiler.StopTiming('extracting')
@@ -437,6 +466,32 @@ class EventExtractionWorker(object):
 
     return False
 
+  def _OpenDataStream(self, file_entry, data_stream_name):
+    """Opens a data stream of a file entry with the block cache.
+
+    The cached blocks of the data stream are identified by the path
+    specification of the file entry, which includes the path specifications
+    of the image and volume the file entry is stored in, and the data stream
+    name.
+
+    Args:
+      file_entry (dfvfs.FileEntry): file entry containing the data stream.
+      data_stream_name (str): name of the data stream.
+
+    Returns:
+      file: file-like object of the data stream or None if the data stream
+          could not be opened. The file-like object is a BlockCacheFileObject
+          unless the block cache is disabled.
+    """
+    file_object = file_entry.GetFileObject(data_stream_name=data_stream_name)
+    if not file_object or not self._block_cache:
+      return file_object
+
+    identifier = (file_entry.path_spec.comparable, data_stream_name)
+    return block_cache_file.BlockCacheFileObject(
+        file_object, block_cache=self._block_cache, identifier=identifier,
+        maximum_read_ahead_size=self._BLOCK_CACHE_MAXIMUM_READ_AHEAD_SIZE)
+
   def _ProcessArchiveTypes(self, mediator, path_spec, type_indicators):
     """Processes a data stream containing archive types such as: TAR or ZIP.
 
@@ -596,6 +651,7 @@ class EventExtractionWorker(object):
       stat_object = sub_file_entry.GetStat()
       if stat_object:
         event_source.file_entry_type = stat_object.type
+        event_source.file_size = getattr(stat_object, 'size', None)
 
       mediator.ProduceEventSource(event_source)
 
@@ -665,6 +721,9 @@ class EventExtractionWorker(object):
   def _ProcessFileEntryDataStream(self, mediator, file_entry, data_stream):
     """Processes a specific data stream of a file entry.
 
+    The data stream is opened once and its data is cached, so that it is
+    read only once by the analyzers, the signature scanner and the parsers.
+
     Args:
       mediator (ParserMediator): mediates the interactions between
           parsers and other components, such as storage and abort signals.
@@ -680,57 +739,73 @@ class EventExtractionWorker(object):
 
     mediator.ClearEventAttributes()
 
-    if data_stream and self._analyzers:
-      # Since AnalyzeDataStream generates event attributes it needs to be
-      # called before producing events.
-      self._AnalyzeDataStream(mediator, file_entry, data_stream.name)
+    file_object = None
+    try:
+      if data_stream and self._analyzers:
+        file_object = self._OpenDataStream(file_entry, data_stream.name)
 
-    self._ExtractMetadataFromFileEntry(mediator, file_entry, data_stream)
+        # Since AnalyzeDataStream generates event attributes it needs to be
+        # called before producing events.
+        self._AnalyzeDataStream(
+            mediator, file_entry, data_stream.name, file_object=file_object)
 
-    # Not every file entry has a data stream. In such cases we want to
-    # extract the metadata only.
-    if not data_stream:
-      return
+      self._ExtractMetadataFromFileEntry(mediator, file_entry, data_stream)
 
-    # Determine if the content of the file entry should not be extracted.
-    skip_content_extraction = self._CanSkipContentExtraction(file_entry)
-    if skip_content_extraction:
-      display_name = mediator.GetDisplayName()
-      logger.debug(
-          'Skipping content extraction of: {0:s}'.format(display_name))
-      self.processing_status = definitions.PROCESSING_STATUS_IDLE
-      return
+      # Not every file entry has a data stream. In such cases we want to
+      # extract the metadata only.
+      if not data_stream:
+        return
 
-    path_spec = copy.deepcopy(file_entry.path_spec)
-    if data_stream and not data_stream.IsDefault():
-      path_spec.data_stream = data_stream.name
+      # Determine if the content of the file entry should not be extracted.
+      skip_content_extraction = self._CanSkipContentExtraction(file_entry)
+      if skip_content_extraction:
+        display_name = mediator.GetDisplayName()
+        logger.debug(
+            'Skipping content extraction of: {0:s}'.format(display_name))
+        self.processing_status = definitions.PROCESSING_STATUS_IDLE
+        return
+
+      path_spec = copy.deepcopy(file_entry.path_spec)
+      if data_stream and not data_stream.IsDefault():
+        path_spec.data_stream = data_stream.name
 
-    archive_types = []
-    compressed_stream_types = []
+      archive_types = []
+      compressed_stream_types = []
 
-    if self._process_compressed_streams:
-      compressed_stream_types = self._GetCompressedStreamTypes(
-          mediator, path_spec)
+      if self._process_compressed_streams:
+        compressed_stream_types = self._GetCompressedStreamTypes(
+            mediator, path_spec)
 
-    if not compressed_stream_types:
-      archive_types = self._GetArchiveTypes(mediator, path_spec)
+      if not compressed_stream_types:
+        archive_types = self._GetArchiveTypes(mediator, path_spec)
 
-    if archive_types:
-      if self._process_archives:
-        self._ProcessArchiveTypes(mediator, path_spec, archive_types)
+      if archive_types:
+        if self._process_archives:
+          self._ProcessArchiveTypes(mediator, path_spec, archive_types)
 
-      if dfvfs_definitions.TYPE_INDICATOR_ZIP in archive_types:
         # ZIP files are the base of certain file formats like docx.
-        self._ExtractContentFromDataStream(
-            mediator, file_entry, data_stream.name)
+        extract_content = (
+            dfvfs_definitions.TYPE_INDICATOR_ZIP in archive_types)
 
-    elif compressed_stream_types:
-      self._ProcessCompressedStreamTypes(
-          mediator, path_spec, compressed_stream_types)
+      elif compressed_stream_types:
+        self._ProcessCompressedStreamTypes(
+            mediator, path_spec, compressed_stream_types)
 
-    else:
-      self._ExtractContentFromDataStream(
-          mediator, file_entry, data_stream.name)
+        extract_content = False
+
+      else:
+        extract_content = True
+
+      if extract_content:
+        if not file_object:
+          file_object = self._OpenDataStream(file_entry, data_stream.name)
+
+        self._ExtractContentFromDataStream(
+            mediator, file_entry, data_stream.name, file_object=file_object)
+
+    finally:
+      if file_object:
+        file_object.close()
 
   def _ProcessMetadataFile(self, mediator, file_entry):
     """Processes a metadata file.
@@ -751,6 +826,39 @@ class EventExtractionWorker(object):
       self._event_extractor.ParseMetadataFile(
           mediator, file_entry, data_stream.name)
 
+  def _SampleBlockCache(self):
+    """Takes a sample of the block cache hits and misses for profiling."""
+    if not self._block_cache:
+      return
+
+    number_of_hits = self._block_cache.number_of_hits
+    number_of_misses = self._block_cache.number_of_misses
+
+    self._processing_profiler.SampleCache(
+        'block_cache', number_of_hits - self._block_cache_number_of_hits,
+        number_of_misses - self._block_cache_number_of_misses)
+
+    self._block_cache_number_of_hits = number_of_hits
+    self._block_cache_number_of_misses = number_of_misses
+
+  def _SampleProcessingCosts(self, file_entry, cpu_time_measurement):
+    """Takes a sample of the cost of processing a file entry.
+
+    Args:
+      file_entry (dfvfs.FileEntry): file entry.
+      cpu_time_measurement (CPUTimeMeasurement): CPU time consumed processing
+          the file entry.
+    """
+    format_identifier = (
+        processing_costs.ProcessingCostModel.GetFormatIdentifier(
+            file_entry.path_spec))
+
+    stat_object = file_entry.GetStat()
+    data_size = getattr(stat_object, 'size', None) or 0
+
+    self._processing_costs_profiler.Sample(
+        format_identifier, data_size, cpu_time_measurement.total_cpu_time)
+
   def _SetHashers(self, hasher_names_string):
     """Sets the hasher names.
 
@@ -812,6 +920,11 @@ class EventExtractionWorker(object):
 
     mediator.SetFileEntry(file_entry)
 
+    cpu_time_measurement = None
+    if self._processing_costs_profiler and not file_entry.IsDirectory():
+      cpu_time_measurement = profilers.CPUTimeMeasurement()
+      cpu_time_measurement.SampleStart()
+
     try:
       if file_entry.IsDirectory():
         self._ProcessDirectory(mediator, file_entry)
@@ -820,6 +933,13 @@ class EventExtractionWorker(object):
     finally:
       mediator.ResetFileEntry()
 
+      if cpu_time_measurement:
+        cpu_time_measurement.SampleStop()
+        self._SampleProcessingCosts(file_entry, cpu_time_measurement)
+
+      if self._processing_profiler:
+        self._SampleBlockCache()
+
       self.last_activity_timestamp = time.time()
       self.processing_status = definitions.PROCESSING_STATUS_IDLE
 
@@ -830,12 +950,33 @@ class EventExtractionWorker(object):
     Args:
       configuration (ExtractionConfiguration): extraction configuration.
     """
+    if configuration.block_cache_size == 0:
+      self._block_cache = None
+      self._block_cache_number_of_hits = 0
+      self._block_cache_number_of_misses = 0
+
+    elif configuration.block_cache_size is not None:
+      self._block_cache = block_cache_file.BlockCache(
+          block_size=self._BLOCK_CACHE_BLOCK_SIZE,
+          maximum_cached_size=configuration.block_cache_size)
+      self._block_cache_number_of_hits = 0
+      self._block_cache_number_of_misses = 0
+
     self._hasher_file_size_limit = configuration.hasher_file_size_limit
     self._SetHashers(configuration.hasher_names_string)
     self._process_archives = configuration.process_archives
     self._process_compressed_streams = configuration.process_compressed_streams
     self._SetYaraRules(configuration.yara_rules_string)
 
+  def SetProcessingCostsProfiler(self, processing_costs_profiler):
+    """Sets the processing costs profiler.
+
+    Args:
+      processing_costs_profiler (ProcessingCostsProfiler): processing costs
+          profiler.
+    """
+    self._processing_costs_profiler = processing_costs_profiler
+
   def SetProcessingProfiler(self, processing_profiler):
     """Sets the parsers profiler.
 
@@ -4,7 +4,9 @@
 from __future__ import unicode_literals
 
 import abc
+import collections
 import errno
+import pickle
 import threading
 import time
 
@@ -19,6 +21,7 @@ import zmq
 from plaso.engine import logger
 from plaso.engine import plaso_queue
 from plaso.lib import errors
+from plaso.lib import py2to3
 
 
 # pylint: disable=no-member
@@ -26,6 +29,13 @@ from plaso.lib import errors
 class ZeroMQQueue(plaso_queue.Queue):
   """Interface for a ZeroMQ backed queue.
 
+  Items are sent as multi-part ZeroMQ messages that consist of an item type
+  frame and an item data frame per item. Items that are already serialized,
+  such as events that are pushed to multiple queues, are sent as-is and
+  popped as bytes, other items are pickled. A message can contain multiple
+  items, which are buffered by the receiving queue and unpickled when they
+  are popped.
+
   Attributes:
     name (str): name to identify the queue.
     port (int): TCP port that the queue is connected or bound to. If the queue
@@ -44,6 +54,9 @@ class ZeroMQQueue(plaso_queue.Queue):
   SOCKET_CONNECTION_CONNECT = 2
   SOCKET_CONNECTION_TYPE = None
 
+  _ITEM_TYPE_PICKLED = b'p'
+  _ITEM_TYPE_SERIALIZED = b's'
+
   def __init__(
       self, delay_open=True, linger_seconds=10, maximum_items=1000,
       name='Unnamed', port=None, timeout_seconds=5):
@@ -80,6 +93,7 @@ class ZeroMQQueue(plaso_queue.Queue):
     self._closed_event = None
     self._high_water_mark = maximum_items
     self._linger_seconds = linger_seconds
+    self._received_items = collections.deque()
     self._terminate_event = None
     self._zmq_context = None
     self._zmq_socket = None
@@ -91,23 +105,80 @@ class ZeroMQQueue(plaso_queue.Queue):
     if not delay_open:
       self._CreateZMQSocket()
 
+  def _DecodeItem(self, item_type, item_data):
+    """Decodes an item received from a ZeroMQ socket.
+
+    Args:
+      item_type (bytes): item type.
+      item_data (bytes): item data.
+
+    Returns:
+      object: item.
+
+    Raises:
+      ValueError: if the item type is not supported.
+    """
+    if item_type == self._ITEM_TYPE_SERIALIZED:
+      return item_data
+
+    if item_type == self._ITEM_TYPE_PICKLED:
+      return pickle.loads(item_data)
+
+    raise ValueError('Unsupported item type: {0!s}'.format(item_type))
+
+  def _EncodeItems(self, items):
+    """Encodes items into the frames of a ZeroMQ message.
+
+    Args:
+      items (list[object]): items.
+
+    Returns:
+      list[bytes]: frames.
+    """
+    frames = []
+    for item in items:
+      if isinstance(item, py2to3.BYTES_TYPE):
+        frames.extend([self._ITEM_TYPE_SERIALIZED, item])
+      else:
+        frames.extend([
+            self._ITEM_TYPE_PICKLED,
+            pickle.dumps(item, pickle.HIGHEST_PROTOCOL)])
+
+    return frames
+
   def _SendItem(self, zmq_socket, item, block=True):
     """Attempts to send an item to a ZeroMQ socket.
 
     Args:
       zmq_socket (zmq.Socket): used to the send the item.
-      item (object): sent on the queue. Will be pickled prior to sending.
+      item (object): sent on the queue. Will be pickled prior to sending,
+          unless it is already serialized.
 
     Returns:
       bool: whether the item was sent successfully.
     """
+    return self._SendItems(zmq_socket, [item], block=block)
+
+  def _SendItems(self, zmq_socket, items, block=True):
+    """Attempts to send items in a single message to a ZeroMQ socket.
+
+    Args:
+      zmq_socket (zmq.Socket): used to the send the items.
+      items (list[object]): sent on the queue. Will be pickled prior to
+          sending, unless they are already serialized.
+
+    Returns:
+      bool: whether the items were sent successfully.
+    """
+    frames = self._EncodeItems(items)
+
     try:
-      logger.debug('{0:s} sending item'.format(self.name))
+      logger.debug('{0:s} sending {1:d} items'.format(self.name, len(items)))
       if block:
-        zmq_socket.send_pyobj(item)
+        zmq_socket.send_multipart(frames)
       else:
-        zmq_socket.send_pyobj(item, zmq.DONTWAIT)
-      logger.debug('{0:s} sent item'.format(self.name))
+        zmq_socket.send_multipart(frames, zmq.DONTWAIT)
+      logger.debug('{0:s} sent items'.format(self.name))
       return True
 
     except zmq.error.Again:
@@ -124,6 +195,9 @@ class ZeroMQQueue(plaso_queue.Queue):
   def _ReceiveItemOnActivity(self, zmq_socket):
     """Attempts to receive an item from a ZeroMQ socket.
 
+    Items of a previously received message are returned before a new message
+    is received.
+
     Args:
       zmq_socket (zmq.Socket): used to the receive the item.
 
@@ -134,12 +208,16 @@ class ZeroMQQueue(plaso_queue.Queue):
       QueueEmpty: if no item could be received within the timeout.
       zmq.error.ZMQError: if an error occurs in ZeroMQ
     """
+    if self._received_items:
+      return self._DecodeItem(*self._received_items.popleft())
+
     events = zmq_socket.poll(
         self._ZMQ_SOCKET_RECEIVE_TIMEOUT_MILLISECONDS)
     if events:
       try:
-        received_object = self._zmq_socket.recv_pyobj()
-        return received_object
+        frames = zmq_socket.recv_multipart()
+        self._received_items.extend(zip(frames[::2], frames[1::2]))
+        return self._DecodeItem(*self._received_items.popleft())
 
       except zmq.error.Again:
         logger.error(
@@ -430,6 +508,27 @@ class ZeroMQPushQueue(ZeroMQQueue):
       RuntimeError: if terminate event is missing.
       zmq.error.ZMQError: if a ZeroMQ specific error occurs.
     """
+    self.PushItems([item], block=block)
+
+  def PushItems(self, items, block=True):
+    """Push items on to the queue in a single message.
+
+    If no ZeroMQ socket has been created, one will be created the first time
+    this method is called.
+
+    Args:
+      items (list[object]): items to push on the queue.
+      block (Optional[bool]): whether the push should be performed in blocking
+          or non-block mode.
+
+    Raises:
+      KeyboardInterrupt: if the process is sent a KeyboardInterrupt while
+          pushing the items.
+      QueueFull: if it was not possible to push the items to the queue
+          within the timeout.
+      RuntimeError: if terminate event is missing.
+      zmq.error.ZMQError: if a ZeroMQ specific error occurs.
+    """
     if not self._zmq_socket:
       self._CreateZMQSocket()
 
@@ -442,12 +541,12 @@ class ZeroMQPushQueue(ZeroMQQueue):
     last_retry_timestamp = time.time() + self.timeout_seconds
     while not self._terminate_event.is_set():
       try:
-        send_successful = self._SendItem(self._zmq_socket, item, block)
+        send_successful = self._SendItems(self._zmq_socket, items, block)
         if send_successful:
           break
 
         if time.time() > last_retry_timestamp:
-          logger.error('{0:s} unable to push item, raising.'.format(
+          logger.error('{0:s} unable to push items, raising.'.format(
               self.name))
           raise errors.QueueFull
 
@@ -505,7 +604,7 @@ class ZeroMQRequestQueue(ZeroMQQueue):
     last_retry_time = time.time() + self.timeout_seconds
     while not self._terminate_event.is_set():
       try:
-        self._zmq_socket.send_pyobj(None)
+        self._zmq_socket.send_multipart(self._EncodeItems([None]))
         break
 
       except zmq.error.Again:
@@ -10,3 +10,6 @@ from plaso.filters import filter_list
 
 # This file implements a separate filter that is not registered.
 # from plaso.filters import file_entry
+
+# This file implements a filter pushdown planner that is not a filter.
+# from plaso.filters import pushdown
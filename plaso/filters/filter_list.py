@@ -10,7 +10,9 @@ import yaml
 
 from plaso.filters import interface
 from plaso.filters import manager
+from plaso.filters import pushdown
 from plaso.lib import errors
+from plaso.lib import objectfilter
 
 
 class ObjectFilterList(interface.FilterObject):
@@ -118,6 +120,20 @@ class ObjectFilterList(interface.FilterObject):
               results_type))
     self._filter_expression = filter_expression
 
+  def GetPushdownPlan(self):
+    """Retrieves the constraints of the filter that storage can evaluate.
+
+    Returns:
+      FilterPushdownPlan: constraints every event that matches the filter
+          satisfies.
+    """
+    if not self.filters:
+      return pushdown.FilterPushdownPlan()
+
+    matchers = [matcher for _, matcher, _ in self.filters]
+    return pushdown.FilterPushdownPlanner.GetPlan(
+        objectfilter.OrFilter(arguments=matchers))
+
   def Match(self, event_object):
     """Determines if an event object matches the filter.
 
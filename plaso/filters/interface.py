@@ -5,6 +5,7 @@ from __future__ import unicode_literals
 
 import abc
 
+from plaso.filters import pushdown
 from plaso.lib import errors
 from plaso.lib import pfilter
 
@@ -73,6 +74,15 @@ class FilterObject(object):
       WrongPlugin: if the filter could not be compiled.
     """
 
+  def GetPushdownPlan(self):
+    """Retrieves the constraints of the filter that storage can evaluate.
+
+    Returns:
+      FilterPushdownPlan: constraints every event that matches the filter
+          satisfies.
+    """
+    return pushdown.FilterPushdownPlanner.GetPlan(self._matcher)
+
   def Match(self, unused_event):
     """Determines if an event matches the filter.
 
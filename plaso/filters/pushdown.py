@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""Planner that determines which filter constraints storage can evaluate.
+
+The planner analyzes a compiled filter (objectfilter AST) and extracts:
+* the time range events must be within, from comparisons of the timestamp;
+* the values attributes, such as data type and parser, must equal.
+
+These constraints are necessary conditions: an event that does not satisfy
+them never matches the filter, hence storage does not need to read it. The
+filter itself is still applied to the events that are read.
+"""
+
+from __future__ import unicode_literals
+
+from plaso.lib import objectfilter
+from plaso.lib import pfilter
+from plaso.lib import py2to3
+from plaso.storage import time_range as storage_time_range
+
+
+class FilterPushdownPlan(object):
+  """Constraints of a filter that can be evaluated by storage.
+
+  Attributes:
+    attribute_values (dict[str, frozenset[str]]): values an attribute must
+        equal, per attribute name.
+    end_timestamp (int): timestamp events must be before or at, or None if
+        not constrained.
+    start_timestamp (int): timestamp events must be at or after, or None if
+        not constrained.
+  """
+
+  def __init__(
+      self, attribute_values=None, end_timestamp=None, start_timestamp=None):
+    """Initializes a filter pushdown plan.
+
+    Args:
+      attribute_values (Optional[dict[str, frozenset[str]]]): values
+          an attribute must equal, per attribute name.
+      end_timestamp (Optional[int]): timestamp events must be before or at.
+      start_timestamp (Optional[int]): timestamp events must be at or after.
+    """
+    super(FilterPushdownPlan, self).__init__()
+    self.attribute_values = attribute_values or {}
+    self.end_timestamp = end_timestamp
+    self.start_timestamp = start_timestamp
+
+  @property
+  def is_constrained(self):
+    """bool: True if the plan constrains the events to read."""
+    return bool(
+        self.attribute_values or self.end_timestamp is not None or
+        self.start_timestamp is not None)
+
+  @property
+  def is_empty(self):
+    """bool: True if no event can satisfy the constraints."""
+    if (self.start_timestamp is not None and self.end_timestamp is not None and
+        self.start_timestamp > self.end_timestamp):
+      return True
+
+    for values in self.attribute_values.values():
+      if not values:
+        return True
+
+    return False
+
+  def GetTimeRange(self, time_range=None):
+    """Retrieves the time range events must be within.
+
+    Args:
+      time_range (Optional[TimeRange]): time range to intersect with the
+          time range of the plan.
+
+    Returns:
+      TimeRange: time range events must be within or None if the time is not
+          constrained.
+
+    Raises:
+      ValueError: if no event can satisfy the time constraints.
+    """
+    start_timestamp = self.start_timestamp
+    end_timestamp = self.end_timestamp
+
+    if time_range:
+      if start_timestamp is None:
+        start_timestamp = time_range.start_timestamp
+      else:
+        start_timestamp = max(start_timestamp, time_range.start_timestamp)
+
+      if end_timestamp is None:
+        end_timestamp = time_range.end_timestamp
+      else:
+        end_timestamp = min(end_timestamp, time_range.end_timestamp)
+
+    if start_timestamp is None and end_timestamp is None:
+      return None
+
+    # Storage time ranges are bounded on both sides.
+    if start_timestamp is None:
+      start_timestamp = storage_time_range.TimeRange.MINIMUM_TIMESTAMP
+    else:
+      start_timestamp = max(
+          start_timestamp, storage_time_range.TimeRange.MINIMUM_TIMESTAMP)
+
+    if end_timestamp is None:
+      end_timestamp = storage_time_range.TimeRange.MAXIMUM_TIMESTAMP
+    else:
+      end_timestamp = min(
+          end_timestamp, storage_time_range.TimeRange.MAXIMUM_TIMESTAMP)
+
+    return storage_time_range.TimeRange(start_timestamp, end_timestamp)
+
+
+class FilterPushdownPlanner(object):
+  """Planner that determines which filter constraints storage can evaluate.
+
+  Only constraints that every matching event must satisfy are pushed down.
+  Constraints of an AND are combined, constraints of an OR only when all of
+  its alternatives constrain the same time bound or attribute. Negated
+  comparisons and other operators are never pushed down.
+  """
+
+  # Names of the attributes of which equality constraints are pushed down.
+  _ATTRIBUTE_NAMES = frozenset(['data_type', 'parser'])
+
+  @classmethod
+  def _CombineAndPlans(cls, plans):
+    """Combines the plans of the children of an AND.
+
+    Args:
+      plans (list[FilterPushdownPlan]): plans of the children.
+
+    Returns:
+      FilterPushdownPlan: plan that satisfies all of the plans.
+    """
+    attribute_values = {}
+    end_timestamp = None
+    start_timestamp = None
+
+    for plan in plans:
+      if plan.start_timestamp is not None:
+        if start_timestamp is None:
+          start_timestamp = plan.start_timestamp
+        else:
+          start_timestamp = max(start_timestamp, plan.start_timestamp)
+
+      if plan.end_timestamp is not None:
+        if end_timestamp is None:
+          end_timestamp = plan.end_timestamp
+        else:
+          end_timestamp = min(end_timestamp, plan.end_timestamp)
+
+      for attribute_name, values in plan.attribute_values.items():
+        if attribute_name in attribute_values:
+          values = attribute_values[attribute_name].intersection(values)
+        attribute_values[attribute_name] = values
+
+    return FilterPushdownPlan(
+        attribute_values=attribute_values, end_timestamp=end_timestamp,
+        start_timestamp=start_timestamp)
+
+  @classmethod
+  def _CombineOrPlans(cls, plans):
+    """Combines the plans of the children of an OR.
+
+    Args:
+      plans (list[FilterPushdownPlan]): plans of the children.
+
+    Returns:
+      FilterPushdownPlan: plan that is satisfied if one of the plans is.
+    """
+    if not plans:
+      return FilterPushdownPlan()
+
+    # Children that can never match do not widen the plan.
+    plans = [plan for plan in plans if not plan.is_empty] or plans[:1]
+
+    start_timestamps = [plan.start_timestamp for plan in plans]
+    if None in start_timestamps:
+      start_timestamp = None
+    else:
+      start_timestamp = min(start_timestamps)
+
+    end_timestamps = [plan.end_timestamp for plan in plans]
+    if None in end_timestamps:
+      end_timestamp = None
+    else:
+      end_timestamp = max(end_timestamps)
+
+    attribute_values = {}
+    for attribute_name, values in plans[0].attribute_values.items():
+      for plan in plans[1:]:
+        if attribute_name not in plan.attribute_values:
+          values = None
+          break
+
+        values = values.union(plan.attribute_values[attribute_name])
+
+      if values is not None:
+        attribute_values[attribute_name] = values
+
+    return FilterPushdownPlan(
+        attribute_values=attribute_values, end_timestamp=end_timestamp,
+        start_timestamp=start_timestamp)
+
+  @classmethod
+  def _GetOperatorPlan(cls, operator):
+    """Retrieves the plan of a binary operator.
+
+    Args:
+      operator (GenericBinaryOperator): binary operator.
+
+    Returns:
+      FilterPushdownPlan: plan of the operator.
+    """
+    if not operator.bool_value:
+      return FilterPushdownPlan()
+
+    attribute_name = operator.left_operand
+    value = operator.right_operand
+
+    if attribute_name == 'timestamp':
+      if not isinstance(value, pfilter.DateCompareObject):
+        return FilterPushdownPlan()
+
+      timestamp = value.data
+      if isinstance(operator, objectfilter.Equals):
+        return FilterPushdownPlan(
+            end_timestamp=timestamp, start_timestamp=timestamp)
+
+      if isinstance(operator, objectfilter.Greater):
+        return FilterPushdownPlan(start_timestamp=timestamp + 1)
+
+      if isinstance(operator, objectfilter.GreaterEqual):
+        return FilterPushdownPlan(start_timestamp=timestamp)
+
+      if isinstance(operator, objectfilter.Less):
+        return FilterPushdownPlan(end_timestamp=timestamp - 1)
+
+      if isinstance(operator, objectfilter.LessEqual):
+        return FilterPushdownPlan(end_timestamp=timestamp)
+
+    elif attribute_name in cls._ATTRIBUTE_NAMES:
+      if isinstance(operator, objectfilter.Equals):
+        if isinstance(value, py2to3.STRING_TYPES):
+          return FilterPushdownPlan(
+              attribute_values={attribute_name: frozenset([value])})
+
+      elif (attribute_name == 'parser' and
+            isinstance(operator, pfilter.ParserList)):
+        return FilterPushdownPlan(
+            attribute_values={
+                attribute_name: frozenset(operator.compiled_list)})
+
+    return FilterPushdownPlan()
+
+  @classmethod
+  def GetPlan(cls, matcher):
+    """Retrieves the plan of a compiled filter.
+
+    Args:
+      matcher (objectfilter.Filter): compiled filter or None.
+
+    Returns:
+      FilterPushdownPlan: plan of the compiled filter.
+    """
+    if isinstance(matcher, objectfilter.AndFilter):
+      plans = [cls.GetPlan(child_matcher) for child_matcher in matcher.args]
+      return cls._CombineAndPlans(plans)
+
+    if isinstance(matcher, objectfilter.OrFilter):
+      plans = [cls.GetPlan(child_matcher) for child_matcher in matcher.args]
+      return cls._CombineOrPlans(plans)
+
+    if isinstance(matcher, objectfilter.GenericBinaryOperator):
+      return cls._GetOperatorPlan(matcher)
+
+    return FilterPushdownPlan()
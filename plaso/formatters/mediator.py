@@ -53,6 +53,16 @@ class FormatterMediator(object):
 
     return self._winevt_database_reader
 
+  @property
+  def data_location(self):
+    """str: path of the formatter data files."""
+    return self._data_location
+
+  @property
+  def language_identifier(self):
+    """str: preferred language identifier, such as "en-US"."""
+    return self._language_identifier
+
   @property
   def lcid(self):
     """int: preferred Language Code identifier (LCID)."""
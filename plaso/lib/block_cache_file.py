@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+"""Block cache file-like object."""
+
+from __future__ import unicode_literals
+
+import os
+
+from plaso.lib import lru_cache
+
+
+class BlockCache(object):
+  """Least recently used (LRU) cache of blocks of data of file-like objects.
+
+  The blocks are identified by the identifier of the file-like object they
+  belong to and the number of the block within the file-like object. Hence
+  a block cache can be shared by multiple file-like objects.
+
+  Attributes:
+    block_size (int): size of a cached block in bytes.
+  """
+
+  def __init__(
+      self, block_size=64 * 1024, maximum_cached_size=32 * 1024 * 1024):
+    """Initializes a block cache.
+
+    Args:
+      block_size (Optional[int]): size of a cached block in bytes.
+      maximum_cached_size (Optional[int]): maximum size of the cached data
+          in bytes, where 0 represents the cache is disabled.
+
+    Raises:
+      ValueError: if the block size or maximum cached size is not supported.
+    """
+    if block_size <= 0:
+      raise ValueError('Unsupported block size: {0:d}'.format(block_size))
+
+    if maximum_cached_size < 0:
+      raise ValueError('Unsupported maximum cached size: {0:d}'.format(
+          maximum_cached_size))
+
+    super(BlockCache, self).__init__()
+    self._blocks = lru_cache.LRUCache(maximum_cached_size // block_size)
+    self.block_size = block_size
+
+  @property
+  def number_of_hits(self):
+    """int: number of blocks that were read from the cache."""
+    return self._blocks.number_of_hits
+
+  @property
+  def number_of_misses(self):
+    """int: number of blocks that were not read from the cache."""
+    return self._blocks.number_of_misses
+
+  def CacheBlock(self, identifier, block_number, data):
+    """Caches a block.
+
+    Args:
+      identifier (object): hashable identifier of the file-like object.
+      block_number (int): number of the block within the file-like object.
+      data (bytes): data of the block.
+    """
+    self._blocks.CacheObject((identifier, block_number), data)
+
+  def Empty(self):
+    """Empties the cache."""
+    self._blocks.Empty()
+
+  def GetBlock(self, identifier, block_number):
+    """Retrieves a cached block.
+
+    Args:
+      identifier (object): hashable identifier of the file-like object.
+      block_number (int): number of the block within the file-like object.
+
+    Returns:
+      bytes: data of the block or None if not cached.
+    """
+    return self._blocks.GetObject((identifier, block_number))
+
+
+class BlockCacheFileObject(object):
+  """File-like object that caches the data of another file-like object.
+
+  The data is cached in blocks of a fixed size, where the least recently used
+  blocks are removed from the cache when it is full. Consecutive blocks that
+  are not cached are read from the file-like object at once. When blocks
+  are read sequentially, additional blocks are read ahead, where the number
+  of blocks read ahead doubles with every sequential read up to the maximum
+  read-ahead size.
+
+  This allows multiple consumers of the same data, such as analyzers,
+  the signature scanner and parsers, to read the data from the underlying
+  file-like object only once. The block cache file-like object takes
+  ownership of the underlying file-like object and closes it when it is
+  closed.
+  """
+
+  def __init__(
+      self, file_object, block_size=64 * 1024, block_cache=None,
+      identifier=None, maximum_cached_size=32 * 1024 * 1024,
+      maximum_read_ahead_size=0):
+    """Initializes a block cache file-like object.
+
+    Args:
+      file_object (FileIO): file-like object to cache the data of.
+      block_size (Optional[int]): size of a cached block in bytes, which is
+          ignored if a block cache is provided.
+      block_cache (Optional[BlockCache]): block cache shared with other
+          file-like objects, where None represents a block cache for this
+          file-like object only.
+      identifier (Optional[object]): hashable identifier of the data of
+          the file-like object in the shared block cache.
+      maximum_cached_size (Optional[int]): maximum size of the cached data
+          in bytes, which is ignored if a block cache is provided.
+      maximum_read_ahead_size (Optional[int]): maximum size of the data that
+          is read ahead in bytes, where 0 represents no read-ahead.
+
+    Raises:
+      ValueError: if the block size is not supported or the identifier is
+          missing for a shared block cache.
+    """
+    if block_cache and identifier is None:
+      raise ValueError('Missing identifier.')
+
+    if not block_cache:
+      block_cache = BlockCache(
+          block_size=block_size, maximum_cached_size=maximum_cached_size)
+
+    super(BlockCacheFileObject, self).__init__()
+    self._block_cache = block_cache
+    self._block_size = block_cache.block_size
+    self._current_offset = 0
+    self._file_object = file_object
+    self._identifier = identifier
+    self._last_read_block_number = None
+    self._maximum_read_ahead_blocks = (
+        maximum_read_ahead_size // self._block_size)
+    self._read_ahead_blocks = 0
+    self._size = file_object.get_size()
+
+  def _ReadBlocks(self, first_block_number, number_of_blocks):
+    """Reads blocks from the file-like object and caches them.
+
+    Args:
+      first_block_number (int): number of the first block to read.
+      number_of_blocks (int): number of blocks to read.
+
+    Returns:
+      list[bytes]: data of the blocks.
+    """
+    self._file_object.seek(
+        first_block_number * self._block_size, os.SEEK_SET)
+    data = self._file_object.read(number_of_blocks * self._block_size)
+
+    blocks = []
+    for block_index in range(number_of_blocks):
+      data_offset = block_index * self._block_size
+      block_data = data[data_offset:data_offset + self._block_size]
+      self._block_cache.CacheBlock(
+          self._identifier, first_block_number + block_index, block_data)
+      blocks.append(block_data)
+
+    return blocks
+
+  # Note: that the following functions do not follow the style guide
+  # because they are part of the file-like object interface.
+  # pylint: disable=invalid-name
+
+  def close(self):
+    """Closes the file-like object."""
+    self._file_object.close()
+
+  def get_offset(self):
+    """Retrieves the current offset into the file-like object.
+
+    Returns:
+      int: current offset.
+    """
+    return self._current_offset
+
+  def get_size(self):
+    """Retrieves the size of the file-like object.
+
+    Returns:
+      int: size of the data.
+    """
+    return self._size
+
+  def read(self, size=None):
+    """Reads a byte string from the file-like object at the current offset.
+
+    Args:
+      size (Optional[int]): number of bytes to read, where None or a negative
+          value represents all remaining data.
+
+    Returns:
+      bytes: data read.
+    """
+    if self._current_offset >= self._size:
+      return b''
+
+    if size is None or size < 0 or self._current_offset + size > self._size:
+      size = self._size - self._current_offset
+
+    if not size:
+      return b''
+
+    first_block_number = self._current_offset // self._block_size
+    last_block_number = (self._current_offset + size - 1) // self._block_size
+
+    if self._maximum_read_ahead_blocks:
+      if (self._last_read_block_number is not None and
+          first_block_number in (
+              self._last_read_block_number, self._last_read_block_number + 1)):
+        self._read_ahead_blocks = min(
+            max(1, self._read_ahead_blocks * 2),
+            self._maximum_read_ahead_blocks)
+      else:
+        self._read_ahead_blocks = 0
+
+      self._last_read_block_number = last_block_number
+
+    blocks = []
+    uncached_block_number = None
+    for block_number in range(first_block_number, last_block_number + 1):
+      block_data = self._block_cache.GetBlock(self._identifier, block_number)
+      if block_data is None:
+        if uncached_block_number is None:
+          uncached_block_number = block_number
+        continue
+
+      if uncached_block_number is not None:
+        blocks.extend(self._ReadBlocks(
+            uncached_block_number, block_number - uncached_block_number))
+        uncached_block_number = None
+
+      blocks.append(block_data)
+
+    if uncached_block_number is not None:
+      number_of_blocks = last_block_number + 1 - uncached_block_number
+
+      # Only the blocks that contain data are read ahead.
+      last_data_block_number = (self._size - 1) // self._block_size
+      number_of_read_ahead_blocks = min(
+          self._read_ahead_blocks, last_data_block_number - last_block_number)
+
+      read_blocks = self._ReadBlocks(
+          uncached_block_number, number_of_blocks + number_of_read_ahead_blocks)
+      blocks.extend(read_blocks[:number_of_blocks])
+
+    data_offset = self._current_offset - (first_block_number * self._block_size)
+    data = b''.join(blocks)[data_offset:data_offset + size]
+
+    self._current_offset += len(data)
+    return data
+
+  def seek(self, offset, whence=os.SEEK_SET):
+    """Seeks to an offset within the file-like object.
+
+    Args:
+      offset (int): offset to seek to.
+      whence (Optional(int)): value that indicates whether offset is an absolute
+          or relative position within the file.
+
+    Raises:
+      IOError: if the seek failed.
+    """
+    if whence == os.SEEK_CUR:
+      offset += self._current_offset
+    elif whence == os.SEEK_END:
+      offset += self._size
+    elif whence != os.SEEK_SET:
+      raise IOError('Unsupported whence.')
+
+    if offset < 0:
+      raise IOError('Invalid offset value less than zero.')
+
+    self._current_offset = offset
+
+  def tell(self):
+    """Retrieves the current offset into the file-like object.
+
+    Returns:
+      int: current offset.
+    """
+    return self._current_offset
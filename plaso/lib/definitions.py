@@ -9,10 +9,14 @@ MICROSECONDS_PER_MINUTE = 60000000
 
 COMPRESSION_FORMAT_NONE = 'none'
 COMPRESSION_FORMAT_ZLIB = 'zlib'
+COMPRESSION_FORMAT_ZLIB_DICTIONARY = 'zlib_dictionary'
+COMPRESSION_FORMAT_ZLIB_FAST = 'zlib_fast'
 
 COMPRESSION_FORMATS = frozenset([
     COMPRESSION_FORMAT_NONE,
-    COMPRESSION_FORMAT_ZLIB])
+    COMPRESSION_FORMAT_ZLIB,
+    COMPRESSION_FORMAT_ZLIB_DICTIONARY,
+    COMPRESSION_FORMAT_ZLIB_FAST])
 
 DEFAULT_WORKER_MEMORY_LIMIT = 2048 * 1024 * 1024
 
@@ -80,9 +84,12 @@ RESERVED_VARIABLE_NAMES = frozenset([
     'timezone',
     'username'])
 
+SERIALIZER_FORMAT_BINARY = 'binary'
 SERIALIZER_FORMAT_JSON = 'json'
 
-SERIALIZER_FORMATS = frozenset([SERIALIZER_FORMAT_JSON])
+SERIALIZER_FORMATS = frozenset([
+    SERIALIZER_FORMAT_BINARY,
+    SERIALIZER_FORMAT_JSON])
 
 STORAGE_FORMAT_SQLITE = 'sqlite'
 
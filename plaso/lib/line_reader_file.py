@@ -1,40 +1,82 @@
 # -*- coding: utf-8 -*-
-"""Binary line reader file-like object."""
+"""Line reader file-like objects."""
 
 from __future__ import unicode_literals
 
+import codecs
 import os
 
 
-class BinaryLineReader(object):
-  """Line reader for binary file-like objects.
+class BufferedLineReader(object):
+  """Buffered line reader for file-like objects.
+
+  The data is read in blocks, where the size of the block doubles with every
+  read up to the maximum read size. The lines in a block are split off at once
+  and, if an encoding is specified, decoded at once. Only when a block cannot
+  be decoded, its lines are decoded individually, such that the lines before
+  a line that cannot be decoded are still read.
+
+  Lines are read from the start of the file-like object and keep their
+  trailing end-of-line indicator, but it may be absent when a file ends with
+  an incomplete line. To bound the memory used for data that does not contain
+  lines, the data read is returned as a line without end-of-line indicator
+  when it contains no end-of-line indicator and exceeds the maximum read
+  size.
 
   Attributes:
-    end_of_line (bytes): byte sequence that separates lines from each other.
+    end_of_line (bytes|str): end-of-line indicator that separates lines from
+        each other, which is a string if an encoding is specified.
   """
 
-  # The size of the lines buffer.
-  _LINES_BUFFER_SIZE = 1024 * 1024
+  # The size of the first block read.
+  _INITIAL_READ_SIZE = 64 * 1024
 
-  # The maximum allowed size of the read buffer.
-  _MAXIMUM_READ_BUFFER_SIZE = 16 * 1024 * 1024
+  # The maximum size of a block read.
+  _MAXIMUM_READ_SIZE = 4 * 1024 * 1024
 
-  def __init__(self, file_object, end_of_line=b'\n'):
+  def __init__(self, file_object, encoding=None, end_of_line=b'\n'):
     """Initializes the line reader.
 
     Args:
       file_object (FileIO): a file-like object to read from.
-      end_of_line (Optional[bytes]): end of line indicator.
+      encoding (Optional[str]): encoding of the text, where None represents
+          the lines should not be decoded.
+      end_of_line (Optional[bytes]): end-of-line indicator, which is decoded
+          if an encoding is specified.
+
+    Raises:
+      LookupError: if the encoding is not supported.
     """
-    super(BinaryLineReader, self).__init__()
+    super(BufferedLineReader, self).__init__()
+    self._current_offset = 0
+    self._decoder = None
+    self._encoded_end_of_line = end_of_line
+    self._encoding = encoding
     self._file_object = file_object
-    self._file_object_size = file_object.get_size()
-    self.end_of_line = end_of_line
-    self._end_of_line_length = len(self.end_of_line)
+    self._is_last_line_terminated = False
+    self._line_index = 0
     self._lines = []
     self._lines_buffer = b''
-    self._lines_buffer_offset = 0
-    self._current_offset = 0
+    self._lines_end_offset = 0
+    self._partial_line = None
+    self._raw_lines = []
+    self._read_offset = 0
+    self._read_size = self._INITIAL_READ_SIZE
+    self._text_prefix_size = 0
+
+    if encoding:
+      end_of_line = end_of_line.decode('ascii')
+
+      self._decoder = codecs.getincrementaldecoder(encoding)(errors='strict')
+
+      # Encodings such as UTF-16 prefix encoded text with a byte-order mark,
+      # which is not part of the encoded end-of-line indicator.
+      self._text_prefix_size = len('a'.encode(encoding))
+      encoded_text = '{0:s}{1:s}'.format('a', end_of_line).encode(encoding)
+      self._encoded_end_of_line = encoded_text[self._text_prefix_size:]
+
+    self._end_of_line_length = len(self._encoded_end_of_line)
+    self.end_of_line = end_of_line
 
   def __enter__(self):
     """Enters a with statement."""
@@ -48,11 +90,182 @@ class BinaryLineReader(object):
     """Returns a line of text.
 
     Yields:
-      bytes: line of text.
+      bytes|str: line of text.
+    """
+    for _, line in self.ReadLinesWithOffsets():
+      yield line
+
+  def _DecodeLines(self, data, raw_lines):
+    """Decodes the lines of a block of data.
+
+    Args:
+      data (bytes): data of the lines.
+      raw_lines (list[bytes]): lines without end-of-line indicator.
+
+    Returns:
+      list[str|UnicodeDecodeError]: decoded lines without end-of-line
+          indicator, or the error raised when decoding the line failed.
     """
+    try:
+      lines = self._decoder.decode(data, final=True).split(self.end_of_line)
+    except UnicodeDecodeError:
+      lines = []
+
+    if data.endswith(self._encoded_end_of_line):
+      lines = lines[:-1]
+
+    if len(lines) == len(raw_lines):
+      return lines
+
+    # Decode the lines individually if the block could not be decoded or
+    # the decoded text is split into a different number of lines.
+    self._decoder.reset()
+
+    lines = []
+    for raw_line in raw_lines:
+      try:
+        line = raw_line.decode(self._encoding)
+      except UnicodeDecodeError as exception:
+        line = exception
+
+      lines.append(line)
+
+    return lines
+
+  def _GetEncodedSize(self, line):
+    """Determines the size of an encoded line.
+
+    Args:
+      line (bytes|str): line.
+
+    Returns:
+      int: size of the encoded line in bytes.
+    """
+    if not self._encoding:
+      return len(line)
+
+    encoded_line = '{0:s}{1:s}'.format('a', line).encode(self._encoding)
+    return len(encoded_line) - self._text_prefix_size
+
+  def _ReadBlock(self):
+    """Reads a block of data that contains whole lines.
+
+    Returns:
+      bytes: data of the block, which is empty if the end of the file-like
+          object was reached.
+    """
+    while True:
+      self._file_object.seek(self._read_offset, os.SEEK_SET)
+      read_buffer = self._file_object.read(self._read_size)
+      self._read_offset += len(read_buffer)
+
+      if not read_buffer:
+        data = self._lines_buffer
+        self._lines_buffer = b''
+        return data
+
+      self._read_size = min(self._read_size * 2, self._MAXIMUM_READ_SIZE)
+
+      if self._lines_buffer:
+        read_buffer = b''.join([self._lines_buffer, read_buffer])
+
+      lines_size = read_buffer.rfind(self._encoded_end_of_line)
+      if lines_size >= 0:
+        lines_size += self._end_of_line_length
+        self._lines_buffer = read_buffer[lines_size:]
+        return read_buffer[:lines_size]
+
+      if len(read_buffer) >= self._MAXIMUM_READ_SIZE:
+        self._lines_buffer = b''
+        return read_buffer
+
+      self._lines_buffer = read_buffer
+
+  def _ReadLines(self):
+    """Reads the lines of the next block of data.
+
+    Returns:
+      bool: True if lines were read, False if the end of the file-like object
+          was reached.
+    """
+    data = self._ReadBlock()
+    if not data:
+      return False
+
+    raw_lines = data.split(self._encoded_end_of_line)
+
+    self._is_last_line_terminated = data.endswith(self._encoded_end_of_line)
+    if self._is_last_line_terminated:
+      raw_lines.pop()
+
+    if not self._encoding:
+      lines = raw_lines
+
+    else:
+      lines = self._DecodeLines(data, raw_lines)
+
+      # Remove a byte-order mark at the start of the file.
+      first_line = lines[0]
+      if (self._lines_end_offset == 0 and
+          not isinstance(first_line, UnicodeDecodeError) and
+          first_line[:1] == '\ufeff'):
+        lines[0] = lines[0][1:]
+
+    self._line_index = 0
+    self._lines = lines
+    self._raw_lines = raw_lines
+    return True
+
+  def _ReadNextLine(self):
+    """Reads the next line from the lines of the current block.
+
+    Returns:
+      bytes|str: line of text.
+
+    Raises:
+      UnicodeDecodeError: if the line cannot be decoded.
+    """
+    line_index = self._line_index
+    line = self._lines[line_index]
+    line_size = len(self._raw_lines[line_index])
+
+    self._line_index += 1
+
+    if self._line_index < len(self._lines) or self._is_last_line_terminated:
+      line_size += self._end_of_line_length
+      if not isinstance(line, UnicodeDecodeError):
+        line = line + self.end_of_line
+
+    self._lines_end_offset += line_size
+    self._current_offset = self._lines_end_offset
+
+    if isinstance(line, UnicodeDecodeError):
+      raise line
+
+    return line
+
+  def ReadLinesWithOffsets(self):
+    """Reads the remaining lines together with their offsets.
+
+    Yields:
+      tuple[int, bytes|str]: offset of the line in bytes and the line.
+
+    Raises:
+      UnicodeDecodeError: if a line cannot be decoded.
+    """
+    offset = self._current_offset
     line = self.readline()
     while line:
-      yield line
+      yield offset, line
+
+      if self._partial_line is None:
+        # Read the lines of the current block without the overhead of
+        # readline.
+        while self._line_index < len(self._lines):
+          offset = self._current_offset
+          yield offset, self._ReadNextLine()
+
+      offset = self._current_offset
       line = self.readline()
 
   # Note: that the following functions do not follow the style guide
@@ -63,75 +276,47 @@ class BinaryLineReader(object):
     """Reads a single line of text.
 
     The functions reads one entire line from the file-like object. A trailing
-    end-of-line indicator (newline by default) is kept in the byte string (but
-    may be absent when a file ends with an incomplete line). An empty byte
-    string is returned only when end-of-file is encountered immediately.
+    end-of-line indicator (newline by default) is kept in the line (but may be
+    absent when a file ends with an incomplete line). An empty line is
+    returned only when end-of-file is encountered immediately.
 
     Args:
-      size (Optional[int]): maximum byte size to read. If present and
-          non-negative, it is a maximum byte count (including the trailing
-          end-of-line) and an incomplete line may be returned.
+      size (Optional[int]): maximum size to read, in bytes or in characters
+          if an encoding is specified. If present and non-negative, it is
+          a maximum count (including the trailing end-of-line) and
+          an incomplete line may be returned.
 
     Returns:
-      bytes: line of text.
+      bytes|str: line of text.
 
     Raises:
-      ValueError: if the specified size is less than zero or greater
-          than the maximum size allowed.
+      UnicodeDecodeError: if the line cannot be decoded.
+      ValueError: if the specified size is less than zero.
     """
     if size is not None and size < 0:
       raise ValueError('Invalid size value smaller than zero.')
 
-    if size is not None and size > self._MAXIMUM_READ_BUFFER_SIZE:
-      raise ValueError(
-          'Invalid size value exceeds maximum value {0:d}.'.format(
-              self._MAXIMUM_READ_BUFFER_SIZE))
-
-    if not self._lines:
-      if self._lines_buffer_offset >= self._file_object_size:
-        return b''
+    if self._partial_line is not None:
+      line = self._partial_line
+      self._partial_line = None
 
-      read_size = size
-      if not read_size:
-        read_size = self._MAXIMUM_READ_BUFFER_SIZE
+    elif self._line_index < len(self._lines) or self._ReadLines():
+      line = self._ReadNextLine()
 
-      if self._lines_buffer_offset + read_size > self._file_object_size:
-        size = self._file_object_size - self._lines_buffer_offset
-
-      self._file_object.seek(self._lines_buffer_offset, os.SEEK_SET)
-      read_buffer = self._file_object.read(size)
-
-      self._lines_buffer_offset += len(read_buffer)
-
-      self._lines = read_buffer.split(self.end_of_line)
-      if self._lines_buffer:
-        self._lines[0] = b''.join([self._lines_buffer, self._lines[0]])
-        self._lines_buffer = b''
-
-      if read_buffer[self._end_of_line_length:] != self.end_of_line:
-        self._lines_buffer = self._lines.pop()
-
-      for index, line in enumerate(self._lines):
-        self._lines[index] = b''.join([line, self.end_of_line])
-
-      if (self._lines_buffer and
-          self._lines_buffer_offset >= self._file_object_size):
-        self._lines.append(self._lines_buffer)
-        self._lines_buffer = b''
-
-    if not self._lines:
-      line = self._lines_buffer
-      self._lines_buffer = b''
-
-    elif not size or size >= len(self._lines[0]):
-      line = self._lines.pop(0)
+    elif self._encoding:
+      return ''
 
     else:
-      line = self._lines[0]
-      self._lines[0] = line[size:]
+      return b''
+
+    if size and size < len(line):
+      self._partial_line = line[size:]
       line = line[:size]
+      self._current_offset = self._lines_end_offset - self._GetEncodedSize(
+          self._partial_line)
 
-    self._current_offset += len(line)
+    else:
+      self._current_offset = self._lines_end_offset
 
     return line
 
@@ -142,26 +327,26 @@ class BinaryLineReader(object):
     the lines read.
 
     Args:
-      sizehint (Optional[int]): maximum byte size to read. If present, instead
-          of reading up to EOF, whole lines totalling sizehint bytes are read.
+      sizehint (Optional[int]): maximum size to read. If present, instead
+          of reading up to EOF, whole lines totalling sizehint are read.
 
     Returns:
-      list[bytes]: lines of text.
+      list[bytes|str]: lines of text.
     """
     if sizehint is None or sizehint <= 0:
       sizehint = None
 
     lines = []
-    lines_byte_size = 0
+    lines_size = 0
     line = self.readline()
 
     while line:
       lines.append(line)
 
       if sizehint is not None:
-        lines_byte_size += len(line)
+        lines_size += len(line)
 
-        if lines_byte_size >= sizehint:
+        if lines_size >= sizehint:
           break
 
       line = self.readline()
@@ -177,6 +362,24 @@ class BinaryLineReader(object):
     return self._current_offset
 
 
+class BinaryLineReader(BufferedLineReader):
+  """Line reader for binary file-like objects.
+
+  Attributes:
+    end_of_line (bytes): byte sequence that separates lines from each other.
+  """
+
+  def __init__(self, file_object, end_of_line=b'\n'):
+    """Initializes the line reader.
+
+    Args:
+      file_object (FileIO): a file-like object to read from.
+      end_of_line (Optional[bytes]): end of line indicator.
+    """
+    super(BinaryLineReader, self).__init__(
+        file_object, end_of_line=end_of_line)
+
+
 class BinaryDSVReader(object):
   """Basic reader for delimiter separated text files of unknown encoding.
 
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""Least recently used (LRU) cache for storing objects."""
+
+from __future__ import unicode_literals
+
+import collections
+
+
+class LRUCache(object):
+  """Least recently used (LRU) cache.
+
+  When the cache is full the least recently used object is removed to make
+  room for a new object.
+
+  Attributes:
+    maximum_number_of_objects (int): maximum number of cached objects.
+    number_of_hits (int): number of lookups that were found in the cache.
+    number_of_misses (int): number of lookups that were not found in
+        the cache.
+  """
+
+  def __init__(self, maximum_number_of_objects):
+    """Initializes a least recently used (LRU) cache.
+
+    Args:
+      maximum_number_of_objects (int): maximum number of cached objects,
+          where 0 represents the cache is disabled.
+
+    Raises:
+      ValueError: if the maximum number of objects value is out of bounds.
+    """
+    if maximum_number_of_objects < 0:
+      raise ValueError('Maximum number of objects value out of bounds.')
+
+    super(LRUCache, self).__init__()
+    self._values = collections.OrderedDict()
+    self.maximum_number_of_objects = maximum_number_of_objects
+    self.number_of_hits = 0
+    self.number_of_misses = 0
+
+  def __len__(self):
+    """Retrieves the number of cached objects."""
+    return len(self._values)
+
+  def CacheObject(self, identifier, value):
+    """Caches an object.
+
+    Args:
+      identifier (object): hashable identifier of the object.
+      value (object): object to cache.
+    """
+    if not self.maximum_number_of_objects:
+      return
+
+    if identifier in self._values:
+      del self._values[identifier]
+
+    elif len(self._values) >= self.maximum_number_of_objects:
+      self._values.popitem(last=False)
+
+    self._values[identifier] = value
+
+  def Empty(self):
+    """Empties the cache."""
+    self._values = collections.OrderedDict()
+
+  def GetObject(self, identifier):
+    """Retrieves a cached object.
+
+    Args:
+      identifier (object): hashable identifier of the object.
+
+    Returns:
+      object: cached object or None if not cached.
+    """
+    value = self._values.pop(identifier, None)
+    if value is None:
+      self.number_of_misses += 1
+      return None
+
+    # Re-insert the object to mark it as the most recently used.
+    self._values[identifier] = value
+    self.number_of_hits += 1
+    return value
@@ -3,6 +3,7 @@
 
 from __future__ import unicode_literals
 
+import pickle
 import threading
 
 from plaso.analysis import mediator as analysis_mediator
@@ -10,6 +11,7 @@ from plaso.containers import tasks
 from plaso.engine import plaso_queue
 from plaso.lib import definitions
 from plaso.lib import errors
+from plaso.lib import py2to3
 from plaso.multi_processing import base_process
 from plaso.multi_processing import logger
 
@@ -163,6 +165,11 @@ class AnalysisProcess(base_process.MultiProcessBaseProcess):
           logger.debug('ConsumeItems exiting, dequeued QueueAbort object.')
           break
 
+        # Events are pushed on the event queue serialized and are only
+        # deserialized by the analysis process that consumes them.
+        if isinstance(event, (py2to3.BYTES_TYPE, memoryview)):
+          event = pickle.loads(event)
+
         self._ProcessEvent(self._analysis_mediator, event)
 
         self._number_of_consumed_events += 1
@@ -52,6 +52,7 @@ class MultiProcessBaseProcess(multiprocessing.Process):
     self._pid = None
     self._processing_configuration = processing_configuration
     self._process_information = None
+    self._processing_costs_profiler = None
     self._processing_profiler = None
     self._quiet_mode = False
     self._rpc_server = None
@@ -194,6 +195,10 @@ class MultiProcessBaseProcess(multiprocessing.Process):
           identifier, configuration)
       self._processing_profiler.Start()
 
+      self._processing_costs_profiler = profilers.ProcessingCostsProfiler(
+          self._name, configuration)
+      self._processing_costs_profiler.Start()
+
     if configuration.HaveProfileSerializers():
       identifier = '{0:s}-serializers'.format(self._name)
       self._serializers_profiler = profilers.SerializersProfiler(
@@ -240,6 +245,10 @@ class MultiProcessBaseProcess(multiprocessing.Process):
       self._processing_profiler.Stop()
       self._processing_profiler = None
 
+    if self._processing_costs_profiler:
+      self._processing_costs_profiler.Stop()
+      self._processing_costs_profiler = None
+
     if self._serializers_profiler:
       self._serializers_profiler.Stop()
       self._serializers_profiler = None
@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""Worker processes that format events for linear output modules."""
+
+from __future__ import unicode_literals
+
+import collections
+import multiprocessing
+
+# The following imports are needed to register the formatters and output
+# modules in the worker processes.
+from plaso import formatters  # pylint: disable=unused-import
+from plaso import output  # pylint: disable=unused-import
+
+from plaso.engine import knowledge_base
+from plaso.formatters import mediator as formatters_mediator
+from plaso.output import manager as output_manager
+from plaso.output import mediator as output_mediator
+
+
+# The output module used by a worker process to format events. The output
+# module is set when the worker process is initialized.
+_output_module = None
+
+
+class _StringOutputWriter(object):
+  """Output writer that stores the output in memory."""
+
+  def __init__(self):
+    """Initializes an output writer."""
+    super(_StringOutputWriter, self).__init__()
+    self._strings = []
+
+  def GetString(self):
+    """Retrieves the output that has been written.
+
+    Returns:
+      str: output.
+    """
+    return ''.join(self._strings)
+
+  def Write(self, string):
+    """Writes a string to the output.
+
+    Args:
+      string (str): output.
+    """
+    self._strings.append(string)
+
+
+def _FormatEvents(operations):
+  """Formats events using the output module of the worker process.
+
+  This function is run by the export worker processes and therefore is
+  defined at module level.
+
+  Args:
+    operations (list[tuple[bool, object]]): write operations, where every
+        operation contains a boolean that indicates the value is an event
+        MACB group and the event or event MACB group.
+
+  Returns:
+    str: formatted output of the events.
+  """
+  output_writer = _StringOutputWriter()
+  _output_module.SetOutputWriter(output_writer)
+
+  for is_event_macb_group, value in operations:
+    if is_event_macb_group:
+      _output_module.WriteEventMACBGroup(value)
+    else:
+      _output_module.WriteEvent(value)
+
+  return output_writer.GetString()
+
+
+def _GetWorkerArguments(output_module):
+  """Retrieves the arguments to initialize an export worker process.
+
+  The output module itself cannot be passed to a worker process since it
+  can contain objects that cannot be pickled, such as its output writer.
+  Instead the worker process creates an output module based on a picklable
+  description of the output module.
+
+  Args:
+    output_module (LinearOutputModule): output module used to format events.
+
+  Returns:
+    tuple: containing:
+
+      str: name of the output module.
+      dict[str, object]: parameters of the output module.
+      dict[str, object]: parameters of the output mediator or None if the
+          output module has no output mediator.
+      dict[str, SystemConfigurationArtifact]: system configuration artifacts
+          per session identifier, used to create the knowledge base.
+  """
+  # pylint: disable=protected-access
+  mediator = output_module._output_mediator
+  if not mediator:
+    return output_module.NAME, output_module.GetParameters(), None, {}
+
+  data_location = None
+  language_identifier = None
+  if mediator.formatter_mediator:
+    data_location = mediator.formatter_mediator.data_location
+    language_identifier = mediator.formatter_mediator.language_identifier
+
+  mediator_parameters = {
+      'data_location': data_location,
+      'language_identifier': language_identifier,
+      'preferred_encoding': mediator.encoding,
+      'timezone': mediator.timezone.zone}
+
+  system_configurations = {}
+  if mediator.knowledge_base:
+    system_configurations = (
+        mediator.knowledge_base.GetSystemConfigurationArtifacts())
+
+  return (
+      output_module.NAME, output_module.GetParameters(), mediator_parameters,
+      system_configurations)
+
+
+def _InitializeWorker(
+    output_module_name, output_module_parameters, mediator_parameters,
+    system_configurations):
+  """Initializes an export worker process.
+
+  Args:
+    output_module_name (str): name of the output module used to format events.
+    output_module_parameters (dict[str, object]): parameters of the output
+        module.
+    mediator_parameters (dict[str, object]): parameters of the output
+        mediator or None if the output module has no output mediator.
+    system_configurations (dict[str, SystemConfigurationArtifact]): system
+        configuration artifacts per session identifier, used to create
+        the knowledge base.
+  """
+  global _output_module  # pylint: disable=global-statement
+
+  mediator = None
+  if mediator_parameters is not None:
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+    for session_identifier, system_configuration in (
+        system_configurations.items()):
+      knowledge_base_object.ReadSystemConfigurationArtifact(
+          system_configuration, session_identifier=session_identifier)
+
+    formatter_mediator = formatters_mediator.FormatterMediator(
+        data_location=mediator_parameters['data_location'])
+    if mediator_parameters['language_identifier']:
+      formatter_mediator.SetPreferredLanguageIdentifier(
+          mediator_parameters['language_identifier'])
+
+    mediator = output_mediator.OutputMediator(
+        knowledge_base_object, formatter_mediator,
+        preferred_encoding=mediator_parameters['preferred_encoding'])
+    mediator.SetTimezone(mediator_parameters['timezone'])
+
+  _output_module = output_manager.OutputManager.NewOutputModule(
+      output_module_name, mediator)
+  _output_module.SetParameters(output_module_parameters)
+
+
+class ExportWorkerPool(object):
+  """Pool of worker processes that format events for an output module.
+
+  Events are buffered into fixed size chunks that are formatted by the worker
+  processes in parallel. The formatted output of the chunks is written by
+  the parent process in the order the events were added.
+
+  The pool implements the event writing methods of an output module so it
+  can be used in place of the output module it formats events for.
+  """
+
+  # The default number of events in a chunk.
+  _DEFAULT_CHUNK_SIZE = 1000
+
+  def __init__(self, output_module, number_of_workers, chunk_size=0):
+    """Initializes an export worker pool.
+
+    Args:
+      output_module (LinearOutputModule): output module that supports
+          parallel export.
+      number_of_workers (int): number of worker processes.
+      chunk_size (Optional[int]): number of events formatted by a worker
+          process at once. A value of 0 indicates the size is
+          _DEFAULT_CHUNK_SIZE.
+
+    Raises:
+      ValueError: if the output module does not support parallel export,
+          or the number of workers or chunk size is out of bounds.
+    """
+    if not getattr(output_module, 'SUPPORTS_PARALLEL_EXPORT', False):
+      raise ValueError('Output module does not support parallel export.')
+
+    if number_of_workers < 1:
+      raise ValueError('Number of workers value out of bounds.')
+
+    if chunk_size < 0:
+      raise ValueError('Chunk size value out of bounds.')
+
+    super(ExportWorkerPool, self).__init__()
+    self._chunk = []
+    self._chunk_size = chunk_size or self._DEFAULT_CHUNK_SIZE
+    self._number_of_events_in_chunk = 0
+    self._number_of_workers = number_of_workers
+    self._output_module = output_module
+    self._pending_results = collections.deque()
+    self._pool = None
+
+  def _StartFormattingChunk(self):
+    """Starts formatting the current chunk in a worker process."""
+    if not self._chunk:
+      return
+
+    # Limit the number of chunks in flight so that the memory usage of
+    # the parent process is bounded.
+    if len(self._pending_results) >= 2 * self._number_of_workers:
+      self._WriteNextResult()
+
+    result = self._pool.apply_async(_FormatEvents, (self._chunk, ))
+    self._pending_results.append(result)
+
+    self._chunk = []
+    self._number_of_events_in_chunk = 0
+
+  def _WriteNextResult(self):
+    """Writes the formatted output of the oldest pending chunk."""
+    result = self._pending_results.popleft()
+    self._output_module.WriteFormattedOutput(result.get())
+
+  def Flush(self):
+    """Formats and writes all buffered events."""
+    self._StartFormattingChunk()
+
+    while self._pending_results:
+      self._WriteNextResult()
+
+  def Start(self):
+    """Starts the worker processes."""
+    if not self._pool:
+      self._pool = multiprocessing.Pool(
+          processes=self._number_of_workers, initializer=_InitializeWorker,
+          initargs=_GetWorkerArguments(self._output_module))
+
+  def Stop(self):
+    """Stops the worker processes.
+
+    Buffered events that have not been flushed are discarded.
+    """
+    if self._pool:
+      self._pool.terminate()
+      self._pool.join()
+      self._pool = None
+
+    self._chunk = []
+    self._number_of_events_in_chunk = 0
+    self._pending_results = collections.deque()
+
+  def WriteEvent(self, event):
+    """Writes an event.
+
+    Args:
+      event (EventObject): event.
+    """
+    self._chunk.append((False, event))
+    self._number_of_events_in_chunk += 1
+
+    if self._number_of_events_in_chunk >= self._chunk_size:
+      self._StartFormattingChunk()
+
+  def WriteEventMACBGroup(self, event_macb_group):
+    """Writes an event MACB group.
+
+    Args:
+      event_macb_group (list[EventObject]): group of events with identical
+          timestamps, attributes and values.
+    """
+    self._chunk.append((True, event_macb_group))
+    self._number_of_events_in_chunk += len(event_macb_group)
+
+    if self._number_of_events_in_chunk >= self._chunk_size:
+      self._StartFormattingChunk()
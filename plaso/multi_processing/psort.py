@@ -6,6 +6,7 @@ from __future__ import unicode_literals
 import collections
 import heapq
 import os
+import pickle
 import time
 
 from plaso.engine import plaso_queue
@@ -16,14 +17,24 @@ from plaso.lib import definitions
 from plaso.lib import py2to3
 from plaso.multi_processing import analysis_process
 from plaso.multi_processing import engine as multi_process_engine
+from plaso.multi_processing import export_workers
 from plaso.multi_processing import logger
 from plaso.multi_processing import multi_process_queue
+from plaso.multi_processing import shard_readers
+from plaso.multi_processing import shared_memory_queue
 from plaso.storage import event_tag_index
+from plaso.storage import interface as storage_interface
 from plaso.storage import time_range as storage_time_range
 
 
 class PsortEventHeap(object):
-  """Psort event heap."""
+  """Psort event heap.
+
+  The identifiers of an event are only determined when there is more than
+  one event on the heap, since they are only used to order, deduplicate and
+  group events relative to each other. An event that is the only event on
+  the heap has empty identifiers instead.
+  """
 
   _IDENTIFIER_EXCLUDED_ATTRIBUTES = frozenset([
       'data_type',
@@ -35,16 +46,50 @@ class PsortEventHeap(object):
       'timestamp',
       'timestamp_desc'])
 
+  # The 'atime', 'ctime', 'crtime', 'mtime' are included for backwards
+  # compatibility with the filestat parser.
+  _MACB_TIMESTAMP_DESCRIPTIONS = frozenset([
+      'atime',
+      'ctime',
+      'crtime',
+      'mtime',
+      definitions.TIME_DESCRIPTION_LAST_ACCESS,
+      definitions.TIME_DESCRIPTION_CHANGE,
+      definitions.TIME_DESCRIPTION_CREATION,
+      definitions.TIME_DESCRIPTION_MODIFICATION])
+
   def __init__(self):
     """Initializes a psort events heap."""
     super(PsortEventHeap, self).__init__()
     self._heap = []
+    self._has_deferred_identifiers = False
 
   @property
   def number_of_events(self):
     """int: number of events on the heap."""
     return len(self._heap)
 
+  def _GetDeferredHeapValues(self, event):
+    """Retrieves the heap values of an event whose identifiers are deferred.
+
+    Args:
+      event (EventObject): event.
+
+    Returns:
+      tuple: contains:
+
+        str: empty identifier of the event MACB group or None if the event
+            cannot be grouped.
+        str: empty identifier of the event content.
+        EventObject: event.
+    """
+    if event.timestamp_desc in self._MACB_TIMESTAMP_DESCRIPTIONS:
+      macb_group_identifier = ''
+    else:
+      macb_group_identifier = None
+
+    return macb_group_identifier, '', event
+
   def _GetEventIdentifiers(self, event):
     """Retrieves different identifiers of the event.
 
@@ -64,6 +109,9 @@ class PsortEventHeap(object):
     timestamps. The PsortEventHeap will store these events individually and
     relies on PsortMultiProcessEngine to do the actual grouping of events.
 
+    The attributes are formatted and joined only once, the event content
+    identifier is derived from the resulting string.
+
     Args:
       event (EventObject): event.
 
@@ -74,10 +122,7 @@ class PsortEventHeap(object):
             be grouped.
         str: identifier of the event content.
     """
-    attributes = []
-
-    attribute_string = 'data_type: {0:s}'.format(event.data_type)
-    attributes.append(attribute_string)
+    attributes = ['data_type: {0:s}'.format(event.data_type)]
 
     for attribute_name, attribute_value in sorted(event.GetAttributes()):
       if attribute_name in self._IDENTIFIER_EXCLUDED_ATTRIBUTES:
@@ -106,20 +151,15 @@ class PsortEventHeap(object):
             attribute_name))
       attributes.append(attribute_string)
 
-    # The 'atime', 'ctime', 'crtime', 'mtime' are included for backwards
-    # compatibility with the filestat parser.
-    if event.timestamp_desc in (
-        'atime', 'ctime', 'crtime', 'mtime',
-        definitions.TIME_DESCRIPTION_LAST_ACCESS,
-        definitions.TIME_DESCRIPTION_CHANGE,
-        definitions.TIME_DESCRIPTION_CREATION,
-        definitions.TIME_DESCRIPTION_MODIFICATION):
-      macb_group_identifier = ', '.join(attributes)
+    attributes_string = ', '.join(attributes)
+
+    if event.timestamp_desc in self._MACB_TIMESTAMP_DESCRIPTIONS:
+      macb_group_identifier = attributes_string
     else:
       macb_group_identifier = None
 
-    attributes.insert(0, event.timestamp_desc)
-    content_identifier = ', '.join(attributes)
+    content_identifier = '{0:s}, {1:s}'.format(
+        event.timestamp_desc, attributes_string)
 
     return macb_group_identifier, content_identifier
 
@@ -135,11 +175,14 @@ class PsortEventHeap(object):
         EventObject: event.
     """
     try:
-      return heapq.heappop(self._heap)
+      heap_values = heapq.heappop(self._heap)
 
     except IndexError:
       return None
 
+    self._has_deferred_identifiers = False
+    return heap_values
+
   def PopEvents(self):
     """Pops events from the heap.
 
@@ -157,6 +200,19 @@ class PsortEventHeap(object):
     Args:
       event (EventObject): event.
     """
+    if not self._heap:
+      self._heap.append(self._GetDeferredHeapValues(event))
+      self._has_deferred_identifiers = True
+      return
+
+    if self._has_deferred_identifiers:
+      _, _, deferred_event = self._heap[0]
+      macb_group_identifier, content_identifier = self._GetEventIdentifiers(
+          deferred_event)
+      self._heap[0] = (macb_group_identifier, content_identifier,
+                       deferred_event)
+      self._has_deferred_identifiers = False
+
     macb_group_identifier, content_identifier = self._GetEventIdentifiers(event)
 
     # We can ignore the timestamp here because the psort engine only stores
@@ -168,17 +224,27 @@ class PsortEventHeap(object):
 class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
   """Psort multi-processing engine."""
 
+  # Maximum number of serialized events pushed on an event queue at once.
+  _EVENT_QUEUE_BATCH_SIZE = 32
+
+  # Size of the shared memory ring buffer used to pass events to the analysis
+  # processes.
+  _EVENT_RING_BUFFER_SIZE = 32 * 1024 * 1024
+
   _PROCESS_JOIN_TIMEOUT = 5.0
   _PROCESS_WORKER_TIMEOUT = 15.0 * 60.0
 
   _QUEUE_TIMEOUT = 10 * 60
 
-  def __init__(self, use_zeromq=True):
+  def __init__(self, use_zeromq=True, use_shared_memory=True):
     """Initializes an engine object.
 
     Args:
       use_zeromq (Optional[bool]): True if ZeroMQ should be used for queuing
           instead of Python's multiprocessing queue.
+      use_shared_memory (Optional[bool]): True if events should be passed to
+          the analysis processes with a single ring buffer in shared memory
+          instead of a queue per analysis process.
     """
     super(PsortMultiProcessEngine, self).__init__()
     self._analysis_plugins = {}
@@ -186,6 +252,9 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
     self._data_location = None
     self._event_filter_expression = None
     self._event_queues = {}
+    self._event_ring_buffer = None
+    self._event_ring_buffer_consumers = {}
+    self._event_ring_buffer_queue = None
     self._event_tag_index = event_tag_index.EventTagIndex()
     # The export event heap is used to make sure the events are sorted in
     # a deterministic way.
@@ -212,6 +281,7 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
     self._serializers_profiler = None
     self._status = definitions.PROCESSING_STATUS_IDLE
     self._status_update_callback = None
+    self._use_shared_memory = use_shared_memory
     self._use_zeromq = use_zeromq
     self._worker_memory_limit = definitions.DEFAULT_WORKER_MEMORY_LIMIT
 
@@ -243,6 +313,10 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
 
     filter_limit = getattr(event_filter, 'limit', None)
 
+    # Every event is serialized once and the same serialized event is pushed
+    # on the event queue of every analysis plugin, in batches.
+    serialized_events = []
+
     for event in storage_writer.GetSortedEvents():
       event_data_identifier = event.GetEventDataIdentifier()
       if event_data_identifier:
@@ -266,9 +340,10 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
         number_of_filtered_events += 1
         continue
 
-      for event_queue in self._event_queues.values():
-        # TODO: Check for premature exit of analysis plugins.
-        event_queue.PushItem(event)
+      serialized_events.append(pickle.dumps(event, pickle.HIGHEST_PROTOCOL))
+      if len(serialized_events) >= self._EVENT_QUEUE_BATCH_SIZE:
+        self._PushSerializedEvents(serialized_events)
+        serialized_events = []
 
       self._number_of_consumed_events += 1
 
@@ -276,10 +351,12 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
           filter_limit == self._number_of_consumed_events):
         break
 
+    if serialized_events:
+      self._PushSerializedEvents(serialized_events)
+
     logger.debug('Finished pushing events to analysis plugins.')
     # Signal that we have finished adding events.
-    for event_queue in self._event_queues.values():
-      event_queue.PushItem(plaso_queue.QueueAbort(), block=False)
+    self._PushQueueAbort()
 
     logger.debug('Processing analysis plugin results.')
 
@@ -417,7 +494,8 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
     """Exports an event using an output module.
 
     Args:
-      output_module (OutputModule): output module.
+      output_module (OutputModule|ExportWorkerPool): output module or pool
+          of worker processes that format events for the output module.
       event (EventObject): event.
       deduplicate_events (Optional[bool]): True if events should be
           deduplicated.
@@ -431,15 +509,27 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
 
   def _ExportEvents(
       self, storage_reader, output_module, deduplicate_events=True,
-      event_filter=None, time_slice=None, use_time_slicer=False):
+      event_filter=None, number_of_reader_processes=0, time_slice=None,
+      use_time_slicer=False):
     """Exports events using an output module.
 
+    If reader processes are requested and the storage reader is file-based,
+    the events are split into time shards that are read by separate processes.
+
+    Unless the 'time slicer' is used, the constraints of the event filter
+    that storage can evaluate, such as time bounds, are pushed down so that
+    events that can never match the filter are not read.
+
     Args:
       storage_reader (StorageReader): storage reader.
-      output_module (OutputModule): output module.
+      output_module (OutputModule|ExportWorkerPool): output module or pool
+          of worker processes that format events for the output module.
       deduplicate_events (Optional[bool]): True if events should be
           deduplicated.
       event_filter (Optional[FilterObject]): event filter.
+      number_of_reader_processes (Optional[int]): number of processes used
+          to read events, where 0 represents reading events in the main
+          process.
       time_slice (Optional[TimeRange]): time range that defines a time slice
           to filter events.
       use_time_slicer (Optional[bool]): True if the 'time slicer' should be
@@ -469,7 +559,52 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
     number_of_filtered_events = 0
     number_of_events_from_time_slice = 0
 
-    for event in storage_reader.GetSortedEvents(time_range=time_slice_range):
+    # The 'time slicer' requires the events that do not match the filter
+    # hence the filter cannot be pushed down.
+    pushdown_plan = None
+    if event_filter and time_slice_buffer is None:
+      pushdown_plan = event_filter.GetPushdownPlan()
+
+    data_types = None
+    has_matching_events = True
+    parser_chains = None
+    read_time_range = time_slice_range
+    if pushdown_plan and pushdown_plan.is_constrained:
+      data_types = pushdown_plan.attribute_values.get('data_type', None)
+      parser_chains = pushdown_plan.attribute_values.get('parser', None)
+
+      if pushdown_plan.is_empty:
+        has_matching_events = False
+
+      else:
+        try:
+          read_time_range = pushdown_plan.GetTimeRange(
+              time_range=time_slice_range)
+        except ValueError:
+          # The time range of the filter and the time slice do not overlap.
+          has_matching_events = False
+
+    event_generator = None
+    if not has_matching_events:
+      logger.debug('Event filter cannot match any event.')
+      event_generator = iter([])
+
+    elif (number_of_reader_processes and
+          isinstance(storage_reader, storage_interface.StorageFileReader)):
+      time_ranges = storage_reader.GetEventTimeRanges(
+          number_of_reader_processes, time_range=read_time_range)
+      if len(time_ranges) > 1:
+        shard_reader = shard_readers.TimeShardedEventReader(
+            storage_reader.path)
+        event_generator = shard_reader.GetSortedEvents(
+            time_ranges, data_types=data_types, parser_chains=parser_chains)
+
+    if event_generator is None:
+      event_generator = storage_reader.GetSortedEvents(
+          time_range=read_time_range, data_types=data_types,
+          parser_chains=parser_chains)
+
+    for event in event_generator:
       event_data_identifier = event.GetEventDataIdentifier()
       if event_data_identifier:
         event_data = storage_reader.GetEventDataByIdentifier(
@@ -559,7 +694,8 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
     """Flushes buffered events and writes them to the output module.
 
     Args:
-      output_module (OutputModule): output module.
+      output_module (OutputModule|ExportWorkerPool): output module or pool
+          of worker processes that format events for the output module.
       deduplicate_events (Optional[bool]): True if events should be
           deduplicated.
     """
@@ -626,6 +762,31 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
 
     self._event_tag_index.SetEventTag(attribute_container)
 
+  def _PushQueueAbort(self):
+    """Pushes a QueueAbort on the event queues of the analysis plugins."""
+    if self._event_ring_buffer_queue:
+      self._event_ring_buffer_queue.PushItem(
+          plaso_queue.QueueAbort(), block=False)
+
+    else:
+      for event_queue in self._event_queues.values():
+        event_queue.PushItem(plaso_queue.QueueAbort(), block=False)
+
+  def _PushSerializedEvents(self, serialized_events):
+    """Pushes serialized events on the event queues of the analysis plugins.
+
+    Args:
+      serialized_events (list[bytes]): serialized events.
+    """
+    if self._event_ring_buffer_queue:
+      # The analysis processes read the events from the same ring buffer.
+      self._event_ring_buffer_queue.PushItems(serialized_events)
+
+    else:
+      for event_queue in self._event_queues.values():
+        # TODO: Check for premature exit of analysis plugins.
+        event_queue.PushItems(serialized_events)
+
   def _StartAnalysisProcesses(self, storage_writer, analysis_plugins):
     """Starts the analysis processes.
 
@@ -636,6 +797,12 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
     """
     logger.info('Starting analysis plugins.')
 
+    if self._use_shared_memory:
+      self._event_ring_buffer = shared_memory_queue.SharedMemoryRingBuffer(
+          len(analysis_plugins), size=self._EVENT_RING_BUFFER_SIZE)
+      self._event_ring_buffer_queue = shared_memory_queue.SharedMemoryPushQueue(
+          self._event_ring_buffer, timeout=self._QUEUE_TIMEOUT)
+
     for analysis_plugin in analysis_plugins.values():
       self._analysis_plugins[analysis_plugin.NAME] = analysis_plugin
 
@@ -689,15 +856,14 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
       # Signal all the processes to abort.
       self._AbortTerminate()
 
-    if not self._use_zeromq:
+    if not self._use_zeromq and not self._event_ring_buffer_queue:
       logger.debug('Emptying queues.')
       for event_queue in self._event_queues.values():
         event_queue.Empty()
 
     # Wake the processes to make sure that they are not blocking
     # waiting for the queue new items.
-    for event_queue in self._event_queues.values():
-      event_queue.PushItem(plaso_queue.QueueAbort(), block=False)
+    self._PushQueueAbort()
 
     # Try waiting for the processes to exit normally.
     self._AbortJoin(timeout=self._PROCESS_JOIN_TIMEOUT)
@@ -715,6 +881,13 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
       for event_queue in self._event_queues.values():
         event_queue.Close(abort=True)
 
+    if self._event_ring_buffer_queue:
+      self._event_ring_buffer_queue.Close(abort=abort)
+
+    self._event_ring_buffer = None
+    self._event_ring_buffer_consumers = {}
+    self._event_ring_buffer_queue = None
+
   def _UpdateProcessingStatus(self, pid, process_status, used_memory):
     """Updates the processing status.
 
@@ -802,7 +975,16 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
       logger.error('Missing analysis plugin: {0:s}'.format(process_name))
       return None
 
-    if self._use_zeromq:
+    if self._event_ring_buffer:
+      # A replacement process continues with the events of the process it
+      # replaces.
+      consumer_index = self._event_ring_buffer_consumers.setdefault(
+          process_name, len(self._event_ring_buffer_consumers))
+      output_event_queue = shared_memory_queue.SharedMemoryPopQueue(
+          self._event_ring_buffer, consumer_index,
+          timeout=self._QUEUE_TIMEOUT)
+
+    elif self._use_zeromq:
       queue_name = '{0:s} output event queue'.format(process_name)
       output_event_queue = zeromq_queue.ZeroMQPushBindQueue(
           name=queue_name, timeout_seconds=self._QUEUE_TIMEOUT)
@@ -816,7 +998,7 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
 
     self._event_queues[process_name] = output_event_queue
 
-    if self._use_zeromq:
+    if self._use_zeromq and not self._event_ring_buffer:
       queue_name = '{0:s} input event queue'.format(process_name)
       input_event_queue = zeromq_queue.ZeroMQPullConnectQueue(
           name=queue_name, delay_open=True, port=output_event_queue.port,
@@ -970,19 +1152,29 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
   def ExportEvents(
       self, knowledge_base_object, storage_reader, output_module,
       processing_configuration, deduplicate_events=True, event_filter=None,
-      status_update_callback=None, time_slice=None, use_time_slicer=False):
+      number_of_worker_processes=0, status_update_callback=None,
+      time_slice=None, use_time_slicer=False):
     """Exports events using an output module.
 
+    Filtering and deduplicating events is done by the main process. If worker
+    processes are requested the events are read in time shards by worker
+    processes and, if the output module supports parallel export, formatted
+    by worker processes.
+
     Args:
       knowledge_base_object (KnowledgeBase): contains information from
           the source data needed for processing.
       storage_reader (StorageReader): storage reader.
-      output_module (OutputModule): output module.
+      output_module (OutputModule|ExportWorkerPool): output module or pool
+          of worker processes that format events for the output module.
       processing_configuration (ProcessingConfiguration): processing
           configuration.
       deduplicate_events (Optional[bool]): True if events should be
           deduplicated.
       event_filter (Optional[FilterObject]): event filter.
+      number_of_worker_processes (Optional[int]): number of worker processes
+          used to read and to format events, where 0 represents reading and
+          formatting events in the main process.
       status_update_callback (Optional[function]): callback function for status
           updates.
       time_slice (Optional[TimeSlice]): slice of time to output.
@@ -1002,17 +1194,35 @@ class PsortMultiProcessEngine(multi_process_engine.MultiProcessEngine):
     output_module.Open()
     output_module.WriteHeader()
 
+    export_worker_pool = None
+    if number_of_worker_processes:
+      if output_module.SUPPORTS_PARALLEL_EXPORT:
+        export_worker_pool = export_workers.ExportWorkerPool(
+            output_module, number_of_worker_processes)
+        export_worker_pool.Start()
+      else:
+        logger.warning((
+            'Output module: {0:s} does not support parallel export, events '
+            'are formatted by the main process.').format(output_module.NAME))
+
     self._StartStatusUpdateThread()
 
     self._StartProfiling(self._processing_configuration.profiling)
 
     try:
       events_counter = self._ExportEvents(
-          storage_reader, output_module, deduplicate_events=deduplicate_events,
-          event_filter=event_filter, time_slice=time_slice,
-          use_time_slicer=use_time_slicer)
+          storage_reader, export_worker_pool or output_module,
+          deduplicate_events=deduplicate_events, event_filter=event_filter,
+          number_of_reader_processes=number_of_worker_processes,
+          time_slice=time_slice, use_time_slicer=use_time_slicer)
+
+      if export_worker_pool:
+        export_worker_pool.Flush()
 
     finally:
+      if export_worker_pool:
+        export_worker_pool.Stop()
+
       # Stop the status update thread after close of the storage writer
       # so we include the storage sync to disk in the status updates.
       self._StopStatusUpdateThread()
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""Processes that read the events of a storage file in time shards."""
+
+from __future__ import unicode_literals
+
+import multiprocessing
+
+# The 'Queue' module was renamed to 'queue' in Python 3
+try:
+  import Queue
+except ImportError:
+  import queue as Queue  # pylint: disable=import-error
+
+from plaso.multi_processing import logger
+from plaso.storage import factory as storage_factory
+
+
+def _ReadTimeShard(
+    storage_file_path, time_range, output_queue, chunk_size, data_types=None,
+    parser_chains=None):
+  """Reads the events of a time shard.
+
+  This function is run by the shard reader processes and therefore is
+  defined at module level.
+
+  Args:
+    storage_file_path (str): path of the storage file.
+    time_range (TimeRange): time range of the shard.
+    output_queue (multiprocessing.Queue): queue the chunks of events are
+        written to. The end of the shard is marked with None and an error with
+        a string that contains the error message.
+    chunk_size (int): number of events per chunk.
+    data_types (Optional[list[str]]): data types used to filter events.
+    parser_chains (Optional[list[str]]): parser chains used to filter
+        events.
+  """
+  try:
+    storage_reader = storage_factory.StorageFactory.CreateStorageReaderForFile(
+        storage_file_path)
+    if not storage_reader:
+      output_queue.put('Unsupported storage file: {0:s}'.format(
+          storage_file_path))
+      return
+
+    try:
+      chunk = []
+      event_generator = storage_reader.GetSortedEvents(
+          time_range=time_range, data_types=data_types,
+          parser_chains=parser_chains)
+      for event in event_generator:
+        chunk.append(event)
+        if len(chunk) >= chunk_size:
+          output_queue.put(chunk)
+          chunk = []
+
+      if chunk:
+        output_queue.put(chunk)
+
+    finally:
+      storage_reader.Close()
+
+  except Exception as exception:  # pylint: disable=broad-except
+    output_queue.put('Unable to read time shard with error: {0!s}'.format(
+        exception))
+    return
+
+  output_queue.put(None)
+
+
+class TimeShardedEventReader(object):
+  """Reads the events of a storage file in time shards.
+
+  The sorted events are split into consecutive time ranges (shards) that each
+  are read and deserialized by a separate process. Since the time ranges are
+  consecutive the events of the shards are returned in order by concatenating
+  the shards.
+  """
+
+  # The default number of events passed from a shard reader process to
+  # the parent process at once.
+  _DEFAULT_CHUNK_SIZE = 500
+
+  # The maximum number of chunks a shard reader process reads ahead.
+  _MAXIMUM_NUMBER_OF_QUEUED_CHUNKS = 16
+
+  _PROCESS_JOIN_TIMEOUT = 5.0
+
+  # Number of seconds to wait for a chunk before checking if the shard reader
+  # process is still alive.
+  _QUEUE_TIMEOUT = 1.0
+
+  def __init__(self, storage_file_path, chunk_size=0):
+    """Initializes a time sharded event reader.
+
+    Args:
+      storage_file_path (str): path of the storage file.
+      chunk_size (Optional[int]): number of events passed from a shard reader
+          process to the parent process at once. A value of 0 indicates the
+          size is _DEFAULT_CHUNK_SIZE.
+
+    Raises:
+      ValueError: if the chunk size is out of bounds.
+    """
+    if chunk_size < 0:
+      raise ValueError('Chunk size value out of bounds.')
+
+    super(TimeShardedEventReader, self).__init__()
+    self._chunk_size = chunk_size or self._DEFAULT_CHUNK_SIZE
+    self._storage_file_path = storage_file_path
+
+  def _GetChunk(self, process, output_queue):
+    """Retrieves the next chunk of events from a shard reader process.
+
+    Args:
+      process (multiprocessing.Process): shard reader process.
+      output_queue (multiprocessing.Queue): queue of the shard reader process.
+
+    Returns:
+      list[EventObject]: events or None if all events of the shard were read.
+
+    Raises:
+      IOError: if the shard reader process failed.
+    """
+    while True:
+      try:
+        chunk = output_queue.get(timeout=self._QUEUE_TIMEOUT)
+        break
+
+      except Queue.Empty:
+        if process.is_alive():
+          continue
+
+        # The process could have exited after the timeout.
+        try:
+          chunk = output_queue.get_nowait()
+          break
+
+        except Queue.Empty:
+          raise IOError(
+              'Shard reader process: {0:s} exited unexpectedly.'.format(
+                  process.name))
+
+    if chunk is not None and not isinstance(chunk, list):
+      raise IOError(chunk)
+
+    return chunk
+
+  def _StopProcesses(self, processes):
+    """Stops shard reader processes.
+
+    Args:
+      processes (list[multiprocessing.Process]): shard reader processes.
+    """
+    for process in processes:
+      if process.is_alive():
+        process.terminate()
+
+    for process in processes:
+      process.join(timeout=self._PROCESS_JOIN_TIMEOUT)
+
+  def GetSortedEvents(self, time_ranges, data_types=None, parser_chains=None):
+    """Retrieves the events in increasing chronological order.
+
+    Args:
+      time_ranges (list[TimeRange]): consecutive time ranges, in increasing
+          chronological order, where each time range is read by a separate
+          process.
+      data_types (Optional[list[str]]): data types used to filter events.
+      parser_chains (Optional[list[str]]): parser chains used to filter
+          events.
+
+    Yields:
+      EventObject: event.
+
+    Raises:
+      IOError: if a time shard cannot be read.
+    """
+    processes = []
+    queues = []
+
+    try:
+      for time_range in time_ranges:
+        output_queue = multiprocessing.Queue(
+            maxsize=self._MAXIMUM_NUMBER_OF_QUEUED_CHUNKS)
+        process = multiprocessing.Process(
+            target=_ReadTimeShard, args=(
+                self._storage_file_path, time_range, output_queue,
+                self._chunk_size, data_types, parser_chains))
+        process.daemon = True
+        process.start()
+
+        processes.append(process)
+        queues.append(output_queue)
+
+      for shard_index, process in enumerate(processes):
+        logger.debug('Reading events of time shard: {0:d}'.format(
+            shard_index))
+
+        output_queue = queues[shard_index]
+
+        chunk = self._GetChunk(process, output_queue)
+        while chunk is not None:
+          for event in chunk:
+            yield event
+
+          chunk = self._GetChunk(process, output_queue)
+
+    finally:
+      self._StopProcesses(processes)
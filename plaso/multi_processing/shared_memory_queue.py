@@ -0,0 +1,494 @@
+# -*- coding: utf-8 -*-
+"""Queues backed by a ring buffer in shared memory."""
+
+from __future__ import unicode_literals
+
+import ctypes
+import multiprocessing
+import struct
+import time
+
+from plaso.engine import plaso_queue
+from plaso.lib import errors
+from plaso.lib import py2to3
+
+
+class SharedMemoryRingBuffer(object):
+  """Single-producer, multi-consumer ring buffer in shared memory.
+
+  The ring buffer stores records, that consist of a 32-bit little-endian
+  data size followed by the data, in a shared memory data buffer. The data
+  buffer is allocated with multiprocessing.RawArray, which is backed by
+  mmap, so that it is shared with child processes. The positions in the
+  ring buffer are stored as cursors that only increase, where:
+
+  * the write cursor is the end of the data published by the producer;
+  * every consumer has a read cursor, which is the start of the data that
+    the consumer still uses.
+
+  The producer can only overwrite data that all consumers have released,
+  hence the slowest consumer provides back-pressure. Consumers that are
+  detached no longer hold back the producer.
+
+  Cursors are only read and updated while holding the condition lock, the
+  data itself is read and written without holding the lock.
+  """
+
+  _DATA_SIZE = struct.Struct('<I')
+
+  # Data size of a record that indicates that the remainder of the data
+  # buffer is unused and the next record is stored at the start of the data
+  # buffer.
+  _PADDING_DATA_SIZE = 0xffffffff
+
+  # Read cursor of a consumer that is detached.
+  _DETACHED_CURSOR = 0xffffffffffffffff
+
+  # Index of the write cursor, the end of data flag and the read cursor of
+  # the first consumer in the cursors array.
+  _WRITE_CURSOR_INDEX = 0
+  _END_OF_DATA_INDEX = 1
+  _READ_CURSORS_INDEX = 2
+
+  def __init__(self, number_of_consumers, size=32 * 1024 * 1024):
+    """Initializes a ring buffer.
+
+    Args:
+      number_of_consumers (int): number of consumers.
+      size (Optional[int]): size of the data buffer in bytes.
+
+    Raises:
+      ValueError: if the number of consumers or the size is not supported.
+    """
+    if number_of_consumers < 0:
+      raise ValueError('Unsupported number of consumers: {0:d}'.format(
+          number_of_consumers))
+
+    if size <= self._DATA_SIZE.size:
+      raise ValueError('Unsupported size: {0:d}'.format(size))
+
+    super(SharedMemoryRingBuffer, self).__init__()
+    self._condition = multiprocessing.Condition()
+    self._cursors = multiprocessing.RawArray(
+        ctypes.c_uint64, self._READ_CURSORS_INDEX + number_of_consumers)
+    self._data = multiprocessing.RawArray(ctypes.c_char, size)
+    self._data_view = None
+
+    self.number_of_consumers = number_of_consumers
+    self.size = size
+
+  def __getstate__(self):
+    """Retrieves the state for pickling.
+
+    Returns:
+      dict[str, object]: state.
+    """
+    state = dict(self.__dict__)
+    # A memory view cannot be pickled and is recreated on demand.
+    state['_data_view'] = None
+    return state
+
+  def _GetAvailableSize(self, write_cursor):
+    """Retrieves the size of the data buffer that can be written.
+
+    The condition lock must be held when calling this method.
+
+    Args:
+      write_cursor (int): write cursor.
+
+    Returns:
+      int: available size in bytes.
+    """
+    return self.size - (write_cursor - self._GetMinimumReadCursor())
+
+  def _GetDataView(self):
+    """Retrieves a view of the data buffer.
+
+    Returns:
+      memoryview|ctypes.Array: memory view of the data buffer or the data
+          buffer itself on Python 2, which does not support casting memory
+          views.
+    """
+    if self._data_view is None:
+      if py2to3.PY_2:
+        self._data_view = self._data
+      else:
+        self._data_view = memoryview(self._data).cast('B')
+    return self._data_view
+
+  def _GetMinimumReadCursor(self):
+    """Retrieves the read cursor of the slowest attached consumer.
+
+    The condition lock must be held when calling this method.
+
+    Returns:
+      int: minimum read cursor or the write cursor if no consumer is attached.
+    """
+    minimum_read_cursor = self._cursors[self._WRITE_CURSOR_INDEX]
+    for read_cursor in self._cursors[self._READ_CURSORS_INDEX:]:
+      if read_cursor != self._DETACHED_CURSOR:
+        minimum_read_cursor = min(minimum_read_cursor, read_cursor)
+    return minimum_read_cursor
+
+  def _Wait(self, predicate, timeout):
+    """Waits for a predicate to become true.
+
+    The condition lock must be held when calling this method.
+
+    Args:
+      predicate (function): predicate.
+      timeout (float): number of seconds to wait, where None represents
+          waiting without timeout.
+
+    Returns:
+      bool: True if the predicate is true, False if the wait timed out.
+    """
+    if timeout is not None:
+      last_wait_time = time.time() + timeout
+
+    while not predicate():
+      if timeout is None:
+        self._condition.wait()
+      else:
+        wait_time = last_wait_time - time.time()
+        if wait_time <= 0:
+          return False
+        self._condition.wait(wait_time)
+
+    return True
+
+  def DetachConsumer(self, consumer_index):
+    """Detaches a consumer.
+
+    A detached consumer no longer holds back the producer.
+
+    Args:
+      consumer_index (int): index of the consumer.
+    """
+    with self._condition:
+      self._cursors[self._READ_CURSORS_INDEX + consumer_index] = (
+          self._DETACHED_CURSOR)
+      self._condition.notify_all()
+
+  def GetReadCursor(self, consumer_index):
+    """Retrieves the read cursor of a consumer.
+
+    Args:
+      consumer_index (int): index of the consumer.
+
+    Returns:
+      int: read cursor of the consumer or the write cursor if the consumer
+          is detached.
+    """
+    with self._condition:
+      read_cursor = self._cursors[self._READ_CURSORS_INDEX + consumer_index]
+      if read_cursor == self._DETACHED_CURSOR:
+        read_cursor = self._cursors[self._WRITE_CURSOR_INDEX]
+      return read_cursor
+
+  def GetRecord(self, read_offset):
+    """Retrieves a record from the data buffer.
+
+    Args:
+      read_offset (int): read cursor of the record, which must precede
+          the write cursor.
+
+    Returns:
+      tuple[memoryview|bytes, int]: data of the record, which is a memory view
+          of the data buffer or a copy on Python 2, and read cursor of the next
+          record.
+    """
+    data_view = self._GetDataView()
+
+    position = read_offset % self.size
+    if self.size - position < self._DATA_SIZE.size:
+      read_offset += self.size - position
+      position = 0
+
+    data_size = self._DATA_SIZE.unpack_from(data_view, position)[0]
+    if data_size == self._PADDING_DATA_SIZE:
+      read_offset += self.size - position
+      position = 0
+      data_size = self._DATA_SIZE.unpack_from(data_view, position)[0]
+
+    position += self._DATA_SIZE.size
+    read_offset += self._DATA_SIZE.size + data_size
+    return data_view[position:position + data_size], read_offset
+
+  def ReleaseAndWaitForRecords(self, consumer_index, read_cursor, timeout):
+    """Releases the consumed data and waits for more records.
+
+    Args:
+      consumer_index (int): index of the consumer.
+      read_cursor (int): start of the data the consumer still uses.
+      timeout (float): number of seconds to wait, where None represents
+          waiting without timeout.
+
+    Returns:
+      tuple[int, bool]: write cursor and True if the producer has signaled
+          the end of data.
+    """
+    cursor_index = self._READ_CURSORS_INDEX + consumer_index
+
+    with self._condition:
+      self._cursors[cursor_index] = read_cursor
+      self._condition.notify_all()
+
+      self._Wait(lambda: (
+          self._cursors[self._WRITE_CURSOR_INDEX] > read_cursor or
+          self._cursors[self._END_OF_DATA_INDEX]), timeout)
+
+      return (
+          self._cursors[self._WRITE_CURSOR_INDEX],
+          bool(self._cursors[self._END_OF_DATA_INDEX]))
+
+  def SignalEndOfData(self):
+    """Signals the consumers that no more records will be written."""
+    with self._condition:
+      self._cursors[self._END_OF_DATA_INDEX] = 1
+      self._condition.notify_all()
+
+  def WriteRecords(self, records, block=True, timeout=None):
+    """Writes records to the data buffer.
+
+    The records are published to the consumers at once.
+
+    Args:
+      records (list[bytes]): data of the records.
+      block (Optional[bool]): True to wait for the consumers to release
+          space in the data buffer.
+      timeout (Optional[float]): number of seconds to wait, where None
+          represents waiting without timeout.
+
+    Returns:
+      bool: True if the records were written, False if there was not enough
+          space in the data buffer.
+
+    Raises:
+      ValueError: if a record does not fit in the data buffer.
+    """
+    data_view = self._GetDataView()
+
+    with self._condition:
+      write_cursor = self._cursors[self._WRITE_CURSOR_INDEX]
+      available_size = self._GetAvailableSize(write_cursor)
+
+    for record in records:
+      record_size = self._DATA_SIZE.size + len(record)
+      if record_size > self.size:
+        raise ValueError('Record size: {0:d} exceeds buffer size.'.format(
+            record_size))
+
+      position = write_cursor % self.size
+      padding_size = 0
+      if self.size - position < record_size:
+        padding_size = self.size - position
+
+      if padding_size + record_size > available_size:
+        with self._condition:
+          # Publish the records written so far before waiting for space.
+          self._cursors[self._WRITE_CURSOR_INDEX] = write_cursor
+          self._condition.notify_all()
+
+          required_size = padding_size + record_size
+          if not block or not self._Wait(lambda: (
+              self._GetAvailableSize(write_cursor) >= required_size), timeout):
+            return False
+
+          available_size = self._GetAvailableSize(write_cursor)
+
+      if padding_size:
+        if padding_size >= self._DATA_SIZE.size:
+          self._DATA_SIZE.pack_into(
+              data_view, position, self._PADDING_DATA_SIZE)
+        write_cursor += padding_size
+        available_size -= padding_size
+        position = 0
+
+      self._DATA_SIZE.pack_into(data_view, position, len(record))
+      position += self._DATA_SIZE.size
+      data_view[position:position + len(record)] = record
+      write_cursor += record_size
+      available_size -= record_size
+
+    with self._condition:
+      self._cursors[self._WRITE_CURSOR_INDEX] = write_cursor
+      self._condition.notify_all()
+
+    return True
+
+
+class SharedMemoryPushQueue(plaso_queue.Queue):
+  """Queue that writes serialized items to a shared memory ring buffer.
+
+  This queue may only be used to push items, not to pop. Pushing a
+  QueueAbort signals the consumers that no more items will be pushed.
+  """
+
+  def __init__(self, ring_buffer, timeout=None):
+    """Initializes a shared memory push queue.
+
+    Args:
+      ring_buffer (SharedMemoryRingBuffer): ring buffer.
+      timeout (Optional[float]): number of seconds for a blocking push to time
+          out, where None will block until there is space in the ring buffer.
+    """
+    super(SharedMemoryPushQueue, self).__init__()
+    self._ring_buffer = ring_buffer
+    self._timeout = timeout
+
+  def Close(self, abort=False):
+    """Closes the queue.
+
+    Args:
+      abort (Optional[bool]): True if the close was issued on abort.
+    """
+    self._ring_buffer.SignalEndOfData()
+
+  def IsEmpty(self):
+    """Determines if the queue is empty."""
+    raise errors.WrongQueueType()
+
+  def Open(self):
+    """Opens the queue."""
+    return
+
+  def PopItem(self):
+    """Pops an item off the queue.
+
+    Raises:
+      WrongQueueType: As Pop is not supported by this queue.
+    """
+    raise errors.WrongQueueType()
+
+  def PushItem(self, item, block=True):
+    """Pushes an item onto the queue.
+
+    Args:
+      item (bytes|QueueAbort): serialized item to add or QueueAbort to
+          signal that no more items will be pushed.
+      block (Optional[bool]): True to block the process when the queue is full.
+
+    Raises:
+      QueueFull: if the item could not be pushed the queue because it's full.
+      ValueError: if the item is not supported.
+    """
+    if isinstance(item, plaso_queue.QueueAbort):
+      self._ring_buffer.SignalEndOfData()
+    else:
+      self.PushItems([item], block=block)
+
+  def PushItems(self, items, block=True):
+    """Pushes serialized items onto the queue.
+
+    Args:
+      items (list[bytes]): serialized items to add.
+      block (Optional[bool]): True to block the process when the queue is full.
+
+    Raises:
+      QueueFull: if the items could not be pushed the queue because it's full.
+      ValueError: if an item is not supported.
+    """
+    for item in items:
+      if not isinstance(item, py2to3.BYTES_TYPE):
+        raise ValueError('Unsupported item type: {0!s}'.format(type(item)))
+
+    if not self._ring_buffer.WriteRecords(
+        items, block=block, timeout=self._timeout):
+      raise errors.QueueFull()
+
+
+class SharedMemoryPopQueue(plaso_queue.Queue):
+  """Queue that reads serialized items from a shared memory ring buffer.
+
+  This queue may only be used to pop items, not to push. Every consumer of
+  the ring buffer has its own pop queue, which starts reading at the read
+  cursor of the consumer. Hence a pop queue that replaces the pop queue of
+  a failed consumer continues with the data the failed consumer did not
+  release.
+
+  The popped items refer to the data in the ring buffer directly and
+  remain valid until the next item is popped. Releasing consumed data and
+  retrieving the position of newly written data requires a lock, hence the
+  pop queue only does so once all known items have been popped.
+  """
+
+  def __init__(self, ring_buffer, consumer_index, timeout=None):
+    """Initializes a shared memory pop queue.
+
+    Args:
+      ring_buffer (SharedMemoryRingBuffer): ring buffer.
+      consumer_index (int): index of the consumer.
+      timeout (Optional[float]): number of seconds for the pop to time out,
+          where None will block until a new item is pushed.
+
+    Raises:
+      ValueError: if the consumer index is out of bounds.
+    """
+    if consumer_index < 0 or consumer_index >= ring_buffer.number_of_consumers:
+      raise ValueError('Consumer index: {0:d} out of bounds.'.format(
+          consumer_index))
+
+    super(SharedMemoryPopQueue, self).__init__()
+    self._consumer_index = consumer_index
+    self._end_of_data = False
+    self._read_cursor = ring_buffer.GetReadCursor(consumer_index)
+    self._ring_buffer = ring_buffer
+    self._timeout = timeout
+    self._write_cursor = self._read_cursor
+
+  def Close(self, abort=False):
+    """Closes the queue.
+
+    Closing the queue detaches the consumer from the ring buffer.
+
+    Args:
+      abort (Optional[bool]): True if the close was issued on abort.
+    """
+    self._ring_buffer.DetachConsumer(self._consumer_index)
+
+  def IsEmpty(self):
+    """Determines if the queue is empty."""
+    return self._read_cursor >= self._write_cursor
+
+  def Open(self):
+    """Opens the queue."""
+    return
+
+  def PopItem(self):
+    """Pops an item off the queue.
+
+    Returns:
+      memoryview|bytes|QueueAbort: serialized item from the queue, which is
+          a memory view of the ring buffer or a copy on Python 2, or
+          a QueueAbort if no more items will be pushed.
+
+    Raises:
+      QueueEmpty: if no item could be retrieved from the queue within the
+          specified timeout.
+    """
+    if self._read_cursor >= self._write_cursor:
+      # The data of the previously popped item is released as well.
+      self._write_cursor, self._end_of_data = (
+          self._ring_buffer.ReleaseAndWaitForRecords(
+              self._consumer_index, self._read_cursor, self._timeout))
+
+      if self._read_cursor >= self._write_cursor:
+        if self._end_of_data:
+          return plaso_queue.QueueAbort()
+        raise errors.QueueEmpty
+
+    data, self._read_cursor = self._ring_buffer.GetRecord(self._read_cursor)
+    return data
+
+  def PushItem(self, item, block=True):
+    """Pushes an item onto the queue.
+
+    Args:
+      item (object): item to add.
+      block (Optional[bool]): whether to block if the queue is full.
+
+    Raises:
+      WrongQueueType: As Push is not supported by this queue.
+    """
+    raise errors.WrongQueueType()
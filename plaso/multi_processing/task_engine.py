@@ -7,8 +7,14 @@ import heapq
 import logging
 import multiprocessing
 import os
+import threading
 import time
 
+try:
+  import Queue  # pylint: disable=import-error
+except ImportError:
+  import queue as Queue  # pylint: disable=import-error
+
 from dfvfs.lib import definitions as dfvfs_definitions
 from dfvfs.resolver import context
 
@@ -16,6 +22,8 @@ from plaso.containers import event_sources
 from plaso.containers import errors as error_containers
 from plaso.engine import extractors
 from plaso.engine import plaso_queue
+from plaso.engine import processing_costs
+from plaso.engine import processing_status
 from plaso.engine import zeromq_queue
 from plaso.lib import definitions
 from plaso.lib import errors
@@ -28,18 +36,44 @@ from plaso.multi_processing import worker_process
 
 
 class _EventSourceHeap(object):
-  """Class that defines an event source heap."""
+  """Class that defines an event source heap.
+
+  Event sources of directories are popped first, since processing them
+  produces new event sources. Event sources of other file entries are popped
+  in order of decreasing estimated processing cost, which is known as longest
+  processing time first scheduling. This prevents a costly file entry that is
+  scheduled last from prolonging the processing of a source.
+  """
 
-  def __init__(self, maximum_number_of_items=50000):
+  def __init__(self, maximum_number_of_items=50000, processing_cost_model=None):
     """Initializes an event source heap.
 
     Args:
       maximum_number_of_items (Optional[int]): maximum number of items
           in the heap.
+      processing_cost_model (Optional[ProcessingCostModel]): processing cost
+          model used to estimate the processing cost of event sources, where
+          None represents a model without processing costs samples.
     """
     super(_EventSourceHeap, self).__init__()
     self._heap = []
     self._maximum_number_of_items = maximum_number_of_items
+    self._processing_cost_model = (
+        processing_cost_model or processing_costs.ProcessingCostModel())
+
+  def PeekEventSource(self):
+    """Retrieves the event source on top of the heap without popping it.
+
+    Returns:
+      EventSource: event source or None if the heap is empty.
+    """
+    try:
+      _, event_source = self._heap[0]
+
+    except IndexError:
+      return None
+
+    return event_source
 
   def PopEventSource(self):
     """Pops an event source from the heap.
@@ -67,9 +101,16 @@ class _EventSourceHeap(object):
     """
     if event_source.file_entry_type == (
         dfvfs_definitions.FILE_ENTRY_TYPE_DIRECTORY):
-      weight = 1
+      weight = (0, 0.0)
     else:
-      weight = 100
+      format_identifier = (
+          self._processing_cost_model.GetFormatIdentifier(
+              event_source.path_spec))
+      processing_cost = self._processing_cost_model.EstimateCost(
+          format_identifier, getattr(event_source, 'file_size', None))
+
+      # Note that the processing cost is negated since heapq is a min-heap.
+      weight = (1, -processing_cost)
 
     heap_values = (weight, event_source)
     heapq.heappush(self._heap, heap_values)
@@ -84,20 +125,46 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
   This class contains functionality to:
   * monitor and manage extraction tasks;
   * merge results returned by extraction workers.
+
+  While tasks are scheduled the results are merged by a merge thread, which
+  owns the session storage writer. The merge thread queues the event sources
+  written by merging for the task scheduler.
   """
 
-  # Maximum number of attribute containers to merge per loop.
+  # Maximum number of attribute containers to merge per loop of the merge
+  # thread, which allows tasks with a higher merge priority to be merged
+  # first.
   _MAXIMUM_NUMBER_OF_CONTAINERS = 50
 
+  # Maximum number of event sources queued by the merge thread.
+  _MAXIMUM_NUMBER_OF_QUEUED_EVENT_SOURCES = 10000
+
+  # Number of seconds the merge thread waits for a task pending merge or
+  # for space in the event source queue.
+  _MERGE_THREAD_WAIT_TIME = 0.1
+
   # Maximum number of concurrent tasks.
   _MAXIMUM_NUMBER_OF_TASKS = 10000
 
+  # Maximum number of path specifications of file entries batched into
+  # a single task.
+  _MAXIMUM_NUMBER_OF_PATH_SPECS_PER_TASK = 256
+
+  # Maximum total size of the data of file entries batched into a single
+  # task (4 MiB). File entries of this size or larger are processed by
+  # a task of their own.
+  _MAXIMUM_TASK_BATCH_SIZE = 4 * 1024 * 1024
+
   # Consider a worker inactive after 15 minutes of no activity.
   _PROCESS_WORKER_TIMEOUT = 15.0 * 60.0
 
   _WORKER_PROCESSES_MINIMUM = 2
   _WORKER_PROCESSES_MAXIMUM = 15
 
+  # Number of seconds the task scheduler waits when it has no task that can
+  # be scheduled.
+  _SCHEDULER_WAIT_TIME = 0.01
+
   _TASK_QUEUE_TIMEOUT_SECONDS = 2
 
   _ZEROMQ_NO_WORKER_REQUEST_TIME_SECONDS = 10 * 60
@@ -114,16 +181,23 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     """
     super(TaskMultiProcessEngine, self).__init__()
     self._enable_sigsegv_handler = False
+    self._event_source_queue = Queue.Queue(
+        maxsize=self._MAXIMUM_NUMBER_OF_QUEUED_EVENT_SOURCES)
     self._filter_find_specs = None
     self._last_worker_number = 0
     self._maximum_number_of_tasks = maximum_number_of_tasks
+    self._merge_active = False
+    self._merge_failed = False
     self._merge_task = None
     self._merge_task_on_hold = None
+    self._merge_thread = None
+    self._merge_time = 0.0
     self._number_of_consumed_errors = 0
     self._number_of_consumed_event_tags = 0
     self._number_of_consumed_events = 0
     self._number_of_consumed_reports = 0
     self._number_of_consumed_sources = 0
+    self._number_of_merged_tasks = 0
     self._number_of_produced_errors = 0
     self._number_of_produced_event_tags = 0
     self._number_of_produced_events = 0
@@ -131,7 +205,9 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     self._number_of_produced_sources = 0
     self._number_of_worker_processes = 0
     self._path_spec_extractor = extractors.PathSpecExtractor()
+    self._processed_path_specs = set()
     self._processing_configuration = None
+    self._processing_cost_model = None
     self._resolver_context = context.Context()
     self._session_identifier = None
     self._status = definitions.PROCESSING_STATUS_IDLE
@@ -142,6 +218,55 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     self._task_manager = task_manager.TaskManager()
     self._use_zeromq = use_zeromq
 
+  def _CreateTask(self, event_source, event_source_heap):
+    """Creates a task to process an event source.
+
+    Event sources of small files on top of the event source heap are batched
+    into the same task, so that the overhead per task, such as creating and
+    merging its task storage, is shared. The number of path specifications
+    in a batch adapts to the size of the files, which is limited by
+    _MAXIMUM_TASK_BATCH_SIZE.
+
+    Args:
+      event_source (EventSource): event source.
+      event_source_heap (_EventSourceHeap): event source heap.
+
+    Returns:
+      Task: task.
+    """
+    task = self._task_manager.CreateTask(self._session_identifier)
+    task.file_entry_type = event_source.file_entry_type
+    task.path_spec = event_source.path_spec
+
+    self._number_of_consumed_sources += 1
+
+    if not self._IsBatchableEventSource(event_source):
+      return task
+
+    path_specs = [event_source.path_spec]
+    batch_size = event_source.file_size
+
+    while len(path_specs) < self._MAXIMUM_NUMBER_OF_PATH_SPECS_PER_TASK:
+      next_event_source = event_source_heap.PeekEventSource()
+      if (not next_event_source or
+          not self._IsBatchableEventSource(next_event_source)):
+        break
+
+      batch_size += next_event_source.file_size
+      if batch_size > self._MAXIMUM_TASK_BATCH_SIZE:
+        break
+
+      event_source_heap.PopEventSource()
+      path_specs.append(next_event_source.path_spec)
+
+      self._number_of_consumed_sources += 1
+
+    if len(path_specs) > 1:
+      task.path_spec = None
+      task.path_specs = path_specs
+
+    return task
+
   def _FillEventSourceHeap(
       self, storage_writer, event_source_heap, start_with_first=False):
     """Fills the event source heap with the available written event sources.
@@ -167,10 +292,11 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
       self._processing_profiler.StopTiming('get_event_source')
 
     while event_source:
-      try:
-        event_source_heap.PushEventSource(event_source)
-      except errors.HeapFull:
-        break
+      if not self._IsProcessedEventSource(event_source):
+        try:
+          event_source_heap.PushEventSource(event_source)
+        except errors.HeapFull:
+          break
 
       if self._processing_profiler:
         self._processing_profiler.StartTiming('get_event_source')
@@ -183,16 +309,92 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     if self._processing_profiler:
       self._processing_profiler.StopTiming('fill_event_source_heap')
 
+  def _FillEventSourceHeapFromQueue(self, event_source_heap):
+    """Fills the event source heap with the event sources queued for merging.
+
+    Args:
+      event_source_heap (_EventSourceHeap): event source heap.
+    """
+    if self._processing_profiler:
+      self._processing_profiler.StartTiming('fill_event_source_heap')
+
+    while True:
+      try:
+        event_source = self._event_source_queue.get_nowait()
+      except Queue.Empty:
+        break
+
+      try:
+        event_source_heap.PushEventSource(event_source)
+      except errors.HeapFull:
+        break
+
+    if self._processing_profiler:
+      self._processing_profiler.StopTiming('fill_event_source_heap')
+
+  def _GetMergeStatus(self):
+    """Retrieves status information about merging.
+
+    Returns:
+      MergeStatus: merge status information.
+    """
+    tasks_status = self._task_manager.GetStatusInformation()
+
+    merge_status = processing_status.MergeStatus()
+    merge_status.merge_time = self._merge_time
+    merge_status.number_of_merged_events = self._number_of_produced_events
+    merge_status.number_of_merged_tasks = self._number_of_merged_tasks
+    merge_status.number_of_tasks_pending_merge = (
+        tasks_status.number_of_tasks_pending_merge)
+
+    return merge_status
+
+  def _IsBatchableEventSource(self, event_source):
+    """Determines if an event source can be batched with other event sources.
+
+    Args:
+      event_source (EventSource): event source.
+
+    Returns:
+      bool: True if the event source is of a file of known size that is
+          smaller than the maximum task batch size.
+    """
+    if event_source.file_entry_type != dfvfs_definitions.FILE_ENTRY_TYPE_FILE:
+      return False
+
+    file_size = getattr(event_source, 'file_size', None)
+    return file_size is not None and file_size < self._MAXIMUM_TASK_BATCH_SIZE
+
+  def _IsProcessedEventSource(self, event_source):
+    """Determines if an event source was processed by a resumed session.
+
+    Args:
+      event_source (EventSource): event source.
+
+    Returns:
+      bool: True if the results of processing the path specification of
+          the event source were merged by the session that is resumed.
+    """
+    if not self._processed_path_specs:
+      return False
+
+    return event_source.path_spec.comparable in self._processed_path_specs
+
   def _MergeTaskStorage(self, storage_writer):
     """Merges a task storage with the session storage.
 
     This function checks all task stores that are ready to merge and updates
-    the scheduled tasks. Note that to prevent this function holding up
-    the task scheduling loop only the first available task storage is merged.
+    the scheduled tasks. Note that only a limited number of attribute
+    containers of the first available task storage is merged, so that a task
+    with a higher merge priority does not have to wait for the merge to
+    complete.
 
     Args:
       storage_writer (StorageWriter): storage writer for a session storage used
           to merge task storage.
+
+    Returns:
+      bool: True if task storage was merged.
     """
     if self._processing_profiler:
       self._processing_profiler.StartTiming('merge_check')
@@ -227,76 +429,134 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     if not self._storage_merge_reader_on_hold:
       task = self._task_manager.GetTaskPendingMerge(self._merge_task)
 
-    # Limit the number of attribute containers from a single task-based
-    # storage file that are merged per loop to keep tasks flowing.
-    if task or self._storage_merge_reader:
-      self._status = definitions.PROCESSING_STATUS_MERGING
+    if not task and not self._storage_merge_reader:
+      return False
 
-      if self._processing_profiler:
-        self._processing_profiler.StartTiming('merge')
+    merge_start_time = time.time()
 
-      if task:
-        if self._storage_merge_reader:
-          self._merge_task_on_hold = self._merge_task
-          self._storage_merge_reader_on_hold = self._storage_merge_reader
+    if self._processing_profiler:
+      self._processing_profiler.StartTiming('merge')
 
-          self._task_manager.SampleTaskStatus(
-              self._merge_task_on_hold, 'merge_on_hold')
+    if task:
+      if self._storage_merge_reader:
+        self._merge_task_on_hold = self._merge_task
+        self._storage_merge_reader_on_hold = self._storage_merge_reader
 
-        self._merge_task = task
-        try:
-          self._storage_merge_reader = storage_writer.StartMergeTaskStorage(
-              task)
+        self._task_manager.SampleTaskStatus(
+            self._merge_task_on_hold, 'merge_on_hold')
 
-          self._task_manager.SampleTaskStatus(task, 'merge_started')
+      self._merge_task = task
+      try:
+        self._storage_merge_reader = storage_writer.StartMergeTaskStorage(
+            task)
 
-        except IOError as exception:
-          logger.error((
-              'Unable to merge results of task: {0:s} '
-              'with error: {1!s}').format(task.identifier, exception))
-          self._storage_merge_reader = None
+        self._task_manager.SampleTaskStatus(task, 'merge_started')
 
-      if self._storage_merge_reader:
+      except IOError as exception:
+        logger.error((
+            'Unable to merge results of task: {0:s} '
+            'with error: {1!s}').format(task.identifier, exception))
+        self._storage_merge_reader = None
+
+    # TODO: Do something more sensible when the task storage cannot be merged,
+    # perhaps retrying the task once that is implemented. For now, we mark the
+    # task as fully merged because we can't continue with it.
+    fully_merged = True
+    merge_failed = not self._storage_merge_reader
+
+    # Limit the number of attribute containers from a single task-based
+    # storage file that are merged per loop.
+    if self._storage_merge_reader:
+      try:
         fully_merged = self._storage_merge_reader.MergeAttributeContainers(
             maximum_number_of_containers=self._MAXIMUM_NUMBER_OF_CONTAINERS)
-      else:
-        # TODO: Do something more sensible when this happens, perhaps
-        # retrying the task once that is implemented. For now, we mark the task
-        # as fully merged because we can't continue with it.
-        fully_merged = True
 
-      if self._processing_profiler:
-        self._processing_profiler.StopTiming('merge')
+      except IOError as exception:
+        logger.error((
+            'Unable to merge results of task: {0:s} '
+            'with error: {1!s}').format(self._merge_task.identifier, exception))
+        merge_failed = True
 
-      if fully_merged:
+    if self._processing_profiler:
+      self._processing_profiler.StopTiming('merge')
+
+    if fully_merged:
+      # A task checkpoint is only written for a task of which the results were
+      # merged, so that a resumed session processes the other tasks again.
+      if not merge_failed:
         try:
-          self._task_manager.CompleteTask(self._merge_task)
+          storage_writer.WriteTaskCheckpoint(self._merge_task)
+
+        except IOError as exception:
+          logger.error((
+              'Unable to write checkpoint of task: {0:s} with error: '
+              '{1!s}').format(self._merge_task.identifier, exception))
 
-        except KeyError as exception:
-          logger.error(
-              'Unable to complete task: {0:s} with error: {1!s}'.format(
-                  self._merge_task.identifier, exception))
+      # The event sources written by merging are queued before the task is
+      # completed, so that the task scheduler does not stop while event
+      # sources are waiting to be scheduled.
+      self._QueueWrittenEventSources(storage_writer)
 
-        if not self._storage_merge_reader_on_hold:
-          self._merge_task = None
-          self._storage_merge_reader = None
-        else:
-          self._merge_task = self._merge_task_on_hold
-          self._storage_merge_reader = self._storage_merge_reader_on_hold
+      try:
+        self._task_manager.CompleteTask(self._merge_task)
 
-          self._merge_task_on_hold = None
-          self._storage_merge_reader_on_hold = None
+      except KeyError as exception:
+        logger.error(
+            'Unable to complete task: {0:s} with error: {1!s}'.format(
+                self._merge_task.identifier, exception))
 
-          self._task_manager.SampleTaskStatus(
-              self._merge_task, 'merge_resumed')
+      self._number_of_merged_tasks += 1
 
-      self._status = definitions.PROCESSING_STATUS_RUNNING
-      self._number_of_produced_errors = storage_writer.number_of_errors
-      self._number_of_produced_events = storage_writer.number_of_events
-      self._number_of_produced_sources = storage_writer.number_of_event_sources
+      if not self._storage_merge_reader_on_hold:
+        self._merge_task = None
+        self._storage_merge_reader = None
+      else:
+        self._merge_task = self._merge_task_on_hold
+        self._storage_merge_reader = self._storage_merge_reader_on_hold
+
+        self._merge_task_on_hold = None
+        self._storage_merge_reader_on_hold = None
+
+        self._task_manager.SampleTaskStatus(
+            self._merge_task, 'merge_resumed')
+
+    self._merge_time += time.time() - merge_start_time
+
+    self._number_of_produced_errors = storage_writer.number_of_errors
+    self._number_of_produced_events = storage_writer.number_of_events
+    self._number_of_produced_sources = storage_writer.number_of_event_sources
+
+    return True
+
+  def _MergeThreadMain(self, storage_writer):
+    """Main function of the merge thread.
+
+    Args:
+      storage_writer (StorageWriter): storage writer for a session storage used
+          to merge task storage.
+    """
+    try:
+      # Event sources that did not fit in the event source heap when
+      # the task scheduler started are queued first.
+      self._QueueWrittenEventSources(storage_writer)
+
+      while self._merge_active and not self._abort:
+        if not self._MergeTaskStorage(storage_writer):
+          time.sleep(self._MERGE_THREAD_WAIT_TIME)
+
+    # All exceptions need to be caught here, since the task scheduler waits
+    # for the tasks pending merge and would otherwise never stop.
+    except Exception as exception:  # pylint: disable=broad-except
+      logger.error(
+          'Unable to merge task storage with error: {0!s}'.format(exception))
+      logger.exception(exception)
+
+      self._merge_failed = True
+      self._abort = True
 
   def _ProcessSources(
-      self, source_path_specs, storage_writer, filter_find_specs=None):
+      self, source_path_specs, storage_writer, filter_find_specs=None,
+      resume=False):
     """Processes the sources.
 
     Args:
@@ -306,6 +566,8 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
       filter_find_specs (Optional[list[dfvfs.FindSpec]]): find specifications
           used in path specification extraction. If set, path specifications
           that match the find specification will be processed.
+      resume (Optional[bool]): True if an interrupted session stored in
+          the session storage should be resumed.
     """
     if self._processing_profiler:
       self._processing_profiler.StartTiming('process_sources')
@@ -316,11 +578,23 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     self._number_of_consumed_events = 0
     self._number_of_consumed_reports = 0
     self._number_of_consumed_sources = 0
+    self._number_of_merged_tasks = 0
     self._number_of_produced_errors = 0
     self._number_of_produced_event_tags = 0
     self._number_of_produced_events = 0
     self._number_of_produced_reports = 0
     self._number_of_produced_sources = 0
+    self._merge_time = 0.0
+    self._processed_path_specs = set()
+
+    if resume:
+      self._ReadTaskCheckpoints(storage_writer)
+
+      # The event sources stored by the resumed session are scheduled again,
+      # except for those of which the results were already merged.
+      storage_writer.RewindWrittenEventSources()
+      if storage_writer.GetFirstWrittenEventSource():
+        source_path_specs = []
 
     path_spec_generator = self._path_spec_extractor.ExtractPathSpecs(
         source_path_specs, find_specs=filter_find_specs,
@@ -367,9 +641,60 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
 
     self._processing_status.UpdateTasksStatus(tasks_status)
 
+    merge_status = self._GetMergeStatus()
+    self._processing_status.UpdateMergeStatus(merge_status)
+
     if self._status_update_callback:
       self._status_update_callback(self._processing_status)
 
+  def _QueueWrittenEventSources(self, storage_writer):
+    """Queues the written event sources for the task scheduler.
+
+    Args:
+      storage_writer (StorageWriter): storage writer for a session storage.
+    """
+    if self._processing_profiler:
+      self._processing_profiler.StartTiming('get_event_source')
+
+    event_source = storage_writer.GetNextWrittenEventSource()
+
+    if self._processing_profiler:
+      self._processing_profiler.StopTiming('get_event_source')
+
+    while event_source and self._merge_active and not self._abort:
+      if not self._IsProcessedEventSource(event_source):
+        try:
+          self._event_source_queue.put(
+              event_source, timeout=self._MERGE_THREAD_WAIT_TIME)
+        except Queue.Full:
+          continue
+
+      if self._processing_profiler:
+        self._processing_profiler.StartTiming('get_event_source')
+
+      event_source = storage_writer.GetNextWrittenEventSource()
+
+      if self._processing_profiler:
+        self._processing_profiler.StopTiming('get_event_source')
+
+  def _ReadTaskCheckpoints(self, storage_writer):
+    """Reads the task checkpoints of a session that is resumed.
+
+    Args:
+      storage_writer (StorageWriter): storage writer for a session storage.
+    """
+    number_of_task_checkpoints = 0
+    for task_checkpoint in storage_writer.GetTaskCheckpoints():
+      for path_spec in task_checkpoint.path_specs or []:
+        self._processed_path_specs.add(path_spec.comparable)
+
+      number_of_task_checkpoints += 1
+
+    logger.debug((
+        'Resuming session with {0:d} merged tasks that processed {1:d} path '
+        'specifications.').format(
+            number_of_task_checkpoints, len(self._processed_path_specs)))
+
   def _ScheduleTask(self, task):
     """Schedules a task.
 
@@ -404,43 +729,54 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
 
     self._status = definitions.PROCESSING_STATUS_RUNNING
 
-    # TODO: make tasks persistent.
-
     # TODO: protect task scheduler loop by catch all and
     # handle abort path.
 
-    event_source_heap = _EventSourceHeap()
+    event_source_heap = _EventSourceHeap(
+        processing_cost_model=self._processing_cost_model)
 
     self._FillEventSourceHeap(
         storage_writer, event_source_heap, start_with_first=True)
 
     event_source = event_source_heap.PopEventSource()
 
+    self._StartMergeThread(storage_writer)
+
+    # Note that the event source queue is checked after the pending tasks,
+    # since the merge thread queues event sources before it completes a task.
     task = None
-    while event_source or self._task_manager.HasPendingTasks():
+    while (event_source or self._task_manager.HasPendingTasks() or
+           not self._event_source_queue.empty()):
       if self._abort:
         break
 
+      if not self._merge_thread.is_alive():
+        logger.error('Merge thread stopped unexpectedly.')
+        self._merge_failed = True
+        self._abort = True
+        break
+
       try:
         if not task:
           task = self._task_manager.CreateRetryTask()
 
         if not task and event_source:
-          task = self._task_manager.CreateTask(self._session_identifier)
-          task.file_entry_type = event_source.file_entry_type
-          task.path_spec = event_source.path_spec
+          task = self._CreateTask(event_source, event_source_heap)
           event_source = None
 
-          self._number_of_consumed_sources += 1
-
           if self._guppy_memory_profiler:
             self._guppy_memory_profiler.Sample()
 
         if task:
           if self._ScheduleTask(task):
-            logger.debug(
-                'Scheduled task {0:s} for path specification {1:s}'.format(
-                    task.identifier, task.path_spec.comparable))
+            if task.path_specs:
+              logger.debug(
+                  'Scheduled task {0:s} for {1:d} path specifications'.format(
+                      task.identifier, len(task.path_specs)))
+            else:
+              logger.debug(
+                  'Scheduled task {0:s} for path specification {1:s}'.format(
+                      task.identifier, task.path_spec.comparable))
 
             self._task_manager.SampleTaskStatus(task, 'scheduled')
 
@@ -449,13 +785,14 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
           else:
             self._task_manager.SampleTaskStatus(task, 'schedule_attempted')
 
-        self._MergeTaskStorage(storage_writer)
-
-        self._FillEventSourceHeap(storage_writer, event_source_heap)
+        self._FillEventSourceHeapFromQueue(event_source_heap)
 
         if not task and not event_source:
           event_source = event_source_heap.PopEventSource()
 
+        if not event_source:
+          time.sleep(self._SCHEDULER_WAIT_TIME)
+
       except KeyboardInterrupt:
         self._abort = True
 
@@ -463,15 +800,23 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
         if self._status_update_callback:
           self._status_update_callback(self._processing_status)
 
+    self._StopMergeThread()
+
     for task in self._task_manager.GetFailedTasks():
-      error = error_containers.ExtractionError(
-          message='Worker failed to process path specification',
-          path_spec=task.path_spec)
-      self._storage_writer.AddError(error)
-      self._processing_status.error_path_specs.append(task.path_spec)
+      for path_spec in task.GetPathSpecs():
+        error = error_containers.ExtractionError(
+            message='Worker failed to process path specification',
+            path_spec=path_spec)
+        self._storage_writer.AddError(error)
+        self._processing_status.error_path_specs.append(path_spec)
 
     self._status = definitions.PROCESSING_STATUS_IDLE
 
+    if self._merge_failed:
+      self._processing_status.aborted = True
+      if self._status_update_callback:
+        self._status_update_callback(self._processing_status)
+
     if self._abort:
       logger.debug('Task scheduler aborted')
     else:
@@ -538,6 +883,20 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
 
     return process
 
+  def _StartMergeThread(self, storage_writer):
+    """Starts the merge thread.
+
+    The merge thread owns the session storage writer until it is stopped.
+
+    Args:
+      storage_writer (StorageWriter): storage writer for a session storage used
+          to merge task storage.
+    """
+    self._merge_active = True
+    self._merge_thread = threading.Thread(
+        name='Merge', target=self._MergeThreadMain, args=(storage_writer, ))
+    self._merge_thread.start()
+
   def _StatusUpdateThreadMain(self):
     """Main function of the status update thread."""
     while self._status_update_active:
@@ -554,6 +913,9 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
 
       self._processing_status.UpdateTasksStatus(tasks_status)
 
+      merge_status = self._GetMergeStatus()
+      self._processing_status.UpdateMergeStatus(merge_status)
+
       if self._status_update_callback:
         self._status_update_callback(self._processing_status)
 
@@ -600,6 +962,14 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     # Kill any lingering processes.
     self._AbortKill()
 
+  def _StopMergeThread(self):
+    """Stops the merge thread."""
+    self._merge_active = False
+    if self._merge_thread:
+      self._merge_thread.join()
+
+    self._merge_thread = None
+
   def _UpdateForemanProcessStatus(self):
     """Update the foreman process status."""
     used_memory = self._process_information.GetUsedMemory() or 0
@@ -705,9 +1075,15 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
       self, session_identifier, source_path_specs, storage_writer,
       processing_configuration, enable_sigsegv_handler=False,
       filter_find_specs=None, number_of_worker_processes=0,
-      status_update_callback=None, worker_memory_limit=None):
+      resume=False, status_update_callback=None, worker_memory_limit=None):
     """Processes the sources and extract events.
 
+    The results of every merged task are checkpointed in the session storage,
+    so that an interrupted session can be resumed without processing the path
+    specifications of which the results were already merged. Note that
+    the results of a task that was being merged when the session was
+    interrupted can be stored more than once.
+
     Args:
       session_identifier (str): identifier of the session.
       source_path_specs (list[dfvfs.PathSpec]): path specifications of
@@ -720,6 +1096,8 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
       filter_find_specs (Optional[list[dfvfs.FindSpec]]): find specifications
           used in path specification extraction.
       number_of_worker_processes (Optional[int]): number of worker processes.
+      resume (Optional[bool]): True if an interrupted session stored in
+          the session storage should be resumed.
       status_update_callback (Optional[function]): callback function for status
           updates.
       worker_memory_limit (Optional[int]): maximum amount of memory a worker is
@@ -800,6 +1178,19 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     if self._storage_profiler:
       storage_writer.SetStorageProfiler(self._storage_profiler)
 
+    # The processing costs samples of previous sessions must be read before
+    # the worker processes start, since these overwrite their sample files.
+    self._processing_cost_model = processing_costs.ProcessingCostModel()
+
+    profiling_configuration = self._processing_configuration.profiling
+    if profiling_configuration and (
+        profiling_configuration.HaveProfileProcessing()):
+      number_of_samples = self._processing_cost_model.ReadSampleFiles(
+          profiling_configuration.directory or os.getcwd())
+      logger.debug(
+          'Read {0:d} processing costs samples of {1:d} formats.'.format(
+              number_of_samples, self._processing_cost_model.number_of_formats))
+
     # Set up the storage writer before the worker processes.
     storage_writer.StartTaskStorage()
 
@@ -824,7 +1215,7 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
 
         self._ProcessSources(
             source_path_specs, storage_writer,
-            filter_find_specs=filter_find_specs)
+            filter_find_specs=filter_find_specs, resume=resume)
 
       finally:
         storage_writer.WriteSessionCompletion(aborted=self._abort)
@@ -885,6 +1276,7 @@ class TaskMultiProcessEngine(engine.MultiProcessEngine):
     self._processing_configuration = None
 
     self._filter_find_specs = None
+    self._processed_path_specs = set()
     self._session_identifier = None
     self._status_update_callback = None
     self._storage_writer = None
@@ -447,7 +447,7 @@ class TaskManager(object):
 
       # There are no tasks being processed, but we might be
       # waiting for some tasks to be merged.
-      if self._HasTasksPendingMerge():
+      if self._HasTasksPendingMerge() or self._tasks_merging:
         return True
 
       # There are no tasks processing or pending merge, but there may
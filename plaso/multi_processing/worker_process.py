@@ -153,6 +153,10 @@ class WorkerProcess(base_process.MultiProcessBaseProcess):
     if self._processing_profiler:
       self._extraction_worker.SetProcessingProfiler(self._processing_profiler)
 
+    if self._processing_costs_profiler:
+      self._extraction_worker.SetProcessingCostsProfiler(
+          self._processing_costs_profiler)
+
     if self._serializers_profiler:
       self._storage_writer.SetSerializersProfiler(self._serializers_profiler)
 
@@ -198,6 +202,9 @@ class WorkerProcess(base_process.MultiProcessBaseProcess):
     if self._processing_profiler:
       self._extraction_worker.SetProcessingProfiler(None)
 
+    if self._processing_costs_profiler:
+      self._extraction_worker.SetProcessingCostsProfiler(None)
+
     if self._serializers_profiler:
       self._storage_writer.SetSerializersProfiler(None)
 
@@ -282,12 +289,18 @@ class WorkerProcess(base_process.MultiProcessBaseProcess):
 
     try:
       # TODO: add support for more task types.
-      self._ProcessPathSpec(
-          self._extraction_worker, self._parser_mediator, task.path_spec)
-      self._number_of_consumed_sources += 1
+      # The path specifications of a batch task are written to a single
+      # task storage.
+      for path_spec in task.GetPathSpecs():
+        if self._abort:
+          break
+
+        self._ProcessPathSpec(
+            self._extraction_worker, self._parser_mediator, path_spec)
+        self._number_of_consumed_sources += 1
 
-      if self._guppy_memory_profiler:
-        self._guppy_memory_profiler.Sample()
+        if self._guppy_memory_profiler:
+          self._guppy_memory_profiler.Sample()
 
     finally:
       storage_writer.WriteTaskCompletion(aborted=self._abort)
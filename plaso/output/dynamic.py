@@ -331,6 +331,8 @@ class DynamicOutputModule(interface.LinearOutputModule):
   DESCRIPTION = (
       'Dynamic selection of fields for a separated value output format.')
 
+  SUPPORTS_PARALLEL_EXPORT = True
+
   _DEFAULT_FIELD_DELIMITER = ','
 
   _DEFAULT_FIELDS = [
@@ -363,6 +365,16 @@ class DynamicOutputModule(interface.LinearOutputModule):
       return field.replace(self._field_delimiter, ' ')
     return field
 
+  def GetParameters(self):
+    """Retrieves the parameters the output module was configured with.
+
+    Returns:
+      dict[str, object]: picklable parameters of the output module.
+    """
+    return {
+        'field_delimiter': self._field_delimiter,
+        'fields': list(self._fields)}
+
   def SetFieldDelimiter(self, field_delimiter):
     """Sets the field delimiter.
 
@@ -379,6 +391,16 @@ class DynamicOutputModule(interface.LinearOutputModule):
     """
     self._fields = fields
 
+  def SetParameters(self, parameters):
+    """Sets the parameters of the output module.
+
+    Args:
+      parameters (dict[str, object]): parameters of the output module,
+          as returned by GetParameters.
+    """
+    self.SetFieldDelimiter(parameters['field_delimiter'])
+    self.SetFields(parameters['fields'])
+
   def WriteEventBody(self, event):
     """Writes the body of an event to the output.
 
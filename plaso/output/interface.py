@@ -15,6 +15,10 @@ class OutputModule(object):
   NAME = ''
   DESCRIPTION = ''
 
+  # True if events can be formatted by multiple processes in parallel, which
+  # requires the output of an event to only depend on the event itself.
+  SUPPORTS_PARALLEL_EXPORT = False
+
   def __init__(self, output_mediator):
     """Initializes an output module.
 
@@ -57,10 +61,30 @@ class OutputModule(object):
     """
     return []
 
+  def GetParameters(self):
+    """Retrieves the parameters the output module was configured with.
+
+    The parameters can be passed to another process, such as an export worker
+    process, to configure an output module of the same type by SetParameters.
+
+    Returns:
+      dict[str, object]: picklable parameters of the output module.
+    """
+    return {}
+
   def Open(self):
     """Opens the output."""
     pass
 
+  def SetParameters(self, parameters):
+    """Sets the parameters of the output module.
+
+    Args:
+      parameters (dict[str, object]): parameters of the output module,
+          as returned by GetParameters.
+    """
+    pass
+
   def WriteEvent(self, event):
     """Writes the event to the output.
 
@@ -174,3 +198,11 @@ class LinearOutputModule(OutputModule):
   def Close(self):
     """Closes the output."""
     self._output_writer = None
+
+  def WriteFormattedOutput(self, output):
+    """Writes output of events that have already been formatted.
+
+    Args:
+      output (str): formatted output of events.
+    """
+    self._output_writer.Write(output)
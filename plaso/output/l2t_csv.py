@@ -23,6 +23,8 @@ class L2TCSVOutputModule(interface.LinearOutputModule):
   NAME = 'l2tcsv'
   DESCRIPTION = 'CSV format used by legacy log2timeline, with 17 fixed fields.'
 
+  SUPPORTS_PARALLEL_EXPORT = True
+
   _FIELD_DELIMITER = ','
   _HEADER = (
       'date,time,timezone,MACB,source,sourcetype,type,user,host,short,desc,'
@@ -50,6 +50,16 @@ class OutputMediator(object):
 
     return self.fields_filter.filter_expression
 
+  @property
+  def formatter_mediator(self):
+    """FormatterMediator: formatter mediator."""
+    return self._formatter_mediator
+
+  @property
+  def knowledge_base(self):
+    """KnowledgeBase: knowledge base."""
+    return self._knowledge_base
+
   @property
   def timezone(self):
     """The timezone."""
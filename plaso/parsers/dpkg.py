@@ -60,6 +60,8 @@ class DpkgParser(text_parser.PyparsingSingleLineTextParser):
   NAME = 'dpkg'
   DESCRIPTION = 'Parser for Debian dpkg.log files.'
 
+  TEXT_HINTS = [r'\d{4}\s*-\s*\d{2}\s*-\s*\d{2}']
+
   _ENCODING = 'utf-8'
 
   _DPKG_STARTUP = 'startup'
@@ -6,8 +6,6 @@ from __future__ import unicode_literals
 import abc
 import csv
 
-from dfvfs.helpers import text_file
-
 from plaso.lib import errors
 from plaso.lib import line_reader_file
 from plaso.lib import py2to3
@@ -15,10 +13,10 @@ from plaso.lib import specification
 from plaso.parsers import interface
 
 
-# The Python 2 version of the csv module does not support Unicode input
-# and we cannot use dfvfs.TextFile. csv.DictReader requires a file-like
-# object that implements readline. BinaryLineReader provides readline on top
-# of dfvfs.FileIO objects.
+# The Python 2 version of the csv module does not support Unicode input.
+# csv.DictReader requires an iterable of lines. BufferedLineReader provides
+# the lines, decoded or not, and their offsets on top of dfvfs.FileIO objects
+# and reads the file in blocks, hence the file is parsed as a stream.
 
 
 class DSVParser(interface.FileObjectParser):
@@ -43,13 +41,13 @@ class DSVParser(interface.FileObjectParser):
   # it can be defined here.
   QUOTE_CHAR = b'"'
 
+  # See TEXT_HINTS of text_parser.PyparsingSingleLineTextParser.
+  TEXT_HINTS = None
+
   # Value that should not appear inside the file, made to test the actual
   # file to see if it confirms to standards.
   _MAGIC_TEST_STRING = b'RegnThvotturMeistarans'
 
-  # Maximum supported file size of 16 MiB.
-  _MAXIMUM_SUPPORTED_FILE_SIZE = 16 * 1024 * 1024
-
   def __init__(self, encoding=None):
     """Initializes a delimiter separated values (DSV) parser.
 
@@ -134,15 +132,6 @@ class DSVParser(interface.FileObjectParser):
     Raises:
       UnableToParseFile: when the file cannot be parsed.
     """
-    file_size = file_object.get_size()
-    # The csv module can consume a lot of memory, 1 GiB for a 100 MiB file.
-    # Hence that the maximum supported file size is restricted.
-    if file_size > self._MAXIMUM_SUPPORTED_FILE_SIZE:
-      display_name = parser_mediator.GetDisplayName()
-      raise errors.UnableToParseFile((
-          '[{0:s}] Unable to parse DSV file: {1:s} size of file exceeds '
-          'maximum supported size').format(self.NAME, display_name))
-
     # TODO: Replace this with detection of the file encoding via byte-order
     # marks. Also see: https://github.com/log2timeline/plaso/issues/1971
     if not self._encoding:
@@ -151,7 +140,8 @@ class DSVParser(interface.FileObjectParser):
     # The Python 2 csv module reads bytes and the Python 3 csv module Unicode
     # reads strings.
     if py2to3.PY_3:
-      line_reader = text_file.TextFile(file_object, encoding=self._encoding)
+      line_reader = line_reader_file.BufferedLineReader(
+          file_object, encoding=self._encoding)
     else:
       line_reader = line_reader_file.BinaryLineReader(file_object)
 
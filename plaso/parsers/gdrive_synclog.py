@@ -50,6 +50,8 @@ class GoogleDriveSyncLogParser(text_parser.PyparsingMultiLineTextParser):
 
   DESCRIPTION = 'Parser for Google Drive Sync log files.'
 
+  TEXT_HINTS = [r'\d{4}\s*-\s*\d{2}\s*-\s*\d{2}']
+
   _ENCODING = 'utf-8'
 
   # Increase the buffer size, as log messages are often many lines of Python
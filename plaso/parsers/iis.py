@@ -139,6 +139,8 @@ class WinIISParser(text_parser.PyparsingSingleLineTextParser):
   # Per https://msdn.microsoft.com/en-us/library/ms525807(v=vs.90).aspx:
   # "log file format(s) are all ASCII text formats (unless UTF-8 is enabled for
   #  your Web sites)
+  TEXT_HINTS = [r'[^\n]*#Software: Microsoft Internet Information Services']
+
   _ENCODING = 'utf-8'
 
   def __init__(self):
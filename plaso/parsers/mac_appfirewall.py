@@ -46,6 +46,8 @@ class MacAppFirewallParser(text_parser.PyparsingSingleLineTextParser):
   NAME = 'mac_appfirewall_log'
   DESCRIPTION = 'Parser for appfirewall.log files.'
 
+  TEXT_HINTS = [r'[A-Za-z]{3}\s*\d{1,2}\s*\d{2}\s*:']
+
   _ENCODING = 'utf-8'
 
   # Define how a log line should look like.
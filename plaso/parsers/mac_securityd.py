@@ -54,6 +54,8 @@ class MacOSSecuritydLogParser(text_parser.PyparsingSingleLineTextParser):
   NAME = 'mac_securityd'
   DESCRIPTION = 'Parser for MacOS securityd log files.'
 
+  TEXT_HINTS = [r'[A-Za-z]{3}\s*\d{1,2}\s*\d{2}\s*:']
+
   _ENCODING = 'utf-8'
   _DEFAULT_YEAR = 2012
 
@@ -48,6 +48,10 @@ class MacWifiLogParser(text_parser.PyparsingSingleLineTextParser):
   NAME = 'macwifi'
   DESCRIPTION = 'Parser for MacOS wifi.log files.'
 
+  TEXT_HINTS = [
+      r'[A-Za-z]{3}\s*[A-Za-z]{3}\s*\d{1,2}\s*\d{2}\s*:',
+      r'[A-Z][a-z]{2}\s*\d{1,2}\s*\d{2}\s*:']
+
   _ENCODING = 'utf-8'
 
   THREE_DIGITS = text_parser.PyparsingConstants.THREE_DIGITS
@@ -50,6 +50,7 @@ class ParserMediator(object):
     self._cpu_time_profiler = None
     self._extra_event_attributes = {}
     self._file_entry = None
+    self._file_entry_event_attributes = None
     self._knowledge_base = knowledge_base
     self._last_event_data_hash = None
     self._last_event_data_identifier = None
@@ -61,6 +62,8 @@ class ParserMediator(object):
     self._parser_chain_components = []
     self._preferred_year = preferred_year
     self._process_information = None
+    self._profiled_bookkeeping_name = None
+    self._profiled_parser_name = None
     self._resolver_context = resolver_context
     self._storage_writer = storage_writer
     self._temporary_directory = temporary_directory
@@ -68,6 +71,10 @@ class ParserMediator(object):
 
     self.last_activity_timestamp = 0.0
 
+  # Suffix of the name of the CPU time profile of the bookkeeping done by
+  # the mediator on behalf of a parser.
+  _BOOKKEEPING_PROFILE_NAME_SUFFIX = '-mediator'
+
   @property
   def abort(self):
     """bool: True if parsing should be aborted."""
@@ -167,6 +174,62 @@ class ParserMediator(object):
           'error: {0:s}').format(exception))
       return None
 
+  def _GetDisplayName(self, file_entry, path_spec, relative_path):
+    """Retrieves the display name for a file entry.
+
+    Args:
+      file_entry (dfvfs.FileEntry): file entry.
+      path_spec (dfvfs.PathSpec): path specification of the file entry.
+      relative_path (str): relative path of the file entry.
+
+    Returns:
+      str: human readable string that describes the path to the file entry.
+    """
+    if not relative_path:
+      return file_entry.name
+
+    return self.GetDisplayNameForPathSpec(path_spec)
+
+  def _GetFileEntryEventAttributes(self, file_entry):
+    """Retrieves the event attributes derived from a file entry.
+
+    The event attributes of the current file entry are determined once and
+    cached until the file entry is reset or another file entry is set.
+
+    Args:
+      file_entry (dfvfs.FileEntry): file entry.
+
+    Returns:
+      tuple[dfvfs.PathSpec, str, str, int]: path specification, relative path,
+          display name and inode of the file entry, where the inode is None
+          if not available.
+    """
+    is_current_file_entry = file_entry is self._file_entry
+    if is_current_file_entry and self._file_entry_event_attributes:
+      return self._file_entry_event_attributes
+
+    path_spec = getattr(file_entry, 'path_spec', None)
+
+    relative_path = path_helper.PathHelper.GetRelativePathForPathSpec(
+        path_spec, mount_path=self._mount_path)
+
+    # TODO: dfVFS refactor: move display name to output since the path
+    # specification contains the full information.
+    display_name = self._GetDisplayName(file_entry, path_spec, relative_path)
+
+    stat_object = file_entry.GetStat()
+    inode_value = getattr(stat_object, 'ino', None)
+    if inode_value is not None:
+      inode_value = self._GetInode(inode_value)
+
+    file_entry_event_attributes = (
+        path_spec, relative_path, display_name, inode_value)
+
+    if is_current_file_entry:
+      self._file_entry_event_attributes = file_entry_event_attributes
+
+    return file_entry_event_attributes
+
   def _GetInode(self, inode_value):
     """Retrieves the inode from the inode value.
 
@@ -227,6 +290,22 @@ class ParserMediator(object):
           'information with error: {0!s}').format(exception))
       return None
 
+  def _StartBookkeepingTiming(self):
+    """Starts timing the bookkeeping done on behalf of the profiled parser.
+
+    The timing of the parser is paused, such that the CPU time samples of
+    the parser only contain the time spent in the parser itself.
+    """
+    if self._cpu_time_profiler and self._profiled_parser_name:
+      self._cpu_time_profiler.PauseTiming(self._profiled_parser_name)
+      self._cpu_time_profiler.ResumeTiming(self._profiled_bookkeeping_name)
+
+  def _StopBookkeepingTiming(self):
+    """Stops timing the bookkeeping done on behalf of the profiled parser."""
+    if self._cpu_time_profiler and self._profiled_parser_name:
+      self._cpu_time_profiler.PauseTiming(self._profiled_bookkeeping_name)
+      self._cpu_time_profiler.ResumeTiming(self._profiled_parser_name)
+
   def AddEventAttribute(self, attribute_name, attribute_value):
     """Adds an attribute that will be set on all events produced.
 
@@ -282,14 +361,16 @@ class ParserMediator(object):
     if file_entry is None:
       raise ValueError('Missing file entry')
 
+    if (file_entry is self._file_entry and
+        self._file_entry_event_attributes):
+      return self._file_entry_event_attributes[2]
+
     path_spec = getattr(file_entry, 'path_spec', None)
 
     relative_path = path_helper.PathHelper.GetRelativePathForPathSpec(
         path_spec, mount_path=self._mount_path)
-    if not relative_path:
-      return file_entry.name
 
-    return self.GetDisplayNameForPathSpec(path_spec)
+    return self._GetDisplayName(file_entry, path_spec, relative_path)
 
   def GetDisplayNameForPathSpec(self, path_spec):
     """Retrieves the display name for a path specification.
@@ -383,16 +464,20 @@ class ParserMediator(object):
     """Removes the last added parser or parser plugin from the parser chain."""
     self._parser_chain_components.pop()
 
-  def ProcessEvent(
-      self, event, parser_chain=None, file_entry=None, query=None):
+  def _ProcessEvent(
+      self, event, parser_chain=None, file_entry_attributes=None, query=None):
     """Processes an event before it written to the storage.
 
     Args:
       event (EventObject|EventData): event or event data.
       parser_chain (Optional[str]): parsing chain up to this point.
-      file_entry (Optional[dfvfs.FileEntry]): file entry, where None will
-          use the current file entry set in the mediator.
+      file_entry_attributes (Optional[tuple[dfvfs.PathSpec, str, str, int]]):
+          event attributes derived from the file entry, as returned by
+          _GetFileEntryEventAttributes, or None if there is no file entry.
       query (Optional[str]): query that was used to obtain the event.
+
+    Raises:
+      KeyError: if the event already has a value for an extra event attribute.
     """
     # TODO: rename this to event.parser_chain or equivalent.
     if not getattr(event, 'parser', None) and parser_chain:
@@ -402,30 +487,20 @@ class ParserMediator(object):
     if not getattr(event, 'text_prepend', None) and self._text_prepend:
       event.text_prepend = self._text_prepend
 
-    if file_entry is None:
-      file_entry = self._file_entry
-
     display_name = None
-    if file_entry:
-      event.pathspec = file_entry.path_spec
+    if file_entry_attributes:
+      path_spec, relative_path, display_name, inode = file_entry_attributes
 
-      if not getattr(event, 'filename', None):
-        path_spec = getattr(file_entry, 'path_spec', None)
-        event.filename = path_helper.PathHelper.GetRelativePathForPathSpec(
-            path_spec, mount_path=self._mount_path)
+      event.pathspec = path_spec
 
-      if not display_name:
-        # TODO: dfVFS refactor: move display name to output since the path
-        # specification contains the full information.
-        display_name = self.GetDisplayName(file_entry)
+      if not getattr(event, 'filename', None):
+        event.filename = relative_path
 
-      stat_object = file_entry.GetStat()
-      inode_value = getattr(stat_object, 'ino', None)
       # TODO: refactor to ProcessEventData.
       # Note that we use getattr here since event can be either EventObject
       # or EventData.
-      if getattr(event, 'inode', None) is None and inode_value is not None:
-        event.inode = self._GetInode(inode_value)
+      if getattr(event, 'inode', None) is None and inode is not None:
+        event.inode = inode
 
     if not getattr(event, 'display_name', None) and display_name:
       event.display_name = display_name
@@ -448,6 +523,34 @@ class ParserMediator(object):
 
       setattr(event, attribute, value)
 
+  def ProcessEvent(
+      self, event, parser_chain=None, file_entry=None, query=None):
+    """Processes an event before it written to the storage.
+
+    Args:
+      event (EventObject|EventData): event or event data.
+      parser_chain (Optional[str]): parsing chain up to this point.
+      file_entry (Optional[dfvfs.FileEntry]): file entry, where None will
+          use the current file entry set in the mediator.
+      query (Optional[str]): query that was used to obtain the event.
+    """
+    self._StartBookkeepingTiming()
+
+    try:
+      if file_entry is None:
+        file_entry = self._file_entry
+
+      file_entry_attributes = None
+      if file_entry:
+        file_entry_attributes = self._GetFileEntryEventAttributes(file_entry)
+
+      self._ProcessEvent(
+          event, parser_chain=parser_chain,
+          file_entry_attributes=file_entry_attributes, query=query)
+
+    finally:
+      self._StopBookkeepingTiming()
+
   def ProduceEventSource(self, event_source):
     """Produces an event source.
 
@@ -460,7 +563,13 @@ class ParserMediator(object):
     if not self._storage_writer:
       raise RuntimeError('Storage writer not set.')
 
-    self._storage_writer.AddEventSource(event_source)
+    self._StartBookkeepingTiming()
+
+    try:
+      self._storage_writer.AddEventSource(event_source)
+    finally:
+      self._StopBookkeepingTiming()
+
     self._number_of_event_sources += 1
 
     self.last_activity_timestamp = time.time()
@@ -475,36 +584,94 @@ class ParserMediator(object):
     Raises:
       InvalidEvent: if the event has no timestamp set.
     """
-    if event.timestamp is None:
-      raise errors_lib.InvalidEvent('Event must have a timestamp set.')
+    self.ProduceEventsWithEventData([(event, event_data)])
 
-    event_data_hash = event_data.GetAttributeValuesHash()
-    if event_data_hash != self._last_event_data_hash:
-      # Make a copy of the event data before adding additional values.
-      event_data = copy.deepcopy(event_data)
+  def ProduceEventsWithEventData(self, events_with_event_data):
+    """Produces a batch of events.
 
-      # TODO: refactor to ProcessEventData.
-      self.ProcessEvent(
-          event_data, parser_chain=self.GetParserChain(),
-          file_entry=self._file_entry)
+    The event attributes derived from the current file entry are determined
+    once for the batch and the batch is added to the storage writer at once.
+    Consecutive events with the same event data share the event data.
 
-      self._storage_writer.AddEventData(event_data)
+    Args:
+      events_with_event_data (list[tuple[EventObject, EventData]]): events and
+          their event data.
 
-      self._last_event_data_hash = event_data_hash
-      self._last_event_data_identifier = event_data.GetIdentifier()
+    Raises:
+      InvalidEvent: if an event has no timestamp set.
+    """
+    if not events_with_event_data:
+      return
 
-    if self._last_event_data_identifier:
-      event.SetEventDataIdentifier(self._last_event_data_identifier)
+    for event, _ in events_with_event_data:
+      if event.timestamp is None:
+        raise errors_lib.InvalidEvent('Event must have a timestamp set.')
 
-    # TODO: remove this after structural fix is in place
-    # https://github.com/log2timeline/plaso/issues/1691
-    event.parser = self.GetParserChain()
+    self._StartBookkeepingTiming()
 
-    self._storage_writer.AddEvent(event)
-    self._number_of_events += 1
+    try:
+      self._ProduceEventsWithEventData(events_with_event_data)
+    finally:
+      self._StopBookkeepingTiming()
 
     self.last_activity_timestamp = time.time()
 
+  def _ProduceEventsWithEventData(self, events_with_event_data):
+    """Processes a batch of events and adds it to the storage writer.
+
+    Args:
+      events_with_event_data (list[tuple[EventObject, EventData]]): events and
+          their event data.
+    """
+    parser_chain = self.GetParserChain()
+
+    file_entry_attributes = None
+    if self._file_entry:
+      file_entry_attributes = self._GetFileEntryEventAttributes(
+          self._file_entry)
+
+    batch = []
+    last_event_data_hash = self._last_event_data_hash
+    for event, event_data in events_with_event_data:
+      event_data_hash = event_data.GetAttributeValuesHash()
+      if event_data_hash == last_event_data_hash:
+        event_data = None
+
+      else:
+        # Make a copy of the event data before adding additional values.
+        event_data = copy.deepcopy(event_data)
+
+        # TODO: refactor to ProcessEventData.
+        self._ProcessEvent(
+            event_data, parser_chain=parser_chain,
+            file_entry_attributes=file_entry_attributes)
+
+        last_event_data_hash = event_data_hash
+
+      # TODO: remove this after structural fix is in place
+      # https://github.com/log2timeline/plaso/issues/1691
+      event.parser = parser_chain
+
+      batch.append((event, event_data))
+
+    if self._last_event_data_identifier:
+      # The events that share the event data produced by a previous batch
+      # refer to it by identifier.
+      for event, event_data in batch:
+        if event_data:
+          break
+        event.SetEventDataIdentifier(self._last_event_data_identifier)
+
+    self._storage_writer.AddEventsWithEventData(batch)
+
+    for _, event_data in reversed(batch):
+      if event_data:
+        self._last_event_data_identifier = event_data.GetIdentifier()
+        break
+
+    self._last_event_data_hash = last_event_data_hash
+    self._number_of_events += len(batch)
+
   def ProduceExtractionError(self, message, path_spec=None):
     """Produces an extraction error.
 
@@ -526,7 +693,14 @@ class ParserMediator(object):
     parser_chain = self.GetParserChain()
     extraction_error = errors.ExtractionError(
         message=message, parser_chain=parser_chain, path_spec=path_spec)
-    self._storage_writer.AddError(extraction_error)
+
+    self._StartBookkeepingTiming()
+
+    try:
+      self._storage_writer.AddError(extraction_error)
+    finally:
+      self._StopBookkeepingTiming()
+
     self._number_of_errors += 1
 
     self.last_activity_timestamp = time.time()
@@ -548,6 +722,7 @@ class ParserMediator(object):
   def ResetFileEntry(self):
     """Resets the active file entry."""
     self._file_entry = None
+    self._file_entry_event_attributes = None
 
   def SampleMemoryUsage(self, parser_name):
     """Takes a sample of the memory usage for profiling.
@@ -562,10 +737,19 @@ class ParserMediator(object):
   def SampleStartTiming(self, parser_name):
     """Starts timing a CPU time sample for profiling.
 
+    The CPU time spent by the mediator on behalf of the parser, such as
+    processing events and writing them to storage, is sampled separately
+    from the CPU time spent in the parser itself, with a profile name of
+    the name of the parser followed by "-mediator".
+
     Args:
       parser_name (str): name of the parser.
     """
     if self._cpu_time_profiler:
+      self._profiled_bookkeeping_name = '{0:s}{1:s}'.format(
+          parser_name, self._BOOKKEEPING_PROFILE_NAME_SUFFIX)
+      self._profiled_parser_name = parser_name
+
       self._cpu_time_profiler.StartTiming(parser_name)
 
   def SampleStopTiming(self, parser_name):
@@ -577,6 +761,12 @@ class ParserMediator(object):
     if self._cpu_time_profiler:
       self._cpu_time_profiler.StopTiming(parser_name)
 
+      if parser_name == self._profiled_parser_name:
+        self._cpu_time_profiler.StopTiming(self._profiled_bookkeeping_name)
+
+        self._profiled_bookkeeping_name = None
+        self._profiled_parser_name = None
+
   def SetEventExtractionConfiguration(self, configuration):
     """Sets the event extraction configuration settings.
 
@@ -586,6 +776,9 @@ class ParserMediator(object):
     """
     self._text_prepend = configuration.text_prepend
 
+    # The display name depends on the text prepend.
+    self._file_entry_event_attributes = None
+
   def SetInputSourceConfiguration(self, configuration):
     """Sets the input source configuration settings.
 
@@ -601,6 +794,9 @@ class ParserMediator(object):
 
     self._mount_path = mount_path
 
+    # The relative path and display name depend on the mount path.
+    self._file_entry_event_attributes = None
+
   def SetFileEntry(self, file_entry):
     """Sets the active file entry.
 
@@ -608,6 +804,7 @@ class ParserMediator(object):
       file_entry (dfvfs.FileEntry): file entry.
     """
     self._file_entry = file_entry
+    self._file_entry_event_attributes = None
 
   def SetStorageWriter(self, storage_writer):
     """Sets the storage writer.
@@ -662,3 +859,5 @@ class ParserMediator(object):
       self._memory_profiler = None
 
     self._process_information = None
+    self._profiled_bookkeeping_name = None
+    self._profiled_parser_name = None
@@ -167,6 +167,10 @@ class NTFSMFTParser(interface.FileObjectParser):
       event_data.name = name
       event_data.parent_file_reference = parent_file_reference
 
+      # The events of the attribute share the event data and are produced
+      # at once.
+      events_with_event_data = []
+
       try:
         creation_time = mft_attribute.get_creation_time_as_integer()
       except OverflowError as exception:
@@ -180,7 +184,7 @@ class NTFSMFTParser(interface.FileObjectParser):
         date_time = self._GetDateTime(creation_time)
         event = time_events.DateTimeValuesEvent(
             date_time, definitions.TIME_DESCRIPTION_CREATION)
-        parser_mediator.ProduceEventWithEventData(event, event_data)
+        events_with_event_data.append((event, event_data))
 
       try:
         modification_time = mft_attribute.get_modification_time_as_integer()
@@ -195,7 +199,7 @@ class NTFSMFTParser(interface.FileObjectParser):
         date_time = self._GetDateTime(modification_time)
         event = time_events.DateTimeValuesEvent(
             date_time, definitions.TIME_DESCRIPTION_MODIFICATION)
-        parser_mediator.ProduceEventWithEventData(event, event_data)
+        events_with_event_data.append((event, event_data))
 
       try:
         access_time = mft_attribute.get_access_time_as_integer()
@@ -210,7 +214,7 @@ class NTFSMFTParser(interface.FileObjectParser):
         date_time = self._GetDateTime(access_time)
         event = time_events.DateTimeValuesEvent(
             date_time, definitions.TIME_DESCRIPTION_LAST_ACCESS)
-        parser_mediator.ProduceEventWithEventData(event, event_data)
+        events_with_event_data.append((event, event_data))
 
       try:
         entry_modification_time = (
@@ -226,7 +230,9 @@ class NTFSMFTParser(interface.FileObjectParser):
         date_time = self._GetDateTime(entry_modification_time)
         event = time_events.DateTimeValuesEvent(
             date_time, definitions.TIME_DESCRIPTION_ENTRY_MODIFICATION)
-        parser_mediator.ProduceEventWithEventData(event, event_data)
+        events_with_event_data.append((event, event_data))
+
+      parser_mediator.ProduceEventsWithEventData(events_with_event_data)
 
     elif mft_attribute.attribute_type == self._MFT_ATTRIBUTE_OBJECT_ID:
       display_name = '$MFT: {0:d}-{1:d}'.format(
@@ -314,6 +320,9 @@ class NTFSUsnJrnlParser(dtfabric_parser.DtFabricBaseParser):
 
   _DEFINITION_FILE = 'ntfs.yaml'
 
+  # Maximum number of events produced at once.
+  _MAXIMUM_NUMBER_OF_EVENTS_PER_BATCH = 1000
+
   # TODO: add support for USN_RECORD_V3 and USN_RECORD_V4 when actually
   # seen to be used.
 
@@ -333,6 +342,7 @@ class NTFSUsnJrnlParser(dtfabric_parser.DtFabricBaseParser):
 
     usn_record_map = self._GetDataTypeMap('usn_record_v2')
 
+    events_with_event_data = []
     usn_record_data = usn_change_journal.read_usn_record()
     while usn_record_data:
       current_offset = usn_change_journal.get_offset()
@@ -341,6 +351,7 @@ class NTFSUsnJrnlParser(dtfabric_parser.DtFabricBaseParser):
         usn_record = self._ReadStructureFromByteStream(
             usn_record_data, current_offset, usn_record_map)
       except (ValueError, errors.ParseError) as exception:
+        parser_mediator.ProduceEventsWithEventData(events_with_event_data)
         raise errors.ParseError((
             'Unable to parse USN record at offset: 0x{0:08x} with error: '
             '{1!s}').format(current_offset, exception))
@@ -376,10 +387,17 @@ class NTFSUsnJrnlParser(dtfabric_parser.DtFabricBaseParser):
 
       event = time_events.DateTimeValuesEvent(
           date_time, definitions.TIME_DESCRIPTION_ENTRY_MODIFICATION)
-      parser_mediator.ProduceEventWithEventData(event, event_data)
+      events_with_event_data.append((event, event_data))
+
+      if (len(events_with_event_data) >=
+          self._MAXIMUM_NUMBER_OF_EVENTS_PER_BATCH):
+        parser_mediator.ProduceEventsWithEventData(events_with_event_data)
+        events_with_event_data = []
 
       usn_record_data = usn_change_journal.read_usn_record()
 
+    parser_mediator.ProduceEventsWithEventData(events_with_event_data)
+
   def ParseFileObject(self, parser_mediator, file_object, **kwargs):
     """Parses a NTFS $UsnJrnl metadata file-like object.
 
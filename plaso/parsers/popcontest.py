@@ -180,6 +180,8 @@ class PopularityContestParser(text_parser.PyparsingSingleLineTextParser):
 
   _SUPPORTED_KEYS = frozenset([key for key, _ in LINE_STRUCTURES])
 
+  TEXT_HINTS = [r'POPULARITY-CONTEST-']
+
   _ENCODING = 'UTF-8'
 
   def _ParseLogLine(self, parser_mediator, structure):
@@ -61,6 +61,8 @@ class SELinuxParser(text_parser.PyparsingSingleLineTextParser):
   NAME = 'selinux'
   DESCRIPTION = 'Parser for SELinux audit.log files.'
 
+  TEXT_HINTS = [r'type\s*=']
+
   _ENCODING = 'utf-8'
 
   _SELINUX_KEY_VALUE_GROUP = pyparsing.Group(
@@ -64,6 +64,8 @@ class SkyDriveLogParser(text_parser.PyparsingMultiLineTextParser):
   NAME = 'skydrive_log'
   DESCRIPTION = 'Parser for OneDrive (or SkyDrive) log files.'
 
+  TEXT_HINTS = [r'######\s*Logging started\.']
+
   _ENCODING = 'utf-8'
 
   # Common SDF (SkyDrive Format) structures.
@@ -258,6 +260,8 @@ class SkyDriveOldLogParser(text_parser.PyparsingSingleLineTextParser):
   NAME = 'skydrive_log_old'
   DESCRIPTION = 'Parser for OneDrive (or SkyDrive) old log files.'
 
+  TEXT_HINTS = [r'\d{2}\s*-\s*\d{2}\s*-\s*\d{4}']
+
   _ENCODING = 'utf-8'
 
   _FOUR_DIGITS = text_parser.PyparsingConstants.FOUR_DIGITS
@@ -41,6 +41,8 @@ class SophosAVLogParser(text_parser.PyparsingSingleLineTextParser):
   NAME = 'sophos_av'
   DESCRIPTION = 'Parser for Anti-Virus log (SAV.txt) files.'
 
+  TEXT_HINTS = [r'\d{4}\s*\d{2}\s*\d{2}']
+
   _ENCODING = 'utf-16-le'
 
   _DATE_ELEMENTS = (
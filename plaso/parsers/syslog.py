@@ -66,6 +66,10 @@ class SyslogParser(text_parser.PyparsingMultiLineTextParser):
 
   DESCRIPTION = 'Syslog Parser'
 
+  TEXT_HINTS = [
+      r'\w{3}\s+\d{1,2}\s\d{2}:\d{2}:\d{2}\s',
+      r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{6}[\+|-]\d{2}:\d{2}\s']
+
   _ENCODING = 'utf-8'
 
   _plugin_classes = {}
@@ -50,6 +50,9 @@ class SystemdJournalParser(interface.FileObjectParser):
 
   DESCRIPTION = 'Parser for Systemd Journal files.'
 
+  # Maximum number of events produced at once.
+  _MAXIMUM_NUMBER_OF_EVENTS_PER_BATCH = 1000
+
   _OBJECT_COMPRESSED_FLAG = 0x00000001
 
   # Unfortunately this doesn't help us knowing about the "dirtiness" or
@@ -211,16 +214,18 @@ class SystemdJournalParser(interface.FileObjectParser):
     event_key, event_value = event_string.split('=', 1)
     return (event_key, event_value)
 
-  def _ParseJournalEntry(self, parser_mediator, file_object, offset):
+  def _ParseJournalEntry(self, file_object, offset):
     """Parses a Systemd journal ENTRY object.
 
     This method will generate an event per ENTRY object.
 
     Args:
-      parser_mediator (ParserMediator): parser mediator.
       file_object (dfvfs.FileIO): a file-like object.
       offset (int): offset of the ENTRY object.
 
+    Returns:
+      tuple[EventObject, EventData]: event and event data of the ENTRY object.
+
     Raises:
       ParseError: When an unexpected object type is parsed.
     """
@@ -259,7 +264,7 @@ class SystemdJournalParser(interface.FileObjectParser):
         timestamp=entry_object.realtime)
     event = time_events.DateTimeValuesEvent(
         date_time, definitions.TIME_DESCRIPTION_WRITTEN)
-    parser_mediator.ProduceEventWithEventData(event, event_data)
+    return event, event_data
 
   def _ParseEntries(self, file_object, offset):
     """Parses Systemd journal ENTRY_ARRAY objects.
@@ -323,18 +328,29 @@ class SystemdJournalParser(interface.FileObjectParser):
     entries_offsets = self._ParseEntries(
         file_object, journal_header.entry_array_offset)
 
+    events_with_event_data = []
     for entry_offset in entries_offsets:
       try:
-        self._ParseJournalEntry(parser_mediator, file_object, entry_offset)
+        events_with_event_data.append(
+            self._ParseJournalEntry(file_object, entry_offset))
       except errors.ParseError as exception:
+        parser_mediator.ProduceEventsWithEventData(events_with_event_data)
         parser_mediator.ProduceExtractionError((
             'Unable to complete parsing journal file: {0:s} at offset '
             '0x{1:08x}').format(exception, entry_offset))
         return
       except construct.ConstructError as exception:
+        parser_mediator.ProduceEventsWithEventData(events_with_event_data)
         raise errors.UnableToParseFile((
             'Unable to parse journal header at offset: 0x{0:08x} with '
             'error: {1:s}').format(entry_offset, exception))
 
+      if (len(events_with_event_data) >=
+          self._MAXIMUM_NUMBER_OF_EVENTS_PER_BATCH):
+        parser_mediator.ProduceEventsWithEventData(events_with_event_data)
+        events_with_event_data = []
+
+    parser_mediator.ProduceEventsWithEventData(events_with_event_data)
+
 
 manager.ParsersManager.RegisterParser(SystemdJournalParser)
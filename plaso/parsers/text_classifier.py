@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""Text format classifier.
+
+The text format classifier determines which text parsers can parse a file,
+so that only the plausible text parsers need to be run on files that do not
+match a known signature.
+"""
+
+from __future__ import unicode_literals
+
+import codecs
+import os
+import re
+
+from plaso.parsers import dsv_parser
+from plaso.parsers import logger
+from plaso.parsers import text_parser
+
+
+class TextFormatClassifier(object):
+  """Text format classifier.
+
+  The start of the file is read and decoded once per encoding used by the
+  text parsers. If the first line cannot be decoded the file is not text in
+  that encoding and none of the text parsers that use the encoding can parse
+  it. Otherwise the text hints of all the text parsers that use the encoding
+  are matched against the decoded text at once, by a single regular
+  expression that contains a look-ahead group per text parser.
+  """
+
+  # Maximum number of bytes read from the start of the file.
+  _MAXIMUM_READ_SIZE = 4096
+
+  def __init__(self, parsers):
+    """Initializes a text format classifier.
+
+    Args:
+      parsers (dict[str, BaseParser]): parsers per name, where only the text
+          parsers are classified.
+    """
+    super(TextFormatClassifier, self).__init__()
+    self._hinted_parser_names = {}
+    self._hints_regexes = {}
+    self._unhinted_parser_names = {}
+
+    text_parser_names = []
+    for parser_name, parser in sorted(parsers.items()):
+      if not isinstance(parser, (
+          text_parser.PyparsingSingleLineTextParser, dsv_parser.DSVParser)):
+        continue
+
+      text_parser_names.append(parser_name)
+
+      encoding = self._GetParserEncoding(parser)
+      if not parser.TEXT_HINTS:
+        self._unhinted_parser_names.setdefault(encoding, []).append(
+            parser_name)
+      else:
+        self._hinted_parser_names.setdefault(encoding, []).append(
+            (parser_name, parser.TEXT_HINTS))
+
+    for encoding, hinted_parser_names in self._hinted_parser_names.items():
+      self._hints_regexes[encoding] = self._CompileHints(hinted_parser_names)
+      self._hinted_parser_names[encoding] = [
+          parser_name for parser_name, _ in hinted_parser_names]
+
+    self.parser_names = frozenset(text_parser_names)
+
+  def _CompileHints(self, hinted_parser_names):
+    """Compiles the text hints of text parsers into a regular expression.
+
+    Every text parser is represented by an optional look-ahead group, which
+    allows a single match to determine all text parsers with a matching hint.
+    The look-ahead group of the N-th text parser is named "parserN".
+
+    Args:
+      hinted_parser_names (list[tuple[str, list[str]]]): names and text hints
+          of the text parsers.
+
+    Returns:
+      re.RegexObject: regular expression of the text hints.
+    """
+    expressions = []
+    for parser_index, (_, text_hints) in enumerate(hinted_parser_names):
+      expressions.append('(?:(?=(?P<parser{0:d}>{1:s})))?'.format(
+          parser_index, '|'.join(
+              '(?:{0:s})'.format(text_hint) for text_hint in text_hints)))
+
+    return re.compile(''.join(expressions))
+
+  def _DecodeText(self, data, encoding):
+    """Decodes the start of a file.
+
+    Args:
+      data (bytes): data read from the start of the file.
+      encoding (str): encoding of the text.
+
+    Returns:
+      str: decoded text, excluding a byte-order mark and leading whitespace,
+          or None if the first line of the text cannot be decoded.
+    """
+    try:
+      decoder = codecs.getincrementaldecoder(encoding)(errors='strict')
+    except LookupError:
+      logger.error('Unsupported encoding: {0:s}'.format(encoding))
+      return None
+
+    try:
+      text = decoder.decode(data, final=False)
+    except UnicodeDecodeError as exception:
+      # The text parsers only require the first line to be decodable.
+      decoder.reset()
+      text = decoder.decode(data[:exception.start], final=False)
+      if '\n' not in text:
+        return None
+
+    return text.lstrip('\ufeff').lstrip()
+
+  def _GetParserEncoding(self, parser):
+    """Retrieves the encoding used by a text parser.
+
+    Args:
+      parser (BaseParser): text parser.
+
+    Returns:
+      str: encoding or None if the parser uses the codepage of the parser
+          mediator.
+    """
+    # pylint: disable=protected-access
+    if isinstance(parser, dsv_parser.DSVParser):
+      return parser._encoding
+
+    return parser._ENCODING
+
+  def Classify(self, file_object, codepage):
+    """Determines the text parsers that can plausibly parse a file.
+
+    Args:
+      file_object (dfvfs.FileIO): file-like object.
+      codepage (str): codepage used by text parsers that do not define
+          an encoding.
+
+    Returns:
+      frozenset[str]: names of the text parsers that can plausibly parse
+          the file.
+    """
+    file_object.seek(0, os.SEEK_SET)
+    data = file_object.read(self._MAXIMUM_READ_SIZE)
+    if not data:
+      return frozenset()
+
+    is_truncated = len(data) == self._MAXIMUM_READ_SIZE
+
+    texts = {}
+    parser_names = []
+    for encoding in set(self._unhinted_parser_names).union(
+        self._hinted_parser_names):
+      text_encoding = encoding or codepage
+      if text_encoding not in texts:
+        texts[text_encoding] = self._DecodeText(data, text_encoding)
+
+      text = texts[text_encoding]
+      if text is None:
+        continue
+
+      parser_names.extend(self._unhinted_parser_names.get(encoding, []))
+
+      hinted_parser_names = self._hinted_parser_names.get(encoding, None)
+      if not hinted_parser_names:
+        continue
+
+      if not text and is_truncated:
+        # The start of the file only contains whitespace, hence the text
+        # parsers cannot be ruled out.
+        parser_names.extend(hinted_parser_names)
+        continue
+
+      match = self._hints_regexes[encoding].match(text)
+      for parser_index, parser_name in enumerate(hinted_parser_names):
+        if match.group('parser{0:d}'.format(parser_index)) is not None:
+          parser_names.append(parser_name)
+
+    return frozenset(parser_names)
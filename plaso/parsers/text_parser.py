@@ -12,9 +12,8 @@ import abc
 
 import pyparsing
 
-from dfvfs.helpers import text_file
-
 from plaso.lib import errors
+from plaso.lib import line_reader_file
 from plaso.lib import py2to3
 from plaso.parsers import interface
 from plaso.parsers import logger
@@ -235,21 +234,104 @@ class PyparsingSingleLineTextParser(interface.FileObjectParser):
   # longer line than 400 bytes.
   MAX_LINE_LENGTH = 400
 
+  # Regular expressions that match the start of the text of files supported
+  # by the parser, which are used by the text format classifier to determine
+  # if the parser can plausibly parse a file. The start of the text excludes
+  # a byte-order mark and leading whitespace. None represents that the parser
+  # can plausibly parse any text file.
+  TEXT_HINTS = None
+
   _ENCODING = None
 
   _EMPTY_LINES = frozenset(['\n', '\r', '\r\n'])
 
+  # Regular expressions with named groups per line structure key, which are
+  # tried before the pyparsing structure with the same key. Parsers that
+  # define regular expressions must implement _GetRegexMatchTokens to build
+  # the same tokens from a match as the pyparsing structure. Lines that do
+  # not match the regular expression are parsed with pyparsing. Note that
+  # the multi line text parser does not use these regular expressions.
+  _LINE_STRUCTURE_REGEXES = {}
+
   # Allow for a maximum of 40 empty lines before we bail out.
   _MAXIMUM_DEPTH = 40
 
+  # Set to True if a line can match at most one of the line structures,
+  # which allows the line structures to be tried in order of the number
+  # of lines they matched.
+  _REORDER_LINE_STRUCTURES = False
+
   def __init__(self):
     """Initializes a parser."""
     super(PyparsingSingleLineTextParser, self).__init__()
     self._current_offset = 0
+    self._line_structure_hits = {}
     # TODO: self._line_structures is a work-around and this needs
     # a structural fix.
     self._line_structures = self.LINE_STRUCTURES
 
+  def _GetRegexMatchTokens(self, key, match):
+    """Retrieves the tokens from a regular expression match.
+
+    Args:
+      key (str): name of the line structure.
+      match (re.MatchObject): match of the regular expression of the line
+          structure.
+
+    Returns:
+      list[tuple[str, object]]: names and values of the tokens, in the order
+          of the pyparsing structure, where a value of None represents
+          a suppressed token, or None if the line should be parsed with
+          pyparsing instead.
+
+    Raises:
+      NotImplementedError: if the parser defines regular expressions but does
+          not implement this method.
+    """
+    raise NotImplementedError
+
+  def _ParseLine(self, line_structures, line):
+    """Parses a line using the line structures.
+
+    Args:
+      line_structures (list[tuple[str, pyparsing.ParserElement]]): names and
+          pyparsing structures of the line structures to try, in order.
+      line (str): line from a text file.
+
+    Returns:
+      tuple: containing:
+
+        int: index of the line structure that matched or None if no line
+            structure matched.
+        pyparsing.ParseResults: tokens parsed from the line or None if no line
+            structure matched.
+    """
+    for index, (key, structure) in enumerate(line_structures):
+      parsed_structure = None
+
+      regex = self._LINE_STRUCTURE_REGEXES.get(key, None)
+      if regex:
+        match = regex.match(line)
+        if match:
+          tokens = self._GetRegexMatchTokens(key, match)
+          if tokens is not None:
+            parsed_structure = pyparsing.ParseResults([])
+            for name, value in tokens:
+              if value is not None:
+                parsed_structure.append(value)
+                parsed_structure[name] = value
+
+      if parsed_structure is None:
+        try:
+          parsed_structure = structure.parseString(line)
+        except pyparsing.ParseException:
+          pass
+
+      if parsed_structure:
+        return index, parsed_structure
+
+    return None, None
+
   def _IsText(self, bytes_in, encoding=None):
     """Examine the bytes in and determine if they are indicative of text.
 
@@ -309,12 +391,13 @@ class PyparsingSingleLineTextParser(interface.FileObjectParser):
 
     return False
 
-  def _ReadLine(self, text_file_object, max_len=0, depth=0):
+  def _ReadLine(self, line_reader, max_len=0, depth=0):
     """Reads a line from a text file.
 
     Args:
-      text_file_object (dfvfs.TextFile): text file.
-      max_len (Optional[int]): maximum number of bytes a single line can take.
+      line_reader (BufferedLineReader): line reader of the text file.
+      max_len (Optional[int]): maximum number of characters a single line can
+          take.
       depth (Optional[int]): number of new lines the parser encountered.
 
     Returns:
@@ -325,7 +408,7 @@ class PyparsingSingleLineTextParser(interface.FileObjectParser):
       UnicodeDecodeError: if the text cannot be decoded using the specified
           encoding.
     """
-    line = text_file_object.readline(size=max_len)
+    line = line_reader.readline(size=max_len)
 
     if not line:
       return ''
@@ -334,7 +417,7 @@ class PyparsingSingleLineTextParser(interface.FileObjectParser):
       if depth == self._MAXIMUM_DEPTH:
         return ''
 
-      return self._ReadLine(text_file_object, max_len=max_len, depth=depth + 1)
+      return self._ReadLine(line_reader, max_len=max_len, depth=depth + 1)
 
     return line.strip()
 
@@ -356,10 +439,11 @@ class PyparsingSingleLineTextParser(interface.FileObjectParser):
           'Line structure undeclared, unable to proceed.')
 
     encoding = self._ENCODING or parser_mediator.codepage
-    text_file_object = text_file.TextFile(file_object, encoding=encoding)
+    line_reader = line_reader_file.BufferedLineReader(
+        file_object, encoding=encoding)
 
     try:
-      line = self._ReadLine(text_file_object, max_len=self.MAX_LINE_LENGTH)
+      line = self._ReadLine(line_reader, max_len=self.MAX_LINE_LENGTH)
     except UnicodeDecodeError:
       raise errors.UnableToParseFile(
           'Not a text file or encoding not supported.')
@@ -381,25 +465,36 @@ class PyparsingSingleLineTextParser(interface.FileObjectParser):
     if not self.VerifyStructure(parser_mediator, line):
       raise errors.UnableToParseFile('Wrong file structure.')
 
+    line_structures = self.LINE_STRUCTURES
+    if self._REORDER_LINE_STRUCTURES:
+      line_structures = list(line_structures)
+
+    self._line_structure_hits = {key: 0 for key, _ in line_structures}
+
     # Set the offset to the beginning of the file.
     self._current_offset = 0
     # Read every line in the text file.
     while line:
       if parser_mediator.abort:
         break
-      parsed_structure = None
-      use_key = None
+
       # Try to parse the line using all the line structures.
-      for key, structure in self.LINE_STRUCTURES:
-        try:
-          parsed_structure = structure.parseString(line)
-        except pyparsing.ParseException:
-          pass
-        if parsed_structure:
-          use_key = key
-          break
+      index, parsed_structure = self._ParseLine(line_structures, line)
 
       if parsed_structure:
+        use_key = line_structures[index][0]
+        self._line_structure_hits[use_key] = (
+            self._line_structure_hits.get(use_key, 0) + 1)
+
+        # Move the line structure ahead of the previous line structure
+        # once it matched more lines.
+        if self._REORDER_LINE_STRUCTURES and index > 0:
+          previous_key = line_structures[index - 1][0]
+          if (self._line_structure_hits[use_key] >
+              self._line_structure_hits.get(previous_key, 0)):
+            line_structures[index - 1], line_structures[index] = (
+                line_structures[index], line_structures[index - 1])
+
         self.ParseRecord(parser_mediator, use_key, parsed_structure)
       else:
         if len(line) > 80:
@@ -408,10 +503,10 @@ class PyparsingSingleLineTextParser(interface.FileObjectParser):
             'unable to parse log line: {0:s} at offset: {1:d}'.format(
                 repr(line), self._current_offset))
 
-      self._current_offset = text_file_object.get_offset()
+      self._current_offset = line_reader.tell()
 
       try:
-        line = self._ReadLine(text_file_object)
+        line = self._ReadLine(line_reader)
       except UnicodeDecodeError:
         parser_mediator.ProduceExtractionError(
             'unable to read and decode log line at offset {0:d}'.format(
@@ -460,20 +555,20 @@ class EncodedTextReader(object):
       encoding (Optional[str]): encoding.
     """
     super(EncodedTextReader, self).__init__()
-    self._buffer = b''
     self._buffer_size = buffer_size
     self._current_offset = 0
     self._encoding = encoding
+    self._line_reader = None
 
     if self._encoding:
-      self._new_line = '\n'.encode(self._encoding)
-      self._carriage_return = '\r'.encode(self._encoding)
+      self._new_line = '\n'
+      self._carriage_return = '\r'
     else:
       self._new_line = b'\n'
       self._carriage_return = b'\r'
 
-    self._new_line_length = len(self._new_line)
-    self._carriage_return_length = len(self._carriage_return)
+    self._carriage_return_and_new_line = (
+        self._carriage_return + self._new_line)
 
     self.lines = ''
 
@@ -485,35 +580,23 @@ class EncodedTextReader(object):
 
     Returns:
       str: line read from the file-like object.
-    """
-    if len(self._buffer) < self._buffer_size:
-      self._buffer = b''.join([
-          self._buffer, file_object.read(self._buffer_size)])
 
-    line, new_line, self._buffer = self._buffer.partition(self._new_line)
-    if not line and not new_line:
-      line = self._buffer
-      self._buffer = b''
+    Raises:
+      UnicodeDecodeError: if the line cannot be decoded using the encoding.
+    """
+    if not self._line_reader:
+      self._line_reader = line_reader_file.BufferedLineReader(
+          file_object, encoding=self._encoding)
 
-    self._current_offset += len(line)
+    line = self._line_reader.readline()
+    self._current_offset = self._line_reader.tell()
 
     # Strip carriage returns from the text.
-    if line.endswith(self._carriage_return):
-      line = line[:-self._carriage_return_length]
+    if line.endswith(self._carriage_return_and_new_line):
+      line = line[:-2] + self._new_line
 
-    if new_line:
-      line = b''.join([line, self._new_line])
-      self._current_offset += self._new_line_length
-
-    # If a parser specifically indicates specific encoding we need
-    # to handle the buffer as it is an encoded string.
-    # If it fails we fail back to the original raw string.
-    if self._encoding:
-      try:
-        line = line.decode(self._encoding)
-      except UnicodeDecodeError:
-        # TODO: it might be better to raise here.
-        pass
+    elif line.endswith(self._carriage_return):
+      line = line[:-1]
 
     return line
 
@@ -538,6 +621,9 @@ class EncodedTextReader(object):
 
     Args:
       file_object (dfvfs.FileIO): file-like object.
+
+    Raises:
+      UnicodeDecodeError: if a line cannot be decoded using the encoding.
     """
     lines_size = len(self.lines)
     if lines_size < self._buffer_size:
@@ -552,8 +638,8 @@ class EncodedTextReader(object):
 
   def Reset(self):
     """Resets the encoded text reader."""
-    self._buffer = b''
     self._current_offset = 0
+    self._line_reader = None
 
     self.lines = ''
 
@@ -653,6 +739,7 @@ class PyparsingMultiLineTextParser(PyparsingSingleLineTextParser):
         if start == 0:
           break
 
+      odd_line = None
       if tokens and start == 0:
         try:
           self.ParseRecord(parser_mediator, key, tokens)
@@ -661,22 +748,25 @@ class PyparsingMultiLineTextParser(PyparsingSingleLineTextParser):
               'unable parse record: {0:s} with error: {1!s}'.format(
                   key, exception))
 
-        self._text_reader.SkipAhead(file_object, end)
-
-      else:
-        odd_line = self._text_reader.ReadLine(file_object)
-        if odd_line:
-          if len(odd_line) > 80:
-            odd_line = '{0:s}...'.format(odd_line[:77])
-          parser_mediator.ProduceExtractionError(
-              'unable to parse log line: {0:s}'.format(repr(odd_line)))
-
+      # Lines that cannot be decoded are skipped, when reading lines into
+      # the lines buffer.
       try:
+        if tokens and start == 0:
+          self._text_reader.SkipAhead(file_object, end)
+        else:
+          odd_line = self._text_reader.ReadLine(file_object)
+
         self._text_reader.ReadLines(file_object)
       except UnicodeDecodeError as exception:
         parser_mediator.ProduceExtractionError(
             'unable to read lines with error: {0!s}'.format(exception))
 
+      if odd_line:
+        if len(odd_line) > 80:
+          odd_line = '{0:s}...'.format(odd_line[:77])
+        parser_mediator.ProduceExtractionError(
+            'unable to parse log line: {0:s}'.format(repr(odd_line)))
+
   @abc.abstractmethod
   def ParseRecord(self, parser_mediator, key, structure):
     """Parses a log record structure and produces events.
@@ -61,6 +61,9 @@ class WinEvtxParser(interface.FileObjectParser):
   NAME = 'winevtx'
   DESCRIPTION = 'Parser for Windows XML EventLog (EVTX) files.'
 
+  # Maximum number of events produced at once.
+  _MAXIMUM_NUMBER_OF_EVENTS_PER_BATCH = 1000
+
   @classmethod
   def GetFormatSpecification(cls):
     """Retrieves the format specification.
@@ -183,6 +186,9 @@ class WinEvtxParser(interface.FileObjectParser):
       record_index (int): event record index.
       evtx_record (pyevtx.record): event record.
       recovered (Optional[bool]): True if the record was recovered.
+
+    Returns:
+      tuple[EventObject, EventData]: event and event data of the record.
     """
     event_data = self._GetEventData(
         parser_mediator, record_index, evtx_record, recovered=recovered)
@@ -203,7 +209,7 @@ class WinEvtxParser(interface.FileObjectParser):
 
     event = time_events.DateTimeValuesEvent(
         date_time, definitions.TIME_DESCRIPTION_WRITTEN)
-    parser_mediator.ProduceEventWithEventData(event, event_data)
+    return event, event_data
 
   def _ParseRecords(self, parser_mediator, evtx_file):
     """Parses Windows XML EventLog (EVTX) records.
@@ -218,33 +224,47 @@ class WinEvtxParser(interface.FileObjectParser):
     # The call to evt_file.get_record() and access to members of evt_record
     # should be called within a try-except.
 
+    events_with_event_data = []
     for record_index in range(evtx_file.number_of_records):
       if parser_mediator.abort:
         break
 
       try:
         evtx_record = evtx_file.get_record(record_index)
-        self._ParseRecord(parser_mediator, record_index, evtx_record)
+        events_with_event_data.append(self._ParseRecord(
+            parser_mediator, record_index, evtx_record))
 
       except IOError as exception:
         parser_mediator.ProduceExtractionError(
             'unable to parse event record: {0:d} with error: {1!s}'.format(
                 record_index, exception))
 
+      if (len(events_with_event_data) >=
+          self._MAXIMUM_NUMBER_OF_EVENTS_PER_BATCH):
+        parser_mediator.ProduceEventsWithEventData(events_with_event_data)
+        events_with_event_data = []
+
     for record_index in range(evtx_file.number_of_recovered_records):
       if parser_mediator.abort:
         break
 
       try:
         evtx_record = evtx_file.get_recovered_record(record_index)
-        self._ParseRecord(
-            parser_mediator, record_index, evtx_record, recovered=True)
+        events_with_event_data.append(self._ParseRecord(
+            parser_mediator, record_index, evtx_record, recovered=True))
 
       except IOError as exception:
         parser_mediator.ProduceExtractionError((
             'unable to parse recovered event record: {0:d} with error: '
             '{1:s}').format(record_index, exception))
 
+      if (len(events_with_event_data) >=
+          self._MAXIMUM_NUMBER_OF_EVENTS_PER_BATCH):
+        parser_mediator.ProduceEventsWithEventData(events_with_event_data)
+        events_with_event_data = []
+
+    parser_mediator.ProduceEventsWithEventData(events_with_event_data)
+
   def ParseFileObject(self, parser_mediator, file_object, **kwargs):
     """Parses a Windows XML EventLog (EVTX) file-like object.
 
@@ -3,6 +3,8 @@
 
 from __future__ import unicode_literals
 
+import re
+
 import pyparsing
 
 from dfdatetime import time_elements as dfdatetime_time_elements
@@ -66,6 +68,8 @@ class WinFirewallParser(text_parser.PyparsingSingleLineTextParser):
   NAME = 'winfirewall'
   DESCRIPTION = 'Parser for Windows Firewall Log files.'
 
+  TEXT_HINTS = [r'#Version: 1\.5']
+
   _ENCODING = 'ascii'
 
   # TODO: Add support for custom field names. Currently this parser only
@@ -118,6 +122,38 @@ class WinFirewallParser(text_parser.PyparsingSingleLineTextParser):
       ('logline', _LOG_LINE),
   ]
 
+  # Regular expression equivalent of the log line structure, for lines where
+  # the values are separated by whitespace.
+  _LOG_LINE_REGEX = re.compile((
+      r'(?P<year>\d{{4}})-(?P<month>\d{{2}})-(?P<day_of_month>\d{{2}})\s+'
+      r'(?P<hours>\d{{2}}):(?P<minutes>\d{{2}}):(?P<seconds>\d{{2}})\s+'
+      r'(?P<action>{0:s})\s+(?P<protocol>{0:s})\s+'
+      r'(?P<source_ip>{1:s})\s+(?P<dest_ip>{1:s})\s+'
+      r'(?P<source_port>{2:s})\s+(?P<dest_port>{2:s})\s+'
+      r'(?P<size>{3:s})\s+(?P<flags>{0:s})\s+(?P<tcp_seq>{3:s})\s+'
+      r'(?P<tcp_ack>{3:s})\s+(?P<tcp_win>{3:s})\s+(?P<icmp_type>{3:s})\s+'
+      r'(?P<icmp_code>{3:s})\s+(?P<info>{0:s})\s+'
+      r'(?P<path>{0:s})(?:\s|$)').format(
+          r'[0-9A-Za-z]+|-', r'\d{1,3}(?:\.\d{1,3}){3}|[0-9A-Fa-f:]+|-',
+          r'\d{1,6}|-', r'\d+|-'))
+
+  _LINE_STRUCTURE_REGEXES = {'logline': _LOG_LINE_REGEX}
+
+  # Comment lines start with "#" and log lines with a date.
+  _REORDER_LINE_STRUCTURES = True
+
+  _DATE_TIME_GROUP_NAMES = (
+      'year', 'month', 'day_of_month', 'hours', 'minutes', 'seconds')
+
+  _INTEGER_GROUP_NAMES = frozenset([
+      'dest_port', 'icmp_code', 'icmp_type', 'size', 'source_port', 'tcp_ack',
+      'tcp_seq', 'tcp_win'])
+
+  _TOKEN_GROUP_NAMES = (
+      'action', 'protocol', 'source_ip', 'dest_ip', 'source_port', 'dest_port',
+      'size', 'flags', 'tcp_seq', 'tcp_ack', 'tcp_win', 'icmp_type',
+      'icmp_code', 'info', 'path')
+
   def __init__(self):
     """Initializes a parser object."""
     super(WinFirewallParser, self).__init__()
@@ -125,6 +161,47 @@ class WinFirewallParser(text_parser.PyparsingSingleLineTextParser):
     self._use_local_timezone = False
     self._version = None
 
+  def _GetRegexMatchTokens(self, unused_key, match):
+    """Retrieves the tokens from a regular expression match.
+
+    Args:
+      key (str): name of the line structure.
+      match (re.MatchObject): match of the regular expression of the line
+          structure.
+
+    Returns:
+      list[tuple[str, object]]: names and values of the tokens, in the order
+          of the pyparsing structure, where a value of None represents
+          a suppressed token, or None if the line should be parsed with
+          pyparsing instead.
+    """
+    date_time = pyparsing.ParseResults([
+        int(match.group(name), 10) for name in self._DATE_TIME_GROUP_NAMES])
+    tokens = [('date_time', date_time)]
+
+    for name in self._TOKEN_GROUP_NAMES:
+      value = match.group(name)
+      if value == '-':
+        value = None
+
+      elif name in self._INTEGER_GROUP_NAMES:
+        value = int(value, 10)
+
+      elif name in ('dest_ip', 'source_ip'):
+        if '.' in value:
+          octets = [int(octet, 10) for octet in value.split('.')]
+          if max(octets) > 255:
+            return None
+
+          value = '.'.join(['{0:d}'.format(octet) for octet in octets])
+
+        # The pyparsing structure stores IP addresses as nested results.
+        value = pyparsing.ParseResults([value])
+
+      tokens.append((name, value))
+
+    return tokens
+
   def _GetStructureValue(self, structure, key):
     """Retrieves a value from a parsed log line, removing empty results.
 
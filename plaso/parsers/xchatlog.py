@@ -91,6 +91,8 @@ class XChatLogParser(text_parser.PyparsingSingleLineTextParser):
   NAME = 'xchatlog'
   DESCRIPTION = 'Parser for XChat log files.'
 
+  TEXT_HINTS = [r'\*\*\*\*']
+
   _ENCODING = 'utf-8'
 
   # Common (header/footer/body) pyparsing structures.
@@ -72,6 +72,8 @@ class XChatScrollbackParser(text_parser.PyparsingSingleLineTextParser):
   NAME = 'xchatscrollback'
   DESCRIPTION = 'Parser for XChat scrollback log files.'
 
+  TEXT_HINTS = [r'T\s*\d']
+
   _ENCODING = 'utf-8'
 
   # Define how a log line should look like.
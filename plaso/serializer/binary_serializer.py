@@ -0,0 +1,693 @@
+# -*- coding: utf-8 -*-
+"""The binary serializer object implementation.
+
+The binary serialized form of an attribute container consists of:
+* header, which contains the format version, the size of a token and
+  the number of tokens, integers, floating-point values and string sizes,
+  and the size of the strings and byte strings data;
+* tokens, which are unsigned integers of 1, 2 or 4 bytes that contain
+  the value types, string indexes, path specification references and
+  number of elements of the values;
+* integers, as 64-bit signed integers;
+* floating-point values, as 64-bit IEEE 754 values;
+* strings data, which is the UTF-8 encoded strings table;
+* byte strings data, which is the concatenation of the byte strings.
+
+All numeric values are stored in little-endian. The strings in the strings
+data are separated by a NUL-character. If a string contains a NUL-character
+the strings are concatenated instead and the first tokens contain the number
+of characters of each string.
+
+Strings, such as attribute names, container types and string values, and
+path specifications are stored once per serialized attribute container and
+referred to by their index in the corresponding table. A path specification
+is defined where it is first referred to, where its parent is defined before
+the path specification itself.
+"""
+
+from __future__ import unicode_literals
+
+import collections
+import functools
+import struct
+
+from dfvfs.path import path_spec as dfvfs_path_spec
+from dfvfs.path import factory as dfvfs_path_spec_factory
+
+from plaso.containers import interface as containers_interface
+from plaso.containers import manager as containers_manager
+from plaso.lib import py2to3
+from plaso.serializer import interface
+from plaso.serializer import logger
+
+
+class BinaryAttributeContainerSerializer(
+    interface.AttributeContainerSerializer):
+  """Class that implements the binary attribute container serializer."""
+
+  FORMAT_VERSION = 1
+
+  TYPE_NONE = 0
+  TYPE_FALSE = 1
+  TYPE_TRUE = 2
+  TYPE_INTEGER = 3
+  TYPE_FLOAT = 4
+  TYPE_STRING = 5
+  TYPE_BYTES = 6
+  TYPE_LIST = 7
+  TYPE_TUPLE = 8
+  TYPE_DICT = 9
+  TYPE_COUNTER = 10
+  TYPE_PATH_SPEC = 11
+  TYPE_CONTAINER = 12
+
+  # Integers that do not fit in 64-bit are stored as a string.
+  TYPE_LONG_INTEGER = 13
+
+  _HEADER = struct.Struct('<BBIIIIII')
+
+  _MAXIMUM_INTEGER = (1 << 63) - 1
+  _MINIMUM_INTEGER = -(1 << 63)
+
+  _PATH_SPEC_PROPERTY_NAMES = frozenset(
+      dfvfs_path_spec_factory.Factory.PROPERTY_NAMES)
+
+  # The struct format characters of the supported token sizes.
+  _TOKEN_FORMATS = {1: 'B', 2: 'H', 4: 'I'}
+
+  @classmethod
+  def _DecodeAttributeContainer(cls, decoder_state):
+    """Decodes an attribute container.
+
+    Args:
+      decoder_state (_DecoderState): decoder state.
+
+    Returns:
+      AttributeContainer: attribute container.
+
+    Raises:
+      ValueError: if the attribute container type is not supported.
+    """
+    next_token = decoder_state.next_token
+    strings = decoder_state.strings
+
+    container_type = strings[next_token()]
+
+    container_class = (
+        containers_manager.AttributeContainersManager.GetAttributeContainer(
+            container_type))
+    if not container_class:
+      raise ValueError('Unsupported container type: {0:s}'.format(
+          container_type))
+
+    container_object = container_class()
+
+    # Be strict about which attributes to set in non event values.
+    supported_attribute_names = None
+    if container_type not in ('event', 'event_data'):
+      supported_attribute_names = container_object.GetAttributeNames()
+
+    for attribute_name, attribute_value in cls._DecodeAttributes(
+        decoder_state):
+      if (supported_attribute_names is not None and
+          attribute_name not in supported_attribute_names):
+        logger.debug((
+            '[DecodeAttributeContainer] unsupported attribute name: '
+            '{0:s}.{1:s}').format(container_type, attribute_name))
+        continue
+
+      setattr(container_object, attribute_name, attribute_value)
+
+    return container_object
+
+  @classmethod
+  def _DecodeAttributes(cls, decoder_state):
+    """Decodes the names and values of attributes.
+
+    Args:
+      decoder_state (_DecoderState): decoder state.
+
+    Returns:
+      list[tuple[str, object]]: names and values of the attributes.
+    """
+    next_integer = decoder_state.next_integer
+    next_token = decoder_state.next_token
+    strings = decoder_state.strings
+
+    attributes = []
+    for _ in range(next_token()):
+      attribute_name = strings[next_token()]
+
+      # Strings and integers are the most common attribute values, hence
+      # these are decoded here instead of by _DecodeValue.
+      value_type = next_token()
+      if value_type == cls.TYPE_STRING:
+        attribute_value = strings[next_token()]
+      elif value_type == cls.TYPE_INTEGER:
+        attribute_value = next_integer()
+      else:
+        attribute_value = cls._DecodeValue(decoder_state, value_type)
+
+      attributes.append((attribute_name, attribute_value))
+
+    return attributes
+
+  @classmethod
+  def _DecodePathSpec(cls, decoder_state):
+    """Decodes a path specification.
+
+    Args:
+      decoder_state (_DecoderState): decoder state.
+
+    Returns:
+      dfvfs.PathSpec: path specification.
+    """
+    next_token = decoder_state.next_token
+    path_specs = decoder_state.path_specs
+
+    reference = next_token()
+    if reference:
+      return path_specs[reference - 1]
+
+    parent = cls._DecodeValue(decoder_state)
+    type_indicator = decoder_state.strings[next_token()]
+
+    kwargs = dict(cls._DecodeAttributes(decoder_state))
+
+    if parent:
+      kwargs['parent'] = parent
+
+    path_spec = dfvfs_path_spec_factory.Factory.NewPathSpec(
+        type_indicator, **kwargs)
+    path_specs.append(path_spec)
+    return path_spec
+
+  @classmethod
+  def _DecodeValue(cls, decoder_state, value_type=None):
+    """Decodes a value.
+
+    Args:
+      decoder_state (_DecoderState): decoder state.
+      value_type (Optional[int]): type of the value, where None indicates
+          the type should be read from the tokens.
+
+    Returns:
+      object: value.
+
+    Raises:
+      ValueError: if the value type or attribute container type is not
+          supported.
+    """
+    next_token = decoder_state.next_token
+    if value_type is None:
+      value_type = next_token()
+
+    if value_type == cls.TYPE_STRING:
+      return decoder_state.strings[next_token()]
+
+    if value_type == cls.TYPE_INTEGER:
+      return decoder_state.next_integer()
+
+    if value_type == cls.TYPE_NONE:
+      return None
+
+    if value_type == cls.TYPE_TRUE:
+      return True
+
+    if value_type == cls.TYPE_FALSE:
+      return False
+
+    if value_type == cls.TYPE_FLOAT:
+      return decoder_state.next_float()
+
+    if value_type == cls.TYPE_BYTES:
+      return decoder_state.ReadBytes(next_token())
+
+    if value_type == cls.TYPE_LIST:
+      return [cls._DecodeValue(decoder_state) for _ in range(next_token())]
+
+    if value_type == cls.TYPE_TUPLE:
+      return tuple([
+          cls._DecodeValue(decoder_state) for _ in range(next_token())])
+
+    if value_type in (cls.TYPE_COUNTER, cls.TYPE_DICT):
+      if value_type == cls.TYPE_COUNTER:
+        value = collections.Counter()
+      else:
+        value = {}
+
+      for _ in range(next_token()):
+        key = cls._DecodeValue(decoder_state)
+        value[key] = cls._DecodeValue(decoder_state)
+      return value
+
+    if value_type == cls.TYPE_PATH_SPEC:
+      return cls._DecodePathSpec(decoder_state)
+
+    if value_type == cls.TYPE_CONTAINER:
+      return cls._DecodeAttributeContainer(decoder_state)
+
+    if value_type == cls.TYPE_LONG_INTEGER:
+      return py2to3.LONG_TYPE(decoder_state.strings[next_token()], 10)
+
+    raise ValueError('Unsupported value type: {0:d}'.format(value_type))
+
+  @classmethod
+  def _EncodePathSpec(cls, encoder_state, path_spec):
+    """Encodes a path specification.
+
+    Args:
+      encoder_state (_EncoderState): encoder state.
+      path_spec (dfvfs.PathSpec): path specification.
+    """
+    tokens = encoder_state.tokens
+
+    # The path specifications are referenced by the encoder state hence
+    # their identifiers remain unique while the attribute container is
+    # encoded.
+    lookup_key = id(path_spec)
+    path_spec_index = encoder_state.path_spec_indexes.get(lookup_key, None)
+    if path_spec_index is not None:
+      tokens.append(path_spec_index + 1)
+      return
+
+    tokens.append(0)
+
+    if path_spec.HasParent():
+      tokens.append(cls.TYPE_PATH_SPEC)
+      cls._EncodePathSpec(encoder_state, path_spec.parent)
+    else:
+      tokens.append(cls.TYPE_NONE)
+
+    # The properties of a path specification are stored as attributes of
+    # the path specification, which is considerably faster to iterate than
+    # all supported property names.
+    properties = [
+        (property_name, property_value)
+        for property_name, property_value in path_spec.__dict__.items()
+        if property_value is not None and
+        property_name in cls._PATH_SPEC_PROPERTY_NAMES]
+
+    tokens.append(encoder_state.GetStringIndex(path_spec.type_indicator))
+    tokens.append(len(properties))
+    cls._EncodeAttributes(encoder_state, properties)
+
+    encoder_state.AddPathSpec(lookup_key, path_spec)
+
+  @classmethod
+  def _EncodeAttributes(cls, encoder_state, attributes):
+    """Encodes the names and values of attributes.
+
+    Args:
+      encoder_state (_EncoderState): encoder state.
+      attributes (list[tuple[str, object]]): names and values of
+          the attributes.
+    """
+    integers_append = encoder_state.integers.append
+    string_indexes = encoder_state.string_indexes
+    tokens_append = encoder_state.tokens.append
+
+    for attribute_name, attribute_value in attributes:
+      string_index = string_indexes.get(attribute_name, None)
+      if string_index is None:
+        string_index = encoder_state.AddString(attribute_name)
+      tokens_append(string_index)
+
+      # Strings and integers are the most common attribute values, hence
+      # these are encoded here instead of by _EncodeValue.
+      value_type = type(attribute_value)
+      if value_type == py2to3.UNICODE_TYPE:
+        string_index = string_indexes.get(attribute_value, None)
+        if string_index is None:
+          string_index = encoder_state.AddString(attribute_value)
+        tokens_append(cls.TYPE_STRING)
+        tokens_append(string_index)
+
+      elif (value_type == int and
+            cls._MINIMUM_INTEGER <= attribute_value <= cls._MAXIMUM_INTEGER):
+        tokens_append(cls.TYPE_INTEGER)
+        integers_append(attribute_value)
+
+      else:
+        cls._EncodeValue(encoder_state, attribute_value)
+
+  @classmethod
+  def _EncodeValue(cls, encoder_state, value):
+    """Encodes a value.
+
+    Args:
+      encoder_state (_EncoderState): encoder state.
+      value (object): value.
+
+    Raises:
+      TypeError: if the type of the value is not supported.
+      ValueError: if the attribute container type is not supported.
+    """
+    tokens = encoder_state.tokens
+
+    # Note that bool is checked before int since bool is a subclass of int.
+    if value is None:
+      tokens.append(cls.TYPE_NONE)
+
+    elif value is True:
+      tokens.append(cls.TYPE_TRUE)
+
+    elif value is False:
+      tokens.append(cls.TYPE_FALSE)
+
+    elif isinstance(value, py2to3.UNICODE_TYPE):
+      tokens.append(cls.TYPE_STRING)
+      tokens.append(encoder_state.GetStringIndex(value))
+
+    elif isinstance(value, py2to3.INTEGER_TYPES):
+      if cls._MINIMUM_INTEGER <= value <= cls._MAXIMUM_INTEGER:
+        tokens.append(cls.TYPE_INTEGER)
+        encoder_state.integers.append(value)
+      else:
+        tokens.append(cls.TYPE_LONG_INTEGER)
+        tokens.append(encoder_state.GetStringIndex('{0:d}'.format(value)))
+
+    elif isinstance(value, float):
+      tokens.append(cls.TYPE_FLOAT)
+      encoder_state.floats.append(value)
+
+    elif isinstance(value, py2to3.BYTES_TYPE):
+      tokens.append(cls.TYPE_BYTES)
+      tokens.append(len(value))
+      encoder_state.byte_strings.append(value)
+
+    elif isinstance(value, (list, tuple)):
+      if isinstance(value, list):
+        tokens.append(cls.TYPE_LIST)
+      else:
+        tokens.append(cls.TYPE_TUPLE)
+
+      tokens.append(len(value))
+      for element in value:
+        cls._EncodeValue(encoder_state, element)
+
+    elif isinstance(value, dict):
+      if isinstance(value, collections.Counter):
+        tokens.append(cls.TYPE_COUNTER)
+      else:
+        tokens.append(cls.TYPE_DICT)
+
+      tokens.append(len(value))
+      for key, element in value.items():
+        cls._EncodeValue(encoder_state, key)
+        cls._EncodeValue(encoder_state, element)
+
+    elif isinstance(value, dfvfs_path_spec.PathSpec):
+      tokens.append(cls.TYPE_PATH_SPEC)
+      cls._EncodePathSpec(encoder_state, value)
+
+    elif isinstance(value, containers_interface.AttributeContainer):
+      container_type = getattr(value, 'CONTAINER_TYPE', None)
+      if not container_type:
+        raise ValueError('Unsupported attribute container type: {0!s}.'.format(
+            type(value)))
+
+      attributes = list(value.GetAttributes())
+
+      tokens.append(cls.TYPE_CONTAINER)
+      tokens.append(encoder_state.GetStringIndex(container_type))
+      tokens.append(len(attributes))
+      cls._EncodeAttributes(encoder_state, attributes)
+
+    else:
+      raise TypeError('Unsupported value type: {0!s}.'.format(type(value)))
+
+  @classmethod
+  def ReadSerialized(cls, serialized):
+    """Reads an attribute container from serialized form.
+
+    Args:
+      serialized (bytes): binary serialized form.
+
+    Returns:
+      AttributeContainer: attribute container or None.
+
+    Raises:
+      TypeError: if the serialized data does not contain an
+          AttributeContainer.
+      ValueError: if the serialized data cannot be decoded.
+    """
+    if not serialized:
+      return None
+
+    try:
+      (format_version, token_size, number_of_tokens, number_of_integers,
+       number_of_floats, number_of_string_sizes, strings_data_size,
+       byte_strings_data_size) = cls._HEADER.unpack_from(serialized, 0)
+
+      if format_version != cls.FORMAT_VERSION:
+        raise ValueError('Unsupported format version: {0:d}'.format(
+            format_version))
+
+      token_format = cls._TOKEN_FORMATS.get(token_size, None)
+      if not token_format:
+        raise ValueError('Unsupported token size: {0:d}'.format(token_size))
+
+      # The tokens, integers and floating-point values are unpacked at once.
+      data_offset = cls._HEADER.size
+      values = struct.unpack_from(
+          '<{0:d}{1:s}{2:d}q{3:d}d'.format(
+              number_of_tokens, token_format, number_of_integers,
+              number_of_floats), serialized, data_offset)
+      data_offset += (
+          number_of_tokens * token_size +
+          (number_of_integers + number_of_floats) * 8)
+
+      integers_offset = number_of_tokens
+      floats_offset = integers_offset + number_of_integers
+      tokens = values[:integers_offset]
+      integers = values[integers_offset:floats_offset]
+      floats = values[floats_offset:]
+
+      strings_data = serialized[data_offset:data_offset + strings_data_size]
+      strings_data = strings_data.decode('utf-8', 'surrogatepass')
+      data_offset += strings_data_size
+
+      byte_strings_data = serialized[
+          data_offset:data_offset + byte_strings_data_size]
+      if len(byte_strings_data) != byte_strings_data_size:
+        raise ValueError('Byte strings data size value out of bounds.')
+
+      decoder_state = _DecoderState(
+          tokens[number_of_string_sizes:], integers, floats,
+          byte_strings_data)
+
+      if not number_of_string_sizes:
+        decoder_state.strings = strings_data.split('\x00')
+
+      else:
+        strings = decoder_state.strings
+        strings_data_offset = 0
+        for string_size in tokens[:number_of_string_sizes]:
+          strings.append(strings_data[
+              strings_data_offset:strings_data_offset + string_size])
+          strings_data_offset += string_size
+
+      attribute_container = cls._DecodeValue(decoder_state)
+
+    except (IndexError, StopIteration, struct.error,
+            UnicodeDecodeError) as exception:
+      raise ValueError(
+          'Unable to decode serialized data with error: {0!s}'.format(
+              exception))
+
+    if not isinstance(
+        attribute_container, containers_interface.AttributeContainer):
+      raise TypeError('{0!s} is not an attribute container type.'.format(
+          type(attribute_container)))
+
+    return attribute_container
+
+  @classmethod
+  def WriteSerialized(cls, attribute_container):
+    """Writes an attribute container to serialized form.
+
+    Args:
+      attribute_container (AttributeContainer): attribute container.
+
+    Returns:
+      bytes: binary serialized form.
+
+    Raises:
+      TypeError: if not an instance of AttributeContainer or if the type of
+          an attribute value is not supported.
+      ValueError: if the attribute container type is not supported.
+    """
+    if not isinstance(
+        attribute_container, containers_interface.AttributeContainer):
+      raise TypeError('{0!s} is not an attribute container type.'.format(
+          type(attribute_container)))
+
+    encoder_state = _EncoderState()
+    cls._EncodeValue(encoder_state, attribute_container)
+
+    # The strings are encoded at once, which is considerably faster than
+    # encoding them individually. Lone surrogates are preserved as-is.
+    # The strings are separated by NUL-characters, unless a string contains
+    # a NUL-character, in which case the size of each string is stored in
+    # the tokens.
+    strings = encoder_state.strings
+    strings_data = '\x00'.join(strings)
+    if strings_data.count('\x00') == len(strings) - 1:
+      tokens = encoder_state.tokens
+      number_of_string_sizes = 0
+    else:
+      strings_data = ''.join(strings)
+      tokens = [len(string) for string in strings]
+      tokens.extend(encoder_state.tokens)
+      number_of_string_sizes = len(strings)
+
+    strings_data = strings_data.encode('utf-8', 'surrogatepass')
+
+    maximum_token = max(tokens)
+    if maximum_token <= 0xff:
+      token_size = 1
+    elif maximum_token <= 0xffff:
+      token_size = 2
+    else:
+      token_size = 4
+
+    byte_strings_data = b''.join(encoder_state.byte_strings)
+
+    integers = encoder_state.integers
+    floats = encoder_state.floats
+
+    header_data = cls._HEADER.pack(
+        cls.FORMAT_VERSION, token_size, len(tokens), len(integers),
+        len(floats), number_of_string_sizes, len(strings_data),
+        len(byte_strings_data))
+
+    # The tokens, integers and floating-point values are packed at once.
+    values_format = '<{0:d}{1:s}{2:d}q{3:d}d'.format(
+        len(tokens), cls._TOKEN_FORMATS[token_size], len(integers),
+        len(floats))
+
+    values = list(tokens)
+    values.extend(integers)
+    values.extend(floats)
+
+    return b''.join([
+        header_data, struct.pack(values_format, *values), strings_data,
+        byte_strings_data])
+
+
+class _DecoderState(object):
+  """State of the decoder of a binary serialized attribute container.
+
+  Attributes:
+    next_float (function): returns the next floating-point value.
+    next_integer (function): returns the next integer.
+    next_token (function): returns the next token.
+    path_specs (list[dfvfs.PathSpec]): path specifications table.
+    strings (list[str]): strings table.
+  """
+
+  def __init__(self, tokens, integers, floats, byte_strings_data):
+    """Initializes a decoder state.
+
+    Args:
+      tokens (tuple[int]): tokens.
+      integers (tuple[int]): integers.
+      floats (tuple[float]): floating-point values.
+      byte_strings_data (bytes): byte strings data.
+    """
+    super(_DecoderState, self).__init__()
+    self._byte_strings_data = byte_strings_data
+    self._byte_strings_data_offset = 0
+    self.next_float = functools.partial(next, iter(floats))
+    self.next_integer = functools.partial(next, iter(integers))
+    self.next_token = functools.partial(next, iter(tokens))
+    self.path_specs = []
+    self.strings = []
+
+  def ReadBytes(self, size):
+    """Reads the next byte string.
+
+    Args:
+      size (int): size of the byte string.
+
+    Returns:
+      bytes: byte string.
+
+    Raises:
+      ValueError: if the size value is out of bounds.
+    """
+    data_offset = self._byte_strings_data_offset
+    data_end_offset = data_offset + size
+    if data_end_offset > len(self._byte_strings_data):
+      raise ValueError('Byte string size value out of bounds.')
+
+    self._byte_strings_data_offset = data_end_offset
+    return self._byte_strings_data[data_offset:data_end_offset]
+
+
+class _EncoderState(object):
+  """State of the encoder of a binary serialized attribute container.
+
+  Attributes:
+    byte_strings (list[bytes]): byte strings.
+    floats (list[float]): floating-point values.
+    integers (list[int]): integers.
+    path_spec_indexes (dict[int, int]): path specification indexes per
+        identifier of the path specification.
+    string_indexes (dict[str, int]): indexes of the strings in the strings
+        table.
+    strings (list[str]): strings table.
+    tokens (list[int]): tokens.
+  """
+
+  def __init__(self):
+    """Initializes an encoder state."""
+    super(_EncoderState, self).__init__()
+    self._path_specs = []
+    self.byte_strings = []
+    self.floats = []
+    self.integers = []
+    self.path_spec_indexes = {}
+    self.string_indexes = {}
+    self.strings = []
+    self.tokens = []
+
+  def AddPathSpec(self, lookup_key, path_spec):
+    """Adds a path specification to the path specifications table.
+
+    Args:
+      lookup_key (int): identifier of the path specification.
+      path_spec (dfvfs.PathSpec): path specification.
+    """
+    self.path_spec_indexes[lookup_key] = len(self._path_specs)
+    self._path_specs.append(path_spec)
+
+  def AddString(self, string):
+    """Adds a string to the strings table.
+
+    Args:
+      string (str): string.
+
+    Returns:
+      int: index of the string in the table.
+    """
+    string_index = len(self.strings)
+    self.string_indexes[string] = string_index
+    self.strings.append(string)
+    return string_index
+
+  def GetStringIndex(self, string):
+    """Retrieves the index of a string in the strings table.
+
+    Args:
+      string (str): string.
+
+    Returns:
+      int: index of the string in the table.
+    """
+    string_index = self.string_indexes.get(string, None)
+    if string_index is None:
+      string_index = self.AddString(string)
+
+    return string_index
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""This file contains the serializer factory class."""
+
+from __future__ import unicode_literals
+
+from plaso.lib import definitions
+from plaso.serializer import binary_serializer
+from plaso.serializer import json_serializer
+
+
+class SerializerFactory(object):
+  """Serializer factory."""
+
+  _ATTRIBUTE_CONTAINER_SERIALIZERS = {
+      definitions.SERIALIZER_FORMAT_BINARY: (
+          binary_serializer.BinaryAttributeContainerSerializer),
+      definitions.SERIALIZER_FORMAT_JSON: (
+          json_serializer.JSONAttributeContainerSerializer)}
+
+  @classmethod
+  def GetAttributeContainerSerializer(cls, serialization_format):
+    """Retrieves an attribute container serializer.
+
+    Args:
+      serialization_format (str): serialization format.
+
+    Returns:
+      AttributeContainerSerializer: attribute container serializer or None
+          if the serialization format is not supported.
+    """
+    return cls._ATTRIBUTE_CONTAINER_SERIALIZERS.get(serialization_format, None)
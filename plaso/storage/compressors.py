@@ -0,0 +1,443 @@
+# -*- coding: utf-8 -*-
+"""The compressors of the data of stored attribute containers."""
+
+from __future__ import unicode_literals
+
+import collections
+import heapq
+import zlib
+
+from plaso.lib import definitions
+from plaso.lib import py2to3
+
+
+class BaseCompressor(object):
+  """Compressor interface."""
+
+  COMPRESSION_FORMAT = None
+
+  # Compressors that support a dictionary can be initialized with
+  # a dictionary that is trained on samples of the data.
+  SUPPORTS_DICTIONARY = False
+
+  def Compress(self, data):
+    """Compresses data.
+
+    Args:
+      data (bytes): data.
+
+    Returns:
+      bytes: compressed data.
+    """
+    return data
+
+  def Decompress(self, compressed_data):
+    """Decompresses data.
+
+    Args:
+      compressed_data (bytes): compressed data.
+
+    Returns:
+      bytes: data.
+
+    Raises:
+      IOError: if the data cannot be decompressed.
+    """
+    return compressed_data
+
+
+class NoneCompressor(BaseCompressor):
+  """Compressor that does not compress the data."""
+
+  COMPRESSION_FORMAT = definitions.COMPRESSION_FORMAT_NONE
+
+
+class ZlibCompressor(BaseCompressor):
+  """Zlib compressor."""
+
+  COMPRESSION_FORMAT = definitions.COMPRESSION_FORMAT_ZLIB
+
+  _COMPRESSION_LEVEL = 6
+
+  def Compress(self, data):
+    """Compresses data.
+
+    Args:
+      data (bytes): data.
+
+    Returns:
+      bytes: zlib compressed data.
+    """
+    return zlib.compress(data, self._COMPRESSION_LEVEL)
+
+  def Decompress(self, compressed_data):
+    """Decompresses data.
+
+    Args:
+      compressed_data (bytes): zlib compressed data.
+
+    Returns:
+      bytes: data.
+
+    Raises:
+      IOError: if the data cannot be decompressed.
+    """
+    try:
+      return zlib.decompress(compressed_data)
+    except zlib.error as exception:
+      raise IOError('Unable to decompress zlib data with error: {0!s}'.format(
+          exception))
+
+
+class FastZlibCompressor(ZlibCompressor):
+  """Zlib compressor that favors speed over compression ratio.
+
+  The data is compressed in the zlib format hence it can be decompressed
+  by a zlib compressor as well.
+  """
+
+  COMPRESSION_FORMAT = definitions.COMPRESSION_FORMAT_ZLIB_FAST
+
+  _COMPRESSION_LEVEL = 1
+
+
+class DictionaryZlibCompressor(ZlibCompressor):
+  """Zlib compressor that uses a preset dictionary.
+
+  The data of a single attribute container is too small for zlib to find
+  many repeated strings in. The preset dictionary contains the strings that
+  are common in the data of multiple attribute containers, such as attribute
+  names and data types, which can then be referenced from the first
+  occurrence in the data of an attribute container.
+
+  The preset dictionary is trained on sample data with a simplified version
+  of the COVER algorithm: segments of the samples are selected by the number
+  of samples that contain the substrings of the segment, where substrings
+  that are already covered by a selected segment no longer count.
+
+  Until a dictionary has been trained the data is compressed without preset
+  dictionary, which zlib indicates in the header of the compressed data.
+  """
+
+  COMPRESSION_FORMAT = definitions.COMPRESSION_FORMAT_ZLIB_DICTIONARY
+
+  SUPPORTS_DICTIONARY = True
+
+  # Zlib can reference preceding data, including the dictionary, within
+  # its window. A window of 8 KiB instead of the maximum of 32 KiB suffices
+  # for the dictionary and reduces the cost of copying a compress or
+  # decompress object per attribute container considerably.
+  _WINDOW_BITS = 13
+
+  _MAXIMUM_DICTIONARY_SIZE = 1 << _WINDOW_BITS
+
+  # The maximum amount of sample data the dictionary is trained on.
+  _MAXIMUM_SAMPLES_SIZE = 512 * 1024
+
+  # The size of the substrings used to score segments.
+  _SUBSTRING_SIZE = 8
+
+  # The size of the segments added to the dictionary.
+  _SEGMENT_SIZE = 64
+
+  # Flag in the second byte of the zlib header that indicates the data was
+  # compressed with a preset dictionary.
+  _ZLIB_FLAG_PRESET_DICTIONARY = 0x20
+
+  def __init__(self, dictionary=None):
+    """Initializes a dictionary zlib compressor.
+
+    Args:
+      dictionary (Optional[bytes]): preset dictionary, where None represents
+          the dictionary has not been trained yet.
+
+    Raises:
+      ValueError: if the dictionary is too large.
+    """
+    if dictionary and len(dictionary) > self._MAXIMUM_DICTIONARY_SIZE:
+      raise ValueError('Dictionary size value out of bounds.')
+
+    super(DictionaryZlibCompressor, self).__init__()
+    self._compress_object = None
+    self._decompress_object = None
+    self.dictionary = dictionary or None
+
+  def __getstate__(self):
+    """Retrieves the state of the compressor for pickling.
+
+    The zlib compress and decompress objects cannot be pickled and are
+    recreated when first used.
+
+    Returns:
+      dict[str, object]: state of the compressor.
+    """
+    return {'dictionary': self.dictionary}
+
+  def __setstate__(self, state):
+    """Sets the state of the compressor after unpickling.
+
+    Args:
+      state (dict[str, object]): state of the compressor.
+    """
+    self._compress_object = None
+    self._decompress_object = None
+    self.dictionary = state['dictionary']
+
+  @classmethod
+  def _GetSegments(cls, sample):
+    """Retrieves the segments of a sample.
+
+    Args:
+      sample (bytes): sample data.
+
+    Yields:
+      bytes: segment.
+    """
+    sample_size = len(sample)
+    segment_offset = 0
+    while segment_offset < sample_size:
+      yield sample[segment_offset:segment_offset + cls._SEGMENT_SIZE]
+      segment_offset += cls._SEGMENT_SIZE // 2
+
+  @classmethod
+  def _GetSubstrings(cls, data):
+    """Retrieves the distinct substrings of data.
+
+    Args:
+      data (bytes): data.
+
+    Returns:
+      set[bytes]: substrings.
+    """
+    return set([
+        data[offset:offset + cls._SUBSTRING_SIZE]
+        for offset in range(len(data) - cls._SUBSTRING_SIZE + 1)])
+
+  def Compress(self, data):
+    """Compresses data.
+
+    Args:
+      data (bytes): data.
+
+    Returns:
+      bytes: zlib compressed data.
+    """
+    if not self.dictionary:
+      return super(DictionaryZlibCompressor, self).Compress(data)
+
+    # Copying a compress object is faster than setting the preset dictionary
+    # of a new compress object.
+    if not self._compress_object:
+      self._compress_object = zlib.compressobj(
+          self._COMPRESSION_LEVEL, zlib.DEFLATED, self._WINDOW_BITS, 8,
+          zlib.Z_DEFAULT_STRATEGY, self.dictionary)
+
+    compress_object = self._compress_object.copy()
+    return compress_object.compress(data) + compress_object.flush()
+
+  def Decompress(self, compressed_data):
+    """Decompresses data.
+
+    Args:
+      compressed_data (bytes): zlib compressed data.
+
+    Returns:
+      bytes: data.
+
+    Raises:
+      IOError: if the data cannot be decompressed.
+    """
+    zlib_header = bytearray(compressed_data[:2])
+    if (len(zlib_header) < 2 or
+        not zlib_header[1] & self._ZLIB_FLAG_PRESET_DICTIONARY):
+      return super(DictionaryZlibCompressor, self).Decompress(compressed_data)
+
+    if not self.dictionary:
+      raise IOError('Unable to decompress zlib data without dictionary.')
+
+    if not self._decompress_object:
+      self._decompress_object = zlib.decompressobj(
+          self._WINDOW_BITS, zdict=self.dictionary)
+
+    decompress_object = self._decompress_object.copy()
+    try:
+      return decompress_object.decompress(compressed_data)
+    except zlib.error as exception:
+      raise IOError('Unable to decompress zlib data with error: {0!s}'.format(
+          exception))
+
+  @classmethod
+  def TrainDictionary(cls, samples):
+    """Trains a preset dictionary.
+
+    Args:
+      samples (list[bytes]): sample data, such as the serialized data of
+          attribute containers of the same type.
+
+    Returns:
+      bytes: preset dictionary or None if there is no sample data.
+    """
+    number_of_samples = 0
+    samples_size = 0
+    substring_frequencies = collections.Counter()
+    for sample in samples:
+      if samples_size + len(sample) > cls._MAXIMUM_SAMPLES_SIZE:
+        break
+
+      number_of_samples += 1
+      samples_size += len(sample)
+      substring_frequencies.update(cls._GetSubstrings(sample))
+
+    # Substrings that only occur in a single sample do not benefit from
+    # the dictionary.
+    for substring, frequency in list(substring_frequencies.items()):
+      if frequency < 2:
+        del substring_frequencies[substring]
+
+    segments_heap = []
+    segment_substrings = {}
+    for sample in samples[:number_of_samples]:
+      for segment in cls._GetSegments(sample):
+        if segment in segment_substrings:
+          continue
+
+        substrings = cls._GetSubstrings(segment)
+        segment_substrings[segment] = substrings
+
+        score = sum([
+            substring_frequencies.get(substring, 0)
+            for substring in substrings])
+        if score:
+          heapq.heappush(segments_heap, (-score, segment))
+
+    # The scores of segments only decrease when segments are selected hence
+    # the score of a segment only needs to be updated when it is the highest
+    # scoring segment.
+    dictionary_segments = []
+    dictionary_size = 0
+    while segments_heap and dictionary_size < cls._MAXIMUM_DICTIONARY_SIZE:
+      _, segment = heapq.heappop(segments_heap)
+      substrings = segment_substrings[segment]
+
+      score = sum([
+          substring_frequencies.get(substring, 0)
+          for substring in substrings])
+      if not score:
+        continue
+
+      if segments_heap and score < -segments_heap[0][0]:
+        heapq.heappush(segments_heap, (-score, segment))
+        continue
+
+      segment = segment[:cls._MAXIMUM_DICTIONARY_SIZE - dictionary_size]
+      dictionary_segments.append(segment)
+      dictionary_size += len(segment)
+
+      for substring in substrings:
+        substring_frequencies.pop(substring, None)
+
+    # Without substrings that are common to multiple samples the dictionary
+    # consists of the sample data itself.
+    if not dictionary_segments:
+      dictionary = b''.join(samples[:max(number_of_samples, 1)])
+      return dictionary[-cls._MAXIMUM_DICTIONARY_SIZE:] or None
+
+    # Zlib encodes references to nearby data with fewer bits, hence the most
+    # common segments are stored at the end of the dictionary.
+    return b''.join(reversed(dictionary_segments))
+
+
+class CompressorFactory(object):
+  """Compressor factory."""
+
+  _COMPRESSORS = {
+      definitions.COMPRESSION_FORMAT_NONE: NoneCompressor,
+      definitions.COMPRESSION_FORMAT_ZLIB: ZlibCompressor,
+      definitions.COMPRESSION_FORMAT_ZLIB_DICTIONARY: DictionaryZlibCompressor,
+      definitions.COMPRESSION_FORMAT_ZLIB_FAST: FastZlibCompressor}
+
+  @classmethod
+  def _GetCompressorClass(cls, compression_format):
+    """Retrieves a compressor class.
+
+    Args:
+      compression_format (str): compression format.
+
+    Returns:
+      type: compressor class.
+
+    Raises:
+      ValueError: if the compression format is not supported.
+    """
+    compressor_class = cls._COMPRESSORS.get(compression_format, None)
+    if not compressor_class:
+      raise ValueError('Unsupported compression format: {0!s}'.format(
+          compression_format))
+
+    # The preset dictionary of zlib compress and decompress objects is not
+    # supported by Python 2.
+    if compressor_class.SUPPORTS_DICTIONARY and py2to3.PY_2:
+      raise ValueError(
+          'Compression format: {0:s} not supported by Python 2.'.format(
+              compression_format))
+
+    return compressor_class
+
+  @classmethod
+  def GetCompressor(cls, compression_format, dictionary=None):
+    """Retrieves a compressor.
+
+    Args:
+      compression_format (str): compression format.
+      dictionary (Optional[bytes]): preset dictionary, which is ignored by
+          compression formats that do not support a dictionary.
+
+    Returns:
+      BaseCompressor: compressor.
+
+    Raises:
+      ValueError: if the compression format is not supported or
+          the dictionary is too large.
+    """
+    compressor_class = cls._GetCompressorClass(compression_format)
+    if compressor_class.SUPPORTS_DICTIONARY:
+      return compressor_class(dictionary=dictionary)
+
+    return compressor_class()
+
+  @classmethod
+  def SupportsDictionary(cls, compression_format):
+    """Determines if a compression format supports a dictionary.
+
+    Args:
+      compression_format (str): compression format.
+
+    Returns:
+      bool: True if the compression format supports a dictionary.
+
+    Raises:
+      ValueError: if the compression format is not supported.
+    """
+    compressor_class = cls._GetCompressorClass(compression_format)
+    return compressor_class.SUPPORTS_DICTIONARY
+
+  @classmethod
+  def TrainDictionary(cls, compression_format, samples):
+    """Trains a dictionary.
+
+    Args:
+      compression_format (str): compression format.
+      samples (list[bytes]): sample data.
+
+    Returns:
+      bytes: dictionary or None if the compression format does not support
+          a dictionary or no dictionary could be trained on the samples.
+
+    Raises:
+      ValueError: if the compression format is not supported.
+    """
+    compressor_class = cls._GetCompressorClass(compression_format)
+    if not compressor_class.SUPPORTS_DICTIONARY:
+      return None
+
+    return compressor_class.TrainDictionary(samples)
@@ -115,24 +115,38 @@ class SerializedEventHeap(object):
 
         int: event timestamp or None if the heap is empty
         bytes: serialized event or None if the heap is empty
+        int: row identifier of the event data of the event or None if
+            not available or if the heap is empty
+        str: data type of the event or None if not available or if the heap
+            is empty
+        str: parser chain of the event or None if not available or if
+            the heap is empty
     """
     try:
-      timestamp, serialized_event = heapq.heappop(self._heap)
+      heap_values = heapq.heappop(self._heap)
 
-      self.data_size -= len(serialized_event)
-      return timestamp, serialized_event
+      self.data_size -= len(heap_values[1])
+      return heap_values
 
     except IndexError:
-      return None, None
+      return None, None, None, None, None
 
-  def PushEvent(self, timestamp, event_data):
+  def PushEvent(
+      self, timestamp, event_data, data_type=None,
+      event_data_row_identifier=None, parser_chain=None):
     """Pushes a serialized event onto the heap.
 
     Args:
       timestamp (int): event timestamp, which contains the number of
           micro seconds since January 1, 1970, 00:00:00 UTC.
       event_data (bytes): serialized event.
+      data_type (Optional[str]): data type of the event.
+      event_data_row_identifier (Optional[int]): row identifier of the event
+          data of the event.
+      parser_chain (Optional[str]): parser chain of the event.
     """
-    heap_values = (timestamp, event_data)
+    heap_values = (
+        timestamp, event_data, event_data_row_identifier, data_type,
+        parser_chain)
     heapq.heappush(self._heap, heap_values)
     self.data_size += len(event_data)
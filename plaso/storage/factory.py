@@ -61,20 +61,34 @@ class StorageFactory(object):
     return None
 
   @classmethod
-  def CreateStorageWriter(cls, storage_format, session, path):
+  def CreateStorageWriter(
+      cls, storage_format, session, path, compression_format=None,
+      serialization_format=definitions.SERIALIZER_FORMAT_JSON,
+      task_compression_format=None):
     """Creates a storage writer.
 
     Args:
       session (Session): session the storage changes are part of.
       path (str): path to the storage file.
       storage_format (str): storage format.
+      compression_format (Optional[str]): compression format of
+          the attribute containers written to a new storage file, where None
+          represents the default of the storage format.
+      serialization_format (Optional[str]): serialization format of
+          the attribute containers written to a new storage file.
+      task_compression_format (Optional[str]): compression format of
+          the attribute containers written to the task storage files, where
+          None represents the default of the storage format.
 
     Returns:
       StorageWriter: a storage writer or None if the storage file cannot be
           opened or the storage format is not supported.
     """
     if storage_format == definitions.STORAGE_FORMAT_SQLITE:
-      return sqlite_writer.SQLiteStorageFileWriter(session, path)
+      return sqlite_writer.SQLiteStorageFileWriter(
+          session, path, compression_format=compression_format,
+          serialization_format=serialization_format,
+          task_compression_format=task_compression_format)
 
     return None
 
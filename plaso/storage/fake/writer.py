@@ -330,12 +330,16 @@ class FakeStorageWriter(interface.StorageWriter):
     self._written_event_source_index += 1
     return event_source
 
-  def GetSortedEvents(self, time_range=None):
+  def GetSortedEvents(
+      self, time_range=None, data_types=None, parser_chains=None):
     """Retrieves the events in increasing chronological order.
 
     Args:
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
+      data_types (Optional[list[str]]): data types used to filter events.
+      parser_chains (Optional[list[str]]): parser chains used to filter
+          events.
 
     Returns:
       generator(EventObject): event generator.
@@ -359,6 +363,14 @@ class FakeStorageWriter(interface.StorageWriter):
       # TODO: refactor this into psort.
       self._ReadEventDataIntoEvent(event)
 
+      if (data_types is not None and
+          getattr(event, 'data_type', None) not in data_types):
+        continue
+
+      if (parser_chains is not None and
+          getattr(event, 'parser', None) not in parser_chains):
+        continue
+
       event_heap.PushEvent(event)
 
     return iter(event_heap.PopEvents())
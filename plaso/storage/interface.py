@@ -9,7 +9,7 @@ import shutil
 import tempfile
 
 from plaso.lib import definitions
-from plaso.serializer import json_serializer
+from plaso.serializer import factory as serializer_factory
 
 
 class SerializedAttributeContainerList(object):
@@ -213,6 +213,20 @@ class BaseStore(object):
       EventTag: event tag.
     """
 
+  @abc.abstractmethod
+  def GetEventTimeRanges(self, maximum_number_of_time_ranges, time_range=None):
+    """Splits the events into consecutive time ranges of similar size.
+
+    Args:
+      maximum_number_of_time_ranges (int): maximum number of time ranges.
+      time_range (Optional[TimeRange]): time range used to filter events
+          that fall in a specific period.
+
+    Returns:
+      list[TimeRange]: consecutive time ranges, in increasing chronological
+          order, that each contain about the same number of events.
+    """
+
   @abc.abstractmethod
   def GetNumberOfEventSources(self):
     """Retrieves the number event sources.
@@ -222,7 +236,8 @@ class BaseStore(object):
     """
 
   @abc.abstractmethod
-  def GetSortedEvents(self, time_range=None):
+  def GetSortedEvents(
+      self, time_range=None, data_types=None, parser_chains=None):
     """Retrieves the events in increasing chronological order.
 
     This includes all events written to the storage including those pending
@@ -231,11 +246,24 @@ class BaseStore(object):
     Args:
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
+      data_types (Optional[list[str]]): data types used to filter events,
+          where events without a stored data type are not filtered.
+      parser_chains (Optional[list[str]]): parser chains used to filter
+          events, where events without a stored parser chain are not
+          filtered.
 
     Yields:
       EventObject: event.
     """
 
+  @abc.abstractmethod
+  def GetTaskCheckpoints(self):
+    """Retrieves the task checkpoints.
+
+    Yields:
+      TaskCheckpoint: task checkpoint attribute container.
+    """
+
   @abc.abstractmethod
   def HasAnalysisReports(self):
     """Determines if a store contains analysis reports.
@@ -317,6 +345,14 @@ class BaseStore(object):
       session_start (SessionStart): session start information.
     """
 
+  @abc.abstractmethod
+  def WriteTaskCheckpoint(self, task_checkpoint):
+    """Writes task checkpoint information.
+
+    Args:
+      task_checkpoint (TaskCheckpoint): task checkpoint information.
+    """
+
   @abc.abstractmethod
   def WriteTaskCompletion(self, task_completion):
     """Writes task completion information.
@@ -335,17 +371,31 @@ class BaseStore(object):
 
 
 class BaseStorageFile(BaseStore):
-  """Interface for file-based stores."""
+  """Interface for file-based stores.
+
+  Attributes:
+    serialization_format (str): serialization format.
+  """
 
   # pylint: disable=abstract-method
 
-  def __init__(self):
-    """Initializes a file-based store."""
+  def __init__(self, serialization_format=definitions.SERIALIZER_FORMAT_JSON):
+    """Initializes a file-based store.
+
+    Args:
+      serialization_format (Optional[str]): serialization format.
+
+    Raises:
+      ValueError: if the serialization format is not supported.
+    """
     super(BaseStorageFile, self).__init__()
     self._is_open = False
     self._read_only = True
     self._serialized_attribute_containers = {}
-    self._serializer = json_serializer.JSONAttributeContainerSerializer
+    self._serializer = None
+    self.serialization_format = None
+
+    self._SetSerializationFormat(serialization_format)
 
   def _DeserializeAttributeContainer(self, container_type, serialized_data):
     """Deserializes an attribute container.
@@ -356,6 +406,9 @@ class BaseStorageFile(BaseStore):
 
     Returns:
       AttributeContainer: attribute container or None.
+
+    Raises:
+      IOError: if the serialized data cannot be decoded.
     """
     if not serialized_data:
       return None
@@ -363,12 +416,17 @@ class BaseStorageFile(BaseStore):
     if self._serializers_profiler:
       self._serializers_profiler.StartTiming(container_type)
 
+    if self.serialization_format == definitions.SERIALIZER_FORMAT_JSON:
+      try:
+        serialized_data = serialized_data.decode('utf-8')
+      except UnicodeDecodeError as exception:
+        raise IOError('Unable to decode serialized data: {0!s}'.format(
+            exception))
+
     try:
-      serialized_string = serialized_data.decode('utf-8')
-    except UnicodeDecodeError as exception:
-      raise IOError('Unable to decode serialized data: {0!s}'.format(
-          exception))
-    attribute_container = self._serializer.ReadSerialized(serialized_string)
+      attribute_container = self._serializer.ReadSerialized(serialized_data)
+    except ValueError as exception:
+      raise IOError('Unable to deserialize data: {0!s}'.format(exception))
 
     if self._serializers_profiler:
       self._serializers_profiler.StopTiming(container_type)
@@ -441,7 +499,8 @@ class BaseStorageFile(BaseStore):
             'Unable to serialize attribute container: {0:s}.'.format(
                 attribute_container.CONTAINER_TYPE))
 
-      attribute_container_data = attribute_container_data.encode('utf-8')
+      if self.serialization_format == definitions.SERIALIZER_FORMAT_JSON:
+        attribute_container_data = attribute_container_data.encode('utf-8')
 
     finally:
       if self._serializers_profiler:
@@ -450,6 +509,25 @@ class BaseStorageFile(BaseStore):
 
     return attribute_container_data
 
+  def _SetSerializationFormat(self, serialization_format):
+    """Sets the serialization format.
+
+    Args:
+      serialization_format (str): serialization format.
+
+    Raises:
+      ValueError: if the serialization format is not supported.
+    """
+    serializer = (
+        serializer_factory.SerializerFactory.GetAttributeContainerSerializer(
+            serialization_format))
+    if not serializer:
+      raise ValueError('Unsupported serialization format: {0!s}'.format(
+          serialization_format))
+
+    self._serializer = serializer
+    self.serialization_format = serialization_format
+
   def _RaiseIfNotWritable(self):
     """Raises if the storage file is not writable.
 
@@ -503,7 +581,10 @@ class StorageFileMergeReader(StorageMergeReader):
       storage_writer (StorageWriter): storage writer.
     """
     super(StorageFileMergeReader, self).__init__(storage_writer)
-    self._serializer = json_serializer.JSONAttributeContainerSerializer
+    self._serialization_format = definitions.SERIALIZER_FORMAT_JSON
+    self._serializer = (
+        serializer_factory.SerializerFactory.GetAttributeContainerSerializer(
+            self._serialization_format))
     self._serializers_profiler = None
 
   def _DeserializeAttributeContainer(self, container_type, serialized_data):
@@ -515,6 +596,9 @@ class StorageFileMergeReader(StorageMergeReader):
 
     Returns:
       AttributeContainer: attribute container or None.
+
+    Raises:
+      IOError: if the serialized data cannot be decoded.
     """
     if not serialized_data:
       return None
@@ -522,12 +606,17 @@ class StorageFileMergeReader(StorageMergeReader):
     if self._serializers_profiler:
       self._serializers_profiler.StartTiming(container_type)
 
+    if self._serialization_format == definitions.SERIALIZER_FORMAT_JSON:
+      try:
+        serialized_data = serialized_data.decode('utf-8')
+      except UnicodeDecodeError as exception:
+        raise IOError('Unable to decode serialized data: {0!s}'.format(
+            exception))
+
     try:
-      serialized_string = serialized_data.decode('utf-8')
-    except UnicodeDecodeError as exception:
-      raise IOError('Unable to decode serialized data: {0!s}'.format(
-          exception))
-    attribute_container = self._serializer.ReadSerialized(serialized_string)
+      attribute_container = self._serializer.ReadSerialized(serialized_data)
+    except ValueError as exception:
+      raise IOError('Unable to deserialize data: {0!s}'.format(exception))
 
     if self._serializers_profiler:
       self._serializers_profiler.StopTiming(container_type)
@@ -629,7 +718,8 @@ class StorageReader(object):
     """
 
   @abc.abstractmethod
-  def GetSortedEvents(self, time_range=None):
+  def GetSortedEvents(
+      self, time_range=None, data_types=None, parser_chains=None):
     """Retrieves the events in increasing chronological order.
 
     This includes all events written to the storage including those pending
@@ -638,6 +728,11 @@ class StorageReader(object):
     Args:
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
+      data_types (Optional[list[str]]): data types used to filter events,
+          where events without a stored data type are not filtered.
+      parser_chains (Optional[list[str]]): parser chains used to filter
+          events, where events without a stored parser chain are not
+          filtered.
 
     Yields:
       EventObject: event.
@@ -686,6 +781,11 @@ class StorageFileReader(StorageReader):
     self._path = path
     self._storage_file = None
 
+  @property
+  def path(self):
+    """str: path to the input file."""
+    return self._path
+
   def Close(self):
     """Closes the storage reader."""
     if self._storage_file:
@@ -762,6 +862,21 @@ class StorageFileReader(StorageReader):
     """
     return self._storage_file.GetEventTags()
 
+  def GetEventTimeRanges(self, maximum_number_of_time_ranges, time_range=None):
+    """Splits the events into consecutive time ranges of similar size.
+
+    Args:
+      maximum_number_of_time_ranges (int): maximum number of time ranges.
+      time_range (Optional[TimeRange]): time range used to filter events
+          that fall in a specific period.
+
+    Returns:
+      list[TimeRange]: consecutive time ranges, in increasing chronological
+          order, that each contain about the same number of events.
+    """
+    return self._storage_file.GetEventTimeRanges(
+        maximum_number_of_time_ranges, time_range=time_range)
+
   def GetNumberOfAnalysisReports(self):
     """Retrieves the number analysis reports.
 
@@ -770,7 +885,8 @@ class StorageFileReader(StorageReader):
     """
     return self._storage_file.GetNumberOfAnalysisReports()
 
-  def GetSortedEvents(self, time_range=None):
+  def GetSortedEvents(
+      self, time_range=None, data_types=None, parser_chains=None):
     """Retrieves the events in increasing chronological order.
 
     This includes all events written to the storage including those pending
@@ -779,11 +895,18 @@ class StorageFileReader(StorageReader):
     Args:
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
+      data_types (Optional[list[str]]): data types used to filter events,
+          where events without a stored data type are not filtered.
+      parser_chains (Optional[list[str]]): parser chains used to filter
+          events, where events without a stored parser chain are not
+          filtered.
 
     Returns:
       generator(EventObject): event generator.
     """
-    return self._storage_file.GetSortedEvents(time_range=time_range)
+    return self._storage_file.GetSortedEvents(
+        time_range=time_range, data_types=data_types,
+        parser_chains=parser_chains)
 
   def ReadPreprocessingInformation(self, knowledge_base):
     """Reads preprocessing information.
@@ -873,6 +996,25 @@ class StorageWriter(object):
       event(EventObject): an event.
     """
 
+  def AddEventsWithEventData(self, events_with_event_data):
+    """Adds events and their event data.
+
+    Args:
+      events_with_event_data (list[tuple[EventObject, EventData]]): events
+          and their event data, where the event data is None if the event
+          refers to the same event data as the previous event.
+    """
+    event_data_identifier = None
+    for event, event_data in events_with_event_data:
+      if event_data:
+        self.AddEventData(event_data)
+        event_data_identifier = event_data.GetIdentifier()
+
+      if event_data_identifier:
+        event.SetEventDataIdentifier(event_data_identifier)
+
+      self.AddEvent(event)
+
   @abc.abstractmethod
   def AddEventSource(self, event_source):
     """Adds an event source.
@@ -946,7 +1088,8 @@ class StorageWriter(object):
     """
 
   @abc.abstractmethod
-  def GetSortedEvents(self, time_range=None):
+  def GetSortedEvents(
+      self, time_range=None, data_types=None, parser_chains=None):
     """Retrieves the events in increasing chronological order.
 
     This includes all events written to the storage including those pending
@@ -955,6 +1098,11 @@ class StorageWriter(object):
     Args:
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
+      data_types (Optional[list[str]]): data types used to filter events,
+          where events without a stored data type are not filtered.
+      parser_chains (Optional[list[str]]): parser chains used to filter
+          events, where events without a stored parser chain are not
+          filtered.
 
     Yields:
       EventObject: event.
@@ -1063,22 +1211,36 @@ class StorageFileWriter(StorageWriter):
   """Defines an interface for a file-backed storage writer."""
 
   def __init__(
-      self, session, output_file,
-      storage_type=definitions.STORAGE_TYPE_SESSION, task=None):
+      self, session, output_file, compression_format=None,
+      serialization_format=definitions.SERIALIZER_FORMAT_JSON,
+      storage_type=definitions.STORAGE_TYPE_SESSION, task=None,
+      task_compression_format=None):
     """Initializes a storage writer.
 
     Args:
       session (Session): session the storage changes are part of.
       output_file (str): path to the output file.
+      compression_format (Optional[str]): compression format of
+          the attribute containers written to a new storage file, where None
+          represents the default of the storage type.
+      serialization_format (Optional[str]): serialization format of
+          the attribute containers written to a new storage file and to
+          the task storage files.
       storage_type (Optional[str]): storage type.
       task(Optional[Task]): task.
+      task_compression_format (Optional[str]): compression format of
+          the attribute containers written to the task storage files, where
+          None represents the default of the task storage type.
     """
     super(StorageFileWriter, self).__init__(
         session, storage_type=storage_type, task=task)
+    self._compression_format = compression_format
     self._merge_task_storage_path = ''
     self._output_file = output_file
     self._processed_task_storage_path = ''
+    self._serialization_format = serialization_format
     self._storage_file = None
+    self._task_compression_format = task_compression_format
     self._task_storage_path = None
 
   @abc.abstractmethod
@@ -1233,6 +1395,25 @@ class StorageFileWriter(StorageWriter):
 
     self._storage_file.AddEventData(event_data)
 
+  def AddEventsWithEventData(self, events_with_event_data):
+    """Adds events and their event data.
+
+    Args:
+      events_with_event_data (list[tuple[EventObject, EventData]]): events
+          and their event data, where the event data is None if the event
+          refers to the same event data as the previous event.
+
+    Raises:
+      IOError: when the storage writer is closed.
+    """
+    self._RaiseIfNotWritable()
+
+    self._storage_file.AddEventsWithEventData(events_with_event_data)
+    self.number_of_events += len(events_with_event_data)
+
+    for event, _ in events_with_event_data:
+      self._UpdateCounters(event)
+
   def AddEventSource(self, event_source):
     """Adds an event source.
 
@@ -1430,7 +1611,8 @@ class StorageFileWriter(StorageWriter):
         path.replace('.plaso', '')
         for path in os.listdir(self._processed_task_storage_path)]
 
-  def GetSortedEvents(self, time_range=None):
+  def GetSortedEvents(
+      self, time_range=None, data_types=None, parser_chains=None):
     """Retrieves the events in increasing chronological order.
 
     This includes all events written to the storage including those pending
@@ -1439,6 +1621,11 @@ class StorageFileWriter(StorageWriter):
     Args:
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
+      data_types (Optional[list[str]]): data types used to filter events,
+          where events without a stored data type are not filtered.
+      parser_chains (Optional[list[str]]): parser chains used to filter
+          events, where events without a stored parser chain are not
+          filtered.
 
     Returns:
       generator(EventObject): event generator.
@@ -1449,7 +1636,27 @@ class StorageFileWriter(StorageWriter):
     if not self._storage_file:
       raise IOError('Unable to read from closed storage writer.')
 
-    return self._storage_file.GetSortedEvents(time_range=time_range)
+    return self._storage_file.GetSortedEvents(
+        time_range=time_range, data_types=data_types,
+        parser_chains=parser_chains)
+
+  def GetTaskCheckpoints(self):
+    """Retrieves the task checkpoints.
+
+    Returns:
+      generator(TaskCheckpoint): task checkpoint generator.
+
+    Raises:
+      IOError: if the storage type is not supported or
+          when the storage writer is closed.
+    """
+    if not self._storage_file:
+      raise IOError('Unable to read from closed storage writer.')
+
+    if self._storage_type != definitions.STORAGE_TYPE_SESSION:
+      raise IOError('Unsupported storage type.')
+
+    return self._storage_file.GetTaskCheckpoints()
 
   def FinalizeTaskStorage(self, task):
     """Finalizes a processed task storage.
@@ -1496,6 +1703,10 @@ class StorageFileWriter(StorageWriter):
 
     self._storage_file.Open(path=self._output_file, read_only=False)
 
+    # An existing storage file keeps its serialization format, which task
+    # storage files should use as well for their rows to be merged directly.
+    self._serialization_format = self._storage_file.serialization_format
+
     self._first_written_event_source_index = (
         self._storage_file.GetNumberOfEventSources())
     self._written_event_source_index = self._first_written_event_source_index
@@ -1569,6 +1780,22 @@ class StorageFileWriter(StorageWriter):
           'Unable to remove task storage file: {0:s} with error: '
           '{1!s}').format(processed_storage_file_path, exception))
 
+  def RewindWrittenEventSources(self):
+    """Rewinds the written event sources to the first stored event source.
+
+    After rewinding, GetFirstWrittenEventSource and GetNextWrittenEventSource
+    also retrieve the event sources that were stored before open, such as
+    those of an interrupted session that is resumed.
+
+    Raises:
+      IOError: when the storage writer is closed.
+    """
+    if not self._storage_file:
+      raise IOError('Unable to read from closed storage writer.')
+
+    self._first_written_event_source_index = 0
+    self._written_event_source_index = 0
+
   def SetSerializersProfiler(self, serializers_profiler):
     """Sets the serializers profiler.
 
@@ -1728,6 +1955,24 @@ class StorageFileWriter(StorageWriter):
     session_start = self._session.CreateSessionStart()
     self._storage_file.WriteSessionStart(session_start)
 
+  def WriteTaskCheckpoint(self, task):
+    """Writes task checkpoint information.
+
+    Args:
+      task (Task): task of which the results were merged.
+
+    Raises:
+      IOError: if the storage type is not supported or
+          when the storage writer is closed.
+    """
+    self._RaiseIfNotWritable()
+
+    if self._storage_type != definitions.STORAGE_TYPE_SESSION:
+      raise IOError('Unsupported storage type.')
+
+    task_checkpoint = task.CreateTaskCheckpoint()
+    self._storage_file.WriteTaskCheckpoint(task_checkpoint)
+
   def WriteTaskCompletion(self, aborted=False):
     """Writes task completion information.
 
@@ -5,14 +5,16 @@ from __future__ import unicode_literals
 
 import os
 import sqlite3
-import zlib
 
 from plaso.containers import errors
 from plaso.containers import event_sources
 from plaso.containers import events
+from plaso.containers import path_specs
 from plaso.containers import reports
 from plaso.containers import tasks
 from plaso.lib import definitions
+from plaso.serializer import factory as serializer_factory
+from plaso.storage import compressors
 from plaso.storage import identifiers
 from plaso.storage import interface
 
@@ -26,6 +28,7 @@ class SQLiteStorageMergeReader(interface.StorageFileMergeReader):
   _CONTAINER_TYPE_EVENT_SOURCE = event_sources.EventSource.CONTAINER_TYPE
   _CONTAINER_TYPE_EVENT_TAG = events.EventTag.CONTAINER_TYPE
   _CONTAINER_TYPE_EXTRACTION_ERROR = errors.ExtractionError.CONTAINER_TYPE
+  _CONTAINER_TYPE_PATH_SPEC = path_specs.PathSpecification.CONTAINER_TYPE
   _CONTAINER_TYPE_TASK_COMPLETION = tasks.TaskCompletion.CONTAINER_TYPE
   _CONTAINER_TYPE_TASK_START = tasks.TaskStart.CONTAINER_TYPE
 
@@ -33,6 +36,7 @@ class SQLiteStorageMergeReader(interface.StorageFileMergeReader):
   # referencing event_data. Container types in this tuple must be ordered after
   # all the container types they reference.
   _CONTAINER_TYPES = (
+      _CONTAINER_TYPE_PATH_SPEC,
       _CONTAINER_TYPE_EVENT_SOURCE,
       _CONTAINER_TYPE_EVENT_DATA,
       _CONTAINER_TYPE_EVENT,
@@ -47,8 +51,20 @@ class SQLiteStorageMergeReader(interface.StorageFileMergeReader):
       _CONTAINER_TYPE_EVENT_SOURCE: '_AddEventSource',
       _CONTAINER_TYPE_EVENT_TAG: '_AddEventTag',
       _CONTAINER_TYPE_EXTRACTION_ERROR: '_AddError',
+      _CONTAINER_TYPE_PATH_SPEC: '_AddPathSpec',
   }
 
+  _COMPRESSION_DICTIONARIES_QUERY = (
+      'SELECT container_type, dictionary FROM compression_dictionary')
+
+  _COMPRESSION_DICTIONARY_TABLE_NAME = 'compression_dictionary'
+
+  # Key of the storage metadata value that contains the compression format
+  # of a specific container type.
+  _CONTAINER_COMPRESSION_FORMAT_KEY = '{0:s}_compression_format'
+
+  _EVENT_DATA_COLUMNS_QUERY = 'PRAGMA table_info(event_data)'
+
   _TABLE_NAMES_QUERY = (
       'SELECT name FROM sqlite_master WHERE type = "table"')
 
@@ -68,12 +84,14 @@ class SQLiteStorageMergeReader(interface.StorageFileMergeReader):
     self._active_cursor = None
     self._add_active_container_method = None
     self._add_container_type_methods = {}
-    self._compression_format = definitions.COMPRESSION_FORMAT_NONE
+    self._compressors = {}
     self._connection = None
     self._container_types = None
     self._cursor = None
     self._event_data_identifier_mappings = {}
+    self._has_path_spec_identifier_column = False
     self._path = path
+    self._path_specs = {}
 
     # Create a runtime lookup table for the add container type method. This
     # prevents having to create a series of if-else checks for container types.
@@ -153,11 +171,27 @@ class SQLiteStorageMergeReader(interface.StorageFileMergeReader):
     """
     self._storage_writer.AddEventTag(event_tag)
 
+  def _AddPathSpec(self, path_spec_container):
+    """Adds a path specification.
+
+    The path specification is not added to the storage writer but kept
+    to be set in the event data that references it. The storage writer stores
+    the path specifications of the event data it adds.
+
+    Args:
+      path_spec_container (PathSpecification): path specification attribute
+          container.
+    """
+    identifier = path_spec_container.GetIdentifier()
+    self._path_specs[identifier.row_identifier] = path_spec_container.path_spec
+
   def _Close(self):
     """Closes the task storage after reading."""
     self._connection.close()
     self._connection = None
+    self._compressors = {}
     self._cursor = None
+    self._path_specs = {}
 
   def _GetContainerTypes(self):
     """Retrieves the container types to merge.
@@ -185,13 +219,51 @@ class SQLiteStorageMergeReader(interface.StorageFileMergeReader):
     self._cursor = self._connection.cursor()
 
   def _ReadStorageMetadata(self):
-    """Reads the task storage metadata."""
+    """Reads the task storage metadata.
+
+    Raises:
+      IOError: if the compression or serialization format is not supported.
+    """
     query = 'SELECT key, value FROM metadata'
     self._cursor.execute(query)
 
     metadata_values = {row[0]: row[1] for row in self._cursor.fetchall()}
 
-    self._compression_format = metadata_values['compression_format']
+    serialization_format = metadata_values.get(
+        'serialization_format', definitions.SERIALIZER_FORMAT_JSON)
+    serializer = (
+        serializer_factory.SerializerFactory.GetAttributeContainerSerializer(
+            serialization_format))
+    if not serializer:
+      raise IOError('Unsupported serialization format: {0!s}'.format(
+          serialization_format))
+
+    self._cursor.execute(self._TABLE_NAMES_QUERY)
+    table_names = [row[0] for row in self._cursor.fetchall()]
+
+    compression_dictionaries = {}
+    if self._COMPRESSION_DICTIONARY_TABLE_NAME in table_names:
+      self._cursor.execute(self._COMPRESSION_DICTIONARIES_QUERY)
+      compression_dictionaries = {
+          row[0]: bytes(row[1]) for row in self._cursor.fetchall()}
+
+    self._compressors = {}
+    for container_type in self._CONTAINER_TYPES:
+      key = self._CONTAINER_COMPRESSION_FORMAT_KEY.format(container_type)
+      compression_format = metadata_values.get(
+          key, metadata_values['compression_format'])
+      dictionary = compression_dictionaries.get(container_type, None)
+
+      try:
+        self._compressors[container_type] = (
+            compressors.CompressorFactory.GetCompressor(
+                compression_format, dictionary=dictionary))
+      except ValueError as exception:
+        raise IOError('Unable to create compressor with error: {0!s}'.format(
+            exception))
+
+    self._serialization_format = serialization_format
+    self._serializer = serializer
 
   def _PrepareForNextContainerType(self):
     """Prepares for the next container type.
@@ -205,8 +277,13 @@ class SQLiteStorageMergeReader(interface.StorageFileMergeReader):
     self._add_active_container_method = self._add_container_type_methods.get(
         self._active_container_type)
 
-    query = 'SELECT _identifier, _data FROM {0:s}'.format(
-        self._active_container_type)
+    if (self._active_container_type == self._CONTAINER_TYPE_EVENT_DATA and
+        self._has_path_spec_identifier_column):
+      query = (
+          'SELECT _identifier, _data, _path_spec_identifier FROM event_data')
+    else:
+      query = 'SELECT _identifier, _data FROM {0:s}'.format(
+          self._active_container_type)
     self._cursor.execute(query)
 
     self._active_cursor = self._cursor
@@ -225,20 +302,43 @@ class SQLiteStorageMergeReader(interface.StorageFileMergeReader):
       bool: True if the entire task storage file has been merged.
 
     Raises:
+      IOError: if the rows of the task storage file cannot be merged.
       RuntimeError: if the add method for the active attribute container
           type is missing.
       OSError: if the task storage file cannot be deleted.
     """
+    number_of_containers = 0
     if not self._cursor:
       self._Open()
       self._ReadStorageMetadata()
       self._container_types = self._GetContainerTypes()
 
-    number_of_containers = 0
+      self._cursor.execute(self._EVENT_DATA_COLUMNS_QUERY)
+      self._has_path_spec_identifier_column = '_path_spec_identifier' in [
+          row[1] for row in self._cursor.fetchall()]
+
+      # The rows of attribute containers that do not need to be passed to
+      # the callback and do not contain references that need rewriting are
+      # merged without deserializing the attribute containers.
+      if not callback:
+        number_of_rows = self._storage_writer.MergeTaskStorageRows(self._path)
+
+        self._container_types = [
+            container_type for container_type in self._container_types
+            if container_type not in number_of_rows]
+        number_of_containers = sum(number_of_rows.values())
+
+        if (maximum_number_of_containers > 0 and
+            number_of_containers >= maximum_number_of_containers and
+            self._container_types):
+          return False
+
     while self._active_cursor or self._container_types:
       if not self._active_cursor:
         self._PrepareForNextContainerType()
 
+      compressor = self._compressors[self._active_container_type]
+
       if maximum_number_of_containers > 0:
         number_of_rows = maximum_number_of_containers - number_of_containers
         rows = self._active_cursor.fetchmany(size=number_of_rows)
@@ -253,15 +353,23 @@ class SQLiteStorageMergeReader(interface.StorageFileMergeReader):
         identifier = identifiers.SQLTableIdentifier(
             self._active_container_type, row[0])
 
-        if self._compression_format == definitions.COMPRESSION_FORMAT_ZLIB:
-          serialized_data = zlib.decompress(row[1])
-        else:
-          serialized_data = row[1]
+        serialized_data = compressor.Decompress(row[1])
 
         attribute_container = self._DeserializeAttributeContainer(
             self._active_container_type, serialized_data)
         attribute_container.SetIdentifier(identifier)
 
+        # Path specifications are only used to set the path specification
+        # of the event data that references them.
+        if self._active_container_type == self._CONTAINER_TYPE_PATH_SPEC:
+          self._add_active_container_method(attribute_container)
+          continue
+
+        if (self._active_container_type == self._CONTAINER_TYPE_EVENT_DATA and
+            self._has_path_spec_identifier_column and
+            row[2] in self._path_specs):
+          attribute_container.pathspec = self._path_specs[row[2]]
+
         if self._active_container_type == self._CONTAINER_TYPE_EVENT_TAG:
           event_identifier = identifiers.SQLTableIdentifier(
               self._CONTAINER_TYPE_EVENT,
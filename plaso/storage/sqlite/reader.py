@@ -10,12 +10,28 @@ from plaso.storage.sqlite import sqlite_file
 class SQLiteStorageFileReader(interface.StorageFileReader):
   """SQLite-based storage file reader."""
 
-  def __init__(self, path):
+  def __init__(
+      self, path, event_data_cache_size=0, join_event_data=False,
+      number_of_read_workers=0, read_batch_size=0):
     """Initializes a storage reader.
 
     Args:
       path (str): path to the input file.
+      event_data_cache_size (Optional[int]): maximum number of event data
+          attribute containers kept in the event data cache, where 0
+          represents the default.
+      join_event_data (Optional[bool]): True if sorted events should be read
+          together with their event data in a single query.
+      number_of_read_workers (Optional[int]): number of worker processes
+          used to decompress and deserialize attribute containers that are
+          read, where 0 represents no worker processes.
+      read_batch_size (Optional[int]): number of rows read from the storage
+          file at once, where 0 represents the default.
     """
     super(SQLiteStorageFileReader, self).__init__(path)
-    self._storage_file = sqlite_file.SQLiteStorageFile()
+    self._storage_file = sqlite_file.SQLiteStorageFile(
+        event_data_cache_size=event_data_cache_size,
+        join_event_data=join_event_data,
+        number_of_read_workers=number_of_read_workers,
+        read_batch_size=read_batch_size)
     self._storage_file.Open(path=path)
@@ -3,22 +3,74 @@
 
 from __future__ import unicode_literals
 
+import functools
+import multiprocessing
 import os
 import sqlite3
-import zlib
 
 from plaso.containers import artifacts
 from plaso.containers import errors
 from plaso.containers import event_sources
 from plaso.containers import events
+from plaso.containers import path_specs
 from plaso.containers import reports
 from plaso.containers import sessions
 from plaso.containers import tasks
 from plaso.lib import definitions
+from plaso.lib import lru_cache
+from plaso.lib import py2to3
+from plaso.serializer import factory as serializer_factory
+from plaso.storage import compressors
 from plaso.storage import event_heaps
 from plaso.storage import identifiers
 from plaso.storage import interface
 from plaso.storage import logger
+from plaso.storage import time_range as storage_time_range
+
+
+def _DeserializeAttributeContainerRow(
+    compressor, serialization_format, row_data):
+  """Decompresses and deserializes an attribute container row.
+
+  This function is run by the read worker processes and therefore is
+  defined at module level.
+
+  Args:
+    compressor (BaseCompressor): compressor of the data of the row.
+    serialization_format (str): serialization format.
+    row_data (bytes): data of the row.
+
+  Returns:
+    tuple[int, AttributeContainer]: size of the serialized data and
+        attribute container or None.
+
+  Raises:
+    IOError: if the data cannot be decompressed or the serialized data
+        cannot be decoded.
+  """
+  serialized_data = compressor.Decompress(row_data)
+  if not serialized_data:
+    return 0, None
+
+  serialized_data_size = len(serialized_data)
+
+  if serialization_format == definitions.SERIALIZER_FORMAT_JSON:
+    try:
+      serialized_data = serialized_data.decode('utf-8')
+    except UnicodeDecodeError as exception:
+      raise IOError('Unable to decode serialized data: {0!s}'.format(
+          exception))
+
+  serializer = (
+      serializer_factory.SerializerFactory.GetAttributeContainerSerializer(
+          serialization_format))
+
+  try:
+    attribute_container = serializer.ReadSerialized(serialized_data)
+  except ValueError as exception:
+    raise IOError('Unable to deserialize data: {0!s}'.format(exception))
+
+  return serialized_data_size, attribute_container
 
 
 class SQLiteStorageFile(interface.BaseStorageFile):
@@ -26,11 +78,10 @@ class SQLiteStorageFile(interface.BaseStorageFile):
 
   Attributes:
     format_version (int): storage format version.
-    serialization_format (str): serialization format.
     storage_type (str): storage type.
   """
 
-  _FORMAT_VERSION = 20180101
+  _FORMAT_VERSION = 20181017
 
   # The earliest format version, stored in-file, that this class
   # is able to read.
@@ -42,10 +93,12 @@ class SQLiteStorageFile(interface.BaseStorageFile):
   _CONTAINER_TYPE_EVENT_SOURCE = event_sources.EventSource.CONTAINER_TYPE
   _CONTAINER_TYPE_EVENT_TAG = events.EventTag.CONTAINER_TYPE
   _CONTAINER_TYPE_EXTRACTION_ERROR = errors.ExtractionError.CONTAINER_TYPE
+  _CONTAINER_TYPE_PATH_SPEC = path_specs.PathSpecification.CONTAINER_TYPE
   _CONTAINER_TYPE_SESSION_COMPLETION = sessions.SessionCompletion.CONTAINER_TYPE
   _CONTAINER_TYPE_SESSION_START = sessions.SessionStart.CONTAINER_TYPE
   _CONTAINER_TYPE_SYSTEM_CONFIGURATION = (
       artifacts.SystemConfigurationArtifact.CONTAINER_TYPE)
+  _CONTAINER_TYPE_TASK_CHECKPOINT = tasks.TaskCheckpoint.CONTAINER_TYPE
   _CONTAINER_TYPE_TASK_COMPLETION = tasks.TaskCompletion.CONTAINER_TYPE
   _CONTAINER_TYPE_TASK_START = tasks.TaskStart.CONTAINER_TYPE
 
@@ -56,9 +109,11 @@ class SQLiteStorageFile(interface.BaseStorageFile):
       _CONTAINER_TYPE_EVENT_DATA,
       _CONTAINER_TYPE_EVENT_SOURCE,
       _CONTAINER_TYPE_EVENT_TAG,
+      _CONTAINER_TYPE_PATH_SPEC,
       _CONTAINER_TYPE_SESSION_COMPLETION,
       _CONTAINER_TYPE_SESSION_START,
       _CONTAINER_TYPE_SYSTEM_CONFIGURATION,
+      _CONTAINER_TYPE_TASK_CHECKPOINT,
       _CONTAINER_TYPE_TASK_COMPLETION,
       _CONTAINER_TYPE_TASK_START)
 
@@ -66,11 +121,31 @@ class SQLiteStorageFile(interface.BaseStorageFile):
   _REFERENCED_CONTAINER_TYPES = (
       _CONTAINER_TYPE_EVENT,
       _CONTAINER_TYPE_EVENT_DATA,
-      _CONTAINER_TYPE_EVENT_SOURCE)
+      _CONTAINER_TYPE_EVENT_SOURCE,
+      _CONTAINER_TYPE_PATH_SPEC)
 
   _CREATE_METADATA_TABLE_QUERY = (
       'CREATE TABLE metadata (key TEXT, value TEXT);')
 
+  # Key of the storage metadata value that contains the compression format
+  # of a specific container type, which is only stored if it differs from
+  # the compression format of the store.
+  _CONTAINER_COMPRESSION_FORMAT_KEY = '{0:s}_compression_format'
+
+  _COMPRESSION_DICTIONARY_TABLE_NAME = 'compression_dictionary'
+
+  _CREATE_COMPRESSION_DICTIONARY_TABLE_QUERY = (
+      'CREATE TABLE compression_dictionary ('
+      'container_type TEXT, dictionary BLOB);')
+
+  _INSERT_COMPRESSION_DICTIONARY_QUERY = (
+      'INSERT INTO compression_dictionary (container_type, dictionary) '
+      'VALUES (?, ?)')
+
+  # Where {0:s} is the name of the database.
+  _SELECT_COMPRESSION_DICTIONARIES_QUERY = (
+      'SELECT container_type, dictionary FROM {0:s}.compression_dictionary')
+
   _CREATE_TABLE_QUERY = (
       'CREATE TABLE {0:s} ('
       '_identifier INTEGER PRIMARY KEY AUTOINCREMENT,'
@@ -80,8 +155,53 @@ class SQLiteStorageFile(interface.BaseStorageFile):
       'CREATE TABLE {0:s} ('
       '_identifier INTEGER PRIMARY KEY AUTOINCREMENT,'
       '_timestamp BIGINT,'
+      '_event_data_identifier INTEGER,'
+      '_data_type TEXT,'
+      '_parser TEXT,'
       '_data {1:s});')
 
+  # The path specification of event data is stored in the path_spec table
+  # and referenced by its row identifier.
+  _CREATE_EVENT_DATA_TABLE_QUERY = (
+      'CREATE TABLE {0:s} ('
+      '_identifier INTEGER PRIMARY KEY AUTOINCREMENT,'
+      '_path_spec_identifier INTEGER,'
+      '_data {1:s});')
+
+  _ADD_COLUMN_QUERY = 'ALTER TABLE {0:s} ADD COLUMN {1:s} {2:s}'
+
+  # Columns of the event table that were added after its initial definition,
+  # which are added when a store without them is opened for writing.
+  _ADDED_EVENT_COLUMNS = [
+      ('_event_data_identifier', 'INTEGER'),
+      ('_data_type', 'TEXT'),
+      ('_parser', 'TEXT')]
+
+  # Columns of the event data table that were added after its initial
+  # definition.
+  _ADDED_EVENT_DATA_COLUMNS = [
+      ('_path_spec_identifier', 'INTEGER')]
+
+  _CREATE_EVENT_TIMESTAMP_INDEX_QUERY = (
+      'CREATE INDEX IF NOT EXISTS event_timestamp ON event (_timestamp)')
+
+  # Indexes of the event attribute columns, which contain the timestamp so
+  # that the events with specific attribute values are read in chronological
+  # order.
+  _CREATE_EVENT_ATTRIBUTE_INDEX_QUERIES = [
+      ('event_data_type', (
+          'CREATE INDEX IF NOT EXISTS event_data_type '
+          'ON event (_data_type, _timestamp)')),
+      ('event_parser', (
+          'CREATE INDEX IF NOT EXISTS event_parser '
+          'ON event (_parser, _timestamp)'))]
+
+  _GET_COLUMNS_QUERY = 'PRAGMA table_info({0:s})'
+
+  _HAS_INDEX_QUERY = (
+      'SELECT name FROM sqlite_master '
+      'WHERE type = "index" AND name = "{0:s}"')
+
   _HAS_TABLE_QUERY = (
       'SELECT name FROM sqlite_master '
       'WHERE type = "table" AND name = "{0:s}"')
@@ -90,41 +210,217 @@ class SQLiteStorageFile(interface.BaseStorageFile):
   # a flush to disk (64 MiB).
   _MAXIMUM_BUFFER_SIZE = 64 * 1024 * 1024
 
+  # The default number of rows read from the database at once.
+  _DEFAULT_READ_BATCH_SIZE = 1000
+
+  # The default maximum number of event data attribute containers kept
+  # in the event data cache.
+  _DEFAULT_EVENT_DATA_CACHE_SIZE = 4096
+
+  # The maximum number of path specifications kept in the path specification
+  # caches.
+  _MAXIMUM_PATH_SPEC_CACHE_SIZE = 1024
+
+  # The minimum and maximum size of the serialized data on which
+  # the compression dictionary of a container type is trained. Until enough
+  # data has been written to train a dictionary it is compressed without one.
+  _MINIMUM_DICTIONARY_SAMPLES_SIZE = 64 * 1024
+  _MAXIMUM_DICTIONARY_SAMPLES_SIZE = 512 * 1024
+
+  _INSERT_EVENT_QUERY = (
+      'INSERT INTO event (_timestamp, _event_data_identifier, _data_type, '
+      '_parser, _data) VALUES (?, ?, ?, ?, ?)')
+
+  _INSERT_EVENT_DATA_QUERY = (
+      'INSERT INTO event_data (_path_spec_identifier, _data) VALUES (?, ?)')
+
+  # Where {0:s} is the expression of the path specification identifier of
+  # the event data.
+  _SELECT_EVENTS_WITH_EVENT_DATA_QUERY = (
+      'SELECT event._identifier, event._data, event._event_data_identifier, '
+      'event_data._data, {0:s} FROM event LEFT JOIN event_data '
+      'ON event._event_data_identifier = event_data._identifier')
+
+  _MERGE_DATABASE_NAME = 'merge_task_storage'
+
+  _ATTACH_DATABASE_QUERY = 'ATTACH DATABASE ? AS {0:s}'
+
+  _DETACH_DATABASE_QUERY = 'DETACH DATABASE {0:s}'
+
+  # Container types of which the rows are copied from a task store when it
+  # is merged. Container types in this tuple must be ordered after all
+  # the container types they reference. Event tags are not copied since
+  # they reference events by row identifier.
+  _MERGE_CONTAINER_TYPES = (
+      _CONTAINER_TYPE_PATH_SPEC,
+      _CONTAINER_TYPE_EVENT_SOURCE,
+      _CONTAINER_TYPE_EVENT_DATA,
+      _CONTAINER_TYPE_EVENT,
+      _CONTAINER_TYPE_EXTRACTION_ERROR)
+
+  # Queries to copy the rows of a task store per container type, where {0:s}
+  # is the name of the attached database and {1:s} the expression of the
+  # data. Identifiers of referenced container types are offset by the first
+  # query parameter, so that the references do not need to be rewritten in
+  # the serialized data.
+  _MERGE_ROWS_QUERIES = {
+      _CONTAINER_TYPE_EVENT: (
+          'INSERT INTO main.event (_timestamp, _event_data_identifier, '
+          '_data_type, _parser, _data) SELECT _timestamp, '
+          '_event_data_identifier + ?, _data_type, _parser, {1:s} '
+          'FROM {0:s}.event ORDER BY _identifier'),
+      _CONTAINER_TYPE_EVENT_DATA: (
+          'INSERT INTO main.event_data (_identifier, _path_spec_identifier, '
+          '_data) SELECT _identifier + ?, _path_spec_identifier + ?, {1:s} '
+          'FROM {0:s}.event_data ORDER BY _identifier'),
+      _CONTAINER_TYPE_EVENT_SOURCE: (
+          'INSERT INTO main.event_source (_identifier, _data) '
+          'SELECT _identifier + ?, {1:s} FROM {0:s}.event_source '
+          'ORDER BY _identifier'),
+      _CONTAINER_TYPE_EXTRACTION_ERROR: (
+          'INSERT INTO main.extraction_error (_data) '
+          'SELECT {1:s} FROM {0:s}.extraction_error ORDER BY _identifier'),
+      _CONTAINER_TYPE_PATH_SPEC: (
+          'INSERT INTO main.path_spec (_identifier, _data) '
+          'SELECT _identifier + ?, {1:s} FROM {0:s}.path_spec '
+          'ORDER BY _identifier')}
+
+  _MERGE_COLUMNS_QUERY = 'PRAGMA {0:s}.table_info({1:s})'
+
+  # Where {0:s} is the name of the attached database and {1:s} the name of
+  # the table.
+  _MERGE_DICTIONARY_SAMPLES_QUERY = (
+      'SELECT _data FROM {0:s}.{1:s} ORDER BY _identifier')
+
+  _MERGE_METADATA_QUERY = 'SELECT key, value FROM {0:s}.metadata'
+
+  _MERGE_PARSER_CHAINS_QUERY = (
+      'SELECT _parser, COUNT(*) FROM {0:s}.event GROUP BY _parser')
+
+  _MERGE_TABLE_NAMES_QUERY = (
+      'SELECT name FROM {0:s}.sqlite_master WHERE type = "table"')
+
   def __init__(
-      self, maximum_buffer_size=0,
+      self, build_timestamp_index=True, compression_format=None,
+      compression_formats=None, event_data_cache_size=0,
+      join_event_data=False, maximum_buffer_size=0, number_of_read_workers=0,
+      read_batch_size=0,
+      serialization_format=definitions.SERIALIZER_FORMAT_JSON,
       storage_type=definitions.STORAGE_TYPE_SESSION):
     """Initializes a store.
 
     Args:
+      build_timestamp_index (Optional[bool]): True if the event timestamp
+          index should be built when sorted events are first read from
+          a store that does not have one. The data type and parser indexes
+          are built likewise when events are first selected on these
+          attributes. Indexes are only built in a store that was opened
+          writable, hence a store opened read-only is never modified.
+      compression_format (Optional[str]): compression format of the data of
+          the attribute containers that are written, where None represents
+          zlib for a session store and no compression for a task store.
+          When an existing store is opened the compression formats of
+          the store are used.
+      compression_formats (Optional[dict[str, str]]): compression formats
+          per container type, which take precedence over the compression
+          format for the container types they contain.
+      event_data_cache_size (Optional[int]): maximum number of event data
+          attribute containers kept in the event data cache. A value of 0
+          indicates the size is _DEFAULT_EVENT_DATA_CACHE_SIZE.
+      join_event_data (Optional[bool]): True if sorted events should be read
+          together with their event data, in a single query, into the event
+          data cache. Read workers are not used to read events in this mode.
       maximum_buffer_size (Optional[int]):
           maximum size of a single storage stream. A value of 0 indicates
           the limit is _MAXIMUM_BUFFER_SIZE.
+      number_of_read_workers (Optional[int]): number of worker processes
+          used to decompress and deserialize attribute containers that are
+          read, where 0 represents no worker processes.
+      read_batch_size (Optional[int]): number of rows read from the database
+          at once. A value of 0 indicates the size is _DEFAULT_READ_BATCH_SIZE.
+      serialization_format (Optional[str]): serialization format of
+          the attribute containers that are written. When an existing store
+          is opened the serialization format of the store is used.
       storage_type (Optional[str]): storage type.
 
     Raises:
-      ValueError: if the maximum buffer size value is out of bounds.
+      ValueError: if the event data cache size, the maximum buffer size value,
+          the number of read workers or the read batch size is out of bounds
+          or if the compression or serialization format is not supported.
     """
+    if not compression_format:
+      if storage_type == definitions.STORAGE_TYPE_SESSION:
+        compression_format = definitions.COMPRESSION_FORMAT_ZLIB
+      else:
+        compression_format = definitions.COMPRESSION_FORMAT_NONE
+
+    compression_formats = dict(compression_formats or {})
+    for container_type in compression_formats.keys():
+      if container_type not in self._CONTAINER_TYPES:
+        raise ValueError('Unsupported container type: {0!s}'.format(
+            container_type))
+
+    for container_type_compression_format in (
+        [compression_format] + list(compression_formats.values())):
+      compressors.CompressorFactory.SupportsDictionary(
+          container_type_compression_format)
+
+    if event_data_cache_size < 0:
+      raise ValueError('Event data cache size value out of bounds.')
+
     if (maximum_buffer_size < 0 or
         maximum_buffer_size > self._MAXIMUM_BUFFER_SIZE):
       raise ValueError('Maximum buffer size value out of bounds.')
 
+    if number_of_read_workers < 0:
+      raise ValueError('Number of read workers value out of bounds.')
+
+    if read_batch_size < 0:
+      raise ValueError('Read batch size value out of bounds.')
+
     if not maximum_buffer_size:
       maximum_buffer_size = self._MAXIMUM_BUFFER_SIZE
 
-    super(SQLiteStorageFile, self).__init__()
+    if not read_batch_size:
+      read_batch_size = self._DEFAULT_READ_BATCH_SIZE
+
+    if not event_data_cache_size:
+      event_data_cache_size = self._DEFAULT_EVENT_DATA_CACHE_SIZE
+
+    super(SQLiteStorageFile, self).__init__(
+        serialization_format=serialization_format)
+    self._build_timestamp_index = build_timestamp_index
+    self._compression_dictionaries = {}
+    self._compression_dictionary_samples = {}
+    self._compression_formats = compression_formats
+    self._compressors = {}
     self._connection = None
     self._cursor = None
+    self._event_data_cache = lru_cache.LRUCache(event_data_cache_size)
+    self._event_data_path_spec_row_identifiers = []
+    self._has_event_attribute_columns = False
+    self._has_event_attribute_indexes = False
+    self._has_event_data_identifier_column = False
+    self._has_event_timestamp_index = False
+    self._has_path_spec_identifier_column = False
+    self._index_creation_failed = False
+    self._join_event_data = join_event_data
+    self._last_path_spec = None
+    self._last_path_spec_row_identifier = None
     self._last_session = 0
     self._maximum_buffer_size = maximum_buffer_size
+    self._merge_compressors = {}
+    self._number_of_read_workers = number_of_read_workers
+    self._path_spec_cache = lru_cache.LRUCache(
+        self._MAXIMUM_PATH_SPEC_CACHE_SIZE)
+    self._path_spec_row_identifiers = lru_cache.LRUCache(
+        self._MAXIMUM_PATH_SPEC_CACHE_SIZE)
+    self._read_batch_size = read_batch_size
+    self._read_workers_pool = None
     self._serialized_event_heap = event_heaps.SerializedEventHeap()
 
-    if storage_type == definitions.STORAGE_TYPE_SESSION:
-      self.compression_format = definitions.COMPRESSION_FORMAT_ZLIB
-    else:
-      self.compression_format = definitions.COMPRESSION_FORMAT_NONE
-
+    self.compression_format = compression_format
     self.format_version = self._FORMAT_VERSION
-    self.serialization_format = definitions.SERIALIZER_FORMAT_JSON
     self.storage_type = storage_type
 
   def _AddAttributeContainer(self, container_type, attribute_container):
@@ -150,11 +446,50 @@ class SQLiteStorageFile(interface.BaseStorageFile):
     if container_list.data_size > self._maximum_buffer_size:
       self._WriteSerializedAttributeContainerList(container_type)
 
-  def _AddSerializedEvent(self, event):
+  def _AddPathSpec(self, path_spec):
+    """Adds a path specification.
+
+    A path specification is stored once and referenced by the row identifier
+    of its path specification attribute container. The event data of a file
+    entry normally shares the same path specification object, hence the last
+    added path specification is checked before the comparable based cache.
+
+    Args:
+      path_spec (dfvfs.PathSpec): path specification.
+
+    Returns:
+      int: row identifier of the path specification attribute container.
+
+    Raises:
+      IOError: if the path specification cannot be serialized.
+    """
+    if path_spec is self._last_path_spec:
+      return self._last_path_spec_row_identifier
+
+    comparable = path_spec.comparable
+    row_identifier = self._path_spec_row_identifiers.GetObject(comparable)
+    if row_identifier is None:
+      path_spec_container = path_specs.PathSpecification(path_spec=path_spec)
+      self._AddAttributeContainer(
+          self._CONTAINER_TYPE_PATH_SPEC, path_spec_container)
+
+      identifier = path_spec_container.GetIdentifier()
+      row_identifier = identifier.row_identifier
+
+      self._path_spec_row_identifiers.CacheObject(comparable, row_identifier)
+      self._path_spec_cache.CacheObject(row_identifier, path_spec)
+
+    self._last_path_spec = path_spec
+    self._last_path_spec_row_identifier = row_identifier
+
+    return row_identifier
+
+  def _AddSerializedEvent(self, event, event_data=None):
     """Adds an serialized event.
 
     Args:
       event (EventObject): event.
+      event_data (Optional[EventData]): event data of the event.
 
     Raises:
       IOError: if the event cannot be serialized.
@@ -166,11 +501,35 @@ class SQLiteStorageFile(interface.BaseStorageFile):
 
     serialized_data = self._SerializeAttributeContainer(event)
 
-    self._serialized_event_heap.PushEvent(event.timestamp, serialized_data)
+    # The values of the event data take precedence, as they do when the event
+    # data is read into the event.
+    data_type = (
+        getattr(event_data, 'data_type', None) or
+        getattr(event, 'data_type', None))
+    parser_chain = (
+        getattr(event_data, 'parser', None) or getattr(event, 'parser', None))
+
+    event_data_row_identifier = getattr(
+        event, 'event_data_row_identifier', None)
+    self._serialized_event_heap.PushEvent(
+        event.timestamp, serialized_data, data_type=data_type,
+        event_data_row_identifier=event_data_row_identifier,
+        parser_chain=parser_chain)
 
     if self._serialized_event_heap.data_size > self._maximum_buffer_size:
       self._WriteSerializedAttributeContainerList(self._CONTAINER_TYPE_EVENT)
 
+  def _CanBuildIndexes(self):
+    """Determines if indexes can be built when events are read.
+
+    Returns:
+      bool: True if indexes can be built, which requires the store to be
+          opened writable.
+    """
+    return bool(
+        self._build_timestamp_index and not self._read_only and
+        not self._index_creation_failed)
+
   @classmethod
   def _CheckStorageMetadata(cls, metadata_values):
     """Checks the storage metadata.
@@ -208,8 +567,17 @@ class SQLiteStorageFile(interface.BaseStorageFile):
       raise IOError('Unsupported compression format: {0:s}'.format(
           compression_format))
 
+    for container_type in cls._CONTAINER_TYPES:
+      key = cls._CONTAINER_COMPRESSION_FORMAT_KEY.format(container_type)
+      compression_format = metadata_values.get(key, None)
+      if (compression_format is not None and
+          compression_format not in definitions.COMPRESSION_FORMATS):
+        raise IOError(
+            'Unsupported compression format: {0:s} of container type: '
+            '{1:s}'.format(compression_format, container_type))
+
     serialization_format = metadata_values.get('serialization_format', None)
-    if serialization_format != definitions.SERIALIZER_FORMAT_JSON:
+    if serialization_format not in definitions.SERIALIZER_FORMATS:
       raise IOError('Unsupported serialization format: {0:s}'.format(
           serialization_format))
 
@@ -218,6 +586,119 @@ class SQLiteStorageFile(interface.BaseStorageFile):
       raise IOError('Unsupported storage type: {0:s}'.format(
           storage_type))
 
+  def _ConvertMergeRowData(self, container_type, row_data):
+    """Converts the data of a row copied from a task store.
+
+    This method is registered as a SQL function to convert the data of rows
+    of which the compression format or dictionary of the task store differs
+    from that of the store.
+
+    Args:
+      container_type (str): attribute container type.
+      row_data (bytes|str): data of the row in the task store.
+
+    Returns:
+      bytes: data of the row in the store.
+
+    Raises:
+      IOError: if the data cannot be decompressed.
+    """
+    source_compressor, target_compressor = self._merge_compressors[
+        container_type]
+
+    if isinstance(row_data, py2to3.UNICODE_TYPE):
+      row_data = row_data.encode('utf-8')
+
+    serialized_data = source_compressor.Decompress(row_data)
+    return sqlite3.Binary(target_compressor.Compress(serialized_data))
+
+  def _CreateEventAttributeIndexes(self):
+    """Creates the event data type and parser indexes.
+
+    The indexes allow SQLite to read the events with specific data types or
+    parser chains in chronological order without a full table scan.
+
+    Returns:
+      bool: True if the event data type and parser indexes were created.
+    """
+    if self._has_event_attribute_indexes:
+      return True
+
+    if not self._has_event_attribute_columns or self._index_creation_failed:
+      return False
+
+    try:
+      for _, query in self._CREATE_EVENT_ATTRIBUTE_INDEX_QUERIES:
+        self._cursor.execute(query)
+      self._connection.commit()
+
+    except sqlite3.OperationalError as exception:
+      logger.warning(
+          'Unable to create event attribute indexes with error: {0!s}'.format(
+              exception))
+
+      # Do not retry creating indexes, for example on read-only media.
+      self._index_creation_failed = True
+      return False
+
+    self._has_event_attribute_indexes = True
+    return True
+
+  def _CreateEventTimestampIndex(self):
+    """Creates the event timestamp index.
+
+    The index allows SQLite to read events in chronological order, and
+    within a time range, without a full table scan and sort.
+
+    Returns:
+      bool: True if the event timestamp index was created.
+    """
+    if self._has_event_timestamp_index:
+      return True
+
+    if (self._index_creation_failed or
+        not self._HasTable(self._CONTAINER_TYPE_EVENT)):
+      return False
+
+    try:
+      self._cursor.execute(self._CREATE_EVENT_TIMESTAMP_INDEX_QUERY)
+      self._connection.commit()
+
+    except sqlite3.OperationalError as exception:
+      logger.warning(
+          'Unable to create event timestamp index with error: {0!s}'.format(
+              exception))
+
+      # Do not retry creating indexes, for example on read-only media.
+      self._index_creation_failed = True
+      return False
+
+    self._has_event_timestamp_index = True
+    return True
+
+  def _DeserializeRowData(self, container_type, row_data):
+    """Decompresses and deserializes the data of an attribute container row.
+
+    Args:
+      container_type (str): attribute container type.
+      row_data (bytes): data of the row.
+
+    Returns:
+      AttributeContainer: attribute container or None.
+
+    Raises:
+      IOError: if the data cannot be decompressed or the serialized data
+          cannot be decoded.
+    """
+    compressor = self._GetCompressor(container_type)
+    serialized_data = compressor.Decompress(row_data)
+
+    if self._storage_profiler:
+      self._storage_profiler.Sample(
+          'read', container_type, len(serialized_data), len(row_data))
+
+    return self._DeserializeAttributeContainer(container_type, serialized_data)
+
   def _GetAttributeContainerByIndex(self, container_type, index):
     """Retrieves a specific attribute container.
 
@@ -228,9 +709,18 @@ class SQLiteStorageFile(interface.BaseStorageFile):
     Returns:
       AttributeContainer: attribute container or None if not available.
     """
+    has_path_spec_identifier_column = bool(
+        container_type == self._CONTAINER_TYPE_EVENT_DATA and
+        self._has_path_spec_identifier_column)
+
     sequence_number = index + 1
-    query = 'SELECT _data FROM {0:s} WHERE rowid = {1:d}'.format(
-        container_type, sequence_number)
+    if has_path_spec_identifier_column:
+      query = (
+          'SELECT _data, _path_spec_identifier FROM event_data '
+          'WHERE rowid = {0:d}').format(sequence_number)
+    else:
+      query = 'SELECT _data FROM {0:s} WHERE rowid = {1:d}'.format(
+          container_type, sequence_number)
     self._cursor.execute(query)
 
     row = self._cursor.fetchone()
@@ -238,10 +728,8 @@ class SQLiteStorageFile(interface.BaseStorageFile):
       identifier = identifiers.SQLTableIdentifier(
           container_type, sequence_number)
 
-      if self.compression_format == definitions.COMPRESSION_FORMAT_ZLIB:
-        serialized_data = zlib.decompress(row[0])
-      else:
-        serialized_data = row[0]
+      compressor = self._GetCompressor(container_type)
+      serialized_data = compressor.Decompress(row[0])
 
       if self._storage_profiler:
         self._storage_profiler.Sample(
@@ -250,6 +738,11 @@ class SQLiteStorageFile(interface.BaseStorageFile):
       attribute_container = self._DeserializeAttributeContainer(
           container_type, serialized_data)
       attribute_container.SetIdentifier(identifier)
+
+      if has_path_spec_identifier_column and row[1] is not None:
+        attribute_container.pathspec = self._GetPathSpecByRowIdentifier(
+            row[1])
+
       return attribute_container
 
     count = self._CountStoredAttributeContainers(container_type)
@@ -264,21 +757,53 @@ class SQLiteStorageFile(interface.BaseStorageFile):
       identifier = identifiers.SQLTableIdentifier(
           container_type, sequence_number)
       attribute_container.SetIdentifier(identifier)
+
+      if container_type == self._CONTAINER_TYPE_EVENT_DATA:
+        path_spec_row_identifier = (
+            self._event_data_path_spec_row_identifiers[index])
+        if path_spec_row_identifier is not None:
+          attribute_container.pathspec = self._GetPathSpecByRowIdentifier(
+              path_spec_row_identifier)
+
     return attribute_container
 
   def _GetAttributeContainers(
-      self, container_type, filter_expression=None, order_by=None):
+      self, container_type, filter_expression=None, filter_values=None,
+      order_by=None):
     """Retrieves attribute containers.
 
+    Rows are read in batches. If read workers are configured the next batch
+    is decompressed and deserialized by the workers while the containers
+    of the current batch are yielded.
+
     Args:
       container_type (str): attribute container type.
       filter_expression (Optional[str]): expression to filter results by.
+      filter_values (Optional[tuple[object]]): values of the parameters
+          in the filter expression.
       order_by (Optional[str]): name of a column to order the results by.
 
     Yields:
       AttributeContainer: attribute container.
     """
-    query = 'SELECT _identifier, _data FROM {0:s}'.format(container_type)
+    # The event data identifier column takes precedence over the event data
+    # row identifier in the serialized data of events, which is not updated
+    # when the rows of a task store are merged.
+    has_event_data_identifier_column = bool(
+        container_type == self._CONTAINER_TYPE_EVENT and
+        self._has_event_data_identifier_column)
+    has_path_spec_identifier_column = bool(
+        container_type == self._CONTAINER_TYPE_EVENT_DATA and
+        self._has_path_spec_identifier_column)
+
+    if has_event_data_identifier_column:
+      query = 'SELECT _identifier, _data, _event_data_identifier FROM event'
+    elif has_path_spec_identifier_column:
+      query = (
+          'SELECT _identifier, _data, _path_spec_identifier FROM event_data')
+    else:
+      query = 'SELECT _identifier, _data FROM {0:s}'.format(container_type)
+
     if filter_expression:
       query = '{0:s} WHERE {1:s}'.format(query, filter_expression)
     if order_by:
@@ -287,27 +812,247 @@ class SQLiteStorageFile(interface.BaseStorageFile):
     # Use a local cursor to prevent another query interrupting the generator.
     cursor = self._connection.cursor()
 
-    cursor.execute(query)
+    cursor.execute(query, filter_values or ())
 
-    row = cursor.fetchone()
-    while row:
-      identifier = identifiers.SQLTableIdentifier(container_type, row[0])
+    compressor = self._GetCompressor(container_type)
+
+    rows = cursor.fetchmany(size=self._read_batch_size)
+    if rows and self._number_of_read_workers:
+      batch_result = self._StartDeserializeRows(container_type, rows)
+    else:
+      batch_result = None
 
-      if self.compression_format == definitions.COMPRESSION_FORMAT_ZLIB:
-        serialized_data = zlib.decompress(row[1])
+    while rows:
+      next_rows = cursor.fetchmany(size=self._read_batch_size)
+      if next_rows and self._number_of_read_workers:
+        next_batch_result = self._StartDeserializeRows(
+            container_type, next_rows)
       else:
-        serialized_data = row[1]
+        next_batch_result = None
 
-      if self._storage_profiler:
-        self._storage_profiler.Sample(
-            'read', container_type, len(serialized_data), len(row[1]))
+      if batch_result:
+        if self._serializers_profiler:
+          self._serializers_profiler.StartTiming(container_type)
 
-      attribute_container = self._DeserializeAttributeContainer(
-          container_type, serialized_data)
-      attribute_container.SetIdentifier(identifier)
-      yield attribute_container
+        batch_values = batch_result.get()
+
+        if self._serializers_profiler:
+          self._serializers_profiler.StopTiming(container_type)
+
+      else:
+        batch_values = []
+        for row in rows:
+          serialized_data = compressor.Decompress(row[1])
+
+          attribute_container = self._DeserializeAttributeContainer(
+              container_type, serialized_data)
+          batch_values.append((len(serialized_data), attribute_container))
+
+      for row, (data_size, attribute_container) in zip(rows, batch_values):
+        if self._storage_profiler:
+          self._storage_profiler.Sample(
+              'read', container_type, data_size, len(row[1]))
 
-      row = cursor.fetchone()
+        if attribute_container:
+          identifier = identifiers.SQLTableIdentifier(container_type, row[0])
+          attribute_container.SetIdentifier(identifier)
+
+          if has_event_data_identifier_column and row[2] is not None:
+            attribute_container.event_data_row_identifier = row[2]
+
+          elif has_path_spec_identifier_column and row[2] is not None:
+            attribute_container.pathspec = self._GetPathSpecByRowIdentifier(
+                row[2])
+
+        yield attribute_container
+
+      rows = next_rows
+      batch_result = next_batch_result
+
+  def _GetCompressor(self, container_type):
+    """Retrieves the compressor of a container type.
+
+    Args:
+      container_type (str): attribute container type.
+
+    Returns:
+      BaseCompressor: compressor.
+
+    Raises:
+      IOError: if the compression format is not supported.
+    """
+    compressor = self._compressors.get(container_type, None)
+    if not compressor:
+      compression_format = self._compression_formats.get(
+          container_type, self.compression_format)
+      dictionary = self._compression_dictionaries.get(container_type, None)
+
+      try:
+        compressor = compressors.CompressorFactory.GetCompressor(
+            compression_format, dictionary=dictionary)
+      except ValueError as exception:
+        raise IOError((
+            'Unable to create compressor of container type: {0:s} with '
+            'error: {1!s}').format(container_type, exception))
+
+      self._compressors[container_type] = compressor
+
+    return compressor
+
+  def _GetEventFilter(self, time_range=None, data_types=None,
+                      parser_chains=None):
+    """Retrieves a filter expression to select events.
+
+    Args:
+      time_range (Optional[TimeRange]): time range or None.
+      data_types (Optional[list[str]]): data types or None.
+      parser_chains (Optional[list[str]]): parser chains or None.
+
+    Returns:
+      tuple: contains:
+
+        str: filter expression or None if there are no filter values.
+        tuple[object]: values of the parameters in the filter expression or
+            None if there are no filter values.
+    """
+    filter_expression, filter_values = self._GetEventTimeRangeFilter(
+        time_range)
+
+    filter_expressions = []
+    if filter_expression:
+      filter_expressions.append(filter_expression)
+
+    filter_values = list(filter_values or [])
+
+    # Stores without the attribute columns cannot be filtered on them.
+    if self._has_event_attribute_columns:
+      for column_name, values in (
+          ('_data_type', data_types), ('_parser', parser_chains)):
+        if values is None:
+          continue
+
+        values = sorted(values)
+        if not values:
+          filter_expressions.append('0')
+          continue
+
+        # Events written before the column was added have no value stored
+        # and are always selected.
+        filter_expressions.append('({0:s} IN ({1:s}) OR {0:s} IS NULL)'.format(
+            column_name, ', '.join(['?'] * len(values))))
+        filter_values.extend(values)
+
+    if not filter_expressions:
+      return None, None
+
+    return ' AND '.join(filter_expressions), tuple(filter_values)
+
+  def _GetEventTimeRangeFilter(self, time_range):
+    """Retrieves a filter expression to select events within a time range.
+
+    Args:
+      time_range (TimeRange): time range or None.
+
+    Returns:
+      tuple: contains:
+
+        str: filter expression or None if there is no time range.
+        tuple[int]: values of the parameters in the filter expression or
+            None if there is no time range.
+    """
+    if not time_range:
+      return None, None
+
+    # Bound parameters allow SQLite to use the timestamp index for
+    # a range seek.
+    return '_timestamp >= ? AND _timestamp <= ?', (
+        time_range.start_timestamp, time_range.end_timestamp)
+
+  def _GetPathSpecByRowIdentifier(self, row_identifier):
+    """Retrieves a path specification by the row identifier of its container.
+
+    Args:
+      row_identifier (int): row identifier of the path specification attribute
+          container.
+
+    Returns:
+      dfvfs.PathSpec: path specification or None if not available.
+    """
+    path_spec = self._path_spec_cache.GetObject(row_identifier)
+    if path_spec is None:
+      path_spec_container = self._GetAttributeContainerByIndex(
+          self._CONTAINER_TYPE_PATH_SPEC, row_identifier - 1)
+      if path_spec_container:
+        path_spec = path_spec_container.path_spec
+        self._path_spec_cache.CacheObject(row_identifier, path_spec)
+
+    return path_spec
+
+  def _GetSortedEventsWithEventData(
+      self, filter_expression=None, filter_values=None):
+    """Retrieves events in chronological order together with their event data.
+
+    The event data of the events is read in the same query and stored in
+    the event data cache, so that subsequent calls to GetEventDataByIdentifier
+    do not require a separate query per event.
+
+    Args:
+      filter_expression (Optional[str]): expression to filter results by.
+      filter_values (Optional[tuple[object]]): values of the parameters
+          in the filter expression.
+
+    Yields:
+      EventObject: event.
+    """
+    if self._has_path_spec_identifier_column:
+      path_spec_identifier_expression = 'event_data._path_spec_identifier'
+    else:
+      path_spec_identifier_expression = 'NULL'
+
+    query = self._SELECT_EVENTS_WITH_EVENT_DATA_QUERY.format(
+        path_spec_identifier_expression)
+    if filter_expression:
+      query = '{0:s} WHERE {1:s}'.format(query, filter_expression)
+    query = '{0:s} ORDER BY event._timestamp'.format(query)
+
+    # Use a local cursor to prevent another query interrupting the generator.
+    cursor = self._connection.cursor()
+
+    cursor.execute(query, filter_values or ())
+
+    rows = cursor.fetchmany(size=self._read_batch_size)
+    while rows:
+      for row in rows:
+        event_data_row_identifier = row[2]
+        if (event_data_row_identifier and row[3] is not None and
+            self._event_data_cache.GetObject(
+                event_data_row_identifier) is None):
+          event_data = self._DeserializeRowData(
+              self._CONTAINER_TYPE_EVENT_DATA, row[3])
+          if event_data:
+            identifier = identifiers.SQLTableIdentifier(
+                self._CONTAINER_TYPE_EVENT_DATA, event_data_row_identifier)
+            event_data.SetIdentifier(identifier)
+
+            if row[4] is not None:
+              event_data.pathspec = self._GetPathSpecByRowIdentifier(row[4])
+
+            self._event_data_cache.CacheObject(
+                event_data_row_identifier, event_data)
+
+        event = self._DeserializeRowData(
+            self._CONTAINER_TYPE_EVENT, row[1])
+        if event:
+          identifier = identifiers.SQLTableIdentifier(
+              self._CONTAINER_TYPE_EVENT, row[0])
+          event.SetIdentifier(identifier)
+
+          if event_data_row_identifier is not None:
+            event.event_data_row_identifier = event_data_row_identifier
+
+        yield event
+
+      rows = cursor.fetchmany(size=self._read_batch_size)
 
   def _HasAttributeContainers(self, container_type):
     """Determines if a store contains a specific type of attribute containers.
@@ -322,6 +1067,35 @@ class SQLiteStorageFile(interface.BaseStorageFile):
     count = self._CountStoredAttributeContainers(container_type)
     return count > 0
 
+  def _HasColumn(self, table_name, column_name):
+    """Determines if a specific column exists.
+
+    Args:
+      table_name (str): name of the table.
+      column_name (str): name of the column.
+
+    Returns:
+      bool: True if the column exists.
+    """
+    query = self._GET_COLUMNS_QUERY.format(table_name)
+
+    self._cursor.execute(query)
+    return column_name in [row[1] for row in self._cursor.fetchall()]
+
+  def _HasIndex(self, index_name):
+    """Determines if a specific index exists.
+
+    Args:
+      index_name (str): name of the index.
+
+    Returns:
+      bool: True if the index exists.
+    """
+    query = self._HAS_INDEX_QUERY.format(index_name)
+
+    self._cursor.execute(query)
+    return bool(self._cursor.fetchone())
+
   def _HasTable(self, table_name):
     """Determines if a specific table exists.
 
@@ -336,6 +1110,168 @@ class SQLiteStorageFile(interface.BaseStorageFile):
     self._cursor.execute(query)
     return bool(self._cursor.fetchone())
 
+  def _GetMergeSourceCompressor(self, compression_format, dictionary):
+    """Retrieves the compressor of a container type of the attached task store.
+
+    Args:
+      compression_format (str): compression format.
+      dictionary (bytes): compression dictionary or None if not available.
+
+    Returns:
+      BaseCompressor: compressor.
+
+    Raises:
+      IOError: if the compression format is not supported.
+    """
+    try:
+      return compressors.CompressorFactory.GetCompressor(
+          compression_format, dictionary=dictionary)
+    except ValueError as exception:
+      raise IOError((
+          'Unable to create compressor of task store with error: '
+          '{0!s}').format(exception))
+
+  def _MergeAttachedTaskStorageRows(self):
+    """Copies the rows of the attached task store.
+
+    Returns:
+      tuple: contains:
+
+        dict[str, int]: number of rows copied per container type, which is
+            empty if the rows of the task store cannot be copied.
+        dict[str, int]: number of events copied per parser chain.
+    """
+    database_name = self._MERGE_DATABASE_NAME
+
+    query = self._MERGE_METADATA_QUERY.format(database_name)
+    self._cursor.execute(query)
+    metadata_values = {row[0]: row[1] for row in self._cursor.fetchall()}
+
+    if (metadata_values.get('serialization_format') !=
+        self.serialization_format):
+      return {}, {}
+
+    compression_formats = {}
+    for container_type in self._MERGE_CONTAINER_TYPES:
+      key = self._CONTAINER_COMPRESSION_FORMAT_KEY.format(container_type)
+      compression_format = metadata_values.get(
+          key, metadata_values.get('compression_format'))
+      if compression_format not in definitions.COMPRESSION_FORMATS:
+        return {}, {}
+
+      compression_formats[container_type] = compression_format
+
+    query = self._MERGE_TABLE_NAMES_QUERY.format(database_name)
+    self._cursor.execute(query)
+    table_names = [row[0] for row in self._cursor.fetchall()]
+
+    if not all([
+        container_type in table_names
+        for container_type in self._MERGE_CONTAINER_TYPES]):
+      return {}, {}
+
+    # Without the event data identifier column the event data references
+    # are only stored in the serialized events and without the path
+    # specification identifier column the path specifications are stored in
+    # the serialized event data.
+    for table_name, added_columns in (
+        (self._CONTAINER_TYPE_EVENT, self._ADDED_EVENT_COLUMNS),
+        (self._CONTAINER_TYPE_EVENT_DATA, self._ADDED_EVENT_DATA_COLUMNS)):
+      query = self._MERGE_COLUMNS_QUERY.format(database_name, table_name)
+      self._cursor.execute(query)
+      column_names = [row[1] for row in self._cursor.fetchall()]
+
+      if not all([
+          column_name in column_names for column_name, _ in added_columns]):
+        return {}, {}
+
+    compression_dictionaries = self._ReadCompressionDictionaries(
+        database_name=database_name)
+
+    # The data of rows is copied as-is if the task store compressed it in
+    # the same way as the store, otherwise it is converted.
+    data_expressions = {}
+    self._merge_compressors = {}
+    for container_type in self._MERGE_CONTAINER_TYPES:
+      source_compressor = self._GetMergeSourceCompressor(
+          compression_formats[container_type],
+          compression_dictionaries.get(container_type, None))
+
+      target_compressor = self._GetCompressor(container_type)
+      if target_compressor.SUPPORTS_DICTIONARY:
+        self._TrainCompressionDictionaryOnMergeRows(
+            container_type, source_compressor)
+        target_compressor = self._GetCompressor(container_type)
+
+      if (source_compressor.COMPRESSION_FORMAT ==
+          target_compressor.COMPRESSION_FORMAT and
+          getattr(source_compressor, 'dictionary', None) ==
+          getattr(target_compressor, 'dictionary', None)):
+        data_expressions[container_type] = '_data'
+      else:
+        self._merge_compressors[container_type] = (
+            source_compressor, target_compressor)
+        data_expressions[container_type] = (
+            "plaso_convert_row_data('{0:s}', _data)".format(container_type))
+
+    query = self._MERGE_PARSER_CHAINS_QUERY.format(database_name)
+    self._cursor.execute(query)
+    parser_chains = {row[0]: row[1] for row in self._cursor.fetchall()}
+
+    event_data_list = self._GetSerializedAttributeContainerList(
+        self._CONTAINER_TYPE_EVENT_DATA)
+    event_source_list = self._GetSerializedAttributeContainerList(
+        self._CONTAINER_TYPE_EVENT_SOURCE)
+    path_spec_list = self._GetSerializedAttributeContainerList(
+        self._CONTAINER_TYPE_PATH_SPEC)
+
+    query_parameters = {
+        self._CONTAINER_TYPE_EVENT: (event_data_list.next_sequence_number, ),
+        self._CONTAINER_TYPE_EVENT_DATA: (
+            event_data_list.next_sequence_number,
+            path_spec_list.next_sequence_number),
+        self._CONTAINER_TYPE_EVENT_SOURCE: (
+            event_source_list.next_sequence_number, ),
+        self._CONTAINER_TYPE_EXTRACTION_ERROR: (),
+        self._CONTAINER_TYPE_PATH_SPEC: (
+            path_spec_list.next_sequence_number, )}
+
+    number_of_rows = {}
+    for container_type in self._MERGE_CONTAINER_TYPES:
+      query = self._MERGE_ROWS_QUERIES[container_type].format(
+          database_name, data_expressions[container_type])
+      self._cursor.execute(query, query_parameters[container_type])
+      number_of_rows[container_type] = self._cursor.rowcount
+
+    event_data_list.next_sequence_number += number_of_rows[
+        self._CONTAINER_TYPE_EVENT_DATA]
+    event_source_list.next_sequence_number += number_of_rows[
+        self._CONTAINER_TYPE_EVENT_SOURCE]
+    path_spec_list.next_sequence_number += number_of_rows[
+        self._CONTAINER_TYPE_PATH_SPEC]
+
+    return number_of_rows, parser_chains
+
+  def _ReadCompressionDictionaries(self, database_name='main'):
+    """Reads the compression dictionaries.
+
+    Args:
+      database_name (Optional[str]): name of the database.
+
+    Returns:
+      dict[str, bytes]: compression dictionary per container type.
+    """
+    query = self._MERGE_TABLE_NAMES_QUERY.format(database_name)
+    self._cursor.execute(query)
+    table_names = [row[0] for row in self._cursor.fetchall()]
+
+    if self._COMPRESSION_DICTIONARY_TABLE_NAME not in table_names:
+      return {}
+
+    query = self._SELECT_COMPRESSION_DICTIONARIES_QUERY.format(database_name)
+    self._cursor.execute(query)
+    return {row[0]: bytes(row[1]) for row in self._cursor.fetchall()}
+
   def _ReadStorageMetadata(self):
     """Reads the storage metadata.
 
@@ -351,9 +1287,126 @@ class SQLiteStorageFile(interface.BaseStorageFile):
 
     self.format_version = metadata_values['format_version']
     self.compression_format = metadata_values['compression_format']
-    self.serialization_format = metadata_values['serialization_format']
+
+    self._compression_formats = {}
+    for container_type in self._CONTAINER_TYPES:
+      key = self._CONTAINER_COMPRESSION_FORMAT_KEY.format(container_type)
+      if key in metadata_values:
+        self._compression_formats[container_type] = metadata_values[key]
+    self._SetSerializationFormat(metadata_values['serialization_format'])
     self.storage_type = metadata_values['storage_type']
 
+  def _StartDeserializeRows(self, container_type, rows):
+    """Starts decompressing and deserializing rows in the read workers.
+
+    Args:
+      container_type (str): attribute container type.
+      rows (list[tuple[int, bytes]]): identifier and data of the rows.
+
+    Returns:
+      multiprocessing.pool.AsyncResult: result of the read workers, which
+          contains the serialized data size and attribute container per row,
+          in the order of the rows.
+    """
+    if not self._read_workers_pool:
+      self._read_workers_pool = multiprocessing.Pool(
+          processes=self._number_of_read_workers)
+
+    compressor = self._GetCompressor(container_type)
+    deserialize_function = functools.partial(
+        _DeserializeAttributeContainerRow, compressor,
+        self.serialization_format)
+
+    return self._read_workers_pool.map_async(
+        deserialize_function, [row[1] for row in rows])
+
+  def _TrainCompressionDictionary(self, container_type, samples):
+    """Trains the compression dictionary of a container type.
+
+    The samples are accumulated until their size suffices to train
+    a dictionary. Once trained the dictionary is stored and used to compress
+    subsequently written data of the container type.
+
+    Args:
+      container_type (str): attribute container type.
+      samples (list[bytes]): serialized data of attribute containers of
+          the container type.
+
+    Raises:
+      IOError: if the compression format is not supported.
+    """
+    compressor = self._GetCompressor(container_type)
+    if not compressor.SUPPORTS_DICTIONARY or compressor.dictionary:
+      return
+
+    dictionary_samples = self._compression_dictionary_samples.setdefault(
+        container_type, [])
+
+    samples_size = sum([len(sample) for sample in dictionary_samples])
+    for sample in samples:
+      if samples_size >= self._MAXIMUM_DICTIONARY_SAMPLES_SIZE:
+        break
+
+      dictionary_samples.append(sample)
+      samples_size += len(sample)
+
+    if samples_size < self._MINIMUM_DICTIONARY_SAMPLES_SIZE:
+      return
+
+    dictionary = compressors.CompressorFactory.TrainDictionary(
+        compressor.COMPRESSION_FORMAT, dictionary_samples)
+    del self._compression_dictionary_samples[container_type]
+
+    if not self._HasTable(self._COMPRESSION_DICTIONARY_TABLE_NAME):
+      self._cursor.execute(self._CREATE_COMPRESSION_DICTIONARY_TABLE_QUERY)
+
+    self._cursor.execute(self._INSERT_COMPRESSION_DICTIONARY_QUERY, (
+        container_type, sqlite3.Binary(dictionary)))
+
+    self._compression_dictionaries[container_type] = dictionary
+    del self._compressors[container_type]
+
+  def _TrainCompressionDictionaryOnMergeRows(
+      self, container_type, source_compressor):
+    """Trains the compression dictionary of a container type on merged rows.
+
+    Args:
+      container_type (str): attribute container type.
+      source_compressor (BaseCompressor): compressor of the container type
+          of the attached task store.
+
+    Raises:
+      IOError: if the data of the rows cannot be decompressed.
+    """
+    if self._compression_dictionaries.get(container_type, None):
+      return
+
+    query = self._MERGE_DICTIONARY_SAMPLES_QUERY.format(
+        self._MERGE_DATABASE_NAME, container_type)
+
+    # Use a local cursor to prevent another query interrupting the samples.
+    cursor = self._connection.cursor()
+    cursor.execute(query)
+
+    samples = []
+    samples_size = 0
+    for row in cursor:
+      if samples_size >= self._MAXIMUM_DICTIONARY_SAMPLES_SIZE:
+        break
+
+      row_data = row[0]
+      if isinstance(row_data, py2to3.UNICODE_TYPE):
+        row_data = row_data.encode('utf-8')
+
+      sample = source_compressor.Decompress(row_data)
+      samples.append(sample)
+      samples_size += len(sample)
+
+    cursor.close()
+
+    if samples:
+      self._TrainCompressionDictionary(container_type, samples)
+
   def _WriteAttributeContainer(self, attribute_container):
     """Writes an attribute container.
 
@@ -363,13 +1416,17 @@ class SQLiteStorageFile(interface.BaseStorageFile):
       attribute_container (AttributeContainer): attribute container.
     """
     if attribute_container.CONTAINER_TYPE == self._CONTAINER_TYPE_EVENT:
-      timestamp, serialized_data = self._serialized_event_heap.PopEvent()
+      (timestamp, serialized_data, event_data_row_identifier, data_type,
+       parser_chain) = self._serialized_event_heap.PopEvent()
     else:
       serialized_data = self._SerializeAttributeContainer(attribute_container)
 
-    if self.compression_format == definitions.COMPRESSION_FORMAT_ZLIB:
-      compressed_data = zlib.compress(serialized_data)
-      serialized_data = sqlite3.Binary(compressed_data)
+    compressor = self._GetCompressor(attribute_container.CONTAINER_TYPE)
+    is_compressed = bool(
+        compressor.COMPRESSION_FORMAT != definitions.COMPRESSION_FORMAT_NONE)
+
+    if is_compressed:
+      compressed_data = compressor.Compress(serialized_data)
     else:
       compressed_data = ''
 
@@ -378,9 +1435,13 @@ class SQLiteStorageFile(interface.BaseStorageFile):
           'write', attribute_container.CONTAINER_TYPE, len(serialized_data),
           len(compressed_data))
 
+    if is_compressed:
+      serialized_data = sqlite3.Binary(compressed_data)
+
     if attribute_container.CONTAINER_TYPE == self._CONTAINER_TYPE_EVENT:
-      query = 'INSERT INTO event (_timestamp, _data) VALUES (?, ?)'
-      self._cursor.execute(query, (timestamp, serialized_data))
+      self._cursor.execute(self._INSERT_EVENT_QUERY, (
+          timestamp, event_data_row_identifier, data_type, parser_chain,
+          serialized_data))
     else:
       query = 'INSERT INTO {0:s} (_data) VALUES (?)'.format(
           attribute_container.CONTAINER_TYPE)
@@ -415,21 +1476,35 @@ class SQLiteStorageFile(interface.BaseStorageFile):
       self._serializers_profiler.StartTiming('write')
 
     if container_type == self._CONTAINER_TYPE_EVENT:
-      query = 'INSERT INTO event (_timestamp, _data) VALUES (?, ?)'
+      query = self._INSERT_EVENT_QUERY
+    elif container_type == self._CONTAINER_TYPE_EVENT_DATA:
+      query = self._INSERT_EVENT_DATA_QUERY
     else:
       query = 'INSERT INTO {0:s} (_data) VALUES (?)'.format(container_type)
 
+    if container_type == self._CONTAINER_TYPE_EVENT:
+      events_values = [
+          self._serialized_event_heap.PopEvent()
+          for _ in range(number_of_attribute_containers)]
+      serialized_data_list = [values[1] for values in events_values]
+    else:
+      serialized_data_list = [
+          container_list.PopAttributeContainer()
+          for _ in range(number_of_attribute_containers)]
+
+    # The dictionary is trained before the data is compressed, so that
+    # the data it is trained on benefits from it as well.
+    self._TrainCompressionDictionary(container_type, serialized_data_list)
+
+    compressor = self._GetCompressor(container_type)
+    is_compressed = bool(
+        compressor.COMPRESSION_FORMAT != definitions.COMPRESSION_FORMAT_NONE)
+
     # TODO: directly use container_list instead of values_tuple_list.
     values_tuple_list = []
-    for _ in range(number_of_attribute_containers):
-      if container_type == self._CONTAINER_TYPE_EVENT:
-        timestamp, serialized_data = self._serialized_event_heap.PopEvent()
-      else:
-        serialized_data = container_list.PopAttributeContainer()
-
-      if self.compression_format == definitions.COMPRESSION_FORMAT_ZLIB:
-        compressed_data = zlib.compress(serialized_data)
-        serialized_data = sqlite3.Binary(compressed_data)
+    for index, serialized_data in enumerate(serialized_data_list):
+      if is_compressed:
+        compressed_data = compressor.Compress(serialized_data)
       else:
         compressed_data = ''
 
@@ -437,8 +1512,19 @@ class SQLiteStorageFile(interface.BaseStorageFile):
         self._storage_profiler.Sample(
             'write', container_type, len(serialized_data), len(compressed_data))
 
+      if is_compressed:
+        serialized_data = sqlite3.Binary(compressed_data)
+
       if container_type == self._CONTAINER_TYPE_EVENT:
-        values_tuple_list.append((timestamp, serialized_data))
+        timestamp, _, event_data_row_identifier, data_type, parser_chain = (
+            events_values[index])
+        values_tuple_list.append((
+            timestamp, event_data_row_identifier, data_type, parser_chain,
+            serialized_data))
+      elif container_type == self._CONTAINER_TYPE_EVENT_DATA:
+        values_tuple_list.append((
+            self._event_data_path_spec_row_identifiers[index],
+            serialized_data))
       else:
         values_tuple_list.append((serialized_data, ))
 
@@ -452,6 +1538,23 @@ class SQLiteStorageFile(interface.BaseStorageFile):
     else:
       container_list.Empty()
 
+    if container_type == self._CONTAINER_TYPE_EVENT_DATA:
+      self._event_data_path_spec_row_identifiers = []
+
+  def _WriteSerializedAttributeContainerLists(self):
+    """Writes all serialized attribute container lists."""
+    self._WriteSerializedAttributeContainerList(
+        self._CONTAINER_TYPE_PATH_SPEC)
+    self._WriteSerializedAttributeContainerList(
+        self._CONTAINER_TYPE_EVENT_SOURCE)
+    self._WriteSerializedAttributeContainerList(
+        self._CONTAINER_TYPE_EVENT_DATA)
+    self._WriteSerializedAttributeContainerList(self._CONTAINER_TYPE_EVENT)
+    self._WriteSerializedAttributeContainerList(
+        self._CONTAINER_TYPE_EVENT_TAG)
+    self._WriteSerializedAttributeContainerList(
+        self._CONTAINER_TYPE_EXTRACTION_ERROR)
+
   def _WriteStorageMetadata(self):
     """Writes the storage metadata."""
     self._cursor.execute(self._CREATE_METADATA_TABLE_QUERY)
@@ -466,6 +1569,11 @@ class SQLiteStorageFile(interface.BaseStorageFile):
     value = self.compression_format
     self._cursor.execute(query, (key, value))
 
+    for container_type, value in sorted(self._compression_formats.items()):
+      if value != self.compression_format:
+        key = self._CONTAINER_COMPRESSION_FORMAT_KEY.format(container_type)
+        self._cursor.execute(query, (key, value))
+
     key = 'serialization_format'
     value = self.serialization_format
     self._cursor.execute(query, (key, value))
@@ -490,7 +1598,8 @@ class SQLiteStorageFile(interface.BaseStorageFile):
       raise ValueError('Attribute container type {0:s} is not supported'.format(
           container_type))
 
-    if not self._HasTable(self._CONTAINER_TYPE_ANALYSIS_REPORT):
+    # Stores created before a container type was added do not have its table.
+    if not self._HasTable(container_type):
       return 0
 
     # Note that this is SQLite specific, and will give inaccurate results if
@@ -542,6 +1651,8 @@ class SQLiteStorageFile(interface.BaseStorageFile):
     """
     self._RaiseIfNotWritable()
 
+    event_data = None
+
     # TODO: change to no longer allow event_data_identifier is None
     # after refactoring every parser to generate event data.
     event_data_identifier = event.GetEventDataIdentifier()
@@ -552,7 +1663,11 @@ class SQLiteStorageFile(interface.BaseStorageFile):
 
       event.event_data_row_identifier = event_data_identifier.row_identifier
 
-    self._AddSerializedEvent(event)
+      # The event data is normally added directly before its events hence
+      # it is retrieved from the event data cache.
+      event_data = self.GetEventDataByIdentifier(event_data_identifier)
+
+    self._AddSerializedEvent(event, event_data=event_data)
 
   def AddEventData(self, event_data):
     """Adds event data.
@@ -565,7 +1680,60 @@ class SQLiteStorageFile(interface.BaseStorageFile):
     """
     self._RaiseIfNotWritable()
 
-    self._AddAttributeContainer(self._CONTAINER_TYPE_EVENT_DATA, event_data)
+    path_spec = getattr(event_data, 'pathspec', None)
+    if path_spec is None:
+      path_spec_row_identifier = None
+    else:
+      path_spec_row_identifier = self._AddPathSpec(path_spec)
+
+    # The path specification identifier is stored before the event data is
+    # added, since adding it can write the serialized event data list.
+    self._event_data_path_spec_row_identifiers.append(path_spec_row_identifier)
+
+    # The path specification is stored in the path specification identifier
+    # column instead of the serialized event data.
+    if path_spec is not None:
+      del event_data.pathspec
+
+    try:
+      self._AddAttributeContainer(self._CONTAINER_TYPE_EVENT_DATA, event_data)
+    finally:
+      if path_spec is not None:
+        event_data.pathspec = path_spec
+
+    identifier = event_data.GetIdentifier()
+    self._event_data_cache.CacheObject(identifier.row_identifier, event_data)
+
+  def AddEventsWithEventData(self, events_with_event_data):
+    """Adds events and their event data.
+
+    Args:
+      events_with_event_data (list[tuple[EventObject, EventData]]): events
+          and their event data, where the event data is None if the event
+          refers to the same event data as the previous event.
+
+    Raises:
+      IOError: when the storage file is closed or read-only or
+          if the event data identifier type is not supported.
+    """
+    self._RaiseIfNotWritable()
+
+    last_event_data = None
+    for event, event_data in events_with_event_data:
+      if event_data:
+        self.AddEventData(event_data)
+        last_event_data = event_data
+
+      if not last_event_data:
+        # The event refers to event data added before the batch.
+        self.AddEvent(event)
+        continue
+
+      event_data_identifier = last_event_data.GetIdentifier()
+      event.SetEventDataIdentifier(event_data_identifier)
+      event.event_data_row_identifier = event_data_identifier.row_identifier
+
+      self._AddSerializedEvent(event, event_data=last_event_data)
 
   def AddEventSource(self, event_source):
     """Adds an event source.
@@ -658,15 +1826,23 @@ class SQLiteStorageFile(interface.BaseStorageFile):
       raise IOError('Storage file already closed.')
 
     if not self._read_only:
-      self._WriteSerializedAttributeContainerList(
-          self._CONTAINER_TYPE_EVENT_SOURCE)
-      self._WriteSerializedAttributeContainerList(
-          self._CONTAINER_TYPE_EVENT_DATA)
-      self._WriteSerializedAttributeContainerList(self._CONTAINER_TYPE_EVENT)
-      self._WriteSerializedAttributeContainerList(
-          self._CONTAINER_TYPE_EVENT_TAG)
-      self._WriteSerializedAttributeContainerList(
-          self._CONTAINER_TYPE_EXTRACTION_ERROR)
+      self._WriteSerializedAttributeContainerLists()
+
+    if self._read_workers_pool:
+      self._read_workers_pool.terminate()
+      self._read_workers_pool.join()
+      self._read_workers_pool = None
+
+    self._event_data_cache.Empty()
+    self._path_spec_cache.Empty()
+    self._path_spec_row_identifiers.Empty()
+
+    self._compression_dictionary_samples = {}
+    self._compressors = {}
+    self._merge_compressors = {}
+
+    self._last_path_spec = None
+    self._last_path_spec_row_identifier = None
 
     if self._connection:
       # We need to run commit or not all data is stored in the database.
@@ -727,8 +1903,15 @@ class SQLiteStorageFile(interface.BaseStorageFile):
     Returns:
       EventData: event data or None if not available.
     """
-    return self._GetAttributeContainerByIndex(
-        self._CONTAINER_TYPE_EVENT_DATA, identifier.row_identifier - 1)
+    event_data = self._event_data_cache.GetObject(identifier.row_identifier)
+    if event_data is None:
+      event_data = self._GetAttributeContainerByIndex(
+          self._CONTAINER_TYPE_EVENT_DATA, identifier.row_identifier - 1)
+      if event_data:
+        self._event_data_cache.CacheObject(
+            identifier.row_identifier, event_data)
+
+    return event_data
 
   def GetEventSourceByIndex(self, index):
     """Retrieves a specific event source.
@@ -786,6 +1969,71 @@ class SQLiteStorageFile(interface.BaseStorageFile):
 
       yield event_tag
 
+  def GetEventTimeRanges(self, maximum_number_of_time_ranges, time_range=None):
+    """Splits the events into consecutive time ranges of similar size.
+
+    The boundaries of the time ranges are quantiles of the event timestamps.
+    Since events with the same timestamp cannot be split over multiple time
+    ranges fewer time ranges than requested can be returned.
+
+    Args:
+      maximum_number_of_time_ranges (int): maximum number of time ranges.
+      time_range (Optional[TimeRange]): time range used to filter events
+          that fall in a specific period.
+
+    Returns:
+      list[TimeRange]: consecutive time ranges, in increasing chronological
+          order, that each contain about the same number of events.
+
+    Raises:
+      ValueError: if the maximum number of time ranges is out of bounds.
+    """
+    if maximum_number_of_time_ranges < 1:
+      raise ValueError('Maximum number of time ranges value out of bounds.')
+
+    if not self._HasTable(self._CONTAINER_TYPE_EVENT):
+      return []
+
+    if self._CanBuildIndexes() and not self._has_event_timestamp_index:
+      self._CreateEventTimestampIndex()
+
+    filter_expression, filter_values = self._GetEventTimeRangeFilter(
+        time_range)
+
+    query = 'SELECT COUNT(*), MIN(_timestamp), MAX(_timestamp) FROM event'
+    if filter_expression:
+      query = '{0:s} WHERE {1:s}'.format(query, filter_expression)
+
+    self._cursor.execute(query, filter_values or ())
+    number_of_events, first_timestamp, last_timestamp = self._cursor.fetchone()
+    if not number_of_events:
+      return []
+
+    query = 'SELECT _timestamp FROM event'
+    if filter_expression:
+      query = '{0:s} WHERE {1:s}'.format(query, filter_expression)
+    query = '{0:s} ORDER BY _timestamp LIMIT 1 OFFSET ?'.format(query)
+
+    boundaries = set()
+    for time_range_index in range(1, maximum_number_of_time_ranges):
+      offset = (number_of_events * time_range_index) // (
+          maximum_number_of_time_ranges)
+      self._cursor.execute(query, (filter_values or ()) + (offset, ))
+      timestamp = self._cursor.fetchone()[0]
+      if timestamp > first_timestamp:
+        boundaries.add(timestamp)
+
+    time_ranges = []
+    start_timestamp = first_timestamp
+    for timestamp in sorted(boundaries):
+      time_ranges.append(storage_time_range.TimeRange(
+          start_timestamp, timestamp - 1))
+      start_timestamp = timestamp
+
+    time_ranges.append(storage_time_range.TimeRange(
+        start_timestamp, last_timestamp))
+    return time_ranges
+
   def GetNumberOfAnalysisReports(self):
     """Retrieves the number analysis reports.
 
@@ -840,33 +2088,41 @@ class SQLiteStorageFile(interface.BaseStorageFile):
 
       yield session
 
-  def GetSortedEvents(self, time_range=None):
+  def GetSortedEvents(
+      self, time_range=None, data_types=None, parser_chains=None):
     """Retrieves the events in increasing chronological order.
 
     Args:
       time_range (Optional[TimeRange]): time range used to filter events
           that fall in a specific period.
+      data_types (Optional[list[str]]): data types used to filter events,
+          where events without a stored data type are not filtered.
+      parser_chains (Optional[list[str]]): parser chains used to filter
+          events, where events without a stored parser chain are not
+          filtered.
 
     Yield:
       EventObject: event.
     """
-    filter_expression = None
-    if time_range:
-      filter_expression = []
-
-      if time_range.start_timestamp:
-        filter_expression.append(
-            '_timestamp >= {0:d}'.format(time_range.start_timestamp))
+    if self._CanBuildIndexes():
+      if not self._has_event_timestamp_index:
+        self._CreateEventTimestampIndex()
 
-      if time_range.end_timestamp:
-        filter_expression.append(
-            '_timestamp <= {0:d}'.format(time_range.end_timestamp))
+      if ((data_types is not None or parser_chains is not None) and
+          not self._has_event_attribute_indexes):
+        self._CreateEventAttributeIndexes()
 
-      filter_expression = ' AND '.join(filter_expression)
+    filter_expression, filter_values = self._GetEventFilter(
+        time_range=time_range, data_types=data_types,
+        parser_chains=parser_chains)
 
-    event_generator = self._GetAttributeContainers(
-        self._CONTAINER_TYPE_EVENT, filter_expression=filter_expression,
-        order_by='_timestamp')
+    if self._join_event_data and self._has_event_data_identifier_column:
+      event_generator = self._GetSortedEventsWithEventData(
+          filter_expression=filter_expression, filter_values=filter_values)
+    else:
+      event_generator = self._GetAttributeContainers(
+          self._CONTAINER_TYPE_EVENT, filter_expression=filter_expression,
+          filter_values=filter_values, order_by='_timestamp')
 
     for event in event_generator:
       if hasattr(event, 'event_data_row_identifier'):
@@ -878,6 +2134,19 @@ class SQLiteStorageFile(interface.BaseStorageFile):
 
       yield event
 
+  def GetTaskCheckpoints(self):
+    """Retrieves the task checkpoints.
+
+    Yields:
+      TaskCheckpoint: task checkpoint attribute container.
+    """
+    if not self._HasTable(self._CONTAINER_TYPE_TASK_CHECKPOINT):
+      return
+
+    for task_checkpoint in self._GetAttributeContainers(
+        self._CONTAINER_TYPE_TASK_CHECKPOINT):
+      yield task_checkpoint
+
   def HasAnalysisReports(self):
     """Determines if a store contains analysis reports.
 
@@ -902,6 +2171,70 @@ class SQLiteStorageFile(interface.BaseStorageFile):
     """
     return self._HasAttributeContainers(self._CONTAINER_TYPE_EVENT_TAG)
 
+  def MergeTaskStorageRows(self, path):
+    """Merges the rows of a task store that do not need to be deserialized.
+
+    The task store is attached to the database and the rows of the container
+    types in _MERGE_CONTAINER_TYPES are copied with INSERT ... SELECT. Their
+    identifiers are offset instead of rewriting the references in the
+    serialized data, hence the event data identifier column of copied events
+    takes precedence over the event data row identifier in their serialized
+    data.
+
+    Args:
+      path (str): path of the task store.
+
+    Returns:
+      tuple: contains:
+
+        dict[str, int]: number of rows copied per container type, which is
+            empty if the rows of the task store cannot be copied.
+        dict[str, int]: number of events copied per parser chain.
+
+    Raises:
+      IOError: when the storage file is closed or read-only or
+          if the rows of the task store cannot be copied.
+    """
+    self._RaiseIfNotWritable()
+
+    # Buffered attribute containers are written first, so that the copied
+    # rows follow the stored rows, of which the number determines the next
+    # sequence number.
+    self._WriteSerializedAttributeContainerLists()
+
+    # A database cannot be attached within a transaction.
+    self._connection.commit()
+
+    self._connection.create_function(
+        'plaso_convert_row_data', 2, self._ConvertMergeRowData)
+
+    query = self._ATTACH_DATABASE_QUERY.format(self._MERGE_DATABASE_NAME)
+    try:
+      self._cursor.execute(query, (os.path.abspath(path), ))
+    except sqlite3.Error as exception:
+      raise IOError('Unable to attach task store with error: {0!s}'.format(
+          exception))
+
+    try:
+      result = self._MergeAttachedTaskStorageRows()
+      self._connection.commit()
+
+    except (IOError, sqlite3.Error) as exception:
+      self._connection.rollback()
+
+      # A compression dictionary trained on the rows of the task store is
+      # no longer stored.
+      self._compression_dictionaries = self._ReadCompressionDictionaries()
+      self._compressors = {}
+      raise IOError('Unable to copy task store rows with error: {0!s}'.format(
+          exception))
+
+    finally:
+      query = self._DETACH_DATABASE_QUERY.format(self._MERGE_DATABASE_NAME)
+      self._cursor.execute(query)
+
+    return result
+
   # pylint: disable=arguments-differ
   def Open(self, path=None, read_only=True, **unused_kwargs):
     """Opens the storage.
@@ -924,8 +2257,13 @@ class SQLiteStorageFile(interface.BaseStorageFile):
 
     path = os.path.abspath(path)
 
+    # The connection is not restricted to the thread that opened the storage
+    # file, since a merge thread can write to a session store. Callers are
+    # responsible for not using the storage file from multiple threads at
+    # the same time.
     connection = sqlite3.connect(
-        path, detect_types=sqlite3.PARSE_DECLTYPES|sqlite3.PARSE_COLNAMES)
+        path, check_same_thread=False,
+        detect_types=sqlite3.PARSE_DECLTYPES|sqlite3.PARSE_COLNAMES)
 
     cursor = connection.cursor()
     if not cursor:
@@ -933,11 +2271,13 @@ class SQLiteStorageFile(interface.BaseStorageFile):
 
     self._connection = connection
     self._cursor = cursor
+    self._index_creation_failed = False
     self._is_open = True
     self._read_only = read_only
 
     if read_only:
       self._ReadStorageMetadata()
+      self._compression_dictionaries = self._ReadCompressionDictionaries()
     else:
       # self._cursor.execute('PRAGMA journal_mode=MEMORY')
 
@@ -948,24 +2288,53 @@ class SQLiteStorageFile(interface.BaseStorageFile):
         self._WriteStorageMetadata()
       else:
         self._ReadStorageMetadata()
-
-      if self.compression_format == definitions.COMPRESSION_FORMAT_ZLIB:
-        data_column_type = 'BLOB'
-      else:
-        data_column_type = 'TEXT'
+        self._compression_dictionaries = self._ReadCompressionDictionaries()
 
       for container_type in self._CONTAINER_TYPES:
         if not self._HasTable(container_type):
+          compression_format = self._compression_formats.get(
+              container_type, self.compression_format)
+          if compression_format == definitions.COMPRESSION_FORMAT_NONE:
+            data_column_type = 'TEXT'
+          else:
+            data_column_type = 'BLOB'
+
           if container_type == self._CONTAINER_TYPE_EVENT:
             query = self._CREATE_EVENT_TABLE_QUERY.format(
                 container_type, data_column_type)
+          elif container_type == self._CONTAINER_TYPE_EVENT_DATA:
+            query = self._CREATE_EVENT_DATA_TABLE_QUERY.format(
+                container_type, data_column_type)
           else:
             query = self._CREATE_TABLE_QUERY.format(
                 container_type, data_column_type)
           self._cursor.execute(query)
 
+      # Stores created before columns were added are upgraded so that events
+      # written to them populate the columns.
+      for table_name, added_columns in (
+          (self._CONTAINER_TYPE_EVENT, self._ADDED_EVENT_COLUMNS),
+          (self._CONTAINER_TYPE_EVENT_DATA, self._ADDED_EVENT_DATA_COLUMNS)):
+        for column_name, column_type in added_columns:
+          if not self._HasColumn(table_name, column_name):
+            query = self._ADD_COLUMN_QUERY.format(
+                table_name, column_name, column_type)
+            self._cursor.execute(query)
+
       self._connection.commit()
 
+    self._has_event_attribute_columns = (
+        self._HasColumn(self._CONTAINER_TYPE_EVENT, '_data_type') and
+        self._HasColumn(self._CONTAINER_TYPE_EVENT, '_parser'))
+    self._has_event_attribute_indexes = all([
+        self._HasIndex(index_name)
+        for index_name, _ in self._CREATE_EVENT_ATTRIBUTE_INDEX_QUERIES])
+    self._has_event_data_identifier_column = self._HasColumn(
+        self._CONTAINER_TYPE_EVENT, '_event_data_identifier')
+    self._has_event_timestamp_index = self._HasIndex('event_timestamp')
+    self._has_path_spec_identifier_column = self._HasColumn(
+        self._CONTAINER_TYPE_EVENT_DATA, '_path_spec_identifier')
+
     last_session_start = self._CountStoredAttributeContainers(
         self._CONTAINER_TYPE_SESSION_START)
 
@@ -1025,6 +2394,10 @@ class SQLiteStorageFile(interface.BaseStorageFile):
   def WriteSessionCompletion(self, session_completion):
     """Writes session completion information.
 
+    The event timestamp index of a session store is built on session
+    completion, since maintaining it while events are being merged would
+    slow down the inserts.
+
     Args:
       session_completion (SessionCompletion): session completion information.
 
@@ -1035,6 +2408,10 @@ class SQLiteStorageFile(interface.BaseStorageFile):
 
     self._WriteAttributeContainer(session_completion)
 
+    if self.storage_type == definitions.STORAGE_TYPE_SESSION:
+      self._WriteSerializedAttributeContainerList(self._CONTAINER_TYPE_EVENT)
+      self._CreateEventTimestampIndex()
+
   def WriteSessionStart(self, session_start):
     """Writes session start information.
 
@@ -1048,6 +2425,30 @@ class SQLiteStorageFile(interface.BaseStorageFile):
 
     self._WriteAttributeContainer(session_start)
 
+  def WriteTaskCheckpoint(self, task_checkpoint):
+    """Writes task checkpoint information.
+
+    The attribute containers written before the task checkpoint are flushed
+    and committed together with it, so that the checkpoint is only stored
+    if the results of the task are.
+
+    Args:
+      task_checkpoint (TaskCheckpoint): task checkpoint information.
+
+    Raises:
+      IOError: when the storage file is closed or read-only or if the storage
+          type does not support task checkpoints.
+    """
+    self._RaiseIfNotWritable()
+
+    if self.storage_type != definitions.STORAGE_TYPE_SESSION:
+      raise IOError('Task checkpoint not supported by storage type.')
+
+    self._WriteSerializedAttributeContainerLists()
+    self._WriteAttributeContainer(task_checkpoint)
+
+    self._connection.commit()
+
   def WriteTaskCompletion(self, task_completion):
     """Writes task completion information.
 
@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 """Storage writer for SQLite storage files."""
 
+from plaso.containers import errors
+from plaso.containers import event_sources
+from plaso.containers import events
 from plaso.lib import definitions
 from plaso.storage import interface
 from plaso.storage.sqlite import merge_reader
@@ -16,7 +19,10 @@ class SQLiteStorageFileWriter(interface.StorageFileWriter):
     Returns:
       SQLiteStorageFile: storage file.
     """
-    return sqlite_file.SQLiteStorageFile(storage_type=self._storage_type)
+    return sqlite_file.SQLiteStorageFile(
+        compression_format=self._compression_format,
+        serialization_format=self._serialization_format,
+        storage_type=self._storage_type)
 
   def _CreateTaskStorageMergeReader(self, path):
     """Creates a task storage merge reader.
@@ -40,5 +46,44 @@ class SQLiteStorageFileWriter(interface.StorageFileWriter):
       SQLiteStorageFileWriter: storage writer.
     """
     return SQLiteStorageFileWriter(
-        self._session, path,
+        self._session, path, compression_format=self._task_compression_format,
+        serialization_format=self._serialization_format,
         storage_type=definitions.STORAGE_TYPE_TASK, task=task)
+
+  def MergeTaskStorageRows(self, path):
+    """Merges the rows of a task storage file that do not need deserializing.
+
+    Args:
+      path (str): path to the task storage file that should be merged.
+
+    Returns:
+      dict[str, int]: number of attribute containers merged per container
+          type, which is empty if the rows of the task storage file cannot
+          be merged directly.
+
+    Raises:
+      IOError: when the storage writer is closed or if the rows of the task
+          storage file cannot be merged.
+    """
+    self._RaiseIfNotWritable()
+
+    number_of_rows, parser_chains = self._storage_file.MergeTaskStorageRows(
+        path)
+
+    self.number_of_errors += number_of_rows.get(
+        errors.ExtractionError.CONTAINER_TYPE, 0)
+    self.number_of_event_sources += number_of_rows.get(
+        event_sources.EventSource.CONTAINER_TYPE, 0)
+    self.number_of_events += number_of_rows.get(
+        events.EventObject.CONTAINER_TYPE, 0)
+
+    # Here we want the name of the parser or plugin not the parser chain.
+    for parser_chain, number_of_events in parser_chains.items():
+      _, _, parser_name = (parser_chain or '').rpartition('/')
+      if not parser_name:
+        parser_name = 'N/A'
+
+      self._session.parsers_counter['total'] += number_of_events
+      self._session.parsers_counter[parser_name] += number_of_events
+
+    return number_of_rows
@@ -16,6 +16,11 @@ class TimeRange(object):
     start_timestamp (int): timestamp that marks the start of the range.
   """
 
+  # The range of timestamps that can be stored, which are signed 64-bit
+  # integers.
+  MAXIMUM_TIMESTAMP = (2 ** 63) - 1
+  MINIMUM_TIMESTAMP = -(2 ** 63)
+
   def __init__(self, start_timestamp, end_timestamp):
     """Initializes a date and time range.
 
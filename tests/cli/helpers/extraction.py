@@ -20,12 +20,16 @@ class ExtractionArgumentsHelperTest(cli_test_lib.CLIToolTestCase):
   # pylint: disable=no-member,protected-access
 
   _EXPECTED_OUTPUT = """\
-usage: cli_helper.py [--preferred_year YEAR] [--process_archives]
-                     [--skip_compressed_streams]
+usage: cli_helper.py [--block_cache_size SIZE] [--preferred_year YEAR]
+                     [--process_archives] [--skip_compressed_streams]
 
 Test argument parser.
 
 optional arguments:
+  --block_cache_size SIZE, --block-cache-size SIZE
+                        Maximum size in bytes of the file content every worker
+                        caches in memory, so that it is read from the source
+                        only once. A value of 0 disables the cache.
   --preferred_year YEAR, --preferred-year YEAR
                         When a format\'s timestamp does not include a year,
                         e.g. syslog, use this as the initial year instead of
@@ -58,6 +62,7 @@ optional arguments:
     test_tool = tools.CLITool()
     extraction.ExtractionArgumentsHelper.ParseOptions(options, test_tool)
 
+    self.assertIsNone(test_tool._block_cache_size)
     self.assertIsNone(test_tool._preferred_year)
     self.assertFalse(test_tool._process_archives)
     self.assertTrue(test_tool._process_compressed_streams)
@@ -65,6 +70,10 @@ optional arguments:
     with self.assertRaises(errors.BadConfigObject):
       extraction.ExtractionArgumentsHelper.ParseOptions(options, None)
 
+    options.block_cache_size = -1
+    with self.assertRaises(errors.BadConfigOption):
+      extraction.ExtractionArgumentsHelper.ParseOptions(options, test_tool)
+
     # TODO: improve test coverage.
 
 
@@ -20,14 +20,28 @@ class StorageFormatArgumentsHelperTest(cli_test_lib.CLIToolTestCase):
   # pylint: disable=no-member,protected-access
 
   _EXPECTED_OUTPUT = """\
-usage: cli_helper.py [--storage_format FORMAT]
+usage: cli_helper.py [--compression_format FORMAT]
+                     [--serializer_format FORMAT] [--storage_format FORMAT]
+                     [--task_compression_format FORMAT]
 
 Test argument parser.
 
 optional arguments:
+  --compression_format FORMAT, --compression-format FORMAT
+                        Format in which attribute containers are compressed in
+                        a new storage file, the default is: zlib. Supported
+                        options: none, zlib, zlib_dictionary, zlib_fast
+  --serializer_format FORMAT, --serializer-format FORMAT
+                        Format in which attribute containers are serialized in
+                        a new storage file, the default is: json. Supported
+                        options: binary, json
   --storage_format FORMAT, --storage-format FORMAT
                         Format of the storage file, the default is: sqlite.
                         Supported options: sqlite
+  --task_compression_format FORMAT, --task-compression-format FORMAT
+                        Format in which attribute containers are compressed in
+                        task storage files, the default is: none. Supported
+                        options: none, zlib, zlib_dictionary, zlib_fast
 """
 
   def testAddArguments(self):
@@ -51,10 +65,46 @@ optional arguments:
     storage_format.StorageFormatArgumentsHelper.ParseOptions(options, test_tool)
 
     self.assertEqual(test_tool._storage_format, options.storage_format)
+    self.assertEqual(test_tool._storage_compression_format, 'zlib')
+    self.assertEqual(test_tool._storage_serializer_format, 'json')
+    self.assertEqual(test_tool._task_storage_compression_format, 'none')
+
+    options.compression_format = 'zlib_fast'
+    options.task_compression_format = 'zlib'
+    storage_format.StorageFormatArgumentsHelper.ParseOptions(options, test_tool)
+
+    self.assertEqual(test_tool._storage_compression_format, 'zlib_fast')
+    self.assertEqual(test_tool._task_storage_compression_format, 'zlib')
+
+    options.serializer_format = 'binary'
+    storage_format.StorageFormatArgumentsHelper.ParseOptions(options, test_tool)
+
+    self.assertEqual(test_tool._storage_serializer_format, 'binary')
 
     with self.assertRaises(errors.BadConfigObject):
       storage_format.StorageFormatArgumentsHelper.ParseOptions(options, None)
 
+    with self.assertRaises(errors.BadConfigOption):
+      options.serializer_format = 'bogus'
+      storage_format.StorageFormatArgumentsHelper.ParseOptions(
+          options, test_tool)
+
+    options.serializer_format = 'json'
+
+    with self.assertRaises(errors.BadConfigOption):
+      options.compression_format = 'bogus'
+      storage_format.StorageFormatArgumentsHelper.ParseOptions(
+          options, test_tool)
+
+    options.compression_format = 'zlib'
+
+    with self.assertRaises(errors.BadConfigOption):
+      options.task_compression_format = 'bogus'
+      storage_format.StorageFormatArgumentsHelper.ParseOptions(
+          options, test_tool)
+
+    options.task_compression_format = 'none'
+
     with self.assertRaises(errors.BadConfigOption):
       options.storage_format = 'bogus'
       storage_format.StorageFormatArgumentsHelper.ParseOptions(
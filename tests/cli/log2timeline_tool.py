@@ -191,6 +191,18 @@ optional arguments:
     options.artifact_definitions_path = self._GetTestFilePath(['artifacts'])
     options.source = self._GetTestFilePath(['testdir'])
 
+    with self.assertRaises(errors.BadConfigOption):
+      test_tool.ParseOptions(options)
+
+    # ParseOptions will raise if resume is used in single process mode.
+    options = test_lib.TestOptions()
+    options.artifact_definitions_path = self._GetTestFilePath(['artifacts'])
+    options.resume = True
+    options.single_process = True
+    options.source = self._GetTestFilePath(['testdir'])
+    options.storage_file = 'storage.plaso'
+    options.storage_format = definitions.STORAGE_FORMAT_SQLITE
+
     with self.assertRaises(errors.BadConfigOption):
       test_tool.ParseOptions(options)
 
@@ -118,7 +118,7 @@ class PsortToolTest(test_lib.CLIToolTestCase):
   if resource is None:
     _EXPECTED_PROCESSING_OPTIONS = """\
 usage: psort_test.py [--temporary_directory DIRECTORY] [--disable_zeromq]
-                     [--worker-memory-limit SIZE]
+                     [--worker-memory-limit SIZE] [--workers WORKERS]
 
 Test argument parser.
 
@@ -135,12 +135,16 @@ optional arguments:
                         bytes, where 0 represents no limit. The default limit
                         is 2147483648 (2 GiB). If a worker process exceeds
                         this limit is is killed by the main (foreman) process.
+  --workers WORKERS     Number of worker processes used to read events and to
+                        format events, for output modules that support it. The
+                        default is 0, which represents reading and formatting
+                        events in the main process.
 """
   else:
     _EXPECTED_PROCESSING_OPTIONS = """\
 usage: psort_test.py [--process_memory_limit SIZE]
                      [--temporary_directory DIRECTORY] [--disable_zeromq]
-                     [--worker-memory-limit SIZE]
+                     [--worker-memory-limit SIZE] [--workers WORKERS]
 
 Test argument parser.
 
@@ -165,6 +169,10 @@ optional arguments:
                         bytes, where 0 represents no limit. The default limit
                         is 2147483648 (2 GiB). If a worker process exceeds
                         this limit is is killed by the main (foreman) process.
+  --workers WORKERS     Number of worker processes used to read events and to
+                        format events, for output modules that support it. The
+                        default is 0, which represents reading and formatting
+                        events in the main process.
 """
 
   # TODO: add test for _CreateOutputModule.
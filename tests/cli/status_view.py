@@ -172,6 +172,21 @@ class StatusViewTest(test_lib.CLIToolTestCase):
 
     test_view.PrintExtractionStatusHeader(None)
 
+    merge_status = processing_status.MergeStatus()
+    merge_status.merge_time = 2.0
+    merge_status.number_of_merged_events = 1000
+    merge_status.number_of_merged_tasks = 3
+    merge_status.number_of_tasks_pending_merge = 5
+
+    test_processing_status = processing_status.ProcessingStatus()
+    test_processing_status.UpdateMergeStatus(merge_status)
+
+    test_view.PrintExtractionStatusHeader(test_processing_status)
+
+    output = output_writer.ReadOutput()
+    self.assertIn('Merge:', output)
+    self.assertIn('500', output)
+
   # TODO: add tests for PrintExtractionSummary
   # TODO: add tests for SetMode
   # TODO: add tests for SetSourceInformation
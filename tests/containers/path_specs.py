@@ -0,0 +1,29 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the path specification attribute containers."""
+
+from __future__ import unicode_literals
+
+import unittest
+
+from plaso.containers import path_specs
+
+from tests import test_lib as shared_test_lib
+
+
+class PathSpecificationTest(shared_test_lib.BaseTestCase):
+  """Tests for the path specification attribute container."""
+
+  def testGetAttributeNames(self):
+    """Tests the GetAttributeNames function."""
+    attribute_container = path_specs.PathSpecification()
+
+    expected_attribute_names = ['path_spec']
+
+    attribute_names = sorted(attribute_container.GetAttributeNames())
+
+    self.assertEqual(attribute_names, expected_attribute_names)
+
+
+if __name__ == '__main__':
+  unittest.main()
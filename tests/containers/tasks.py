@@ -49,6 +49,24 @@ class TaskTest(shared_test_lib.BaseTestCase):
     self.assertFalse(retry_task.has_retry)
     self.assertEqual(retry_task.path_spec, task.path_spec)
 
+    task.path_specs = ['test_path_spec1', 'test_path_spec2']
+
+    retry_task = task.CreateRetryTask()
+    self.assertEqual(retry_task.path_specs, task.path_specs)
+
+  def testCreateTaskCheckpoint(self):
+    """Tests the CreateTaskCheckpoint function."""
+    session_identifier = '{0:s}'.format(uuid.uuid4().hex)
+    task = tasks.Task(session_identifier=session_identifier)
+    task.path_specs = ['test_path_spec1', 'test_path_spec2']
+
+    task_checkpoint = task.CreateTaskCheckpoint()
+    self.assertIsNotNone(task_checkpoint)
+    self.assertEqual(task_checkpoint.identifier, task.identifier)
+    self.assertEqual(
+        task_checkpoint.path_specs, ['test_path_spec1', 'test_path_spec2'])
+    self.assertIsNotNone(task_checkpoint.timestamp)
+
   def testCreateTaskCompletion(self):
     """Tests the CreateTaskCompletion function."""
     session_identifier = '{0:s}'.format(uuid.uuid4().hex)
@@ -65,6 +83,21 @@ class TaskTest(shared_test_lib.BaseTestCase):
     task_start = task.CreateTaskStart()
     self.assertIsNotNone(task_start)
 
+  def testGetPathSpecs(self):
+    """Tests the GetPathSpecs function."""
+    session_identifier = '{0:s}'.format(uuid.uuid4().hex)
+    task = tasks.Task(session_identifier=session_identifier)
+
+    self.assertEqual(task.GetPathSpecs(), [])
+
+    task.path_spec = 'test_path_spec'
+    self.assertEqual(task.GetPathSpecs(), ['test_path_spec'])
+
+    task.path_spec = None
+    task.path_specs = ['test_path_spec1', 'test_path_spec2']
+    self.assertEqual(
+        task.GetPathSpecs(), ['test_path_spec1', 'test_path_spec2'])
+
   def testUpdateProcessingTime(self):
     """Tests the UpdateProcessingTime function."""
     session_identifier = '{0:s}'.format(uuid.uuid4().hex)
@@ -76,6 +109,21 @@ class TaskTest(shared_test_lib.BaseTestCase):
     self.assertIsNotNone(task.last_processing_time)
 
 
+class TaskCheckpointTest(shared_test_lib.BaseTestCase):
+  """Tests for the task checkpoint attribute container."""
+
+  def testGetAttributeNames(self):
+    """Tests the GetAttributeNames function."""
+    attribute_container = tasks.TaskCheckpoint()
+
+    expected_attribute_names = [
+        'identifier', 'path_specs', 'session_identifier', 'timestamp']
+
+    attribute_names = sorted(attribute_container.GetAttributeNames())
+
+    self.assertEqual(attribute_names, expected_attribute_names)
+
+
 class TaskCompletionTest(shared_test_lib.BaseTestCase):
   """Tests for the task completion attribute container."""
 
@@ -199,6 +199,24 @@ class KnowledgeBaseTest(shared_test_lib.BaseTestCase):
     self.assertIsNotNone(system_configuration.hostname)
     self.assertEqual(system_configuration.hostname.name, 'myhost.mydomain')
 
+  def testGetSystemConfigurationArtifacts(self):
+    """Tests the GetSystemConfigurationArtifacts function."""
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+
+    hostname_artifact = artifacts.HostnameArtifact(name='myhost.mydomain')
+    knowledge_base_object.SetHostname(hostname_artifact, session_identifier=1)
+
+    user_account = artifacts.UserAccountArtifact(
+        identifier='1000', user_directory='/home/testuser',
+        username='testuser')
+    knowledge_base_object.AddUserAccount(user_account, session_identifier=2)
+
+    system_configurations = (
+        knowledge_base_object.GetSystemConfigurationArtifacts())
+    self.assertEqual(sorted(system_configurations.keys()), [1, 2])
+    self.assertEqual(system_configurations[1].hostname.name, 'myhost.mydomain')
+    self.assertEqual(len(system_configurations[2].user_accounts), 1)
+
   def testGetUsernameByIdentifier(self):
     """Tests the GetUsernameByIdentifier function."""
     knowledge_base_object = knowledge_base.KnowledgeBase()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the processing cost model."""
+
+from __future__ import unicode_literals
+
+import unittest
+
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+
+from plaso.engine import configurations
+from plaso.engine import processing_costs
+from plaso.engine import profilers
+
+from tests import test_lib as shared_test_lib
+
+
+class ProcessingCostModelTest(shared_test_lib.BaseTestCase):
+  """Tests for the processing cost model."""
+
+  def testAddSampleAndEstimateCost(self):
+    """Tests the AddSample and EstimateCost functions."""
+    cost_model = processing_costs.ProcessingCostModel()
+
+    cost = cost_model.EstimateCost('.evtx', 10 * 1024 * 1024)
+    self.assertAlmostEqual(cost, 1.001)
+
+    cost = cost_model.EstimateCost('.evtx', None)
+    self.assertAlmostEqual(cost, 0.001)
+
+    cost_model.AddSample('.evtx', 1000, 1.0)
+    cost_model.AddSample('.evtx', 3000, 3.0)
+    self.assertEqual(cost_model.number_of_formats, 1)
+
+    cost = cost_model.EstimateCost('.evtx', 2000)
+    self.assertAlmostEqual(cost, 2.001)
+
+    cost_model.AddSample('$mft', 0, 0.5)
+    cost_model.AddSample('$mft', 0, 1.5)
+
+    cost = cost_model.EstimateCost('$mft', 2000)
+    self.assertAlmostEqual(cost, 1.0)
+
+  def testGetFormatIdentifier(self):
+    """Tests the GetFormatIdentifier function."""
+    test_cases = (
+        ('/Windows/System32/winevt/Logs/Security.EVTX', '.evtx'),
+        ('C:\\Windows\\System32\\config\\SYSTEM', 'system'),
+        ('/home/user/.bash_history', '.bash_history'),
+        ('/var/log/syslog.1', '.1'))
+
+    for location, expected_format_identifier in test_cases:
+      path_spec = path_spec_factory.Factory.NewPathSpec(
+          dfvfs_definitions.TYPE_INDICATOR_OS, location=location)
+      format_identifier = (
+          processing_costs.ProcessingCostModel.GetFormatIdentifier(path_spec))
+      self.assertEqual(format_identifier, expected_format_identifier)
+
+    self.assertEqual(
+        processing_costs.ProcessingCostModel.GetFormatIdentifier(None), '')
+
+  def testReadSampleFiles(self):
+    """Tests the ReadSampleFiles function."""
+    profiling_configuration = configurations.ProfilingConfiguration()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      profiling_configuration.directory = temp_directory
+
+      test_profiler = profilers.ProcessingCostsProfiler(
+          'Worker_00', profiling_configuration)
+
+      test_profiler.Start()
+      test_profiler.Sample('.evtx', 1000, 1.0)
+      test_profiler.Sample('.evtx', 3000, 3.0)
+      test_profiler.Sample('.txt', 1000, 0.01)
+      test_profiler.Stop()
+
+      cost_model = processing_costs.ProcessingCostModel()
+      number_of_samples = cost_model.ReadSampleFiles(temp_directory)
+
+    self.assertEqual(number_of_samples, 3)
+    self.assertEqual(cost_model.number_of_formats, 2)
+
+    cost = cost_model.EstimateCost('.evtx', 2000)
+    self.assertAlmostEqual(cost, 2.001)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -99,6 +99,14 @@ class ProcessingStatusTest(unittest.TestCase):
         'test', 'Idle', 12345, 2000000, 'test process',
         0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
 
+  def testUpdateMergeStatus(self):
+    """Tests the UpdateMergeStatus function."""
+    merge_status = processing_status.MergeStatus()
+
+    status = processing_status.ProcessingStatus()
+    status.UpdateMergeStatus(merge_status)
+    self.assertEqual(status.merge_status, merge_status)
+
   def testUpdateTasksStatus(self):
     """Tests the UpdateTasksStatus function."""
     task_status = processing_status.TasksStatus()
@@ -114,6 +122,19 @@ class ProcessingStatusTest(unittest.TestCase):
         0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
 
 
+class MergeStatusTest(unittest.TestCase):
+  """Tests the merge status."""
+
+  def testEventsPerSecond(self):
+    """Tests the events_per_second property."""
+    merge_status = processing_status.MergeStatus()
+    self.assertEqual(merge_status.events_per_second, 0)
+
+    merge_status.merge_time = 2.0
+    merge_status.number_of_merged_events = 1000
+    self.assertEqual(merge_status.events_per_second, 500)
+
+
 class TasksStatusTest(unittest.TestCase):
   """Tests the task status."""
 
@@ -4,6 +4,8 @@
 
 from __future__ import unicode_literals
 
+import gzip
+import os
 import time
 import unittest
 
@@ -152,6 +154,53 @@ class ProcessingProfilerTest(shared_test_lib.BaseTestCase):
 
       test_profiler.Stop()
 
+  def testSampleCache(self):
+    """Tests the SampleCache function."""
+    profiling_configuration = configurations.ProfilingConfiguration()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      profiling_configuration.directory = temp_directory
+
+      test_profiler = profilers.ProcessingProfiler(
+          'test', profiling_configuration)
+
+      test_profiler.Start()
+
+      for _ in range(5):
+        test_profiler.SampleCache('test_cache', 3, 1)
+
+      test_profiler.Stop()
+
+      sample_file_path = os.path.join(
+          temp_directory, 'processing_caches-test.csv.gz')
+      with gzip.open(sample_file_path, 'rb') as file_object:
+        lines = file_object.read().decode('utf-8').split('\n')
+
+      self.assertEqual(lines[0], 'Time\tName\tHits\tMisses')
+      self.assertTrue(lines[1].endswith('\ttest_cache\t3\t1'))
+
+
+class ProcessingCostsProfilerTest(shared_test_lib.BaseTestCase):
+  """Tests for the processing costs profiler."""
+
+  def testSample(self):
+    """Tests the Sample function."""
+    profiling_configuration = configurations.ProfilingConfiguration()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      profiling_configuration.directory = temp_directory
+
+      test_profiler = profilers.ProcessingCostsProfiler(
+          'test', profiling_configuration)
+
+      test_profiler.Start()
+
+      for _ in range(5):
+        test_profiler.Sample('.evtx', 1024, 0.5)
+        time.sleep(0.01)
+
+      test_profiler.Stop()
+
 
 class SerializersProfilerTest(shared_test_lib.BaseTestCase):
   """Tests for the serializers CPU time profiler."""
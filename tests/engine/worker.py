@@ -14,6 +14,7 @@ from plaso.containers import sessions
 from plaso.engine import configurations
 from plaso.engine import knowledge_base
 from plaso.engine import worker
+from plaso.lib import block_cache_file
 from plaso.parsers import mediator as parsers_mediator
 from plaso.storage.fake import writer as fake_writer
 
@@ -109,6 +110,35 @@ class EventExtractionWorkerTest(shared_test_lib.BaseTestCase):
     event_attribute = mediator._extra_event_attributes.get('test_result', None)
     self.assertEqual(event_attribute, 'is_vegetable')
 
+  @shared_test_lib.skipUnlessHasTestFile(['syslog'])
+  def testOpenDataStream(self):
+    """Tests the _OpenDataStream function."""
+    file_entry = self._GetTestFileEntry(['syslog'])
+
+    extraction_worker = worker.EventExtractionWorker()
+
+    file_object = extraction_worker._OpenDataStream(file_entry, '')
+    try:
+      self.assertIsInstance(
+          file_object, block_cache_file.BlockCacheFileObject)
+      self.assertEqual(file_object.get_size(), 1509)
+    finally:
+      file_object.close()
+
+    # Test with the block cache disabled.
+    configuration = configurations.ExtractionConfiguration()
+    configuration.block_cache_size = 0
+    extraction_worker.SetExtractionConfiguration(configuration)
+    self.assertIsNone(extraction_worker._block_cache)
+
+    file_object = extraction_worker._OpenDataStream(file_entry, '')
+    try:
+      self.assertNotIsInstance(
+          file_object, block_cache_file.BlockCacheFileObject)
+      self.assertEqual(file_object.get_size(), 1509)
+    finally:
+      file_object.close()
+
   @shared_test_lib.skipUnlessHasTestFile(['syslog'])
   def testProcessPathSpecFile(self):
     """Tests the ProcessPathSpec function on a file."""
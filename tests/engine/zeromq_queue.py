@@ -89,6 +89,31 @@ class ZeroMQQueuesTest(shared_test_lib.BaseTestCase):
     push_queue.Close()
     pull_queue.Close()
 
+  def testPushItemsPullQueues(self):
+    """Tests that items can be transferred in a batch to a pull queue."""
+    push_queue = zeromq_queue.ZeroMQPushBindQueue(
+        name='pushitemspull_pushbind', delay_open=False, linger_seconds=1)
+    pull_queue = zeromq_queue.ZeroMQPullConnectQueue(
+        name='pushitemspull_pullconnect', delay_open=False,
+        port=push_queue.port, linger_seconds=1)
+
+    # Serialized items are transferred as-is, other items are pickled.
+    items = [b'serialized item', 'first item', {'second': 'item'}]
+    push_queue.PushItems(items)
+    push_queue.PushItem('third item')
+
+    for item in items:
+      popped_item = pull_queue.PopItem()
+      self.assertEqual(popped_item, item)
+
+    self.assertEqual(len(pull_queue._received_items), 0)
+
+    popped_item = pull_queue.PopItem()
+    self.assertEqual(popped_item, 'third item')
+
+    push_queue.Close()
+    pull_queue.Close()
+
   def testQueueStart(self):
     """Tests that delayed creation of ZeroMQ sockets occurs correctly."""
     for queue_class in self._QUEUE_CLASSES:
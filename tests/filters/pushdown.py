@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the filter pushdown planner."""
+
+from __future__ import unicode_literals
+
+import unittest
+
+from plaso.filters import event_filter
+from plaso.filters import pushdown
+from plaso.storage import time_range as storage_time_range
+
+from tests.filters import test_lib
+
+
+class FilterPushdownPlanTest(test_lib.FilterTestCase):
+  """Tests for the filter pushdown plan."""
+
+  def testIsConstrained(self):
+    """Tests the is_constrained property."""
+    plan = pushdown.FilterPushdownPlan()
+    self.assertFalse(plan.is_constrained)
+
+    plan = pushdown.FilterPushdownPlan(end_timestamp=10)
+    self.assertTrue(plan.is_constrained)
+
+    plan = pushdown.FilterPushdownPlan(
+        attribute_values={'data_type': frozenset(['fs:stat'])})
+    self.assertTrue(plan.is_constrained)
+
+  def testIsEmpty(self):
+    """Tests the is_empty property."""
+    plan = pushdown.FilterPushdownPlan(end_timestamp=10, start_timestamp=5)
+    self.assertFalse(plan.is_empty)
+
+    plan = pushdown.FilterPushdownPlan(end_timestamp=5, start_timestamp=10)
+    self.assertTrue(plan.is_empty)
+
+    plan = pushdown.FilterPushdownPlan(
+        attribute_values={'data_type': frozenset()})
+    self.assertTrue(plan.is_empty)
+
+  def testGetTimeRange(self):
+    """Tests the GetTimeRange function."""
+    plan = pushdown.FilterPushdownPlan()
+    self.assertIsNone(plan.GetTimeRange())
+
+    plan = pushdown.FilterPushdownPlan(start_timestamp=5)
+    time_range = plan.GetTimeRange()
+    self.assertEqual(time_range.start_timestamp, 5)
+    self.assertEqual(
+        time_range.end_timestamp,
+        storage_time_range.TimeRange.MAXIMUM_TIMESTAMP)
+
+    time_range = plan.GetTimeRange(
+        time_range=storage_time_range.TimeRange(0, 10))
+    self.assertEqual(time_range.start_timestamp, 5)
+    self.assertEqual(time_range.end_timestamp, 10)
+
+    with self.assertRaises(ValueError):
+      plan.GetTimeRange(time_range=storage_time_range.TimeRange(0, 4))
+
+
+class FilterPushdownPlannerTest(test_lib.FilterTestCase):
+  """Tests for the filter pushdown planner."""
+
+  def _GetPlan(self, filter_expression):
+    """Retrieves the plan of a filter expression.
+
+    Args:
+      filter_expression (str): filter expression.
+
+    Returns:
+      FilterPushdownPlan: plan of the filter expression.
+    """
+    test_filter = event_filter.EventObjectFilter()
+    test_filter.CompileFilter(filter_expression)
+    return test_filter.GetPushdownPlan()
+
+  def testGetPlanTimestamp(self):
+    """Tests the GetPlan function with timestamp comparisons."""
+    plan = self._GetPlan('timestamp > 10 and timestamp <= 20')
+    self.assertEqual(plan.start_timestamp, 11)
+    self.assertEqual(plan.end_timestamp, 20)
+
+    plan = self._GetPlan('timestamp >= 10 and timestamp < 20')
+    self.assertEqual(plan.start_timestamp, 10)
+    self.assertEqual(plan.end_timestamp, 19)
+
+    plan = self._GetPlan('timestamp is 15')
+    self.assertEqual(plan.start_timestamp, 15)
+    self.assertEqual(plan.end_timestamp, 15)
+
+    plan = self._GetPlan('date > "2015-01-01 00:00:00"')
+    self.assertEqual(plan.start_timestamp, 1420070400000001)
+    self.assertIsNone(plan.end_timestamp)
+
+    plan = self._GetPlan('timestamp < 5 and timestamp > 10')
+    self.assertTrue(plan.is_empty)
+
+    # Negated comparisons are not pushed down.
+    plan = self._GetPlan('timestamp is not 15')
+    self.assertFalse(plan.is_constrained)
+
+  def testGetPlanAttributes(self):
+    """Tests the GetPlan function with attribute comparisons."""
+    plan = self._GetPlan(
+        '(data_type is "fs:stat" or data_type is "fs:mactime:line") and '
+        'parser is "filestat"')
+    self.assertEqual(plan.attribute_values, {
+        'data_type': frozenset(['fs:stat', 'fs:mactime:line']),
+        'parser': frozenset(['filestat'])})
+
+    plan = self._GetPlan('data_type is "fs:stat" and data_type is "test"')
+    self.assertTrue(plan.is_empty)
+
+    plan = self._GetPlan('data_type is not "fs:stat"')
+    self.assertFalse(plan.is_constrained)
+
+    plan = self._GetPlan('filename is "/tmp/test"')
+    self.assertFalse(plan.is_constrained)
+
+  def testGetPlanOr(self):
+    """Tests the GetPlan function with alternatives."""
+    plan = self._GetPlan(
+        '(timestamp > 10 and timestamp < 20) or '
+        '(timestamp > 30 and timestamp < 40)')
+    self.assertEqual(plan.start_timestamp, 11)
+    self.assertEqual(plan.end_timestamp, 39)
+
+    # An alternative without constraints does not constrain the OR.
+    plan = self._GetPlan('timestamp > 10 or parser is "filestat"')
+    self.assertFalse(plan.is_constrained)
+
+    plan = self._GetPlan('data_type is "fs:stat" or timestamp > 10')
+    self.assertFalse(plan.is_constrained)
+
+
+if __name__ == '__main__':
+  unittest.main()
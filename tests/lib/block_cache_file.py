@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the block cache file-like object."""
+
+from __future__ import unicode_literals
+
+import io
+import os
+import unittest
+
+from plaso.lib import block_cache_file
+
+from tests import test_lib as shared_test_lib
+
+
+class TestFileObject(io.BytesIO):
+  """File-like object that counts the number of bytes read.
+
+  Attributes:
+    number_of_bytes_read (int): number of bytes read.
+  """
+
+  def __init__(self, data):
+    """Initializes the file-like object.
+
+    Args:
+      data (bytes): data.
+    """
+    super(TestFileObject, self).__init__(data)
+    self._size = len(data)
+    self.number_of_bytes_read = 0
+
+  # pylint: disable=invalid-name
+
+  def get_size(self):
+    """Retrieves the size of the data.
+
+    Returns:
+      int: size of the data.
+    """
+    return self._size
+
+  def read(self, size=-1):
+    """Reads data.
+
+    Args:
+      size (Optional[int]): number of bytes to read.
+
+    Returns:
+      bytes: data read.
+    """
+    data = super(TestFileObject, self).read(size)
+    self.number_of_bytes_read += len(data)
+    return data
+
+
+class BlockCacheTest(shared_test_lib.BaseTestCase):
+  """Tests for the block cache."""
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    block_cache = block_cache_file.BlockCache(
+        block_size=1024, maximum_cached_size=16 * 1024)
+    self.assertEqual(block_cache.block_size, 1024)
+
+    with self.assertRaises(ValueError):
+      block_cache_file.BlockCache(block_size=0)
+
+    with self.assertRaises(ValueError):
+      block_cache_file.BlockCache(maximum_cached_size=-1)
+
+  def testCacheBlockAndGetBlock(self):
+    """Tests the CacheBlock and GetBlock functions."""
+    block_cache = block_cache_file.BlockCache(
+        block_size=1024, maximum_cached_size=2048)
+
+    block_cache.CacheBlock('test1', 0, b'A' * 1024)
+    block_cache.CacheBlock('test2', 0, b'B' * 1024)
+
+    self.assertEqual(block_cache.GetBlock('test1', 0), b'A' * 1024)
+    self.assertEqual(block_cache.GetBlock('test2', 0), b'B' * 1024)
+    self.assertIsNone(block_cache.GetBlock('test1', 1))
+
+    self.assertEqual(block_cache.number_of_hits, 2)
+    self.assertEqual(block_cache.number_of_misses, 1)
+
+    # The least recently used block is removed when the cache is full.
+    block_cache.CacheBlock('test1', 1, b'C' * 1024)
+    self.assertIsNone(block_cache.GetBlock('test1', 0))
+
+    block_cache.Empty()
+    self.assertIsNone(block_cache.GetBlock('test1', 1))
+
+
+class BlockCacheFileObjectTest(shared_test_lib.BaseTestCase):
+  """Tests for the block cache file-like object."""
+
+  _TEST_DATA = bytes(bytearray(range(256))) * 40
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    test_file_object = TestFileObject(self._TEST_DATA)
+
+    with self.assertRaises(ValueError):
+      block_cache_file.BlockCacheFileObject(test_file_object, block_size=0)
+
+    block_cache = block_cache_file.BlockCache()
+    with self.assertRaises(ValueError):
+      block_cache_file.BlockCacheFileObject(
+          test_file_object, block_cache=block_cache)
+
+  def testRead(self):
+    """Tests the read function."""
+    block_cache = block_cache_file.BlockCache(
+        block_size=1024, maximum_cached_size=16 * 1024)
+    test_file_object = TestFileObject(self._TEST_DATA)
+    file_object = block_cache_file.BlockCacheFileObject(
+        test_file_object, block_cache=block_cache, identifier='test')
+
+    self.assertEqual(file_object.get_size(), 10240)
+
+    data = file_object.read(100)
+    self.assertEqual(data, self._TEST_DATA[:100])
+    self.assertEqual(file_object.tell(), 100)
+
+    file_object.seek(1000, os.SEEK_SET)
+    data = file_object.read(3000)
+    self.assertEqual(data, self._TEST_DATA[1000:4000])
+
+    file_object.seek(-20, os.SEEK_END)
+    data = file_object.read(100)
+    self.assertEqual(data, self._TEST_DATA[-20:])
+
+    data = file_object.read()
+    self.assertEqual(data, b'')
+
+    file_object.seek(0, os.SEEK_SET)
+    data = file_object.read()
+    self.assertEqual(data, self._TEST_DATA)
+
+    # Every byte is read from the underlying file-like object only once.
+    self.assertEqual(test_file_object.number_of_bytes_read, 10240)
+    self.assertEqual(block_cache.number_of_misses, 10)
+    self.assertEqual(block_cache.number_of_hits, 6)
+
+    with self.assertRaises(IOError):
+      file_object.seek(-1, os.SEEK_SET)
+
+    file_object.close()
+    self.assertTrue(test_file_object.closed)
+
+  def testReadWithSmallCache(self):
+    """Tests the read function with a cache smaller than the data."""
+    test_file_object = TestFileObject(self._TEST_DATA)
+    file_object = block_cache_file.BlockCacheFileObject(
+        test_file_object, block_size=1024, maximum_cached_size=2048)
+
+    data = file_object.read()
+    self.assertEqual(data, self._TEST_DATA)
+
+    file_object.seek(9000, os.SEEK_SET)
+    data = file_object.read(1000)
+    self.assertEqual(data, self._TEST_DATA[9000:10000])
+
+    file_object.seek(0, os.SEEK_SET)
+    data = file_object.read(10)
+    self.assertEqual(data, self._TEST_DATA[:10])
+
+    self.assertEqual(test_file_object.number_of_bytes_read, 10240 + 1024)
+
+  def testReadWithReadAhead(self):
+    """Tests the read function with read-ahead."""
+    test_file_object = TestFileObject(self._TEST_DATA)
+    file_object = block_cache_file.BlockCacheFileObject(
+        test_file_object, block_size=1024, maximum_cached_size=16 * 1024,
+        maximum_read_ahead_size=4096)
+
+    # The first read does not read ahead.
+    data = file_object.read(512)
+    self.assertEqual(data, self._TEST_DATA[:512])
+    self.assertEqual(test_file_object.number_of_bytes_read, 1024)
+
+    # Sequential reads double the number of blocks read ahead.
+    data = file_object.read(1024)
+    self.assertEqual(data, self._TEST_DATA[512:1536])
+    self.assertEqual(test_file_object.number_of_bytes_read, 3072)
+
+    data = file_object.read(2048)
+    self.assertEqual(data, self._TEST_DATA[1536:3584])
+    self.assertEqual(test_file_object.number_of_bytes_read, 6144)
+
+    # Blocks that were read ahead are read from the cache.
+    data = file_object.read(1024)
+    self.assertEqual(data, self._TEST_DATA[3584:4608])
+    self.assertEqual(test_file_object.number_of_bytes_read, 6144)
+
+    # Read-ahead is bounded by the size of the data.
+    data = file_object.read()
+    self.assertEqual(data, self._TEST_DATA[4608:])
+    self.assertEqual(test_file_object.number_of_bytes_read, 10240)
+
+    # A non-sequential read does not read ahead.
+    file_object.seek(0, os.SEEK_SET)
+    data = file_object.read(10)
+    self.assertEqual(data, self._TEST_DATA[:10])
+
+
+if __name__ == '__main__':
+  unittest.main()
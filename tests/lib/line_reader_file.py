@@ -1,9 +1,10 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-"""Tests for the binary line reader file-like object."""
+"""Tests for the line reader file-like objects."""
 
 from __future__ import unicode_literals
 
+import io
 import unittest
 
 from dfvfs.file_io import os_file_io
@@ -15,6 +16,89 @@ from plaso.lib import line_reader_file
 from tests import test_lib as shared_test_lib
 
 
+class TestBufferedLineReader(line_reader_file.BufferedLineReader):
+  """Buffered line reader with small blocks for testing."""
+
+  _INITIAL_READ_SIZE = 4
+
+  _MAXIMUM_READ_SIZE = 16
+
+
+class BufferedLineReaderTest(shared_test_lib.BaseTestCase):
+  """Tests for the buffered line reader."""
+
+  def testReadLinesWithOffsets(self):
+    """Tests the ReadLinesWithOffsets function."""
+    file_object = io.BytesIO(b'first\nsecond line\r\n\nlast')
+    line_reader = TestBufferedLineReader(file_object)
+
+    lines = list(line_reader.ReadLinesWithOffsets())
+    self.assertEqual(lines, [
+        (0, b'first\n'), (6, b'second line\r\n'), (19, b'\n'), (20, b'last')])
+    self.assertEqual(line_reader.tell(), 24)
+
+    # Data without an end-of-line within the maximum read size is returned
+    # in parts.
+    file_object = io.BytesIO(b'A' * 40)
+    line_reader = TestBufferedLineReader(file_object)
+
+    lines = list(line_reader.ReadLinesWithOffsets())
+    self.assertEqual(lines, [(0, b'A' * 28), (28, b'A' * 12)])
+
+  def testReadLinesWithOffsetsAndEncoding(self):
+    """Tests the ReadLinesWithOffsets function with an encoding."""
+    file_object = io.BytesIO(
+        '\ufeffFörst\nSëcond\n'.encode('utf-8'))
+    line_reader = TestBufferedLineReader(file_object, encoding='utf-8')
+
+    # The byte-order mark is removed but included in the offsets.
+    lines = list(line_reader.ReadLinesWithOffsets())
+    self.assertEqual(lines, [(0, 'Först\n'), (10, 'Sëcond\n')])
+
+    file_object = io.BytesIO('First\nSecond'.encode('utf-16'))
+    line_reader = TestBufferedLineReader(file_object, encoding='utf-16')
+
+    lines = list(line_reader.ReadLinesWithOffsets())
+    self.assertEqual(lines, [(0, 'First\n'), (14, 'Second')])
+
+    # The lines before a line that cannot be decoded are read.
+    file_object = io.BytesIO(b'first\n\xff\nlast\n')
+    line_reader = TestBufferedLineReader(file_object, encoding='utf-8')
+
+    lines = []
+    with self.assertRaises(UnicodeDecodeError):
+      for offset, line in line_reader.ReadLinesWithOffsets():
+        lines.append((offset, line))
+
+    self.assertEqual(lines, [(0, 'first\n')])
+
+    lines = list(line_reader.ReadLinesWithOffsets())
+    self.assertEqual(lines, [(8, 'last\n')])
+
+  def testReadline(self):
+    """Tests the readline function."""
+    file_object = io.BytesIO('Förstë line\nlast\n'.encode('utf-8'))
+    line_reader = TestBufferedLineReader(file_object, encoding='utf-8')
+
+    line = line_reader.readline(size=3)
+    self.assertEqual(line, 'För')
+    self.assertEqual(line_reader.tell(), 4)
+
+    line = line_reader.readline()
+    self.assertEqual(line, 'stë line\n')
+    self.assertEqual(line_reader.tell(), 14)
+
+    line = line_reader.readline()
+    self.assertEqual(line, 'last\n')
+    self.assertEqual(line_reader.tell(), 19)
+
+    line = line_reader.readline()
+    self.assertEqual(line, '')
+
+    with self.assertRaises(ValueError):
+      line_reader.readline(size=-1)
+
+
 class BinaryLineReaderTest(shared_test_lib.BaseTestCase):
   """Tests for the binary line reader."""
 
@@ -161,11 +245,6 @@ class BinaryLineReaderTest(shared_test_lib.BaseTestCase):
 
     file_object.close()
 
-  # TODO: Add a test which tests reading a file which is
-  # larger than the buffer size, and read lines until it crosses
-  # that original buffer size (to test if the buffer is correctly
-  # filled).
-
 
 class BinaryDSVReaderTest(shared_test_lib.BaseTestCase):
   """Tests for the binary delimited separated values reader."""
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the least recently used (LRU) cache."""
+
+from __future__ import unicode_literals
+
+import unittest
+
+from plaso.lib import lru_cache
+
+
+class LRUCacheTest(unittest.TestCase):
+  """Tests for the least recently used (LRU) cache."""
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    cache = lru_cache.LRUCache(10)
+    self.assertEqual(len(cache), 0)
+
+    with self.assertRaises(ValueError):
+      lru_cache.LRUCache(-1)
+
+  def testCacheObject(self):
+    """Tests the CacheObject function."""
+    cache = lru_cache.LRUCache(2)
+
+    cache.CacheObject(1, 'one')
+    cache.CacheObject(2, 'two')
+    self.assertEqual(len(cache), 2)
+
+    # Retrieving 1 makes 2 the least recently used object.
+    self.assertEqual(cache.GetObject(1), 'one')
+
+    cache.CacheObject(3, 'three')
+    self.assertEqual(len(cache), 2)
+    self.assertIsNone(cache.GetObject(2))
+    self.assertEqual(cache.GetObject(1), 'one')
+    self.assertEqual(cache.GetObject(3), 'three')
+
+    cache.CacheObject(3, 'THREE')
+    self.assertEqual(len(cache), 2)
+    self.assertEqual(cache.GetObject(3), 'THREE')
+
+    cache = lru_cache.LRUCache(0)
+    cache.CacheObject(1, 'one')
+    self.assertEqual(len(cache), 0)
+
+  def testEmpty(self):
+    """Tests the Empty function."""
+    cache = lru_cache.LRUCache(2)
+
+    cache.CacheObject(1, 'one')
+    cache.Empty()
+    self.assertEqual(len(cache), 0)
+    self.assertIsNone(cache.GetObject(1))
+
+  def testGetObject(self):
+    """Tests the GetObject function."""
+    cache = lru_cache.LRUCache(2)
+
+    self.assertIsNone(cache.GetObject(1))
+    self.assertEqual(cache.number_of_hits, 0)
+    self.assertEqual(cache.number_of_misses, 1)
+
+    cache.CacheObject(1, 'one')
+    self.assertEqual(cache.GetObject(1), 'one')
+    self.assertEqual(cache.number_of_hits, 1)
+    self.assertEqual(cache.number_of_misses, 1)
+
+
+if __name__ == '__main__':
+  unittest.main()
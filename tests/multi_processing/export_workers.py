@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the export worker processes."""
+
+from __future__ import unicode_literals
+
+import pickle
+import unittest
+
+from plaso.containers import artifacts
+from plaso.containers import events
+from plaso.engine import knowledge_base
+from plaso.formatters import mediator as formatters_mediator
+from plaso.lib import definitions
+from plaso.multi_processing import export_workers
+from plaso.output import dynamic
+from plaso.output import interface as output_interface
+from plaso.output import manager as output_manager
+from plaso.output import mediator as output_mediator
+
+from tests import test_lib as shared_test_lib
+from tests.cli import test_lib as cli_test_lib
+
+
+class TestOutputModule(output_interface.LinearOutputModule):
+  """Output module for testing."""
+
+  NAME = 'export_workers_test'
+
+  SUPPORTS_PARALLEL_EXPORT = True
+
+  def WriteEventBody(self, event):
+    """Writes the body of an event to the output.
+
+    Args:
+      event (EventObject): event.
+    """
+    self._output_writer.Write('{0:d},{1:s}\n'.format(
+        event.timestamp, event.timestamp_desc))
+
+  def WriteEventMACBGroup(self, event_macb_group):
+    """Writes an event MACB group to the output.
+
+    Args:
+      event_macb_group (list[EventObject]): group of events with identical
+          timestamps, attributes and values.
+    """
+    timestamp_descriptions = [
+        event.timestamp_desc for event in event_macb_group]
+    self._output_writer.Write('{0:d},{1:s}\n'.format(
+        event_macb_group[0].timestamp, '; '.join(timestamp_descriptions)))
+
+
+class ExportWorkerPoolTest(shared_test_lib.BaseTestCase):
+  """Tests for the export worker pool."""
+
+  # pylint: disable=protected-access
+
+  def _CreateTestEvents(self):
+    """Creates events for testing.
+
+    Returns:
+      list[EventObject]: events.
+    """
+    test_events = []
+    for timestamp in range(1000000, 1000250):
+      event = events.EventObject()
+      event.timestamp = timestamp
+      event.timestamp_desc = definitions.TIME_DESCRIPTION_WRITTEN
+      test_events.append(event)
+
+    return test_events
+
+  def testGetWorkerArguments(self):
+    """Tests the _GetWorkerArguments and _InitializeWorker functions."""
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+    hostname_artifact = artifacts.HostnameArtifact(name='myhost')
+    knowledge_base_object.SetHostname(hostname_artifact, session_identifier=1)
+
+    formatter_mediator = formatters_mediator.FormatterMediator()
+    mediator = output_mediator.OutputMediator(
+        knowledge_base_object, formatter_mediator)
+    mediator.SetTimezone('Europe/Amsterdam')
+
+    output_module = dynamic.DynamicOutputModule(mediator)
+    output_module.SetFieldDelimiter('|')
+    output_module.SetFields(['date', 'time', 'hostname'])
+    output_module.SetOutputWriter(cli_test_lib.TestOutputWriter())
+
+    worker_arguments = export_workers._GetWorkerArguments(output_module)
+    worker_arguments = pickle.loads(pickle.dumps(worker_arguments))
+
+    self.assertEqual(worker_arguments[0], 'dynamic')
+
+    system_configurations = worker_arguments[3]
+    self.assertIsInstance(
+        system_configurations[1], artifacts.SystemConfigurationArtifact)
+
+    try:
+      export_workers._InitializeWorker(*worker_arguments)
+
+      worker_output_module = export_workers._output_module
+      self.assertIsInstance(worker_output_module, dynamic.DynamicOutputModule)
+      self.assertEqual(
+          worker_output_module.GetParameters(),
+          output_module.GetParameters())
+
+      worker_mediator = worker_output_module._output_mediator
+      self.assertEqual(worker_mediator.timezone.zone, 'Europe/Amsterdam')
+      self.assertEqual(
+          worker_mediator.knowledge_base.GetHostname(session_identifier=1),
+          'myhost')
+
+    finally:
+      export_workers._output_module = None
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    output_module = TestOutputModule(None)
+
+    export_worker_pool = export_workers.ExportWorkerPool(output_module, 2)
+    self.assertIsNotNone(export_worker_pool)
+
+    with self.assertRaises(ValueError):
+      export_workers.ExportWorkerPool(output_module, 0)
+
+    with self.assertRaises(ValueError):
+      export_workers.ExportWorkerPool(output_module, 2, chunk_size=-1)
+
+    output_module.SUPPORTS_PARALLEL_EXPORT = False
+    with self.assertRaises(ValueError):
+      export_workers.ExportWorkerPool(output_module, 2)
+
+  def testWriteEvents(self):
+    """Tests the WriteEvent and WriteEventMACBGroup functions."""
+    test_events = self._CreateTestEvents()
+
+    output_writer = cli_test_lib.TestOutputWriter()
+    output_module = TestOutputModule(None)
+    output_module.SetOutputWriter(output_writer)
+
+    for event in test_events[:200]:
+      output_module.WriteEvent(event)
+    output_module.WriteEventMACBGroup(test_events[200:])
+
+    expected_output = output_writer.ReadOutput()
+
+    output_writer = cli_test_lib.TestOutputWriter()
+    output_module = TestOutputModule(None)
+    output_module.SetOutputWriter(output_writer)
+
+    export_worker_pool = export_workers.ExportWorkerPool(
+        output_module, 2, chunk_size=16)
+
+    # The worker processes create the output module by name.
+    output_manager.OutputManager.RegisterOutput(TestOutputModule)
+
+    try:
+      export_worker_pool.Start()
+
+      for event in test_events[:200]:
+        export_worker_pool.WriteEvent(event)
+      export_worker_pool.WriteEventMACBGroup(test_events[200:])
+
+      export_worker_pool.Flush()
+
+    finally:
+      export_worker_pool.Stop()
+      output_manager.OutputManager.DeregisterOutput(TestOutputModule)
+
+    output = output_writer.ReadOutput()
+    self.assertEqual(output, expected_output)
+
+
+if __name__ == '__main__':
+  unittest.main()
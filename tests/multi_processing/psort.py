@@ -9,12 +9,18 @@ import os
 import shutil
 import unittest
 
+try:
+  import mock  # pylint: disable=import-error
+except ImportError:
+  from unittest import mock
+
 from plaso.analysis import interface as analysis_interface
 from plaso.analysis import tagging
 from plaso.containers import events
 from plaso.containers import sessions
 from plaso.engine import configurations
 from plaso.engine import knowledge_base
+from plaso.filters import event_filter
 from plaso.formatters import interface as formatters_interface
 from plaso.formatters import manager as formatters_manager
 from plaso.formatters import mediator as formatters_mediator
@@ -183,6 +189,21 @@ class PsortEventHeapTest(shared_test_lib.BaseTestCase):
     expected_identifier = 'Metadata Modification Time, data_type: test:event'
     self.assertEqual(content_identifier, expected_identifier)
 
+    attributes = {
+        'regvalue': {'Value': 'c:/Temp/evil.exe'},
+        'timestamp_desc': definitions.TIME_DESCRIPTION_LAST_VISITED,
+        'username': 'joesmith'}
+    event = containers_test_lib.TestEvent(5134324321, attributes=attributes)
+    macb_group_identifier, content_identifier = (
+        event_heap._GetEventIdentifiers(event))
+
+    self.assertIsNone(macb_group_identifier)
+
+    expected_identifier = (
+        'Last Visited Time, data_type: test:event, '
+        'regvalue: [(\'Value\', \'c:/Temp/evil.exe\')], username: joesmith')
+    self.assertEqual(content_identifier, expected_identifier)
+
   def testPopEvent(self):
     """Tests the PopEvent function."""
     event_heap = psort.PsortEventHeap()
@@ -237,12 +258,55 @@ class PsortEventHeapTest(shared_test_lib.BaseTestCase):
 
     self.assertEqual(len(event_heap._heap), 0)
 
-    event = containers_test_lib.TestEvent(
+    event1 = containers_test_lib.TestEvent(
         5134324321, attributes=self._TEST_EVENT_ATTRIBUTES)
-    event_heap.PushEvent(event)
+    event_heap.PushEvent(event1)
 
     self.assertEqual(len(event_heap._heap), 1)
 
+    # The identifiers of a single event on the heap are deferred.
+    self.assertEqual(event_heap._heap[0], ('', '', event1))
+
+    event2 = containers_test_lib.TestEvent(
+        5134324321, attributes=self._TEST_EVENT_ATTRIBUTES)
+    event_heap.PushEvent(event2)
+
+    self.assertEqual(len(event_heap._heap), 2)
+
+    expected_identifiers = (
+        'data_type: test:event',
+        'Metadata Modification Time, data_type: test:event')
+    for macb_group_identifier, content_identifier, _ in event_heap._heap:
+      self.assertEqual(
+          (macb_group_identifier, content_identifier), expected_identifiers)
+
+  def testPushEventWithUniqueTimestamps(self):
+    """Tests that PushEvent defers the identifiers of a single event."""
+    event_heap = psort.PsortEventHeap()
+
+    with mock.patch.object(
+        event_heap, '_GetEventIdentifiers',
+        wraps=event_heap._GetEventIdentifiers) as mock_get_event_identifiers:
+      # The psort engine empties the heap before it pushes an event with
+      # a different timestamp.
+      for timestamp in (2345871286, 5134324321, 5134324322):
+        event = containers_test_lib.TestEvent(
+            timestamp, attributes=self._TEST_EVENT_ATTRIBUTES)
+        event_heap.PushEvent(event)
+
+        heap_values = list(event_heap.PopEvents())
+        self.assertEqual(len(heap_values), 1)
+        self.assertIs(heap_values[0][2], event)
+
+      self.assertEqual(mock_get_event_identifiers.call_count, 0)
+
+      for _ in range(2):
+        event = containers_test_lib.TestEvent(
+            5134324323, attributes=self._TEST_EVENT_ATTRIBUTES)
+        event_heap.PushEvent(event)
+
+      self.assertEqual(mock_get_event_identifiers.call_count, 2)
+
 
 class PsortMultiProcessEngineTest(shared_test_lib.BaseTestCase):
   """Tests for the multi-processing engine."""
@@ -421,6 +485,47 @@ class PsortMultiProcessEngineTest(shared_test_lib.BaseTestCase):
     self.assertEqual(len(output_module.events), 15)
     self.assertEqual(len(output_module.macb_groups), 3)
 
+  def testInternalExportEventsWithEventFilter(self):
+    """Tests the _ExportEvents function with an event filter."""
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+    output_writer = cli_test_lib.TestBinaryOutputWriter()
+
+    formatter_mediator = formatters_mediator.FormatterMediator()
+
+    output_mediator_object = output_mediator.OutputMediator(
+        knowledge_base_object, formatter_mediator)
+
+    output_module = TestOutputModule(output_mediator_object)
+    output_module.SetOutputWriter(output_writer)
+
+    test_engine = psort.PsortMultiProcessEngine()
+
+    test_filter = event_filter.EventObjectFilter()
+    test_filter.CompileFilter(
+        'timestamp >= 5134324322 and timestamp < 9134324321')
+
+    formatters_manager.FormattersManager.RegisterFormatter(TestEventFormatter)
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'storage.plaso')
+      self._CreateTestStorageFile(temp_file)
+
+      storage_reader = (
+          storage_factory.StorageFactory.CreateStorageReaderForFile(temp_file))
+      storage_reader.ReadPreprocessingInformation(knowledge_base_object)
+
+      events_counter = test_engine._ExportEvents(
+          storage_reader, output_module, deduplicate_events=False,
+          event_filter=test_filter)
+
+    formatters_manager.FormattersManager.DeregisterFormatter(TestEventFormatter)
+
+    self.assertEqual(events_counter['Events processed'], 8)
+
+    # The time bounds of the filter are pushed down to storage hence
+    # the events outside of the bounds are not read.
+    self.assertEqual(events_counter['Events filtered'], 0)
+
   # TODO: add test for _FlushExportBuffer.
   # TODO: add test for _StartAnalysisProcesses.
   # TODO: add test for _StatusUpdateThreadMain.
@@ -533,6 +638,39 @@ class PsortMultiProcessEngineTest(shared_test_lib.BaseTestCase):
         'repeated')
     self.assertEqual(lines[14], expected_line)
 
+  def testExportEventsWithWorkerProcesses(self):
+    """Tests the ExportEvents function with worker processes."""
+    storage_file_path = self._GetTestFilePath(['psort_test.plaso'])
+
+    outputs = []
+    for number_of_worker_processes in (0, 2):
+      knowledge_base_object = knowledge_base.KnowledgeBase()
+      output_writer = cli_test_lib.TestBinaryOutputWriter()
+
+      formatter_mediator = formatters_mediator.FormatterMediator()
+      formatter_mediator.SetPreferredLanguageIdentifier('en-US')
+
+      output_mediator_object = output_mediator.OutputMediator(
+          knowledge_base_object, formatter_mediator)
+
+      output_module = dynamic.DynamicOutputModule(output_mediator_object)
+      output_module.SetOutputWriter(output_writer)
+
+      configuration = configurations.ProcessingConfiguration()
+
+      storage_reader = (
+          storage_factory.StorageFactory.CreateStorageReaderForFile(
+              storage_file_path))
+
+      test_engine = psort.PsortMultiProcessEngine()
+      test_engine.ExportEvents(
+          knowledge_base_object, storage_reader, output_module, configuration,
+          number_of_worker_processes=number_of_worker_processes)
+
+      outputs.append(output_writer.ReadOutput())
+
+    self.assertEqual(outputs[1], outputs[0])
+
 
 if __name__ == '__main__':
   unittest.main()
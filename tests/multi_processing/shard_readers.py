@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the time shard reader processes."""
+
+from __future__ import unicode_literals
+
+import unittest
+
+from plaso.multi_processing import shard_readers
+from plaso.storage.sqlite import reader as sqlite_reader
+
+from tests import test_lib as shared_test_lib
+
+
+class TimeShardedEventReaderTest(shared_test_lib.BaseTestCase):
+  """Tests for the time sharded event reader."""
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    event_reader = shard_readers.TimeShardedEventReader('plaso.sqlite')
+    self.assertIsNotNone(event_reader)
+
+    with self.assertRaises(ValueError):
+      shard_readers.TimeShardedEventReader('plaso.sqlite', chunk_size=-1)
+
+  @shared_test_lib.skipUnlessHasTestFile(['psort_test.plaso'])
+  def testGetSortedEvents(self):
+    """Tests the GetSortedEvents function."""
+    storage_file_path = self._GetTestFilePath(['psort_test.plaso'])
+
+    storage_reader = sqlite_reader.SQLiteStorageFileReader(storage_file_path)
+    try:
+      expected_values = [
+          (event.timestamp, event.GetIdentifier().CopyToString())
+          for event in storage_reader.GetSortedEvents()]
+
+      time_ranges = storage_reader.GetEventTimeRanges(3)
+
+    finally:
+      storage_reader.Close()
+
+    self.assertEqual(len(time_ranges), 3)
+
+    event_reader = shard_readers.TimeShardedEventReader(
+        storage_file_path, chunk_size=4)
+
+    test_values = [
+        (event.timestamp, event.GetIdentifier().CopyToString())
+        for event in event_reader.GetSortedEvents(time_ranges)]
+
+    self.assertEqual(test_values, expected_values)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests the queues backed by a ring buffer in shared memory."""
+
+from __future__ import unicode_literals
+
+import unittest
+
+from plaso.engine import plaso_queue
+from plaso.lib import errors
+from plaso.multi_processing import shared_memory_queue
+
+from tests import test_lib as shared_test_lib
+
+
+class SharedMemoryRingBufferTest(shared_test_lib.BaseTestCase):
+  """Tests the shared memory ring buffer."""
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    ring_buffer = shared_memory_queue.SharedMemoryRingBuffer(2, size=64)
+    self.assertEqual(ring_buffer.number_of_consumers, 2)
+    self.assertEqual(ring_buffer.size, 64)
+
+    with self.assertRaises(ValueError):
+      shared_memory_queue.SharedMemoryRingBuffer(-1)
+
+    with self.assertRaises(ValueError):
+      shared_memory_queue.SharedMemoryRingBuffer(1, size=4)
+
+  def testWriteRecords(self):
+    """Tests the WriteRecords function."""
+    ring_buffer = shared_memory_queue.SharedMemoryRingBuffer(1, size=64)
+
+    result = ring_buffer.WriteRecords([b'A' * 28, b'B' * 28], block=False)
+    self.assertTrue(result)
+
+    # The ring buffer is full until the consumer releases the data.
+    result = ring_buffer.WriteRecords([b'C'], block=False)
+    self.assertFalse(result)
+
+    with self.assertRaises(ValueError):
+      ring_buffer.WriteRecords([b'D' * 64])
+
+    ring_buffer.DetachConsumer(0)
+
+    result = ring_buffer.WriteRecords([b'C'], block=False)
+    self.assertTrue(result)
+
+
+class SharedMemoryQueuesTest(shared_test_lib.BaseTestCase):
+  """Tests the shared memory push and pop queues."""
+
+  def testPushAndPopItems(self):
+    """Tests the PushItems and PopItem functions."""
+    ring_buffer = shared_memory_queue.SharedMemoryRingBuffer(2, size=64)
+    push_queue = shared_memory_queue.SharedMemoryPushQueue(ring_buffer)
+    pop_queues = [
+        shared_memory_queue.SharedMemoryPopQueue(
+            ring_buffer, consumer_index, timeout=0)
+        for consumer_index in range(2)]
+
+    # The items wrap around the end of the ring buffer.
+    for index in range(10):
+      items = [
+          '{0:d}-{1:d}'.format(index, item_index).encode('utf-8') * 3
+          for item_index in range(3)]
+      push_queue.PushItems(items, block=False)
+
+      for pop_queue in pop_queues:
+        for item in items:
+          popped_item = pop_queue.PopItem()
+          self.assertEqual(bytes(popped_item), item)
+
+        self.assertTrue(pop_queue.IsEmpty())
+        with self.assertRaises(errors.QueueEmpty):
+          pop_queue.PopItem()
+
+    push_queue.PushItem(b'last')
+    push_queue.PushItem(plaso_queue.QueueAbort())
+
+    for pop_queue in pop_queues:
+      popped_item = pop_queue.PopItem()
+      self.assertEqual(bytes(popped_item), b'last')
+
+      popped_item = pop_queue.PopItem()
+      self.assertIsInstance(popped_item, plaso_queue.QueueAbort)
+
+    with self.assertRaises(ValueError):
+      push_queue.PushItem('bogus')
+
+    with self.assertRaises(errors.WrongQueueType):
+      push_queue.PopItem()
+
+    with self.assertRaises(errors.WrongQueueType):
+      pop_queues[0].PushItem(b'bogus')
+
+    with self.assertRaises(ValueError):
+      shared_memory_queue.SharedMemoryPopQueue(ring_buffer, 2)
+
+  def testPushItemsWithSlowestConsumer(self):
+    """Tests that the slowest consumer provides back-pressure."""
+    ring_buffer = shared_memory_queue.SharedMemoryRingBuffer(2, size=64)
+    push_queue = shared_memory_queue.SharedMemoryPushQueue(ring_buffer)
+    pop_queue = shared_memory_queue.SharedMemoryPopQueue(
+        ring_buffer, 0, timeout=0)
+    slow_pop_queue = shared_memory_queue.SharedMemoryPopQueue(
+        ring_buffer, 1, timeout=0)
+
+    push_queue.PushItems([b'A' * 28, b'B' * 28], block=False)
+
+    pop_queue.PopItem()
+    pop_queue.PopItem()
+    with self.assertRaises(errors.QueueEmpty):
+      pop_queue.PopItem()
+
+    with self.assertRaises(errors.QueueFull):
+      push_queue.PushItem(b'C', block=False)
+
+    slow_pop_queue.PopItem()
+
+    # A replacement pop queue continues with the data not released by
+    # the consumer it replaces.
+    slow_pop_queue = shared_memory_queue.SharedMemoryPopQueue(
+        ring_buffer, 1, timeout=0)
+    popped_item = slow_pop_queue.PopItem()
+    self.assertEqual(bytes(popped_item), b'A' * 28)
+
+    slow_pop_queue.Close()
+
+    push_queue.PushItem(b'C', block=False)
+
+    popped_item = pop_queue.PopItem()
+    self.assertEqual(bytes(popped_item), b'C')
+
+
+if __name__ == '__main__':
+  unittest.main()
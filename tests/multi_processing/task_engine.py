@@ -12,17 +12,233 @@ from artifacts import registry as artifacts_registry
 from dfvfs.lib import definitions as dfvfs_definitions
 from dfvfs.path import factory as path_spec_factory
 
+from plaso.containers import event_sources
 from plaso.containers import sessions
+from plaso.containers import tasks
 from plaso.engine import configurations
+from plaso.engine import processing_costs
+from plaso.lib import errors
 from plaso.multi_processing import task_engine
 from plaso.storage.sqlite import writer as sqlite_writer
 
 from tests import test_lib as shared_test_lib
 
 
+class EventSourceHeapTest(shared_test_lib.BaseTestCase):
+  """Tests for the event source heap."""
+
+  # pylint: disable=protected-access
+
+  def _CreateEventSource(self, location, file_entry_type, file_size):
+    """Creates a file entry event source for testing.
+
+    Args:
+      location (str): location of the file entry.
+      file_entry_type (str): dfVFS file entry type.
+      file_size (int): size of the data of the file entry.
+
+    Returns:
+      FileEntryEventSource: event source.
+    """
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=location)
+
+    event_source = event_sources.FileEntryEventSource(path_spec=path_spec)
+    event_source.file_entry_type = file_entry_type
+    event_source.file_size = file_size
+    return event_source
+
+  def _GetLocations(self, event_source_heap):
+    """Pops all event sources from the heap.
+
+    Args:
+      event_source_heap (_EventSourceHeap): event source heap.
+
+    Returns:
+      list[str]: locations of the event sources in order of popping.
+    """
+    locations = []
+    event_source = event_source_heap.PopEventSource()
+    while event_source:
+      locations.append(event_source.path_spec.location)
+      event_source = event_source_heap.PopEventSource()
+
+    return locations
+
+  def testPushPopEventSource(self):
+    """Tests the PushEventSource and PopEventSource functions."""
+    event_source_heap = task_engine._EventSourceHeap()
+    for location, file_entry_type, file_size in (
+        ('/small.txt', dfvfs_definitions.FILE_ENTRY_TYPE_FILE, 100),
+        ('/large.txt', dfvfs_definitions.FILE_ENTRY_TYPE_FILE, 100000),
+        ('/directory', dfvfs_definitions.FILE_ENTRY_TYPE_DIRECTORY, 0),
+        ('/Security.evtx', dfvfs_definitions.FILE_ENTRY_TYPE_FILE, 10000)):
+      event_source = self._CreateEventSource(
+          location, file_entry_type, file_size)
+      event_source_heap.PushEventSource(event_source)
+
+    locations = self._GetLocations(event_source_heap)
+    self.assertEqual(locations, [
+        '/directory', '/large.txt', '/Security.evtx', '/small.txt'])
+
+    # Costs learned from samples take precedence over the size of the data.
+    processing_cost_model = processing_costs.ProcessingCostModel()
+    processing_cost_model.AddSample('.evtx', 10000, 10.0)
+    processing_cost_model.AddSample('.txt', 100000, 0.1)
+
+    event_source_heap = task_engine._EventSourceHeap(
+        processing_cost_model=processing_cost_model)
+    for location, file_size in (
+        ('/small.txt', 100), ('/large.txt', 100000),
+        ('/Security.evtx', 10000)):
+      event_source = self._CreateEventSource(
+          location, dfvfs_definitions.FILE_ENTRY_TYPE_FILE, file_size)
+      event_source_heap.PushEventSource(event_source)
+
+    locations = self._GetLocations(event_source_heap)
+    self.assertEqual(locations, [
+        '/Security.evtx', '/large.txt', '/small.txt'])
+
+  def testPushEventSourceHeapFull(self):
+    """Tests the PushEventSource function with a full heap."""
+    event_source_heap = task_engine._EventSourceHeap(
+        maximum_number_of_items=2)
+
+    event_source = self._CreateEventSource(
+        '/file1', dfvfs_definitions.FILE_ENTRY_TYPE_FILE, 100)
+    event_source_heap.PushEventSource(event_source)
+
+    event_source = self._CreateEventSource(
+        '/file2', dfvfs_definitions.FILE_ENTRY_TYPE_FILE, 100)
+    with self.assertRaises(errors.HeapFull):
+      event_source_heap.PushEventSource(event_source)
+
+
 class TaskMultiProcessEngineTest(shared_test_lib.BaseTestCase):
   """Tests for the task multi-process engine."""
 
+  # pylint: disable=protected-access
+
+  def _CreateEventSource(self, location, file_size):
+    """Creates a file entry event source for testing.
+
+    Args:
+      location (str): location of the file entry.
+      file_size (int): size of the data of the file entry.
+
+    Returns:
+      FileEntryEventSource: event source.
+    """
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=location)
+
+    event_source = event_sources.FileEntryEventSource(path_spec=path_spec)
+    event_source.file_entry_type = dfvfs_definitions.FILE_ENTRY_TYPE_FILE
+    event_source.file_size = file_size
+    return event_source
+
+  def testCreateTask(self):
+    """Tests the _CreateTask function."""
+    test_engine = task_engine.TaskMultiProcessEngine(
+        maximum_number_of_tasks=100)
+    test_engine._MAXIMUM_NUMBER_OF_PATH_SPECS_PER_TASK = 3
+    test_engine._MAXIMUM_TASK_BATCH_SIZE = 1000
+
+    event_source_heap = task_engine._EventSourceHeap()
+    for location, file_size in (
+        ('/file1', 2000), ('/file2', 950), ('/file3', 300), ('/file4', 200),
+        ('/file5', 100), ('/file6', 50)):
+      event_source = self._CreateEventSource(location, file_size)
+      event_source_heap.PushEventSource(event_source)
+
+    # Files larger than the batch size are not batched.
+    event_source = event_source_heap.PopEventSource()
+    task = test_engine._CreateTask(event_source, event_source_heap)
+    self.assertEqual(task.path_spec.location, '/file1')
+    self.assertIsNone(task.path_specs)
+
+    # The size of the files per task is limited.
+    event_source = event_source_heap.PopEventSource()
+    task = test_engine._CreateTask(event_source, event_source_heap)
+    self.assertEqual(task.path_spec.location, '/file2')
+    self.assertIsNone(task.path_specs)
+
+    # The number of path specifications per task is limited.
+    event_source = event_source_heap.PopEventSource()
+    task = test_engine._CreateTask(event_source, event_source_heap)
+    self.assertIsNone(task.path_spec)
+    self.assertEqual(
+        [path_spec.location for path_spec in task.path_specs],
+        ['/file3', '/file4', '/file5'])
+
+    event_source = event_source_heap.PopEventSource()
+    task = test_engine._CreateTask(event_source, event_source_heap)
+    self.assertEqual(task.path_spec.location, '/file6')
+    self.assertIsNone(task.path_specs)
+
+    self.assertIsNone(event_source_heap.PopEventSource())
+
+    self.assertEqual(test_engine._number_of_consumed_sources, 6)
+
+  def testFillEventSourceHeapOnResume(self):
+    """Tests the _FillEventSourceHeap function when resuming a session."""
+    session = sessions.Session()
+
+    task = tasks.Task(session_identifier=session.identifier)
+    task.path_specs = [
+        self._CreateEventSource(location, 100).path_spec
+        for location in ('/file1', '/file3')]
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'storage.plaso')
+      storage_writer = sqlite_writer.SQLiteStorageFileWriter(session, temp_file)
+      storage_writer.Open()
+
+      for location in ('/file1', '/file2', '/file3'):
+        event_source = self._CreateEventSource(location, 100)
+        storage_writer.AddEventSource(event_source)
+
+      storage_writer.WriteTaskCheckpoint(task)
+      storage_writer.Close()
+
+      test_engine = task_engine.TaskMultiProcessEngine(
+          maximum_number_of_tasks=100)
+
+      storage_writer = sqlite_writer.SQLiteStorageFileWriter(session, temp_file)
+      storage_writer.Open()
+
+      test_engine._ReadTaskCheckpoints(storage_writer)
+      storage_writer.RewindWrittenEventSources()
+
+      event_source_heap = task_engine._EventSourceHeap()
+      test_engine._FillEventSourceHeap(
+          storage_writer, event_source_heap, start_with_first=True)
+
+      storage_writer.Close()
+
+    event_source = event_source_heap.PopEventSource()
+    self.assertEqual(event_source.path_spec.location, '/file2')
+    self.assertIsNone(event_source_heap.PopEventSource())
+
+  def testMergeThreadMain(self):
+    """Tests the _MergeThreadMain function."""
+    session = sessions.Session()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'storage.plaso')
+      storage_writer = sqlite_writer.SQLiteStorageFileWriter(session, temp_file)
+
+      test_engine = task_engine.TaskMultiProcessEngine(
+          maximum_number_of_tasks=100)
+      test_engine._merge_active = True
+
+      # An error raised by the storage writer, which is not opened, stops
+      # the merge thread and aborts processing.
+      test_engine._MergeThreadMain(storage_writer)
+
+    self.assertTrue(test_engine._merge_failed)
+    self.assertTrue(test_engine._abort)
+
   @shared_test_lib.skipUnlessHasTestFile(['ímynd.dd'])
   def testProcessSources(self):
     """Tests the PreprocessSources and ProcessSources function."""
@@ -47,6 +47,21 @@ class DynamicOutputModuleTest(test_lib.OutputModuleTestCase):
 
   # TODO: add coverage for _FormatTag.
 
+  def testGetSetParameters(self):
+    """Tests the GetParameters and SetParameters functions."""
+    output_mediator = self._CreateOutputMediator()
+    output_module = dynamic.DynamicOutputModule(output_mediator)
+    output_module.SetFieldDelimiter('|')
+    output_module.SetFields(['date', 'time', 'message'])
+
+    parameters = output_module.GetParameters()
+    self.assertEqual(parameters, {
+        'field_delimiter': '|', 'fields': ['date', 'time', 'message']})
+
+    output_module = dynamic.DynamicOutputModule(output_mediator)
+    output_module.SetParameters(parameters)
+    self.assertEqual(output_module.GetParameters(), parameters)
+
   def testHeader(self):
     """Tests the WriteHeader function."""
     output_mediator = self._CreateOutputMediator()
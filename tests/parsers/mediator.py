@@ -4,6 +4,8 @@
 
 from __future__ import unicode_literals
 
+import gzip
+import os
 import unittest
 
 from dfdatetime import fake_time
@@ -39,6 +41,53 @@ class ParsersMediatorTest(test_lib.ParserTestCase):
 
     # TODO: improve test coverage.
 
+  @shared_test_lib.skipUnlessHasTestFile(['syslog.gz'])
+  def testGetFileEntryEventAttributes(self):
+    """Tests the _GetFileEntryEventAttributes function."""
+    session = sessions.Session()
+    storage_writer = fake_writer.FakeStorageWriter(session)
+    parsers_mediator = self._CreateParserMediator(storage_writer)
+
+    test_path = self._GetTestFilePath(['syslog.gz'])
+    os_path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=test_path)
+    file_entry = path_spec_resolver.Resolver.OpenFileEntry(os_path_spec)
+
+    parsers_mediator.SetFileEntry(file_entry)
+
+    file_entry_attributes = parsers_mediator._GetFileEntryEventAttributes(
+        file_entry)
+    path_spec, relative_path, display_name, inode = file_entry_attributes
+
+    self.assertEqual(path_spec, os_path_spec)
+    self.assertEqual(relative_path, test_path)
+    self.assertEqual(display_name, 'OS:{0:s}'.format(test_path))
+    self.assertIsNotNone(inode)
+
+    # The event attributes of the current file entry are cached.
+    self.assertIs(
+        parsers_mediator._GetFileEntryEventAttributes(file_entry),
+        file_entry_attributes)
+
+    # The cached event attributes are invalidated by a configuration change.
+    configuration = configurations.EventExtractionConfiguration()
+    configuration.text_prepend = 'C:'
+    parsers_mediator.SetEventExtractionConfiguration(configuration)
+
+    file_entry_attributes = parsers_mediator._GetFileEntryEventAttributes(
+        file_entry)
+    self.assertEqual(file_entry_attributes[2], 'OS:C:{0:s}'.format(test_path))
+    self.assertEqual(
+        parsers_mediator.GetDisplayName(), 'OS:C:{0:s}'.format(test_path))
+
+    # The cached event attributes are invalidated when the file entry is reset.
+    parsers_mediator.ResetFileEntry()
+    self.assertIsNone(parsers_mediator._file_entry_event_attributes)
+
+    # The event attributes of another file entry are not cached.
+    parsers_mediator._GetFileEntryEventAttributes(file_entry)
+    self.assertIsNone(parsers_mediator._file_entry_event_attributes)
+
   # TODO: add tests for _GetInode.
 
   def testGetLatestYearFromFileEntry(self):
@@ -194,6 +243,51 @@ class ParsersMediatorTest(test_lib.ParserTestCase):
       parsers_mediator.ProduceEventWithEventData(
           event_without_timestamp, event_data)
 
+  def testProduceEventsWithEventData(self):
+    """Tests the ProduceEventsWithEventData method."""
+    session = sessions.Session()
+    storage_writer = fake_writer.FakeStorageWriter(session)
+    storage_writer.Open()
+    parsers_mediator = self._CreateParserMediator(storage_writer)
+
+    first_event_data = events.EventData()
+    first_event_data.value = 'first'
+    second_event_data = events.EventData()
+    second_event_data.value = 'second'
+
+    events_with_event_data = []
+    for event_data in (first_event_data, first_event_data, second_event_data):
+      event = events.EventObject()
+      event.timestamp = fake_time.FakeTime()
+      events_with_event_data.append((event, event_data))
+
+    parsers_mediator.ProduceEventsWithEventData(events_with_event_data)
+    self.assertEqual(storage_writer.number_of_events, 3)
+    self.assertEqual(parsers_mediator.number_of_produced_events, 3)
+
+    # Consecutive events with the same event data share the event data.
+    event_data_identifiers = [
+        event.GetEventDataIdentifier().CopyToString()
+        for event, _ in events_with_event_data]
+    self.assertEqual(event_data_identifiers[0], event_data_identifiers[1])
+    self.assertNotEqual(event_data_identifiers[1], event_data_identifiers[2])
+
+    # Events in a next batch can share the event data of the previous batch.
+    event = events.EventObject()
+    event.timestamp = fake_time.FakeTime()
+    parsers_mediator.ProduceEventsWithEventData([(event, second_event_data)])
+    self.assertEqual(
+        event.GetEventDataIdentifier().CopyToString(),
+        event_data_identifiers[2])
+
+    event_without_timestamp = events.EventObject()
+    with self.assertRaises(errors.InvalidEvent):
+      parsers_mediator.ProduceEventsWithEventData([
+          (event, first_event_data),
+          (event_without_timestamp, first_event_data)])
+
+    self.assertEqual(storage_writer.number_of_events, 4)
+
   # TODO: add tests for ProduceExtractionError.
   # TODO: add tests for RemoveEventAttribute.
 
@@ -208,6 +302,42 @@ class ParsersMediatorTest(test_lib.ParserTestCase):
   # TODO: add tests for SetEventExtractionConfiguration.
   # TODO: add tests for SetInputSourceConfiguration.
 
+  def testSampleStartStopTiming(self):
+    """Tests the SampleStartTiming and SampleStopTiming functions."""
+    session = sessions.Session()
+    storage_writer = fake_writer.FakeStorageWriter(session)
+    storage_writer.Open()
+    parsers_mediator = self._CreateParserMediator(storage_writer)
+
+    profiling_configuration = configurations.ProfilingConfiguration()
+    profiling_configuration.profilers = set(['parsers'])
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      profiling_configuration.directory = temp_directory
+
+      parsers_mediator.StartProfiling(profiling_configuration, 'test', None)
+
+      parsers_mediator.SampleStartTiming('test_parser')
+
+      event_data = events.EventData()
+      event = events.EventObject()
+      event.timestamp = fake_time.FakeTime()
+      parsers_mediator.ProduceEventWithEventData(event, event_data)
+
+      parsers_mediator.SampleStopTiming('test_parser')
+
+      parsers_mediator.StopProfiling()
+
+      sample_file_path = os.path.join(
+          temp_directory, 'cputime-test-parsers.csv.gz')
+      with gzip.open(sample_file_path, 'rb') as sample_file:
+        lines = sample_file.read().decode('utf-8').split('\n')
+
+    # The CPU time of the bookkeeping of the mediator is sampled separately
+    # from that of the parser.
+    profile_names = [line.split('\t')[1] for line in lines[1:] if line]
+    self.assertEqual(profile_names, ['test_parser', 'test_parser-mediator'])
+
   def testSetFileEntry(self):
     """Tests the SetFileEntry function."""
     session = sessions.Session()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the text format classifier."""
+
+from __future__ import unicode_literals
+
+import io
+import unittest
+
+from plaso.parsers import bash_history
+from plaso.parsers import sophos_av
+from plaso.parsers import syslog
+from plaso.parsers import text_classifier
+from plaso.parsers import winfirewall
+from plaso.parsers import winreg
+
+from tests.parsers import test_lib
+
+
+class TextFormatClassifierTest(test_lib.ParserTestCase):
+  """Tests for the text format classifier."""
+
+  def _CreateClassifier(self):
+    """Creates a text format classifier.
+
+    Returns:
+      TextFormatClassifier: text format classifier.
+    """
+    parsers = {
+        'bash': bash_history.BashHistoryParser(),
+        'sophos': sophos_av.SophosAVLogParser(),
+        'syslog': syslog.SyslogParser(),
+        'winfirewall': winfirewall.WinFirewallParser(),
+        'winreg': winreg.WinRegistryParser()}
+
+    return text_classifier.TextFormatClassifier(parsers)
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    classifier = self._CreateClassifier()
+
+    expected_parser_names = frozenset([
+        'bash', 'sophos', 'syslog', 'winfirewall'])
+    self.assertEqual(classifier.parser_names, expected_parser_names)
+
+  def testClassify(self):
+    """Tests the Classify function."""
+    classifier = self._CreateClassifier()
+
+    file_object = io.BytesIO(
+        b'Jan 22 07:52:33 myhostname.myhost.com client[30840]: INFO No new '
+        b'content.\n')
+    parser_names = classifier.Classify(file_object, 'cp1252')
+    self.assertEqual(parser_names, frozenset(['bash', 'syslog']))
+
+    # Leading whitespace and a byte-order mark are ignored.
+    file_object = io.BytesIO(b'\xef\xbb\xbf\n\n#Version: 1.5\r\n')
+    parser_names = classifier.Classify(file_object, 'cp1252')
+    self.assertEqual(parser_names, frozenset(['bash']))
+
+    file_object = io.BytesIO(b'  #Version: 1.5\r\n')
+    parser_names = classifier.Classify(file_object, 'cp1252')
+    self.assertEqual(parser_names, frozenset(['bash', 'winfirewall']))
+
+    file_object = io.BytesIO(
+        '20100101 123456 Sophos message\n'.encode('utf-16-le'))
+    parser_names = classifier.Classify(file_object, 'cp1252')
+    self.assertEqual(parser_names, frozenset(['bash', 'sophos']))
+
+    # Data that cannot be decoded in the first line is not text.
+    file_object = io.BytesIO(b'\xff\xfe\x81\x00\x8d')
+    parser_names = classifier.Classify(file_object, 'utf-8')
+    self.assertEqual(parser_names, frozenset())
+
+    # Data that cannot be decoded after the first line is text.
+    file_object = io.BytesIO(b'ls -l\n\xff\xfe\x81\x00')
+    parser_names = classifier.Classify(file_object, 'utf-8')
+    self.assertEqual(parser_names, frozenset(['bash']))
+
+    file_object = io.BytesIO(b'')
+    parser_names = classifier.Classify(file_object, 'cp1252')
+    self.assertEqual(parser_names, frozenset())
+
+
+if __name__ == '__main__':
+  unittest.main()
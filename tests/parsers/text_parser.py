@@ -4,6 +4,7 @@
 
 from __future__ import unicode_literals
 
+import re
 import unittest
 
 import pyparsing
@@ -81,6 +82,65 @@ class PyparsingConstantsTest(test_lib.ParserTestCase):
           'a9', parseAll=True)
 
 
+class TestPyparsingSingleLineTextParser(
+    text_parser.PyparsingSingleLineTextParser):
+  """Single line PyParsing-based text parser for testing."""
+
+  NAME = 'test_text'
+
+  _LOG_LINE = (
+      text_parser.PyparsingConstants.INTEGER.setResultsName('number') +
+      pyparsing.Word(pyparsing.alphas).setResultsName('word'))
+
+  LINE_STRUCTURES = [
+      ('comment', text_parser.PyparsingConstants.COMMENT_LINE_HASH),
+      ('logline', _LOG_LINE)]
+
+  _LINE_STRUCTURE_REGEXES = {
+      'logline': re.compile(r'(?P<number>\d+) (?P<word>[A-Za-z]+)$')}
+
+  def _GetRegexMatchTokens(self, unused_key, match):
+    """Retrieves the tokens from a regular expression match.
+
+    Args:
+      key (str): name of the line structure.
+      match (re.MatchObject): match of the regular expression of the line
+          structure.
+
+    Returns:
+      list[tuple[str, object]]: names and values of the tokens.
+    """
+    number = int(match.group('number'), 10)
+    if number == 0:
+      return None
+
+    return [('number', number), ('word', match.group('word'))]
+
+  def ParseRecord(self, parser_mediator, key, structure):
+    """Parses a log record structure and produces events.
+
+    Args:
+      parser_mediator (ParserMediator): mediates interactions between parsers
+          and other components, such as storage and dfvfs.
+      key (str): name of the parsed structure.
+      structure (pyparsing.ParseResults): tokens from a parsed log line.
+    """
+    return
+
+  def VerifyStructure(self, parser_mediator, line):
+    """Verify the structure of the file and return boolean based on that check.
+
+    Args:
+      parser_mediator (ParserMediator): mediates interactions between parsers
+          and other components, such as storage and dfvfs.
+      line (str): single line from the text file.
+
+    Returns:
+      bool: True if this is the correct parser, False otherwise.
+    """
+    return True
+
+
 class PyparsingSingleLineTextParserTest(unittest.TestCase):
   """Tests for the single line PyParsing-based text parser."""
 
@@ -108,6 +168,37 @@ class PyparsingSingleLineTextParserTest(unittest.TestCase):
     bytes_in = b'Ascii Open then...\x00\x99\x23'
     self.assertFalse(parser._IsText(bytes_in))
 
+  def testParseLine(self):
+    """Tests the _ParseLine function."""
+    parser = TestPyparsingSingleLineTextParser()
+    line_structures = parser.LINE_STRUCTURES
+
+    # Line parsed with the regular expression.
+    index, structure = parser._ParseLine(line_structures, '12 apples')
+    self.assertEqual(index, 1)
+    self.assertEqual(structure.number, 12)
+    self.assertEqual(structure.word, 'apples')
+    self.assertEqual(structure.asList(), [12, 'apples'])
+
+    # Line not matched by the regular expression, parsed with pyparsing.
+    index, structure = parser._ParseLine(line_structures, '12  apples')
+    self.assertEqual(index, 1)
+    self.assertEqual(structure.number, 12)
+    self.assertEqual(structure.word, 'apples')
+
+    # Line for which the tokens are not built from the regular expression.
+    index, structure = parser._ParseLine(line_structures, '0 apples')
+    self.assertEqual(index, 1)
+    self.assertEqual(structure.number, 0)
+
+    index, structure = parser._ParseLine(line_structures, '# comment')
+    self.assertEqual(index, 0)
+    self.assertEqual(structure[-1], 'comment')
+
+    index, structure = parser._ParseLine(line_structures, 'apples')
+    self.assertIsNone(index)
+    self.assertIsNone(structure)
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the serializer object implementation using a binary format."""
+
+from __future__ import unicode_literals
+
+import collections
+import unittest
+
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import fake_path_spec
+from dfvfs.path import factory as path_spec_factory
+
+from plaso.containers import event_sources
+from plaso.containers import events
+from plaso.containers import sessions
+from plaso.containers import tasks
+from plaso.serializer import binary_serializer
+from plaso.serializer import json_serializer
+
+from tests import test_lib as shared_test_lib
+
+
+class BinaryAttributeContainerSerializerTest(shared_test_lib.BaseTestCase):
+  """Tests for the binary attribute container serializer object."""
+
+  _SERIALIZER = binary_serializer.BinaryAttributeContainerSerializer
+
+  def _CreateTestEventData(self):
+    """Creates event data for testing.
+
+    Returns:
+      EventData: event data.
+    """
+    test_file = self._GetTestFilePath(['ímynd.dd'])
+
+    volume_path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=test_file)
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_TSK, inode=15,
+        location='/passwords.txt', parent=volume_path_spec)
+
+    event_data = events.EventData(data_type='test:event2')
+    event_data.pathspec = path_spec
+    event_data.parser = 'test_parser'
+
+    event_data.binary_string = b'\xc0\x90\x90binary'
+    event_data.empty_string = ''
+    event_data.zero_integer = 0
+    event_data.integer = 34
+    event_data.negative_integer = -1
+    event_data.large_integer = 1 << 70
+    event_data.float = -122.082203542683
+    event_data.string = 'Normal string'
+    event_data.unicode_string = 'And I am a unicörn.'
+    event_data.nul_string = 'NUL\x00string'
+    event_data.my_list = ['asf', 4234, 2, 54, 'asf']
+    event_data.my_dict = {
+        'a': 'not b', 'c': 34, 'list': ['sf', 234], 'an': [234, 32]}
+    event_data.a_tuple = (
+        'some item', [234, 52, 15], {'a': 'not a', 'b': 'not b'}, 35)
+    event_data.a_boolean = True
+    event_data.null_value = None
+    return event_data
+
+  def testReadAndWriteSerializedEventData(self):
+    """Test ReadSerialized and WriteSerialized of EventData."""
+    expected_event_data = self._CreateTestEventData()
+
+    serialized_data = self._SERIALIZER.WriteSerialized(expected_event_data)
+    self.assertIsInstance(serialized_data, bytes)
+
+    event_data = self._SERIALIZER.ReadSerialized(serialized_data)
+
+    self.assertIsNotNone(event_data)
+    self.assertIsInstance(event_data, events.EventData)
+
+    expected_event_data_dict = expected_event_data.CopyToDict()
+    expected_event_data_dict['pathspec'] = (
+        expected_event_data.pathspec.comparable)
+
+    event_data_dict = event_data.CopyToDict()
+    event_data_dict['pathspec'] = event_data.pathspec.comparable
+
+    self.assertEqual(event_data_dict, expected_event_data_dict)
+    self.assertIsInstance(event_data.a_tuple, tuple)
+
+  def testReadAndWriteSerializedEventObject(self):
+    """Test ReadSerialized and WriteSerialized of EventObject."""
+    expected_event = events.EventObject()
+    expected_event.timestamp = 1234124
+    expected_event.timestamp_desc = 'Written'
+    expected_event.event_data_row_identifier = 5
+
+    serialized_data = self._SERIALIZER.WriteSerialized(expected_event)
+    event = self._SERIALIZER.ReadSerialized(serialized_data)
+
+    self.assertIsInstance(event, events.EventObject)
+    self.assertEqual(event.CopyToDict(), expected_event.CopyToDict())
+
+  def testReadAndWriteSerializedEventSource(self):
+    """Test ReadSerialized and WriteSerialized of EventSource."""
+    test_path_spec = fake_path_spec.FakePathSpec(location='/opt/plaso.txt')
+
+    expected_event_source = event_sources.EventSource(path_spec=test_path_spec)
+
+    serialized_data = self._SERIALIZER.WriteSerialized(expected_event_source)
+    event_source = self._SERIALIZER.ReadSerialized(serialized_data)
+
+    self.assertIsInstance(event_source, event_sources.EventSource)
+    self.assertEqual(
+        event_source.path_spec.comparable, test_path_spec.comparable)
+
+  def testReadAndWriteSerializedSession(self):
+    """Test ReadSerialized and WriteSerialized of Session."""
+    parsers_counter = collections.Counter()
+    parsers_counter['filestat'] = 3
+    parsers_counter['total'] = 3
+
+    expected_session = sessions.Session()
+    expected_session.parsers_counter = parsers_counter
+
+    serialized_data = self._SERIALIZER.WriteSerialized(expected_session)
+    session = self._SERIALIZER.ReadSerialized(serialized_data)
+
+    self.assertIsInstance(session, sessions.Session)
+    self.assertIsInstance(session.parsers_counter, collections.Counter)
+    self.assertEqual(session.CopyToDict(), expected_session.CopyToDict())
+
+  def testReadAndWriteSerializedTask(self):
+    """Test ReadSerialized and WriteSerialized of Task."""
+    expected_task = tasks.Task(session_identifier='a1b2c3')
+    expected_task.path_specs = [
+        fake_path_spec.FakePathSpec(location='/opt/plaso1.txt'),
+        fake_path_spec.FakePathSpec(location='/opt/plaso2.txt')]
+
+    serialized_data = self._SERIALIZER.WriteSerialized(expected_task)
+    task = self._SERIALIZER.ReadSerialized(serialized_data)
+
+    self.assertIsInstance(task, tasks.Task)
+    self.assertEqual(task.identifier, expected_task.identifier)
+    self.assertEqual(task.session_identifier, 'a1b2c3')
+    self.assertEqual(
+        [path_spec.comparable for path_spec in task.path_specs],
+        [path_spec.comparable for path_spec in expected_task.path_specs])
+
+  def testInterning(self):
+    """Tests that strings and path specifications are interned."""
+    volume_path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location='/image.raw')
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_TSK, location='/opt/plaso.txt',
+        parent=volume_path_spec)
+
+    event_data = events.EventData(data_type='test:event')
+    event_data.pathspec = path_spec
+    event_data.parent_path_spec = volume_path_spec
+    event_data.strings = ['repeated string'] * 10
+
+    serialized_data = self._SERIALIZER.WriteSerialized(event_data)
+    self.assertEqual(serialized_data.count(b'repeated string'), 1)
+    self.assertEqual(serialized_data.count(b'/image.raw'), 1)
+
+    event_data = self._SERIALIZER.ReadSerialized(serialized_data)
+    self.assertIs(event_data.pathspec.parent, event_data.parent_path_spec)
+    self.assertEqual(event_data.strings, ['repeated string'] * 10)
+
+  def testReadSerializedInvalidData(self):
+    """Tests ReadSerialized with invalid data."""
+    self.assertIsNone(self._SERIALIZER.ReadSerialized(b''))
+
+    event_data = self._CreateTestEventData()
+    serialized_data = self._SERIALIZER.WriteSerialized(event_data)
+
+    with self.assertRaises(ValueError):
+      self._SERIALIZER.ReadSerialized(b'\xff' + serialized_data[1:])
+
+    with self.assertRaises(ValueError):
+      self._SERIALIZER.ReadSerialized(serialized_data[:-8])
+
+  def testWriteSerializedUnsupportedType(self):
+    """Tests WriteSerialized with an unsupported attribute value type."""
+    event_data = events.EventData(data_type='test:event')
+    event_data.unsupported = object()
+
+    with self.assertRaises(TypeError):
+      self._SERIALIZER.WriteSerialized(event_data)
+
+    with self.assertRaises(TypeError):
+      self._SERIALIZER.WriteSerialized({'data_type': 'test:event'})
+
+  def testSerializedSize(self):
+    """Tests that the binary form is smaller than the JSON form."""
+    event_data = self._CreateTestEventData()
+
+    serialized_data = self._SERIALIZER.WriteSerialized(event_data)
+    json_string = (
+        json_serializer.JSONAttributeContainerSerializer.WriteSerialized(
+            event_data))
+
+    self.assertLess(len(serialized_data), len(json_string.encode('utf-8')))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the serializer factory."""
+
+from __future__ import unicode_literals
+
+import unittest
+
+from plaso.lib import definitions
+from plaso.serializer import binary_serializer
+from plaso.serializer import factory
+from plaso.serializer import json_serializer
+
+from tests import test_lib as shared_test_lib
+
+
+class SerializerFactoryTest(shared_test_lib.BaseTestCase):
+  """Tests for the serializer factory."""
+
+  def testGetAttributeContainerSerializer(self):
+    """Tests the GetAttributeContainerSerializer function."""
+    serializer = factory.SerializerFactory.GetAttributeContainerSerializer(
+        definitions.SERIALIZER_FORMAT_BINARY)
+    self.assertEqual(
+        serializer, binary_serializer.BinaryAttributeContainerSerializer)
+
+    serializer = factory.SerializerFactory.GetAttributeContainerSerializer(
+        definitions.SERIALIZER_FORMAT_JSON)
+    self.assertEqual(
+        serializer, json_serializer.JSONAttributeContainerSerializer)
+
+    serializer = factory.SerializerFactory.GetAttributeContainerSerializer(
+        'bogus')
+    self.assertIsNone(serializer)
+
+
+if __name__ == '__main__':
+  unittest.main()
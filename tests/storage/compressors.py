@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for the compressors of the data of stored attribute containers."""
+
+from __future__ import unicode_literals
+
+import pickle
+import unittest
+
+from plaso.lib import definitions
+from plaso.lib import py2to3
+from plaso.storage import compressors
+
+
+class CompressorsTestCase(unittest.TestCase):
+  """Shared functionality for compressor tests."""
+
+  def _CreateTestSamples(self, number_of_samples):
+    """Creates serialized attribute container data for testing.
+
+    Args:
+      number_of_samples (int): number of samples.
+
+    Returns:
+      list[bytes]: samples.
+    """
+    sample_format = (
+        '{{"__container_type__": "event_data", "__type__": '
+        '"AttributeContainer", "data_type": "windows:registry:key_value", '
+        '"key_path": "HKEY_LOCAL_MACHINE\\\\Software\\\\Run{0:d}", '
+        '"parser": "winreg/windows_run", "values": "value: {1:d}"}}')
+
+    return [
+        sample_format.format(index % 10, index).encode('utf-8')
+        for index in range(number_of_samples)]
+
+
+class NoneCompressorTest(CompressorsTestCase):
+  """Tests for the compressor that does not compress the data."""
+
+  def testCompressAndDecompress(self):
+    """Tests the Compress and Decompress functions."""
+    test_compressor = compressors.NoneCompressor()
+
+    compressed_data = test_compressor.Compress(b'test data')
+    self.assertEqual(compressed_data, b'test data')
+
+    data = test_compressor.Decompress(compressed_data)
+    self.assertEqual(data, b'test data')
+
+
+class ZlibCompressorTest(CompressorsTestCase):
+  """Tests for the zlib compressor."""
+
+  def testCompressAndDecompress(self):
+    """Tests the Compress and Decompress functions."""
+    test_compressor = compressors.ZlibCompressor()
+
+    compressed_data = test_compressor.Compress(b'test data')
+    self.assertNotEqual(compressed_data, b'test data')
+
+    data = test_compressor.Decompress(compressed_data)
+    self.assertEqual(data, b'test data')
+
+    with self.assertRaises(IOError):
+      test_compressor.Decompress(b'bogus')
+
+  def testFastCompress(self):
+    """Tests the Compress function of the fast zlib compressor."""
+    test_compressor = compressors.FastZlibCompressor()
+    compressed_data = test_compressor.Compress(b'test data')
+
+    # The data is compressed in the zlib format.
+    test_compressor = compressors.ZlibCompressor()
+    data = test_compressor.Decompress(compressed_data)
+    self.assertEqual(data, b'test data')
+
+
+@unittest.skipIf(py2to3.PY_2, 'Preset dictionaries not supported by Python 2')
+class DictionaryZlibCompressorTest(CompressorsTestCase):
+  """Tests for the zlib compressor that uses a preset dictionary."""
+
+  # pylint: disable=protected-access
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    test_compressor = compressors.DictionaryZlibCompressor()
+    self.assertIsNone(test_compressor.dictionary)
+
+    with self.assertRaises(ValueError):
+      compressors.DictionaryZlibCompressor(dictionary=b'\x00' * (
+          compressors.DictionaryZlibCompressor._MAXIMUM_DICTIONARY_SIZE + 1))
+
+  def testCompressAndDecompress(self):
+    """Tests the Compress and Decompress functions."""
+    test_samples = self._CreateTestSamples(100)
+
+    dictionary = compressors.DictionaryZlibCompressor.TrainDictionary(
+        test_samples)
+    test_compressor = compressors.DictionaryZlibCompressor(
+        dictionary=dictionary)
+
+    compressed_data = test_compressor.Compress(test_samples[0])
+    data = test_compressor.Decompress(compressed_data)
+    self.assertEqual(data, test_samples[0])
+
+    zlib_compressor = compressors.ZlibCompressor()
+    zlib_compressed_data = zlib_compressor.Compress(test_samples[0])
+    self.assertLess(len(compressed_data), len(zlib_compressed_data))
+
+    # Data compressed without dictionary can be decompressed as well.
+    data = test_compressor.Decompress(zlib_compressed_data)
+    self.assertEqual(data, test_samples[0])
+
+    test_compressor = compressors.DictionaryZlibCompressor()
+    with self.assertRaises(IOError):
+      test_compressor.Decompress(compressed_data)
+
+  def testPickle(self):
+    """Tests pickling a compressor."""
+    test_samples = self._CreateTestSamples(100)
+
+    dictionary = compressors.DictionaryZlibCompressor.TrainDictionary(
+        test_samples)
+    test_compressor = compressors.DictionaryZlibCompressor(
+        dictionary=dictionary)
+
+    compressed_data = test_compressor.Compress(test_samples[0])
+
+    test_compressor = pickle.loads(pickle.dumps(test_compressor))
+    self.assertEqual(test_compressor.dictionary, dictionary)
+
+    data = test_compressor.Decompress(compressed_data)
+    self.assertEqual(data, test_samples[0])
+
+  def testTrainDictionary(self):
+    """Tests the TrainDictionary function."""
+    test_samples = self._CreateTestSamples(100)
+
+    dictionary = compressors.DictionaryZlibCompressor.TrainDictionary(
+        test_samples)
+    self.assertIsNotNone(dictionary)
+    self.assertLessEqual(
+        len(dictionary),
+        compressors.DictionaryZlibCompressor._MAXIMUM_DICTIONARY_SIZE)
+    self.assertIn(b'windows:registry:key_value', dictionary)
+
+    dictionary = compressors.DictionaryZlibCompressor.TrainDictionary([])
+    self.assertIsNone(dictionary)
+
+
+class CompressorFactoryTest(CompressorsTestCase):
+  """Tests for the compressor factory."""
+
+  def testGetCompressor(self):
+    """Tests the GetCompressor function."""
+    test_compressor = compressors.CompressorFactory.GetCompressor(
+        definitions.COMPRESSION_FORMAT_ZLIB)
+    self.assertIsInstance(test_compressor, compressors.ZlibCompressor)
+
+    with self.assertRaises(ValueError):
+      compressors.CompressorFactory.GetCompressor('bogus')
+
+  def testSupportsDictionary(self):
+    """Tests the SupportsDictionary function."""
+    result = compressors.CompressorFactory.SupportsDictionary(
+        definitions.COMPRESSION_FORMAT_ZLIB)
+    self.assertFalse(result)
+
+    with self.assertRaises(ValueError):
+      compressors.CompressorFactory.SupportsDictionary('bogus')
+
+  @unittest.skipIf(
+      py2to3.PY_2, 'Preset dictionaries not supported by Python 2')
+  def testTrainDictionary(self):
+    """Tests the TrainDictionary function."""
+    test_samples = self._CreateTestSamples(100)
+
+    dictionary = compressors.CompressorFactory.TrainDictionary(
+        definitions.COMPRESSION_FORMAT_ZLIB_DICTIONARY, test_samples)
+    self.assertIsNotNone(dictionary)
+
+    dictionary = compressors.CompressorFactory.TrainDictionary(
+        definitions.COMPRESSION_FORMAT_ZLIB, test_samples)
+    self.assertIsNone(dictionary)
+
+
+if __name__ == '__main__':
+  unittest.main()
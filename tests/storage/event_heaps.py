@@ -121,18 +121,29 @@ class SerializedEventHeapTest(test_lib.StorageTestCase):
 
     self.assertEqual(len(event_heap._heap), 0)
 
-    test_timestamp, test_event_data = event_heap.PopEvent()
+    (test_timestamp, test_event_data, test_event_data_row_identifier,
+     test_data_type, test_parser_chain) = event_heap.PopEvent()
     self.assertIsNone(test_timestamp)
     self.assertIsNone(test_event_data)
+    self.assertIsNone(test_event_data_row_identifier)
+    self.assertIsNone(test_data_type)
+    self.assertIsNone(test_parser_chain)
 
     event_heap.PushEvent(5134324321, b'event_data1')
-    event_heap.PushEvent(2345871286, b'event_data2')
+    event_heap.PushEvent(
+        2345871286, b'event_data2', data_type='test:event',
+        event_data_row_identifier=2, parser_chain='test_parser')
 
     self.assertEqual(len(event_heap._heap), 2)
 
-    test_timestamp, test_event_data = event_heap.PopEvent()
+    (test_timestamp, test_event_data, test_event_data_row_identifier,
+     test_data_type, test_parser_chain) = event_heap.PopEvent()
     self.assertEqual(test_timestamp, 2345871286)
     self.assertEqual(test_event_data, b'event_data2')
+    self.assertEqual(test_event_data_row_identifier, 2)
+    self.assertEqual(test_data_type, 'test:event')
+    self.assertEqual(test_parser_chain, 'test_parser')
+    self.assertEqual(event_heap.data_size, len(b'event_data1'))
 
     self.assertEqual(len(event_heap._heap), 1)
 
@@ -8,6 +8,7 @@ import unittest
 
 from plaso.containers import errors
 from plaso.containers import event_sources
+from plaso.containers import events
 from plaso.containers import reports
 from plaso.containers import sessions
 from plaso.containers import tasks
@@ -69,6 +70,32 @@ class FakeStorageWriterTest(test_lib.StorageTestCase):
     with self.assertRaises(IOError):
       storage_writer.AddEvent(event)
 
+  def testAddEventsWithEventData(self):
+    """Tests the AddEventsWithEventData function."""
+    session = sessions.Session()
+    test_events = self._CreateTestEvents()
+
+    storage_writer = fake_writer.FakeStorageWriter(session)
+    storage_writer.Open()
+
+    event_data = events.EventData(data_type='test:event')
+    events_with_event_data = [(test_events[0], event_data)]
+    events_with_event_data.extend([(event, None) for event in test_events[1:]])
+
+    storage_writer.AddEventsWithEventData(events_with_event_data)
+    self.assertEqual(storage_writer.number_of_events, len(test_events))
+
+    event_data_identifier = event_data.GetIdentifier()
+    for event in test_events:
+      self.assertEqual(
+          event.GetEventDataIdentifier().CopyToString(),
+          event_data_identifier.CopyToString())
+
+    storage_writer.Close()
+
+    with self.assertRaises(IOError):
+      storage_writer.AddEventsWithEventData(events_with_event_data)
+
   def testAddEventSource(self):
     """Tests the AddEventSource function."""
     session = sessions.Session()
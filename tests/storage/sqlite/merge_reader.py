@@ -7,10 +7,16 @@ from __future__ import unicode_literals
 import os
 import unittest
 
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+
+from plaso.containers import event_sources
+from plaso.containers import events
 from plaso.containers import sessions
 from plaso.containers import tasks
 from plaso.lib import definitions
 from plaso.storage.sqlite import merge_reader
+from plaso.storage.sqlite import sqlite_file
 from plaso.storage.sqlite import writer
 
 from tests import test_lib as shared_test_lib
@@ -84,6 +90,229 @@ class SQLiteStorageMergeReaderTest(test_lib.StorageTestCase):
 
       storage_writer.Close()
 
+  def testMergeAttributeContainersWithSerializationFormats(self):
+    """Tests the MergeAttributeContainers function with different formats."""
+    session = sessions.Session()
+    task = tasks.Task(session_identifier=session.identifier)
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      task_storage_path = os.path.join(temp_directory, 'task.sqlite')
+      task_storage_writer = writer.SQLiteStorageFileWriter(
+          session, task_storage_path,
+          serialization_format=definitions.SERIALIZER_FORMAT_BINARY,
+          storage_type=definitions.STORAGE_TYPE_TASK, task=task)
+
+      task_storage_writer.Open()
+
+      for event in self._CreateTestEvents():
+        task_storage_writer.AddEvent(event)
+
+      task_storage_writer.Close()
+
+      session_storage_path = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_writer = writer.SQLiteStorageFileWriter(
+          session, session_storage_path)
+
+      test_reader = merge_reader.SQLiteStorageMergeReader(
+          storage_writer, task_storage_path)
+
+      storage_writer.Open()
+
+      # The rows cannot be merged directly since the serialization formats
+      # differ, hence the attribute containers are deserialized.
+      result = test_reader.MergeAttributeContainers()
+      self.assertTrue(result)
+      self.assertEqual(
+          test_reader._serialization_format,
+          definitions.SERIALIZER_FORMAT_BINARY)
+
+      self.assertEqual(storage_writer.number_of_events, 4)
+
+      storage_writer.Close()
+
+  def testMergeAttributeContainersWithCompressionFormats(self):
+    """Tests the MergeAttributeContainers function with compression formats."""
+    session = sessions.Session()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      task_storage_path = os.path.join(temp_directory, 'task.sqlite')
+      session_storage_path = os.path.join(temp_directory, 'plaso.sqlite')
+
+      storage_writer = writer.SQLiteStorageFileWriter(
+          session, session_storage_path,
+          compression_format=definitions.COMPRESSION_FORMAT_ZLIB_DICTIONARY)
+      storage_writer.Open()
+
+      for task_compression_format in (
+          definitions.COMPRESSION_FORMAT_NONE,
+          definitions.COMPRESSION_FORMAT_ZLIB,
+          definitions.COMPRESSION_FORMAT_ZLIB_DICTIONARY):
+        task = tasks.Task(session_identifier=session.identifier)
+        task_storage_writer = writer.SQLiteStorageFileWriter(
+            session, task_storage_path,
+            compression_format=task_compression_format,
+            storage_type=definitions.STORAGE_TYPE_TASK, task=task)
+
+        task_storage_writer.Open()
+
+        for event in self._CreateTestEvents():
+          task_storage_writer.AddEvent(event)
+
+        task_storage_writer.Close()
+
+        test_reader = merge_reader.SQLiteStorageMergeReader(
+            storage_writer, task_storage_path)
+
+        # The rows are merged directly and their data is converted to
+        # the compression format of the session store.
+        result = test_reader.MergeAttributeContainers()
+        self.assertTrue(result)
+
+      self.assertEqual(storage_writer.number_of_events, 12)
+
+      storage_writer.Close()
+
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=session_storage_path)
+
+      test_events = list(storage_file.GetSortedEvents())
+
+      storage_file.Close()
+
+    self.assertEqual(len(test_events), 12)
+
+  def testMergeAttributeContainersWithEventData(self):
+    """Tests the MergeAttributeContainers function with event data."""
+    session = sessions.Session()
+    task = tasks.Task(session_identifier=session.identifier)
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      task_storage_path = os.path.join(temp_directory, 'task.sqlite')
+      task_storage_writer = writer.SQLiteStorageFileWriter(
+          session, task_storage_path,
+          storage_type=definitions.STORAGE_TYPE_TASK, task=task)
+
+      task_storage_writer.Open()
+
+      path_spec = path_spec_factory.Factory.NewPathSpec(
+          dfvfs_definitions.TYPE_INDICATOR_OS, location='/tmp/NTUSER.DAT')
+
+      for key_path in ('key1', 'key2'):
+        event_data = events.EventData(data_type='windows:registry:key_value')
+        event_data.key_path = key_path
+        event_data.pathspec = path_spec
+        event_data.parser = 'winreg/UNKNOWN'
+        task_storage_writer.AddEventData(event_data)
+
+        event = events.EventObject()
+        event.timestamp = 1
+        event.timestamp_desc = definitions.TIME_DESCRIPTION_WRITTEN
+        event.SetEventDataIdentifier(event_data.GetIdentifier())
+        task_storage_writer.AddEvent(event)
+
+      task_storage_writer.AddEventSource(event_sources.EventSource())
+
+      task_storage_writer.Close()
+
+      session_storage_path = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_writer = writer.SQLiteStorageFileWriter(
+          session, session_storage_path)
+
+      storage_writer.Open()
+
+      # Event data and path specifications stored in the session before
+      # the task is merged offset the identifiers of the merged event data
+      # and path specifications.
+      event_data = events.EventData(data_type='fs:stat')
+      event_data.pathspec = path_spec_factory.Factory.NewPathSpec(
+          dfvfs_definitions.TYPE_INDICATOR_OS, location='/tmp/SYSTEM')
+      storage_writer.AddEventData(event_data)
+
+      test_reader = merge_reader.SQLiteStorageMergeReader(
+          storage_writer, task_storage_path)
+
+      result = test_reader.MergeAttributeContainers()
+      self.assertTrue(result)
+      self.assertFalse(os.path.exists(task_storage_path))
+
+      self.assertEqual(storage_writer.number_of_events, 2)
+      self.assertEqual(storage_writer.number_of_event_sources, 1)
+      self.assertEqual(session.parsers_counter['UNKNOWN'], 2)
+
+      storage_writer.Close()
+
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=session_storage_path)
+
+      key_paths = []
+      for event in storage_file.GetSortedEvents():
+        event_data = storage_file.GetEventDataByIdentifier(
+            event.GetEventDataIdentifier())
+        key_paths.append(event_data.key_path)
+
+        self.assertEqual(event_data.pathspec.comparable, path_spec.comparable)
+
+      storage_file.Close()
+
+      self.assertEqual(sorted(key_paths), ['key1', 'key2'])
+
+  def testMergeAttributeContainersWithPathSpecs(self):
+    """Tests the MergeAttributeContainers function with path specifications."""
+    session = sessions.Session()
+    task = tasks.Task(session_identifier=session.identifier)
+
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location='/tmp/NTUSER.DAT')
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      task_storage_path = os.path.join(temp_directory, 'task.sqlite')
+      task_storage_writer = writer.SQLiteStorageFileWriter(
+          session, task_storage_path,
+          storage_type=definitions.STORAGE_TYPE_TASK, task=task)
+
+      task_storage_writer.Open()
+
+      for key_path in ('key1', 'key2'):
+        event_data = events.EventData(data_type='windows:registry:key_value')
+        event_data.key_path = key_path
+        event_data.pathspec = path_spec
+        task_storage_writer.AddEventData(event_data)
+
+      task_storage_writer.Close()
+
+      session_storage_path = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_writer = writer.SQLiteStorageFileWriter(
+          session, session_storage_path)
+
+      storage_writer.Open()
+
+      merged_container_types = []
+
+      def _Callback(unused_storage_writer, attribute_container):
+        merged_container_types.append(attribute_container.CONTAINER_TYPE)
+
+      test_reader = merge_reader.SQLiteStorageMergeReader(
+          storage_writer, task_storage_path)
+
+      result = test_reader.MergeAttributeContainers(callback=_Callback)
+      self.assertTrue(result)
+
+      # Path specifications are not passed to the callback.
+      self.assertEqual(merged_container_types, ['event_data', 'event_data'])
+
+      storage_writer.Close()
+
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=session_storage_path)
+
+      self.assertEqual(storage_file._CountStoredAttributeContainers(
+          storage_file._CONTAINER_TYPE_PATH_SPEC), 1)
+
+      for event_data in storage_file.GetEventData():
+        self.assertEqual(event_data.pathspec.comparable, path_spec.comparable)
+
+      storage_file.Close()
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -7,12 +7,17 @@ from __future__ import unicode_literals
 import os
 import unittest
 
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+
 from plaso.containers import errors
 from plaso.containers import event_sources
+from plaso.containers import events
 from plaso.containers import reports
 from plaso.containers import sessions
 from plaso.containers import tasks
 from plaso.lib import definitions
+from plaso.storage import time_range
 from plaso.storage.sqlite import sqlite_file
 
 from tests import test_lib as shared_test_lib
@@ -73,6 +78,40 @@ class SQLiteStorageFileTest(test_lib.StorageTestCase):
 
       storage_file.Close()
 
+  def testAddEventsWithEventData(self):
+    """Tests the AddEventsWithEventData function."""
+    test_events = self._CreateTestEvents()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      event_data = events.EventData(data_type='test:event')
+      event_data.value = 'test'
+
+      events_with_event_data = [(test_events[0], event_data)]
+      events_with_event_data.extend([
+          (event, None) for event in test_events[1:]])
+
+      storage_file.AddEventsWithEventData(events_with_event_data)
+
+      storage_file.Close()
+
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file)
+
+      stored_events = list(storage_file.GetEvents())
+      self.assertEqual(len(stored_events), len(test_events))
+
+      for event in stored_events:
+        event_data_identifier = event.GetEventDataIdentifier()
+        stored_event_data = storage_file.GetEventDataByIdentifier(
+            event_data_identifier)
+        self.assertEqual(stored_event_data.value, 'test')
+
+      storage_file.Close()
+
   def testAddEventSource(self):
     """Tests the AddEventSource function."""
     event_source = event_sources.EventSource()
@@ -106,6 +145,61 @@ class SQLiteStorageFileTest(test_lib.StorageTestCase):
 
   # TODO: add tests for CheckSupportedFormat
 
+  def testAddEventDataWithPathSpec(self):
+    """Tests the AddEventData function with a path specification."""
+    volume_path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location='/image.raw')
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_TSK, inode=15,
+        location='/passwords.txt', parent=volume_path_spec)
+    other_path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_TSK, inode=16,
+        location='/secrets.txt', parent=volume_path_spec)
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      event_data_identifiers = []
+      for test_path_spec in (path_spec, path_spec, other_path_spec, None):
+        event_data = events.EventData(data_type='test:event')
+        if test_path_spec:
+          event_data.pathspec = test_path_spec
+        storage_file.AddEventData(event_data)
+
+        self.assertIs(getattr(event_data, 'pathspec', None), test_path_spec)
+        event_data_identifiers.append(event_data.GetIdentifier())
+
+      # Event data that has not been written is read from the serialized
+      # attribute container list.
+      storage_file._event_data_cache.Empty()
+      event_data = storage_file.GetEventDataByIdentifier(
+          event_data_identifiers[1])
+      self.assertEqual(event_data.pathspec.comparable, path_spec.comparable)
+
+      storage_file.Close()
+
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file)
+
+      self.assertEqual(storage_file._CountStoredAttributeContainers(
+          storage_file._CONTAINER_TYPE_PATH_SPEC), 2)
+
+      path_spec_comparables = [
+          getattr(getattr(event_data, 'pathspec', None), 'comparable', None)
+          for event_data in storage_file.GetEventData()]
+      self.assertEqual(path_spec_comparables, [
+          path_spec.comparable, path_spec.comparable,
+          other_path_spec.comparable, None])
+
+      event_data = storage_file.GetEventDataByIdentifier(
+          event_data_identifiers[2])
+      self.assertEqual(
+          event_data.pathspec.comparable, other_path_spec.comparable)
+
+      storage_file.Close()
+
   def testGetAnalysisReports(self):
     """Tests the GetAnalysisReports function."""
     analysis_report = reports.AnalysisReport(
@@ -224,6 +318,65 @@ class SQLiteStorageFileTest(test_lib.StorageTestCase):
 
       storage_file.Close()
 
+  def testGetEventTimeRanges(self):
+    """Tests the GetEventTimeRanges function."""
+    test_events = self._CreateTestEvents()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      for event in test_events:
+        storage_file.AddEvent(event)
+
+      storage_file.Close()
+
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file)
+
+      expected_timestamps = [
+          event.timestamp for event in storage_file.GetSortedEvents()]
+
+      time_ranges = storage_file.GetEventTimeRanges(1)
+      self.assertEqual(len(time_ranges), 1)
+      self.assertEqual(
+          time_ranges[0].start_timestamp, expected_timestamps[0])
+      self.assertEqual(
+          time_ranges[0].end_timestamp, expected_timestamps[-1])
+
+      time_ranges = storage_file.GetEventTimeRanges(2)
+      self.assertEqual(len(time_ranges), 2)
+      self.assertEqual(
+          time_ranges[0].end_timestamp + 1, time_ranges[1].start_timestamp)
+
+      timestamps = []
+      for test_time_range in time_ranges:
+        timestamps.extend([
+            event.timestamp for event in storage_file.GetSortedEvents(
+                time_range=test_time_range)])
+
+      self.assertEqual(timestamps, expected_timestamps)
+
+      # Events with the same timestamp are not split over time ranges.
+      time_ranges = storage_file.GetEventTimeRanges(10)
+      self.assertLessEqual(len(time_ranges), len(set(expected_timestamps)))
+
+      test_time_range = time_range.TimeRange(
+          1334940000000000, 1334966400000000)
+      time_ranges = storage_file.GetEventTimeRanges(
+          1, time_range=test_time_range)
+      self.assertEqual(len(time_ranges), 1)
+      self.assertGreaterEqual(
+          time_ranges[0].start_timestamp, test_time_range.start_timestamp)
+      self.assertLessEqual(
+          time_ranges[0].end_timestamp, test_time_range.end_timestamp)
+
+      with self.assertRaises(ValueError):
+        storage_file.GetEventTimeRanges(0)
+
+      storage_file.Close()
+
   # TODO: add tests for GetNumberOfAnalysisReports
   # TODO: add tests for GetNumberOfEventSources
 
@@ -249,9 +402,347 @@ class SQLiteStorageFileTest(test_lib.StorageTestCase):
       test_events = list(storage_file.GetSortedEvents())
       self.assertEqual(len(test_events), 4)
 
+      timestamps = [event.timestamp for event in test_events]
+      self.assertEqual(timestamps, sorted(timestamps))
+
       storage_file.Close()
 
-    # TODO: add test with time range.
+      # Test with a time range.
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file)
+
+      test_time_range = time_range.TimeRange(
+          1334940000000000, 1334966400000000)
+      test_events = list(storage_file.GetSortedEvents(
+          time_range=test_time_range))
+      self.assertEqual(len(test_events), 3)
+
+      storage_file.Close()
+
+  def testGetSortedEventsWithReadWorkers(self):
+    """Tests the GetSortedEvents function with read workers."""
+    test_events = self._CreateTestEvents()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      for event in test_events:
+        storage_file.AddEvent(event)
+
+      storage_file.Close()
+
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file)
+
+      expected_events = list(storage_file.GetSortedEvents())
+
+      storage_file.Close()
+
+      storage_file = sqlite_file.SQLiteStorageFile(
+          number_of_read_workers=2, read_batch_size=3)
+      storage_file.Open(path=temp_file)
+
+      test_events = list(storage_file.GetSortedEvents())
+
+      storage_file.Close()
+
+    self.assertEqual(len(test_events), 4)
+
+    expected_values = [
+        (event.GetIdentifier().CopyToString(), event.timestamp)
+        for event in expected_events]
+    test_values = [
+        (event.GetIdentifier().CopyToString(), event.timestamp)
+        for event in test_events]
+    self.assertEqual(test_values, expected_values)
+
+  def testGetSortedEventsWithBinarySerializationFormat(self):
+    """Tests the GetSortedEvents function with binary serialization."""
+    test_events = self._CreateTestEvents()
+
+    with self.assertRaises(ValueError):
+      sqlite_file.SQLiteStorageFile(serialization_format='bogus')
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile(
+          serialization_format=definitions.SERIALIZER_FORMAT_BINARY)
+      storage_file.Open(path=temp_file, read_only=False)
+
+      for event in test_events:
+        storage_file.AddEvent(event)
+
+      storage_file.Close()
+
+      # The serialization format of the store is used to read it.
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file)
+
+      self.assertEqual(
+          storage_file.serialization_format,
+          definitions.SERIALIZER_FORMAT_BINARY)
+
+      test_events = list(storage_file.GetSortedEvents())
+
+      storage_file.Close()
+
+      storage_file = sqlite_file.SQLiteStorageFile(
+          number_of_read_workers=2, read_batch_size=3)
+      storage_file.Open(path=temp_file)
+
+      test_events_with_workers = list(storage_file.GetSortedEvents())
+
+      storage_file.Close()
+
+    self.assertEqual(len(test_events), 4)
+
+    timestamps = [event.timestamp for event in test_events]
+    self.assertEqual(timestamps, sorted(timestamps))
+
+    self.assertEqual(
+        [event.timestamp for event in test_events_with_workers], timestamps)
+
+  def testGetSortedEventsWithCompressionFormats(self):
+    """Tests the GetSortedEvents function with compression formats."""
+    test_events = self._CreateTestEvents()
+
+    with self.assertRaises(ValueError):
+      sqlite_file.SQLiteStorageFile(compression_format='bogus')
+
+    with self.assertRaises(ValueError):
+      sqlite_file.SQLiteStorageFile(compression_formats={'bogus': 'zlib'})
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile(
+          compression_format=definitions.COMPRESSION_FORMAT_ZLIB_DICTIONARY,
+          compression_formats={
+              'extraction_error': definitions.COMPRESSION_FORMAT_NONE})
+      storage_file.Open(path=temp_file, read_only=False)
+
+      # Train the dictionary on the few test events.
+      storage_file._MINIMUM_DICTIONARY_SAMPLES_SIZE = 0
+
+      for event in test_events:
+        storage_file.AddEvent(event)
+
+      storage_file.Close()
+
+      # The compression formats of the store are used to read it.
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file)
+
+      self.assertEqual(
+          storage_file.compression_format,
+          definitions.COMPRESSION_FORMAT_ZLIB_DICTIONARY)
+      self.assertEqual(
+          storage_file._compression_formats,
+          {'extraction_error': definitions.COMPRESSION_FORMAT_NONE})
+      self.assertEqual(
+          list(storage_file._compression_dictionaries.keys()), ['event'])
+
+      test_events = list(storage_file.GetSortedEvents())
+
+      storage_file.Close()
+
+      storage_file = sqlite_file.SQLiteStorageFile(
+          number_of_read_workers=2, read_batch_size=3)
+      storage_file.Open(path=temp_file)
+
+      test_events_with_workers = list(storage_file.GetSortedEvents())
+
+      storage_file.Close()
+
+    self.assertEqual(len(test_events), 4)
+
+    timestamps = [event.timestamp for event in test_events]
+    self.assertEqual(timestamps, sorted(timestamps))
+
+    self.assertEqual(
+        [event.timestamp for event in test_events_with_workers], timestamps)
+
+  def testGetSortedEventsWithEventData(self):
+    """Tests the GetSortedEvents function with joined event data."""
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      path_spec = path_spec_factory.Factory.NewPathSpec(
+          dfvfs_definitions.TYPE_INDICATOR_OS, location='/tmp/test.txt')
+
+      event_data = events.EventData(data_type='test:event')
+      event_data.pathspec = path_spec
+      event_data.value = 'test'
+      storage_file.AddEventData(event_data)
+
+      for timestamp in (1334961526929596, 1334940286000000):
+        event = events.EventObject()
+        event.timestamp = timestamp
+        event.timestamp_desc = definitions.TIME_DESCRIPTION_WRITTEN
+        event.SetEventDataIdentifier(event_data.GetIdentifier())
+        storage_file.AddEvent(event)
+
+      storage_file.Close()
+
+      storage_file = sqlite_file.SQLiteStorageFile(join_event_data=True)
+      storage_file.Open(path=temp_file)
+
+      self.assertTrue(storage_file._HasColumn(
+          'event', '_event_data_identifier'))
+
+      test_events = list(storage_file.GetSortedEvents())
+      self.assertEqual(len(test_events), 2)
+      self.assertEqual(len(storage_file._event_data_cache), 1)
+
+      timestamps = [event.timestamp for event in test_events]
+      self.assertEqual(timestamps, [1334940286000000, 1334961526929596])
+
+      for event in test_events:
+        event_data_identifier = event.GetEventDataIdentifier()
+        test_event_data = storage_file.GetEventDataByIdentifier(
+            event_data_identifier)
+        self.assertEqual(test_event_data.value, 'test')
+        self.assertEqual(
+            test_event_data.pathspec.comparable, path_spec.comparable)
+        self.assertEqual(
+            test_event_data.GetIdentifier().CopyToString(),
+            event_data_identifier.CopyToString())
+
+      self.assertEqual(storage_file._event_data_cache.number_of_misses, 1)
+
+      storage_file.Close()
+
+  def testGetSortedEventsWithAttributes(self):
+    """Tests the GetSortedEvents function with data types and parser chains."""
+    test_events = self._CreateTestEvents()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      for event in test_events:
+        storage_file.AddEvent(event)
+
+      event_data = events.EventData(data_type='test:event')
+      event_data.parser = 'test_parser'
+      storage_file.AddEventData(event_data)
+
+      for timestamp in (1334961526929596, 1334940286000000):
+        event = events.EventObject()
+        event.timestamp = timestamp
+        event.timestamp_desc = definitions.TIME_DESCRIPTION_WRITTEN
+        event.SetEventDataIdentifier(event_data.GetIdentifier())
+        storage_file.AddEvent(event)
+
+      storage_file.Close()
+
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      self.assertFalse(storage_file._HasIndex('event_data_type'))
+
+      test_events = list(storage_file.GetSortedEvents(
+          data_types=['text:entry']))
+      self.assertEqual(len(test_events), 1)
+      self.assertTrue(storage_file._HasIndex('event_data_type'))
+      self.assertTrue(storage_file._HasIndex('event_parser'))
+
+      test_events = list(storage_file.GetSortedEvents(
+          data_types=['test:event']))
+      self.assertEqual(len(test_events), 2)
+
+      timestamps = [event.timestamp for event in test_events]
+      self.assertEqual(timestamps, [1334940286000000, 1334961526929596])
+
+      test_events = list(storage_file.GetSortedEvents(
+          parser_chains=['test_parser', 'UNKNOWN']))
+      self.assertEqual(len(test_events), 6)
+
+      test_time_range = time_range.TimeRange(
+          1334940000000000, 1334950000000000)
+      test_events = list(storage_file.GetSortedEvents(
+          time_range=test_time_range, data_types=['test:event'],
+          parser_chains=['test_parser']))
+      self.assertEqual(len(test_events), 1)
+
+      test_events = list(storage_file.GetSortedEvents(data_types=[]))
+      self.assertEqual(len(test_events), 0)
+
+      # Events without a stored data type are not filtered.
+      storage_file._cursor.execute('UPDATE event SET _data_type = NULL')
+
+      test_events = list(storage_file.GetSortedEvents(
+          data_types=['test:event']))
+      self.assertEqual(len(test_events), 6)
+
+      storage_file.Close()
+
+  def testGetSortedEventsTimestampIndex(self):
+    """Tests the event timestamp index used by GetSortedEvents."""
+    test_events = self._CreateTestEvents()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      for event in test_events:
+        storage_file.AddEvent(event)
+
+      storage_file.Close()
+
+      storage_file = sqlite_file.SQLiteStorageFile(build_timestamp_index=False)
+      storage_file.Open(path=temp_file)
+
+      self.assertFalse(storage_file._HasIndex('event_timestamp'))
+
+      test_events = list(storage_file.GetSortedEvents())
+      self.assertEqual(len(test_events), 4)
+      self.assertFalse(storage_file._HasIndex('event_timestamp'))
+
+      storage_file.Close()
+
+      # A store opened read-only is not modified.
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file)
+
+      test_events = list(storage_file.GetSortedEvents(
+          data_types=['test:event']))
+      self.assertEqual(len(test_events), 0)
+      self.assertFalse(storage_file._HasIndex('event_timestamp'))
+      self.assertFalse(storage_file._HasIndex('event_data_type'))
+
+      storage_file.Close()
+
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      test_events = list(storage_file.GetSortedEvents())
+      self.assertEqual(len(test_events), 4)
+      self.assertTrue(storage_file._HasIndex('event_timestamp'))
+
+      storage_file.Close()
+
+      # A failed attempt to create the indexes is not retried.
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+      storage_file._cursor.execute('DROP INDEX event_timestamp')
+      storage_file._has_event_timestamp_index = False
+
+      storage_file._cursor.execute('PRAGMA query_only = ON')
+      test_events = list(storage_file.GetSortedEvents())
+      self.assertEqual(len(test_events), 4)
+
+      storage_file._cursor.execute('PRAGMA query_only = OFF')
+      test_events = list(storage_file.GetSortedEvents())
+      self.assertEqual(len(test_events), 4)
+      self.assertFalse(storage_file._HasIndex('event_timestamp'))
+
+      storage_file.Close()
 
   # TODO: add tests for HasAnalysisReports
   # TODO: add tests for HasErrors
@@ -278,6 +769,67 @@ class SQLiteStorageFileTest(test_lib.StorageTestCase):
       storage_file.WriteSessionStart(session_start)
       storage_file.WriteSessionCompletion(session_completion)
 
+      self.assertFalse(storage_file._HasIndex('event_timestamp'))
+
+      storage_file.Close()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      storage_file.WriteSessionStart(session_start)
+      storage_file.WriteSessionCompletion(session_completion)
+
+      self.assertTrue(storage_file._HasIndex('event_timestamp'))
+
+      storage_file.Close()
+
+  def testWriteTaskCheckpoint(self):
+    """Tests the WriteTaskCheckpoint and GetTaskCheckpoints functions."""
+    session = sessions.Session()
+    task = tasks.Task(session_identifier=session.identifier)
+    task.path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location='/tmp/test')
+    task_checkpoint = task.CreateTaskCheckpoint()
+
+    with shared_test_lib.TempDirectory() as temp_directory:
+      temp_file = os.path.join(temp_directory, 'plaso.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile()
+      storage_file.Open(path=temp_file, read_only=False)
+
+      self.assertEqual(list(storage_file.GetTaskCheckpoints()), [])
+
+      storage_file.AddEventSource(event_sources.EventSource())
+      storage_file.WriteTaskCheckpoint(task_checkpoint)
+
+      # The task checkpoint and the attribute containers written before it
+      # are committed, hence available to a reader before close.
+      storage_reader = sqlite_file.SQLiteStorageFile()
+      storage_reader.Open(path=temp_file)
+
+      test_task_checkpoints = list(storage_reader.GetTaskCheckpoints())
+      self.assertEqual(len(test_task_checkpoints), 1)
+      self.assertEqual(test_task_checkpoints[0].identifier, task.identifier)
+      self.assertEqual(
+          [path_spec.comparable
+           for path_spec in test_task_checkpoints[0].path_specs],
+          [task.path_spec.comparable])
+
+      self.assertEqual(storage_reader.GetNumberOfEventSources(), 1)
+
+      storage_reader.Close()
+
+      storage_file.Close()
+
+      temp_file = os.path.join(temp_directory, 'task.sqlite')
+      storage_file = sqlite_file.SQLiteStorageFile(
+          storage_type=definitions.STORAGE_TYPE_TASK)
+      storage_file.Open(path=temp_file, read_only=False)
+
+      with self.assertRaises(IOError):
+        storage_file.WriteTaskCheckpoint(task_checkpoint)
+
       storage_file.Close()
 
   def testWriteTaskStartAndCompletion(self):
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Script to benchmark the psort event heap."""
+
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import sys
+import timeit
+
+# Change PYTHONPATH to include plaso.
+sys.path.insert(0, '.')
+
+from plaso.containers import events  # pylint: disable=wrong-import-position
+from plaso.lib import definitions  # pylint: disable=wrong-import-position
+from plaso.multi_processing import psort  # pylint: disable=wrong-import-position
+
+
+def CreateTestEvent():
+  """Creates an event with typical attributes.
+
+  Returns:
+    EventObject: event.
+  """
+  event = events.EventObject()
+  event.data_type = 'test:event'
+  event.filename = 'C:\\Windows\\System32\\config\\SYSTEM'
+  event.offset = 1024
+  event.regvalue = {'Value': 'c:/Temp/evil.exe'}
+  event.timestamp = 5134324321
+  event.timestamp_desc = definitions.TIME_DESCRIPTION_CHANGE
+  event.username = 'joesmith'
+  return event
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Benchmarks pushing events with unique timestamps onto the psort event '
+      'heap, which defers determining the identifiers of the events.'))
+
+  argument_parser.add_argument(
+      '--number', dest='number', type=int, default=100000, help=(
+          'number of events to push per run.'))
+
+  argument_parser.add_argument(
+      '--repeat', dest='repeat', type=int, default=3, help=(
+          'number of runs, of which the fastest is reported.'))
+
+  options = argument_parser.parse_args()
+
+  event = CreateTestEvent()
+  event_heap = psort.PsortEventHeap()
+
+  def _PushAndPopEvent():
+    event_heap.PushEvent(event)
+    event_heap.PopEvent()
+
+  def _GetEventIdentifiers():
+    event_heap._GetEventIdentifiers(event)  # pylint: disable=protected-access
+
+  push_time = min(timeit.repeat(
+      _PushAndPopEvent, number=options.number, repeat=options.repeat))
+  identifiers_time = min(timeit.repeat(
+      _GetEventIdentifiers, number=options.number, repeat=options.repeat))
+
+  print('Push and pop of events with unique timestamps\n'
+        '\tevents:\t\t\t{0:d}\n\ttotal time:\t\t{1:.3f}s\n'.format(
+            options.number, push_time))
+  print('Determining event identifiers\n'
+        '\tevents:\t\t\t{0:d}\n\ttotal time:\t\t{1:.3f}s\n'.format(
+            options.number, identifiers_time))
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
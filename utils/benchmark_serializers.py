@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Script to benchmark the attribute container serializers."""
+
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import os
+import sys
+import time
+import zlib
+
+# Change PYTHONPATH to include plaso.
+sys.path.insert(0, '.')
+
+from plaso.lib import definitions  # pylint: disable=wrong-import-position
+from plaso.serializer import factory as serializer_factory  # pylint: disable=wrong-import-position
+from plaso.storage.sqlite import sqlite_file  # pylint: disable=wrong-import-position
+
+
+class BenchmarkResult(object):
+  """Result of a benchmark run.
+
+  Attributes:
+    compressed_size (int): size of the zlib compressed serialized data.
+    description (str): description of the benchmark run.
+    number_of_containers (int): number of attribute containers serialized.
+    read_time (float): time in seconds to deserialize the attribute
+        containers.
+    serialized_size (int): size of the serialized data.
+    write_time (float): time in seconds to serialize the attribute
+        containers.
+  """
+
+  def __init__(self, description):
+    """Initializes a benchmark result.
+
+    Args:
+      description (str): description of the benchmark run.
+    """
+    super(BenchmarkResult, self).__init__()
+    self.compressed_size = 0
+    self.description = description
+    self.number_of_containers = 0
+    self.read_time = None
+    self.serialized_size = 0
+    self.write_time = None
+
+
+def BenchmarkSerializer(attribute_containers, serialization_format):
+  """Benchmarks serializing and deserializing attribute containers.
+
+  The serialized data is compared in the form it is stored in, which is
+  UTF-8 encoded for JSON.
+
+  Args:
+    attribute_containers (list[AttributeContainer]): attribute containers.
+    serialization_format (str): serialization format.
+
+  Returns:
+    BenchmarkResult: benchmark result.
+  """
+  serializer = (
+      serializer_factory.SerializerFactory.GetAttributeContainerSerializer(
+          serialization_format))
+  is_json = serialization_format == definitions.SERIALIZER_FORMAT_JSON
+
+  result = BenchmarkResult(serialization_format)
+
+  start_time = time.time()
+
+  serialized_data_list = []
+  for attribute_container in attribute_containers:
+    serialized_data = serializer.WriteSerialized(attribute_container)
+    if is_json:
+      serialized_data = serialized_data.encode('utf-8')
+    serialized_data_list.append(serialized_data)
+
+  result.write_time = time.time() - start_time
+
+  start_time = time.time()
+
+  for serialized_data in serialized_data_list:
+    if is_json:
+      serialized_data = serialized_data.decode('utf-8')
+    serializer.ReadSerialized(serialized_data)
+
+  result.read_time = time.time() - start_time
+
+  result.number_of_containers = len(serialized_data_list)
+  for serialized_data in serialized_data_list:
+    result.serialized_size += len(serialized_data)
+    result.compressed_size += len(zlib.compress(serialized_data))
+
+  return result
+
+
+def PrintResult(result):
+  """Prints a benchmark result.
+
+  Args:
+    result (BenchmarkResult): benchmark result.
+  """
+  print('{0:s}\n\tattribute containers:\t{1:d}\n\twrite time:\t\t{2:.3f}s\n'
+        '\tread time:\t\t{3:.3f}s\n\tserialized size:\t{4:d}\n'
+        '\tcompressed size:\t{5:d}\n'.format(
+            result.description, result.number_of_containers,
+            result.write_time, result.read_time, result.serialized_size,
+            result.compressed_size))
+
+
+def ReadAttributeContainers(path, maximum_number_of_containers):
+  """Reads the events and event data from a storage file.
+
+  Args:
+    path (str): path of the storage file.
+    maximum_number_of_containers (int): maximum number of events and of event
+        data to read, where 0 represents no limit.
+
+  Returns:
+    list[AttributeContainer]: attribute containers.
+  """
+  attribute_containers = []
+
+  storage_file = sqlite_file.SQLiteStorageFile()
+  storage_file.Open(path=path)
+
+  try:
+    for generator in (storage_file.GetEvents(), storage_file.GetEventData()):
+      for index, attribute_container in enumerate(generator):
+        if maximum_number_of_containers and (
+            index >= maximum_number_of_containers):
+          break
+        attribute_containers.append(attribute_container)
+
+  finally:
+    storage_file.Close()
+
+  return attribute_containers
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Benchmarks the attribute container serializers with the events and '
+      'event data of a plaso storage file.'))
+
+  argument_parser.add_argument(
+      '--maximum', dest='maximum_number_of_containers', type=int, default=0,
+      help=('maximum number of events and of event data to benchmark with, '
+            'where 0 represents no limit.'))
+
+  argument_parser.add_argument(
+      'storage_file', type=str, help='path of the plaso storage file.')
+
+  options = argument_parser.parse_args()
+
+  if not os.path.isfile(options.storage_file):
+    print('No such file: {0:s}'.format(options.storage_file))
+    return False
+
+  attribute_containers = ReadAttributeContainers(
+      options.storage_file, options.maximum_number_of_containers)
+
+  for serialization_format in sorted(definitions.SERIALIZER_FORMATS):
+    result = BenchmarkSerializer(attribute_containers, serialization_format)
+    PrintResult(result)
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Script to benchmark reading events from a plaso storage file."""
+
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+# Change PYTHONPATH to include plaso.
+sys.path.insert(0, '.')
+
+from plaso.storage import time_range as storage_time_range  # pylint: disable=wrong-import-position
+from plaso.storage.sqlite import sqlite_file  # pylint: disable=wrong-import-position
+
+
+class BenchmarkResult(object):
+  """Result of a benchmark run.
+
+  Attributes:
+    description (str): description of the benchmark run.
+    number_of_events (int): number of events read.
+    time_to_first_event (float): time in seconds until the first event
+        was read.
+    total_time (float): time in seconds until all events were read.
+  """
+
+  def __init__(self, description):
+    """Initializes a benchmark result.
+
+    Args:
+      description (str): description of the benchmark run.
+    """
+    super(BenchmarkResult, self).__init__()
+    self.description = description
+    self.number_of_events = 0
+    self.time_to_first_event = None
+    self.total_time = None
+
+
+def BenchmarkSortedEvents(path, description, time_range=None, **kwargs):
+  """Benchmarks reading events, and their event data, in chronological order.
+
+  Args:
+    path (str): path of the storage file.
+    description (str): description of the benchmark run.
+    time_range (Optional[TimeRange]): time range used to filter events.
+    kwargs (dict[str, object]): keyword arguments of the storage file.
+
+  Returns:
+    BenchmarkResult: benchmark result.
+  """
+  result = BenchmarkResult(description)
+
+  start_time = time.time()
+
+  # The storage file is opened writable, since indexes are only built in
+  # a writable storage file.
+  storage_file = sqlite_file.SQLiteStorageFile(**kwargs)
+  storage_file.Open(path=path, read_only=False)
+
+  try:
+    for event in storage_file.GetSortedEvents(time_range=time_range):
+      if not result.number_of_events:
+        result.time_to_first_event = time.time() - start_time
+      result.number_of_events += 1
+
+      # Make sure the event is used so that the read is not optimized away.
+      _ = event.timestamp
+
+      event_data_identifier = event.GetEventDataIdentifier()
+      if event_data_identifier:
+        storage_file.GetEventDataByIdentifier(event_data_identifier)
+
+  finally:
+    storage_file.Close()
+
+  result.total_time = time.time() - start_time
+  return result
+
+
+def DropEventTimestampIndex(path):
+  """Drops the event timestamp index from a storage file.
+
+  Args:
+    path (str): path of the storage file.
+  """
+  connection = sqlite3.connect(path)
+  try:
+    connection.execute('DROP INDEX IF EXISTS event_timestamp')
+    connection.commit()
+  finally:
+    connection.close()
+
+
+def PrintResult(result):
+  """Prints a benchmark result.
+
+  Args:
+    result (BenchmarkResult): benchmark result.
+  """
+  time_to_first_event = result.time_to_first_event
+  if time_to_first_event is None:
+    time_to_first_event = 0.0
+
+  print('{0:s}\n\tevents:\t\t\t{1:d}\n\ttime to first event:\t{2:.3f}s\n'
+        '\ttotal time:\t\t{3:.3f}s\n'.format(
+            result.description, result.number_of_events, time_to_first_event,
+            result.total_time))
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Benchmarks reading events from a plaso storage file.'))
+
+  argument_parser.add_argument(
+      '--batch_size', '--batch-size', dest='read_batch_size', type=int,
+      default=0, help='number of rows read from the storage file at once.')
+
+  argument_parser.add_argument(
+      '--end', dest='end_timestamp', type=int, default=None, help=(
+          'end timestamp of the time range to read, in number of '
+          'microseconds since January 1, 1970, 00:00:00 UTC.'))
+
+  argument_parser.add_argument(
+      '--start', dest='start_timestamp', type=int, default=None, help=(
+          'start timestamp of the time range to read, in number of '
+          'microseconds since January 1, 1970, 00:00:00 UTC.'))
+
+  argument_parser.add_argument(
+      '--workers', dest='number_of_read_workers', type=int, default=0, help=(
+          'number of read worker processes to also benchmark reading with.'))
+
+  argument_parser.add_argument(
+      'storage_file', type=str, help='path of the plaso storage file.')
+
+  options = argument_parser.parse_args()
+
+  if not os.path.isfile(options.storage_file):
+    print('No such file: {0:s}'.format(options.storage_file))
+    return False
+
+  time_range = None
+  if options.start_timestamp is not None or options.end_timestamp is not None:
+    start_timestamp = options.start_timestamp
+    if start_timestamp is None:
+      start_timestamp = storage_time_range.TimeRange.MINIMUM_TIMESTAMP
+
+    end_timestamp = options.end_timestamp
+    if end_timestamp is None:
+      end_timestamp = storage_time_range.TimeRange.MAXIMUM_TIMESTAMP
+
+    time_range = storage_time_range.TimeRange(start_timestamp, end_timestamp)
+
+  # The benchmark modifies the storage file hence it works on a copy.
+  temporary_directory = tempfile.mkdtemp()
+  try:
+    path = os.path.join(
+        temporary_directory, os.path.basename(options.storage_file))
+    shutil.copyfile(options.storage_file, path)
+
+    DropEventTimestampIndex(path)
+
+    result = BenchmarkSortedEvents(
+        path, 'Sorted events without timestamp index',
+        time_range=time_range, build_timestamp_index=False)
+    PrintResult(result)
+
+    result = BenchmarkSortedEvents(
+        path, 'Sorted events including building timestamp index',
+        time_range=time_range)
+    PrintResult(result)
+
+    result = BenchmarkSortedEvents(
+        path, 'Sorted events with timestamp index', time_range=time_range,
+        read_batch_size=options.read_batch_size)
+    PrintResult(result)
+
+    result = BenchmarkSortedEvents(
+        path, 'Sorted events with timestamp index and joined event data',
+        time_range=time_range, join_event_data=True,
+        read_batch_size=options.read_batch_size)
+    PrintResult(result)
+
+    if options.number_of_read_workers:
+      description = (
+          'Sorted events with timestamp index and {0:d} read workers').format(
+              options.number_of_read_workers)
+      result = BenchmarkSortedEvents(
+          path, description, time_range=time_range,
+          number_of_read_workers=options.number_of_read_workers,
+          read_batch_size=options.read_batch_size)
+      PrintResult(result)
+
+  finally:
+    shutil.rmtree(temporary_directory, True)
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)